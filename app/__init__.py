@@ -1,10 +1,10 @@
 from flask import Flask, Response, current_app
-from flask_sqlalchemy import SQLAlchemy
 from flask_restx import  Api, fields
 import json
 from flask_session import Session
 
-from app.config import SWAGGER_AUTHORIZATIONS
+from app.models import db
+from app.config import ENTITY_VIEW_DB_NAME, IDEMPOTENCY_DB_NAME, P12_FILE_PATH, REQUEST_DECOMPRESSION_MAX_SIZE, SUBSCRIPTION_NOTIFICATION_TOKEN, SUBSCRIPTIONS_ENABLED, SWAGGER_AUTHORIZATIONS, WRITE_BEHIND_DB_NAME, WRITE_BEHIND_ENABLED
 
 
 
@@ -35,14 +35,27 @@ def create_app():
     from app.api import get_namespaces as get_routes_namespaces
     from app.smartdatamodel_api import get_namespaces as get_api_namespaces
     app = Flask(__name__)
+    from app.compression import RequestDecompressionMiddleware
+    app.wsgi_app = RequestDecompressionMiddleware(app.wsgi_app, max_size=REQUEST_DECOMPRESSION_MAX_SIZE)
     app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///database.sqlite3"
-    db = SQLAlchemy()
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
     app.config['SECRET_KEY'] = "your_super_secret_key_here"
     app.config['SESSION_TYPE'] = 'filesystem'
     app.json_encoder = CustomJSONEncoder
+    from app.utils import json_default
+    # The Smart Data Models returned by the ingest endpoints hold the datetimes filled in by the models.
+    app.config['RESTX_JSON'] = {'default': json_default}
     Session(app)
+    from app.static_documents import exclude_public_responses
+    exclude_public_responses(app.session_interface)
     from app.auth import login_manager
     login_manager.init_app(app)
+    if P12_FILE_PATH:
+        # Decrypt the iSHARE key once at startup instead of on the first outbound request.
+        from app.utils import ishare_key_material
+        ishare_key_material.load()
     from app.routes import main_blueprint
     app.register_blueprint(main_blueprint)
 
@@ -61,6 +74,23 @@ def create_app():
     from app.smartdatamodel_api import smartdata_blueprint
     app.register_blueprint(smartdata_blueprint, url_prefix='/api')
 
+    from app.smartdatamodel_api import idempotency_store
+    idempotency_store.init_app(app, IDEMPOTENCY_DB_NAME)
+
+    if WRITE_BEHIND_ENABLED:
+        from app.smartdatamodel_api import write_behind_queue
+        write_behind_queue.init_app(app, WRITE_BEHIND_DB_NAME)
+        write_behind_queue.start()
+
+    if SUBSCRIPTIONS_ENABLED:
+        if not SUBSCRIPTION_NOTIFICATION_TOKEN:
+            # The notifications overwrite the entities served by the view, so they must be authenticated.
+            raise RuntimeError("SUBSCRIPTIONS_ENABLED requires a SUBSCRIPTION_NOTIFICATION_TOKEN.")
+        from app.subscriptions import entity_view, subscription_manager
+        entity_view.init_app(app, ENTITY_VIEW_DB_NAME)
+        # One process of the deployment subscribes and resynchronises; the view is shared by all of them.
+        subscription_manager.start(lock_path=entity_view.path + ".lock")
+
     from app.api  import api_blueprint
     app.register_blueprint(api_blueprint)
 
@@ -1,12 +1,22 @@
 
-from flask import Blueprint, request, jsonify
+import base64
+import hmac
+import json
+import logging
+from urllib.parse import urlencode
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from app.models import  User
-from app.utils import add_policy, api_key_required, get_token, get_token_with_jwt, get_x_auth_token, list_policies, store_policy_in_ar, test_policy
+from app.utils import add_policy, api_key_required, entity_cache, invalidate_entity, kong_read_headers, get_token, get_token_with_jwt, get_x_auth_token, keyrock_admin_request, list_policies, store_policy_in_ar, test_policy
 from flask_login import current_user, login_required
-from app.config import  DEVELOPMENT, APP_KEYROCK_PASSWORD, APP_KEYROCK_USERNAME, KEYROCK_APPLICATION_URL_1, KEYROCK_APPLICATION_URL_2, KONG_ENTITIES, KONG_ENTITIES_TYPE, KEYROCK_USERS_URL
-import requests
+from app.config import  BROKER_PAGE_SIZE, BROKER_STREAM_CHUNK_SIZE, DEVELOPMENT, ENTITY_CACHE_ENABLED, ENTITY_TYPES, SUBSCRIPTION_NOTIFICATION_TOKEN, KEYROCK_APPLICATION_URL_1, KEYROCK_APPLICATION_URL_2, KONG_ENTITIES, KONG_ENTITIES_TYPE, KEYROCK_USERS_URL
+from app.http_client import http_client
 from flask_restx import  Resource, Namespace
 from app.models import db
+from app.metrics import metrics
+from app.streaming import iter_json_array, ndjson_line
+from app.entity_view import check_entities
+from app.subscriptions import entity_view
 
 # Defining Blueprint for the API
 api_blueprint = Blueprint("api", __name__)
@@ -17,10 +27,11 @@ authentication_ns = Namespace('authentication', description='Authentication Oper
 authorization_ns = Namespace('authorization', description='Authorization Operations')
 context_broker_ns = Namespace('context-broker', description='Context Broker Operations')
 keyrock_ns = Namespace('keyrock', description='Keyrock Operations')
+monitoring_ns = Namespace('monitoring', description='Monitoring Operations')
 
 def get_namespaces():
     # Function to return all namespaces
-    return [authentication_ns, authorization_ns, context_broker_ns, keyrock_ns]
+    return [authentication_ns, authorization_ns, context_broker_ns, keyrock_ns, monitoring_ns]
 
 def conditional_decorator(decorator1, decorator2):
     # Conditional decorator function, returns different decorator based on the environment
@@ -64,28 +75,247 @@ class GetJWTAccessToken(Resource):
         return get_token_with_jwt()
 
 
+def encode_cursor(offset, limit):
+    # Opaque to the client: it only has to send it back to get the next page.
+    return base64.urlsafe_b64encode(f"{offset}:{limit}".encode()).decode()
+
+
+def decode_cursor(cursor):
+    offset, limit = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+    return int(offset), int(limit)
+
+
+def read_pagination_args(args):
+    """
+    This method reads the limit, offset and cursor query parameters.
+
+    Returns:
+        A tuple (offset, limit), where limit is None when the client did not ask for one.
+
+    Raises:
+        ValueError: If a parameter is not a valid non-negative integer or cursor.
+    """
+    cursor = args.get("cursor")
+    if cursor:
+        try:
+            offset, limit = decode_cursor(cursor)
+        except Exception:
+            raise ValueError("Invalid cursor.")
+    else:
+        offset = int(args.get("offset", 0))
+        limit = int(args["limit"]) if args.get("limit") else None
+    if offset < 0 or (limit is not None and limit <= 0):
+        raise ValueError("offset must be >= 0 and limit > 0.")
+    return offset, limit
+
+
+GEO_RELATIONS = ("near", "within", "contains", "intersects", "equals", "disjoint", "overlaps")
+GEOMETRIES = ("Point", "MultiPoint", "LineString", "MultiLineString", "Polygon", "MultiPolygon")
+QUERY_OPTIONS = ("keyValues", "sysAttrs")
+
+
+def read_query_args(args):
+    """
+    This method reads the NGSI-LD query parameters forwarded to the broker: attrs, q, the geo-query
+    (georel, geometry, coordinates and optionally geoproperty) and options.
+
+    Returns:
+        A dictionary with the parameters present in the request.
+
+    Raises:
+        ValueError: If a parameter is malformed or the geo-query is incomplete.
+    """
+    query = {}
+    if args.get("attrs"):
+        attrs = [attr.strip() for attr in args["attrs"].split(",") if attr.strip()]
+        query["attrs"] = ",".join(attrs)
+    if args.get("q"):
+        query["q"] = args["q"]
+
+    geo = {name: args.get(name) for name in ("georel", "geometry", "coordinates") if args.get(name)}
+    if geo:
+        if len(geo) != 3:
+            raise ValueError("georel, geometry and coordinates must be used together.")
+        if geo["georel"].split(";")[0] not in GEO_RELATIONS:
+            raise ValueError(f"georel must be one of {', '.join(GEO_RELATIONS)}.")
+        if geo["georel"].startswith("near") and "Distance==" not in geo["georel"]:
+            raise ValueError("near requires maxDistance or minDistance, e.g. near;maxDistance==1000.")
+        if geo["geometry"] not in GEOMETRIES:
+            raise ValueError(f"geometry must be one of {', '.join(GEOMETRIES)}.")
+        try:
+            coordinates = json.loads(geo["coordinates"])
+        except ValueError:
+            raise ValueError("coordinates must be a JSON array.")
+        if not isinstance(coordinates, list):
+            raise ValueError("coordinates must be a JSON array.")
+        query.update(geo)
+        if args.get("geoproperty"):
+            query["geoproperty"] = args["geoproperty"]
+
+    if args.get("options"):
+        options = [option.strip() for option in args["options"].split(",") if option.strip()]
+        unknown = [option for option in options if option not in QUERY_OPTIONS]
+        if unknown:
+            raise ValueError(f"Unsupported options: {', '.join(unknown)}.")
+        query["options"] = ",".join(options)
+    return query
+
+
+def next_page_link(next_cursor):
+    # Keep the filters of the current request, replacing the pagination by the cursor.
+    args = {key: value for key, value in request.args.items() if key not in ("limit", "offset", "cursor")}
+    args["cursor"] = next_cursor
+    return f'<{request.base_url}?{urlencode(args)}>; rel="next"'
+
+
+def project_entity(entity, attrs, key_values):
+    """
+    This method applies attrs and options=keyValues to an entity of the local view, as the broker would.
+    """
+    projected = {}
+    for key, value in entity.items():
+        if attrs and key not in ("id", "type", "@context") and key not in attrs:
+            continue
+        if key_values and isinstance(value, dict) and key not in ("id", "type", "@context"):
+            value = value.get("value", value.get("object", value))
+        projected[key] = value
+    return projected
+
+
+def entities_from_view(entity_type, offset, limit, count, query):
+    """
+    This method answers GetEntitiesByType from the local entity view. Without attrs or options
+    the stored JSON is joined as it is, without decoding the entities.
+    """
+    rows = entity_view.list(entity_type, offset, limit)
+    received = len(rows)
+    options = query.get("options", "").split(",")
+    if "attrs" in query or "keyValues" in options:
+        attrs = set(query["attrs"].split(",")) if "attrs" in query else None
+        rows = [json.dumps(project_entity(json.loads(row), attrs, "keyValues" in options)) for row in rows]
+    body = '{"entities": [' + ",".join(rows) + "]"
+    headers = {}
+    if limit is not None and received == limit:
+        next_cursor = encode_cursor(offset + limit, limit)
+        body += f', "next_cursor": "{next_cursor}"'
+        headers["Link"] = next_page_link(next_cursor)
+    if count:
+        headers["NGSILD-Results-Count"] = str(entity_view.count(entity_type))
+    return Response(body + "}", mimetype="application/json", headers=headers)
+
+
+def stream_entities(url, headers, query, first_response, offset, limit, page_limit, ndjson):
+    """
+    This method forwards the entities of a type chunk by chunk, requesting the following pages from the
+    broker as the previous ones are consumed, so the full list is never held in memory.
+
+    Elements are emitted as a JSON array, or one per line when ndjson is True. If a later page fails
+    the output stops there, leaving an unterminated JSON array.
+    """
+    if not ndjson:
+        yield b"["
+    sent = 0
+    response = first_response
+    while True:
+        received = 0
+        try:
+            for element in iter_json_array(response.iter_content(chunk_size=BROKER_STREAM_CHUNK_SIZE)):
+                if ndjson:
+                    yield ndjson_line(element)
+                else:
+                    yield element if sent == 0 else b"," + element
+                sent += 1
+                received += 1
+        finally:
+            response.close()
+
+        offset += received
+        if received < page_limit or (limit is not None and sent >= limit):
+            break
+        page_limit = BROKER_PAGE_SIZE if limit is None else min(BROKER_PAGE_SIZE, limit - sent)
+        response = http_client.get(url, headers=headers, params={**query, "limit": page_limit, "offset": offset}, stream=True)
+        if response.status_code != 200:
+            logging.warning(f"Entity stream interrupted at offset {offset}: {response.status_code} - {response.text}")
+            response.close()
+            return
+    if not ndjson:
+        yield b"]"
+
+
 @context_broker_ns.route("/entity/<entity>")
 class GetEntitiesByType(Resource):
     # Resource class for fetching entities by their type
     @context_broker_ns.doc('get_entities_by_type')
     @context_broker_ns.param('entity', 'The type of entity')
+    @context_broker_ns.param('limit', 'Maximum number of entities to return')
+    @context_broker_ns.param('offset', 'Number of entities to skip')
+    @context_broker_ns.param('cursor', 'Cursor returned as next_cursor by the previous page. Replaces limit and offset')
+    @context_broker_ns.param('count', 'Set to true to receive the total number of entities in the NGSILD-Results-Count header')
+    @context_broker_ns.param('stream', 'Set to true to stream all the entities (or the first limit ones) instead of one page')
+    @context_broker_ns.param('format', 'Format of the stream: json (default) or ndjson')
+    @context_broker_ns.param('attrs', 'Comma-separated attributes to return, e.g. name,location')
+    @context_broker_ns.param('q', 'NGSI-LD query, e.g. area>10;cropStatus=="seeded"')
+    @context_broker_ns.param('georel', 'Geo-relationship, e.g. near;maxDistance==2000 or within')
+    @context_broker_ns.param('geometry', 'Geometry of the geo-query: Point, Polygon, ...')
+    @context_broker_ns.param('coordinates', 'Coordinates of the geometry as a JSON array, e.g. [-5.66,40.96]')
+    @context_broker_ns.param('geoproperty', 'GeoProperty the geo-query applies to (default location)')
+    @context_broker_ns.param('options', 'keyValues to receive attribute values instead of full NGSI-LD attributes')
     @conditional_decorator(login_required, api_key_required)
     def get(self, entity):
+        try:
+            offset, limit = read_pagination_args(request.args)
+            query = read_query_args(request.args)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        stream = request.args.get("stream", "false").lower() == "true"
+        count = request.args.get("count", "false").lower() == "true"
+
+        # The view projects attrs and keyValues itself but cannot evaluate q or geo-queries.
+        if not stream and "q" not in query and "georel" not in query and entity_view.is_synced(entity):
+            return entities_from_view(entity, offset, limit, count, query)
+
         token = get_token_with_jwt()
-        headers = {
-            "Authorization" : f'Bearer {token}',
-            "Content-Type" :  "application/json"
-        }
+        # The Link header gives the broker the @context used to write the entities, so the attribute
+        # names in attrs and q resolve to the same terms.
+        headers = kong_read_headers(token)
 
         url = f"{KONG_ENTITIES_TYPE}{entity}"
 
-        response = requests.get(url, headers=headers)
+        params = dict(query)
+        page_limit = None
+        if stream or limit is not None:
+            page_limit = BROKER_PAGE_SIZE if limit is None else min(BROKER_PAGE_SIZE, limit)
+            params["limit"] = page_limit
+        if offset:
+            params["offset"] = offset
+        if count:
+            params["count"] = "true"
 
-        if response.status_code == 200:
-            entities = response.json()
-            return {"entities": entities}, 200
-        else:
-            return {"error": f"Error al obtener entidades del Context Broker: {response.status_code} - {response.text}"}, response.status_code
+        response = http_client.get(url, headers=headers, params=params, stream=stream)
+
+        if response.status_code != 200:
+            error = {"error": f"Error al obtener entidades del Context Broker: {response.status_code} - {response.text}"}
+            response.close()
+            return error, response.status_code
+
+        response_headers = {}
+        if count and "NGSILD-Results-Count" in response.headers:
+            response_headers["NGSILD-Results-Count"] = response.headers["NGSILD-Results-Count"]
+
+        if stream:
+            ndjson = request.args.get("format", "json").lower() == "ndjson"
+            return Response(
+                stream_with_context(stream_entities(url, headers, query, response, offset, limit, page_limit, ndjson)),
+                mimetype="application/x-ndjson" if ndjson else "application/json",
+                headers=response_headers
+            )
+
+        entities = response.json()
+        body = {"entities": entities}
+        if page_limit is not None and len(entities) == page_limit:
+            body["next_cursor"] = encode_cursor(offset + page_limit, page_limit)
+            response_headers["Link"] = next_page_link(body["next_cursor"])
+        return body, 200, response_headers
 
 
 
@@ -94,24 +324,34 @@ class GetEntityById(Resource):
     # Resource class for fetching an entity by its ID
     @context_broker_ns.doc('get_entity_by_id')
     @context_broker_ns.param('entity_id', 'The ID of the entity to fetch')
+    @context_broker_ns.response(304, 'The entity still matches the ETag sent in If-None-Match.')
     @conditional_decorator(login_required, api_key_required)
     def get(self, entity_id):
-        token = get_token_with_jwt()
-        headers = {
-            "Authorization" : f'Bearer {token}',
-            "Content-Type" :  "application/json"
-        }
+        viewed = entity_view.get(entity_id)
+        cached = entity_cache.get(entity_id) if ENTITY_CACHE_ENABLED and viewed is None else None
+        if viewed is not None:
+            entity = json.loads(viewed)
+            etag = entity_cache.compute_etag(entity)
+        elif cached is not None:
+            entity, etag = cached
+        else:
+            token = get_token_with_jwt()
+            # Same @context as the list reads, so the attribute names resolve to the same terms.
+            headers = kong_read_headers(token)
 
-        url = f"{KONG_ENTITIES}/{entity_id}"
+            url = f"{KONG_ENTITIES}/{entity_id}"
 
-        response = requests.get(url, headers=headers)
-        
+            response = http_client.get(url, headers=headers)
+
+            if response.status_code != 200:
+                return {"error": f"Error al obtener entidad del Context Broker: {response.status_code} - {response.text}"}, response.status_code
 
-        if response.status_code == 200:
             entity = response.json()
-            return {"entity": entity}, 200
-        else:
-            return {"error": f"Error al obtener entidad del Context Broker: {response.status_code} - {response.text}"}, response.status_code
+            etag = entity_cache.set(entity_id, entity) if ENTITY_CACHE_ENABLED else entity_cache.compute_etag(entity)
+
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers={"ETag": f'"{etag}"'})
+        return {"entity": entity}, 200, {"ETag": f'"{etag}"'}
 
 
 @context_broker_ns.route("/entity/types")
@@ -121,12 +361,39 @@ class GetAllEntityTypes(Resource):
     @conditional_decorator(login_required, api_key_required)
     def get(self):
         return {
-            "entity_types" : [
-                "AgriFarm", "AgriCarbonFootprint", "AgriCrop", "AgriGreenHouse", "AgriParcel", "AgriParcelOperation", "AgriParcelRecord", "AgriSoil", "AgriSoilState", "AgriYield"
-            ]
+            "entity_types" : ENTITY_TYPES
         }
 
 
+@context_broker_ns.route("/notifications")
+class Notifications(Resource):
+    # Resource class receiving the NGSI-LD notifications of the subscriptions registered by this service
+    @context_broker_ns.doc('notifications')
+    @context_broker_ns.response(204, 'Notification applied to the local entity view.')
+    @context_broker_ns.response(401, 'Missing or wrong X-Notification-Token.')
+    def post(self):
+        # Without a token configured nothing is accepted: the notifications overwrite the entities served by the view.
+        token = request.headers.get("X-Notification-Token", "")
+        if not SUBSCRIPTION_NOTIFICATION_TOKEN or not hmac.compare_digest(token.encode(), SUBSCRIPTION_NOTIFICATION_TOKEN.encode()):
+            return {"error": "Invalid notification token."}, 401
+
+        notification = request.get_json(silent=True)
+        if not isinstance(notification, dict) or not isinstance(notification.get("data"), list):
+            return {"error": "The body must be an NGSI-LD notification."}, 400
+
+        entities = notification["data"]
+        try:
+            check_entities(entities)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        if entity_view.enabled:
+            entity_view.apply(entities)
+        for entity in entities:
+            invalidate_entity(entity["id"])
+        metrics.incr("notifications.received")
+        return "", 204
+
+
 
 
 @authorization_ns.route("/store-policy")
@@ -171,6 +438,15 @@ class ListUserPolicies(Resource):
             return {"error": "Error al listar las políticas."}, 500
 
 
+@monitoring_ns.route("/metrics")
+class GetMetrics(Resource):
+    # Resource class for reading the process-wide counters and histograms
+    @monitoring_ns.doc('get_metrics')
+    @api_key_required
+    def get(self):
+        return metrics.snapshot(), 200
+
+
 
 if DEVELOPMENT:
    
@@ -199,10 +475,8 @@ if DEVELOPMENT:
                 return jsonify({"error": "Passwords do not match."}), 400
 
             
-            admin_token = get_x_auth_token(APP_KEYROCK_USERNAME, APP_KEYROCK_PASSWORD)
             headers = {
-                'Content-Type': 'application/json',
-                'X-Auth-token': admin_token,
+                'Content-Type': 'application/json'
             }
 
             payload = {
@@ -213,7 +487,7 @@ if DEVELOPMENT:
                 }
             }
 
-            response = requests.post(KEYROCK_USERS_URL, json=payload, headers=headers)
+            response = keyrock_admin_request("POST", KEYROCK_USERS_URL, json=payload, headers=headers)
 
             if response.status_code == 201:  # User created successfully
                 user_data = response.json()
@@ -235,12 +509,7 @@ if DEVELOPMENT:
         @keyrock_ns.param('app_id', 'The ID of the app to fetch')
         def get(self, app_id):
             url = f'{KEYROCK_APPLICATION_URL_1}/{app_id}/{KEYROCK_APPLICATION_URL_2}'
-            x_auth_token = get_x_auth_token(APP_KEYROCK_USERNAME, APP_KEYROCK_PASSWORD)
-            headers = {
-                'X-Auth-token': x_auth_token
-            }
-
-            response = requests.get(url, headers=headers)
+            response = keyrock_admin_request("GET", url)
 
             if response.status_code == 200:
                 return jsonify(response.json())
@@ -254,10 +523,8 @@ if DEVELOPMENT:
         @keyrock_ns.doc('get_apps')
         @login_required
         def get(self):
-            admin_token = get_x_auth_token(APP_KEYROCK_USERNAME, APP_KEYROCK_PASSWORD)
-            headers = {'X-Auth-token': admin_token}
             keyrock_apps_url = KEYROCK_APPLICATION_URL_1
-            response = requests.get(keyrock_apps_url, headers=headers)
+            response = keyrock_admin_request("GET", keyrock_apps_url)
             if response.status_code == 200:
                 try:
                     apps_data = response.json()["applications"]
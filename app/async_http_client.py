@@ -0,0 +1,139 @@
+import asyncio
+import itertools
+import os
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+from app.config import ASYNC_BROKER_MAX_CONNECTIONS, ASYNC_BROKER_MAX_IN_FLIGHT, HTTP_BACKOFF_FACTOR, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_RETRIES
+from app.metrics import metrics
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class AsyncHttpClient:
+    """
+    AsyncHttpClient class runs one shared `httpx.AsyncClient` on an event loop owned by a daemon thread
+    of the worker process, so the synchronous views can keep many broker calls in flight at once
+    instead of waiting for each round-trip.
+
+    The connections are split between several clients of at most CONNECTIONS_PER_CLIENT each, used in
+    turn: httpcore scans the whole pool on every request, so one large pool spends more CPU per request
+    the more connections it holds.
+
+    Coroutines are handed to the loop with `run`, which blocks the calling thread until they finish.
+    Calls are timed and retried as HttpClient does: idempotent methods are retried with exponential
+    backoff on connection errors and 502/503/504 responses. httpx is an optional dependency.
+
+    Attributes:
+        - max_connections (int): Maximum number of connections the client opens.
+        - max_in_flight (int): Maximum number of requests awaiting a response at the same time.
+        - connect_timeout (float): Seconds to establish a connection.
+        - read_timeout (float): Seconds to wait for a response.
+        - retries (int): Maximum number of retries of an idempotent call.
+        - backoff_factor (float): Base of the exponential backoff between retries, in seconds.
+    """
+
+    CONNECTIONS_PER_CLIENT = 10
+    RETRY_STATUSES = (502, 503, 504)
+    IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "PUT", "DELETE", "OPTIONS"))
+
+    def __init__(self, max_connections=100, max_in_flight=50, connect_timeout=5, read_timeout=30, retries=3, backoff_factor=0.3):
+        self.max_connections = max_connections
+        self.max_in_flight = max_in_flight
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._lock = threading.Lock()
+        self._loop = None
+        self._loop_pid = None
+        self._clients = None
+        self._in_flight = None
+
+    @staticmethod
+    def available():
+        return httpx is not None
+
+    @property
+    def loop(self):
+        # The loop thread does not survive a fork, so every worker process starts its own.
+        if self._loop is None or self._loop_pid != os.getpid():
+            with self._lock:
+                if self._loop is None or self._loop_pid != os.getpid():
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name="async-http-client", daemon=True).start()
+                    asyncio.run_coroutine_threadsafe(self._open(), loop).result()
+                    self._loop = loop
+                    self._loop_pid = os.getpid()
+        return self._loop
+
+    async def _open(self):
+        clients = []
+        for start in range(0, self.max_connections, self.CONNECTIONS_PER_CLIENT):
+            size = min(self.CONNECTIONS_PER_CLIENT, self.max_connections - start)
+            limits = httpx.Limits(max_connections=size, max_keepalive_connections=size)
+            # As urllib3 does, so the body is not held back by Nagle's algorithm until the headers are acknowledged.
+            transport = httpx.AsyncHTTPTransport(limits=limits, socket_options=[(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)])
+            clients.append(httpx.AsyncClient(transport=transport, timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout)))
+        self._clients = itertools.cycle(clients)
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+
+    def run(self, coroutine):
+        """
+        This method runs a coroutine on the loop of the client and returns its result.
+
+        Raises:
+            RuntimeError: If httpx is not installed.
+        """
+        if httpx is None:
+            coroutine.close()
+            raise RuntimeError("The async broker path needs httpx installed.")
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    async def request(self, method, url, **kwargs):
+        host = urlsplit(url).netloc or "unknown"
+        attempts = self.retries + 1 if method in self.IDEMPOTENT_METHODS else 1
+        for attempt in range(attempts):
+            response = None
+            start = time.perf_counter()
+            try:
+                async with self._in_flight:
+                    response = await next(self._clients).request(method, url, **kwargs)
+            except httpx.TransportError:
+                metrics.incr(f"http.errors.{host}")
+                if attempt + 1 == attempts:
+                    raise
+            finally:
+                metrics.observe(f"http.latency_ms.{host}", (time.perf_counter() - start) * 1000)
+            if response is not None:
+                metrics.incr(f"http.responses.{host}.{response.status_code // 100}xx")
+                if response.status_code not in self.RETRY_STATUSES or attempt + 1 == attempts:
+                    return response
+            await asyncio.sleep(self.backoff_factor * 2 ** attempt)
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def patch(self, url, **kwargs):
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self.request("DELETE", url, **kwargs)
+
+
+async_http_client = AsyncHttpClient(
+    max_connections=ASYNC_BROKER_MAX_CONNECTIONS,
+    max_in_flight=ASYNC_BROKER_MAX_IN_FLIGHT,
+    connect_timeout=HTTP_CONNECT_TIMEOUT,
+    read_timeout=HTTP_READ_TIMEOUT,
+    retries=HTTP_RETRIES,
+    backoff_factor=HTTP_BACKOFF_FACTOR
+)
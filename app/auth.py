@@ -1,18 +1,24 @@
 from flask import redirect
 from flask_login import LoginManager
-from app.models import User
-from app.config import APP_KEYROCK_PASSWORD, APP_KEYROCK_USERNAME, KEYROCK_BASE_URL, KEYROCK_USERS_URL
-from app.utils import get_x_auth_token
-import requests
+from app.cache import TTLCache
+from app.models import User, db
+from app.config import KEYROCK_USERS_URL, USER_CACHE_MAX_SIZE, USER_CACHE_TTL
+from app.utils import keyrock_admin_request
 
 # Instantiate a LoginManager object
 login_manager = LoginManager()
 
+# Profiles of recently loaded users, as (id, username, email) tuples.
+user_cache = TTLCache("cache.users", max_size=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL)
+
 @login_manager.user_loader
 def load_user(user_id):
     """
         This function loads a user by their ID.
 
+        The profile is served from memory, then from the User table, and only fetched from
+        Keyrock the first time the user is seen.
+
         Args:
             user_id (str): The ID of the user to be loaded.
 
@@ -20,16 +26,40 @@ def load_user(user_id):
             User: The User object if the user is found.
             None: If the user is not found.
     """
-    admin_token = get_x_auth_token(APP_KEYROCK_USERNAME, APP_KEYROCK_PASSWORD)
-    headers = {'X-Auth-token': f'{admin_token}'}
+    profile = user_cache.get(user_id)
+    if profile is not None:
+        return User(*profile)
+
+    user = db.session.get(User, user_id)
+    if user is not None:
+        user_cache.set(user_id, (user.id, user.username, user.email))
+        return user
+
+    return refresh_user(user_id)
+
+
+def refresh_user(user_id):
+    """
+        This function fetches a user from Keyrock and stores the profile in the User table and in memory.
+
+        Args:
+            user_id (str): The ID of the user to be fetched.
+
+        Returns:
+            User: The User object if the user is found.
+            None: If the user is not found.
+    """
     user_info_url = f"{KEYROCK_USERS_URL}/{user_id}" 
-    response = requests.get(user_info_url, headers=headers)
+    response = keyrock_admin_request("GET", user_info_url)
     if response.status_code in(200, 201):
         user_data = response.json()["user"]
-        user = User(id=user_data["id"], username=user_data["username"], email=user_data["email"])
+        user = db.session.merge(User(id=user_data["id"], username=user_data["username"], email=user_data["email"]))
+        db.session.commit()
+        user_cache.set(user_id, (user.id, user.username, user.email))
         return user
     else:
         print(f"Error fetching user data from Keyrock: {response.status_code} - {response.text}")
+        user_cache.delete(user_id)
         return None
     
 @login_manager.unauthorized_handler
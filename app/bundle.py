@@ -0,0 +1,159 @@
+import heapq
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from app.metrics import metrics
+
+WRITTEN_STATUSES = ("created", "updated", "upserted")
+
+
+def entity_references(entity):
+    """
+    This method yields the ids named by the Relationship attributes of an NGSI-LD entity.
+    """
+    for value in entity.values():
+        for attribute in value if isinstance(value, list) else (value,):
+            if isinstance(attribute, dict) and attribute.get("type") == "Relationship":
+                target = attribute.get("object")
+                yield from target if isinstance(target, list) else (target,)
+
+
+def dependency_order(entities):
+    """
+    This method works out which entities of a bundle must be written before each one: those it
+    references through a Relationship. References to entities outside the bundle are ignored.
+
+    Relationships often go both ways (an AgriFarm `hasAgriParcel` its parcels, which are `belongsTo`
+    the farm), so cycles are broken by writing first the entity that comes first in the bundle.
+
+    Parameters:
+        entities (list): NGSI-LD entities, each one with its "id".
+
+    Returns:
+        A list with, for every entity, the positions of the entities it waits for. The dependencies never form a cycle.
+    """
+    positions = {entity["id"]: index for index, entity in enumerate(entities)}
+    references = []
+    for index, entity in enumerate(entities):
+        targets = {positions[target] for target in entity_references(entity) if target in positions}
+        targets.discard(index)
+        references.append(sorted(targets))
+
+    dependents = [[] for _ in entities]
+    waiting = [len(targets) for targets in references]
+    for index, targets in enumerate(references):
+        for target in targets:
+            dependents[target].append(index)
+
+    # Kahn's algorithm, taking the first entity of the bundle among those ready; when a cycle leaves
+    # none ready, the first entity not ranked yet is ranked as if its dependencies were met.
+    ready = [index for index, count in enumerate(waiting) if not count]
+    rank = [None] * len(entities)
+    ranked = 0
+    first_unranked = 0
+    while ranked < len(entities):
+        if ready:
+            index = heapq.heappop(ready)
+            if rank[index] is not None:
+                continue
+        else:
+            while rank[first_unranked] is not None:
+                first_unranked += 1
+            index = first_unranked
+        rank[index] = ranked
+        ranked += 1
+        for dependent in dependents[index]:
+            waiting[dependent] -= 1
+            if not waiting[dependent] and rank[dependent] is None:
+                heapq.heappush(ready, dependent)
+    return [[target for target in targets if rank[target] < rank[index]] for index, targets in enumerate(references)]
+
+
+class BundleWriter:
+    """
+    BundleWriter class writes a set of related entities, such as a farm with its parcels, buildings
+    and owner, from a pool of threads instead of one request after another.
+
+    At most `max_in_flight` entities are written at the same time. An entity is only written once the
+    entities it references (see dependency_order) were written; if one of them failed, it is skipped.
+    Each result carries the time the entity waited for its dependencies and a free thread, and the
+    time its write took.
+
+    Attributes:
+        - write (callable): Function receiving an entity and returning its result, as
+          `app.utils.upsert_to_kong` does for each entity: {"id": ..., "status": ..., "error": ...}.
+        - max_in_flight (int): Maximum number of entities written at the same time.
+    """
+
+    def __init__(self, write, max_in_flight=8):
+        self.write = write
+        self.max_in_flight = max_in_flight
+
+    def _timed_write(self, entity, start):
+        begin = time.perf_counter()
+        try:
+            result = self.write(entity)
+        except Exception as e:
+            logging.warning(f"Error writing {entity['id']} of a bundle: {e}")
+            result = {"id": entity["id"], "status": "failed", "error": str(e)}
+        end = time.perf_counter()
+        return {**result, "queued_ms": round((begin - start) * 1000, 3), "write_ms": round((end - begin) * 1000, 3)}
+
+    def write_all(self, entities):
+        """
+        This method writes the entities of a bundle.
+
+        Parameters:
+            entities (list): NGSI-LD entities with distinct ids.
+
+        Returns:
+            A tuple (results, elapsed_ms): one result per entity, in the same order, with the ids it
+            depended on ("depends_on") and its timing, and the time taken by the whole bundle.
+        """
+        start = time.perf_counter()
+        dependencies = dependency_order(entities)
+        dependents = [[] for _ in entities]
+        waiting = [len(targets) for targets in dependencies]
+        for index, targets in enumerate(dependencies):
+            for target in targets:
+                dependents[target].append(index)
+        results = [None] * len(entities)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_in_flight, len(entities))), thread_name_prefix="bundle") as executor:
+            in_flight = {}
+
+            def release(indexes):
+                # Writes the entities whose dependencies are over, and skips those with a failed dependency.
+                while indexes:
+                    index = indexes.pop()
+                    failed = [entities[target]["id"] for target in dependencies[index] if results[target]["status"] not in WRITTEN_STATUSES]
+                    if not failed:
+                        in_flight[executor.submit(self._timed_write, entities[index], start)] = index
+                        continue
+                    results[index] = {"id": entities[index]["id"], "status": "skipped", "error": f"Not written: it references {', '.join(failed)}, which could not be written."}
+                    indexes.extend(finish(index))
+
+            def finish(index):
+                ready = []
+                for dependent in dependents[index]:
+                    waiting[dependent] -= 1
+                    if not waiting[dependent]:
+                        ready.append(dependent)
+                return ready
+
+            release([index for index in reversed(range(len(entities))) if not waiting[index]])
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = in_flight.pop(future)
+                    results[index] = future.result()
+                    release(finish(index))
+
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+        metrics.incr("bundle.entities", len(entities))
+        metrics.observe("bundle.elapsed_ms", elapsed_ms)
+        for index, result in enumerate(results):
+            result["type"] = entities[index]["type"]
+            result["depends_on"] = [entities[target]["id"] for target in dependencies[index]]
+        return results, elapsed_ms
@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+
+from app.metrics import metrics
+
+
+class TTLCache:
+    """
+    TTLCache class is a bounded in-memory cache whose entries expire after a time-to-live.
+
+    When the cache is full the least recently used entry is evicted. Every entry can carry its
+    own TTL, so short-lived values (e.g. negative results) share the cache with long-lived ones.
+
+    Attributes:
+        - name (str): Prefix used for the metrics of this cache, e.g. "cache.introspection".
+        - max_size (int): Maximum number of entries.
+        - ttl (float): Default time-to-live of an entry, in seconds.
+    """
+
+    def __init__(self, name, max_size=1024, ttl=300):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        This method returns the cached value of a key, or `default` when it is missing or expired.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if now < expires_at:
+                    self._entries.move_to_end(key)
+                    metrics.incr(f"{self.name}.hits")
+                    return value
+                del self._entries[key]
+        metrics.incr(f"{self.name}.misses")
+        return default
+
+    def set(self, key, value, ttl=None):
+        """
+        This method stores a value. A TTL of zero or less is ignored and the value is not cached.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                metrics.incr(f"{self.name}.evictions")
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
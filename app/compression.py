@@ -0,0 +1,236 @@
+import gzip
+import json
+import zlib
+
+from werkzeug.exceptions import BadRequest, HTTPException, RequestEntityTooLarge
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import LimitedStream
+
+from app.metrics import metrics
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Upper bounds of the compression ratio histograms (compressed size / original size).
+RATIO_BUCKETS = (0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75, 1)
+# A zstd block decompresses to at most ZSTD_BLOCK_SIZE bytes and takes at least ZSTD_MIN_BLOCK_INPUT
+# compressed bytes (an RLE block), which bounds what a slice of compressed input can expand to.
+ZSTD_BLOCK_SIZE = 131072
+ZSTD_MIN_BLOCK_INPUT = 4
+
+
+def supported_encodings():
+    return ("gzip", "x-gzip", "zstd") if zstandard is not None else ("gzip", "x-gzip")
+
+
+def record_compression(name, original_size, compressed_size):
+    """
+    This method records the sizes of a compressed body under "compression.<name>": bytes before and
+    after compression and their ratio.
+    """
+    metrics.incr(f"compression.{name}.bytes_uncompressed", original_size)
+    metrics.incr(f"compression.{name}.bytes_compressed", compressed_size)
+    if original_size:
+        metrics.observe(f"compression.{name}.ratio", compressed_size / original_size, buckets=RATIO_BUCKETS)
+
+
+class BadCompressedBody(BadRequest):
+    description = "The request body cannot be decompressed with its Content-Encoding."
+
+
+class DecompressingStream:
+    """
+    DecompressingStream class is a file-like object that decompresses a request body while it is read,
+    so a large NDJSON upload is never held whole in memory, compressed or not.
+
+    No step decompresses much more than what is left below `max_size`: gzip is decompressed with a
+    `max_length` and its unconsumed input carried over to the next step. The zstd decompressor takes
+    no such limit, so it is given slices of input small enough that their output, whatever the ratio,
+    exceeds what is left by at most one block (ZSTD_BLOCK_SIZE).
+
+    Attributes:
+        - stream (file): The compressed WSGI input.
+        - encoding (str): Content coding of the body, "gzip" or "zstd".
+        - max_size (int): Maximum number of decompressed bytes; reading past it raises RequestEntityTooLarge (413).
+        - chunk_size (int): Compressed bytes read from the input at a time.
+        - error (HTTPException): The error raised while reading the body, if any.
+    """
+
+    def __init__(self, stream, encoding, max_size, chunk_size=65536):
+        self.stream = stream
+        self.encoding = "zstd" if encoding == "zstd" else "gzip"
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self._decompressor = self._new_decompressor()
+        self._unconsumed = b""
+        self._buffer = bytearray()
+        self._position = 0
+        self._eof = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.error = None
+
+    def _new_decompressor(self):
+        if self.encoding == "zstd":
+            return zstandard.ZstdDecompressor().decompressobj()
+        # 16 + MAX_WBITS: a gzip header and trailer around the deflate data.
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def _read_chunk(self):
+        try:
+            self._decompress_chunk()
+        except HTTPException as e:
+            # Kept for the middleware, which answers it whatever the application made of it.
+            self.error = e
+            raise
+
+    def _decompress(self, max_length):
+        # Decompresses part of the unconsumed input into at most about `max_length` bytes.
+        if self.encoding == "gzip":
+            data = self._decompressor.decompress(self._unconsumed, max_length)
+            self._unconsumed = self._decompressor.unconsumed_tail
+        else:
+            # Each slice can complete at most one block more than the output still allowed.
+            parts = []
+            while self._unconsumed and max_length > 0 and not self._decompressor.eof:
+                size = max(1, ZSTD_MIN_BLOCK_INPUT * (max_length // ZSTD_BLOCK_SIZE))
+                parts.append(self._decompressor.decompress(self._unconsumed[:size]))
+                self._unconsumed = self._unconsumed[size:]
+                max_length -= len(parts[-1])
+            data = b"".join(parts)
+        # A body may hold several gzip members or zstd frames one after another.
+        if self._decompressor.eof and (self._decompressor.unused_data or self._unconsumed):
+            self._unconsumed = self._decompressor.unused_data + self._unconsumed
+            self._decompressor = self._new_decompressor()
+        return data
+
+    def _decompress_chunk(self):
+        try:
+            if not self._unconsumed:
+                compressed = self.stream.read(self.chunk_size)
+                self.bytes_in += len(compressed)
+                # Sliced without copying the rest of the chunk at every step.
+                self._unconsumed = memoryview(compressed)
+            if not self._unconsumed:
+                self._eof = True
+                data = self._decompressor.flush()
+                if not getattr(self._decompressor, "eof", True):
+                    raise BadCompressedBody("The compressed body is truncated.")
+                record_compression("requests", self.bytes_out + len(data), self.bytes_in)
+            else:
+                data = self._decompress(self.max_size - self.bytes_out + 1)
+        except zlib.error as e:
+            raise BadCompressedBody(f"The body is not valid gzip: {e}")
+        except Exception as e:
+            if zstandard is not None and isinstance(e, zstandard.ZstdError):
+                raise BadCompressedBody(f"The body is not valid zstd: {e}")
+            raise
+        self.bytes_out += len(data)
+        if self.bytes_out > self.max_size:
+            metrics.incr("compression.requests.too_large")
+            raise RequestEntityTooLarge(f"The decompressed body exceeds {self.max_size} bytes.")
+        self._buffer += data
+
+    def _take(self, end):
+        # Returns the buffered bytes up to `end`; the consumed ones are dropped once they are most of the buffer.
+        data = bytes(self._buffer[self._position:end])
+        self._position = end
+        if self._position > len(self._buffer) // 2:
+            del self._buffer[:self._position]
+            self._position = 0
+        return data
+
+    def read(self, size=-1):
+        while not self._eof and (size is None or size < 0 or len(self._buffer) - self._position < size):
+            self._read_chunk()
+        if size is None or size < 0:
+            return self._take(len(self._buffer))
+        return self._take(min(len(self._buffer), self._position + size))
+
+    def readline(self, size=-1):
+        limit = None if size is None or size < 0 else self._position + size
+        searched = self._position
+        while True:
+            end = self._buffer.find(b"\n", searched)
+            if end >= 0:
+                end += 1
+                break
+            if self._eof or (limit is not None and len(self._buffer) >= limit):
+                end = len(self._buffer)
+                break
+            searched = len(self._buffer)
+            self._read_chunk()
+        return self._take(end if limit is None else min(end, limit))
+
+    def __iter__(self):
+        return iter(self.readline, b"")
+
+
+class RequestDecompressionMiddleware:
+    """
+    RequestDecompressionMiddleware class is a WSGI middleware that accepts request bodies sent with
+    `Content-Encoding: gzip` (or `zstd`, when the `zstandard` package is installed): the body is
+    decompressed while the application reads it, and the request reaches the application as if it
+    had been sent uncompressed. Other encodings are answered with 415, bodies that cannot be
+    decompressed with 400 and bodies larger than `max_size` once decompressed with 413, all of them
+    as a JSON {"error": ...}.
+
+    Attributes:
+        - app (callable): The wrapped WSGI application.
+        - max_size (int): Maximum decompressed size of a body, in bytes.
+    """
+
+    def __init__(self, app, max_size=104857600):
+        self.app = app
+        self.max_size = max_size
+
+    def __call__(self, environ, start_response):
+        encoding = environ.get("HTTP_CONTENT_ENCODING", "").strip().lower()
+        if not encoding or encoding == "identity":
+            return self.app(environ, start_response)
+        if encoding not in supported_encodings():
+            response = error_response(f"Unsupported Content-Encoding: {encoding}", 415)
+            response.headers["Accept-Encoding"] = ", ".join(supported_encodings())
+            return response(environ, start_response)
+
+        stream = environ["wsgi.input"]
+        if environ.get("CONTENT_LENGTH") and not environ.get("wsgi.input_terminated"):
+            # The compressed body ends at its Content-Length, not at the end of the connection.
+            stream = LimitedStream(stream, int(environ["CONTENT_LENGTH"]))
+        body = DecompressingStream(stream, encoding, self.max_size)
+        environ["wsgi.input"] = body
+        # The decompressed length is unknown: the application reads the body up to its end.
+        environ["wsgi.input_terminated"] = True
+        environ.pop("CONTENT_LENGTH", None)
+        del environ["HTTP_CONTENT_ENCODING"]
+
+        held = []
+
+        def checked_start_response(status, headers, exc_info=None):
+            # The response of an application that failed reading the body is replaced below.
+            if body.error is None:
+                return start_response(status, headers, exc_info)
+            held.append(status)
+            return lambda data: None
+
+        iterable = self.app(environ, checked_start_response)
+        if not held:
+            return iterable
+        if hasattr(iterable, "close"):
+            iterable.close()
+        return error_response(body.error.description, body.error.code)(environ, start_response)
+
+
+def error_response(message, status):
+    return Response(json.dumps({"error": message}), status=status, mimetype="application/json")
+
+
+def compress_body(data, level=5):
+    """
+    This method compresses the body of an outgoing request with gzip and records its sizes.
+    """
+    compressed = gzip.compress(data, compresslevel=level, mtime=0)
+    record_compression("upstream", len(data), len(compressed))
+    return compressed
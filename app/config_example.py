@@ -6,6 +6,8 @@ DEVELOPMENT = False #REQUIRED
 REQUIRED_KEYROCK_APP_KEY =  False #REQUIRED
 P12_FILE_PATH = '' #REQUIRED
 P12_FILE_PASS = '' #REQUIRED
+P12_HOT_RELOAD = False #Load the PKCS#12 file again when its modification time changes.
+P12_RELOAD_INTERVAL = 30 #Seconds between two modification time checks of the PKCS#12 file.
 USER_EORI = '' #REQUIRED
 USER_SERVICE_PROVIDER_EORI = '' #REQUIRED
 
@@ -26,6 +28,79 @@ KEYROCK_LOGOUT = f'{KEYROCK_BASE_URL}/auth/logout'
 KONG_ADMIN_URL = '' #REQUIRED
 KONG_ENTITIES_TYPE = f'{KONG_ADMIN_URL}ngsi-ld/v1/entities?type='
 KONG_ENTITIES = f'{KONG_ADMIN_URL}ngsi-ld/v1/entities'
+KONG_ENTITY_OPERATIONS_UPSERT = f'{KONG_ADMIN_URL}ngsi-ld/v1/entityOperations/upsert'
+KONG_BATCH_CHUNK_SIZE = 100 #Maximum number of entities sent to the broker in a single batch upsert request.
+BATCH_MAX_ITEMS = 10000 #Maximum number of entities accepted by a single /api/batch request.
+BUNDLE_MAX_IN_FLIGHT = 8 #Maximum number of entities of an /api/bundle request written to the broker at the same time.
+GEOMETRY_SIMPLIFY_TOLERANCE = 0 #Douglas-Peucker tolerance, in degrees, applied to lines and polygon rings before they are sent (e.g. 0.00001 is about 1 m). 0 disables the simplification.
+STREAM_WINDOW_SIZE = 500 #Entities converted and sent to the broker at a time by the /api/stream NDJSON endpoints.
+STREAM_MAX_LINE_LENGTH = 1048576 #Maximum size in bytes of a single NDJSON line.
+STREAM_MAX_REPORTED_ERRORS = 100 #Maximum number of failed lines listed in a /api/stream response.
+REQUEST_DECOMPRESSION_MAX_SIZE = 104857600 #Maximum decompressed size in bytes of a request body sent with Content-Encoding gzip (or zstd, with `pip install zstandard`). Larger bodies are answered with 413.
+BROKER_PAGE_SIZE = 1000 #Maximum number of entities requested from the broker in one page (NGSI-LD 'limit').
+BROKER_STREAM_CHUNK_SIZE = 65536 #Size in bytes of the chunks read from the broker when streaming entities.
+
+#Entity read cache of /context-broker/entity/id/<entity_id>
+ENTITY_CACHE_ENABLED = True #Serve repeated entity lookups from a cache, invalidated when this service writes the entity.
+ENTITY_CACHE_DEFAULT_TTL = 30 #Seconds an entity of a type missing from ENTITY_CACHE_TTLS is cached.
+ENTITY_CACHE_TTLS = { #Seconds an entity is cached, per type. 0 disables the cache for the type.
+    'AgriFarm': 600,
+    'AgriSoil': 600,
+    'Building': 600,
+    'AgriParcel': 300,
+    'AgriGreenHouse': 300,
+    'AgriApp': 300,
+    'Person': 300,
+    'AgriParcelRecord': 0,
+    'AgriSoilState': 0,
+}
+ENTITY_CACHE_MAX_SIZE = 5000 #Maximum number of entities cached in each process.
+ENTITY_CACHE_BACKEND = '' #Optional cache shared by all the worker processes: 'filesystem' or '' (in-process only).
+ENTITY_CACHE_DIR = '/tmp/cads_entity_cache' #Directory of the 'filesystem' backend.
+ENTITY_CACHE_LOCAL_TTL = 5 #Maximum seconds an entity is kept in process when a shared backend is used.
+
+#Write-behind ingestion queue
+WRITE_BEHIND_ENABLED = False #Store ingested entities in a local queue, answer 202 with a tracking id and send them to the broker in the background.
+WRITE_BEHIND_DB_NAME = 'ingest_queue.sqlite3' #SQLite (WAL) file of the queue, created in the instance folder next to database.sqlite3.
+WRITE_BEHIND_WORKERS = 2 #Worker threads per process draining the queue.
+WRITE_BEHIND_BATCH_SIZE = 100 #Maximum number of queued entities sent in a single batch upsert.
+WRITE_BEHIND_MAX_ATTEMPTS = 5 #Attempts before a queued entity is marked as failed.
+WRITE_BEHIND_RETRY_DELAY = 5 #Base delay in seconds of the exponential backoff between attempts.
+WRITE_BEHIND_RETENTION = 86400 #Seconds that delivered or failed entities remain visible at /api/ingest-status/<id>.
+IDEMPOTENCY_KEY_TTL = 86400 #Seconds the response to a request sent with an Idempotency-Key header is replayed to the retries of the client.
+IDEMPOTENCY_CONTENT_TTL = 300 #Seconds an entity sent again with unchanged content is answered without writing it to the broker. 0 disables it.
+IDEMPOTENCY_MAX_SIZE = 100000 #Maximum number of idempotency keys and entity content hashes kept in each process.
+IDEMPOTENCY_BACKEND = '' #Optional store shared by all the worker processes: 'filesystem' or '' (in-process only).
+IDEMPOTENCY_DIR = '/tmp/cads_idempotency' #Directory of the 'filesystem' backend.
+IDEMPOTENCY_DB_NAME = 'idempotency.sqlite3' #SQLite (WAL) file of the Idempotency-Keys in progress, created in the instance folder.
+IDEMPOTENCY_PENDING_TTL = 600 #Seconds after which a key left in progress (e.g. by a worker that died) can be used again.
+DIFF_UPDATES_ENABLED = False #Send the entities of the single-entity endpoints written recently as a PATCH of the attributes that changed instead of the whole entity.
+DIFF_UPDATES_TTL = 600 #Seconds the last written version of an entity is kept to compute the next diff.
+DIFF_UPDATES_MAX_SIZE = 10000 #Maximum number of entity versions kept in process when DIFF_UPDATES_BACKEND is ''.
+DIFF_UPDATES_BACKEND = '' #Store of the versions shared by all the worker processes: 'filesystem' or '' (in-process only). Required with several workers, otherwise one diffs against a version another has overwritten.
+DIFF_UPDATES_DIR = '/tmp/cads_diff_updates' #Directory of the 'filesystem' backend.
+KONG_VERIFY_SAMPLE_RATE = 0.0 #Fraction (0 to 1) of the writes read back from Kong in the background to check they were stored. 0 disables it.
+KONG_VERIFY_DELAY = 3 #Seconds to wait after a write before reading the entity back.
+KONG_VERIFY_QUEUE_SIZE = 1000 #Maximum number of pending read-back checks.
+
+#Outbound HTTP client (Kong and Keyrock)
+HTTP_POOL_CONNECTIONS = 10 #Number of hosts whose keep-alive connection pools are kept.
+HTTP_POOL_MAXSIZE = 20 #Maximum number of keep-alive connections per host.
+HTTP_CONNECT_TIMEOUT = 5 #Seconds to establish a connection.
+HTTP_READ_TIMEOUT = 30 #Seconds to wait for a response.
+HTTP_RETRIES = 3 #Retries of idempotent calls (GET, PUT, DELETE...) on connection errors and 502/503/504 responses.
+HTTP_BACKOFF_FACTOR = 0.3 #Base of the exponential backoff between retries, in seconds.
+ASYNC_BROKER_ENABLED = False #Send the chunks of a batch upsert to the broker concurrently over a shared async client. Needs httpx installed (pip install httpx).
+ASYNC_BROKER_MAX_IN_FLIGHT = 50 #Maximum number of broker requests awaiting a response at the same time in each worker process.
+ASYNC_BROKER_MAX_CONNECTIONS = 100 #Maximum number of connections of the async client in each worker process.
+KONG_COMPRESS_REQUESTS = False #Send the entities written to the broker compressed with gzip (Content-Encoding: gzip). Kong or the broker must accept compressed request bodies.
+KONG_COMPRESS_MIN_SIZE = 1024 #Smallest body in bytes that is compressed when KONG_COMPRESS_REQUESTS is set.
+KONG_COMPRESS_LEVEL = 5 #gzip level (1 fastest to 9 smallest) of the bodies sent to the broker.
+
+#iSHARE access token cache
+ISHARE_TOKEN_REFRESH_MARGIN = 60 #Seconds before 'expires_in' at which the cached iSHARE token is renewed.
+ISHARE_TOKEN_BACKGROUND_REFRESH = True #Renew the iSHARE token from a background thread instead of on the request path.
+ISHARE_TOKEN_DEFAULT_EXPIRES_IN = 3600 #Lifetime assumed when Keyrock does not return 'expires_in'.
 
 #DEVELOPMENT constant or REQUIRED_KEYROCK_APP_KEY constant is set to true fill this constants
 APP_KEYROCK_USERNAME = '' #Only fill out the 'APP_KEYROCK_USERNAME constant' if the REQUIRED_KEYROCK_APP_KEY is set to true.
@@ -34,6 +109,10 @@ APP_URL = '' #Only fill out the 'APP_KEYROCK_PASSWORD constant' if the REQUIRED_
 APP_REDIRECT_URI = f'{APP_URL}/callback' #Only fill out the 'APP_REDIRECT_URI constant' if the REQUIRED_KEYROCK_APP_KEY is set to true.
 APP_CLIENT_ID = '' #Only fill out the 'APP_CLIENT_ID constant' if the REQUIRED_KEYROCK_APP_KEY is set to true.
 APP_CLIENT_SECRET = '' #Only fill out the 'APP_CLIENT_SECRET constant' if the REQUIRED_KEYROCK_APP_KEY is set to true.
+KEYROCK_ADMIN_TOKEN_REFRESH_MARGIN = 60 #Seconds before expiry at which the administrator X-Auth token is requested again.
+KEYROCK_ADMIN_TOKEN_DEFAULT_EXPIRES_IN = 3600 #Lifetime assumed for the administrator X-Auth token when Keyrock does not return 'expires_at'.
+USER_CACHE_TTL = 300 #Seconds a user profile is served from memory before it is read again from the User table.
+USER_CACHE_MAX_SIZE = 1000 #Maximum number of user profiles kept in memory.
 #Only used if the REQUIRED_KEYROCK_APP_KEY is set to true.
 SWAGGER_AUTHORIZATIONS = {
     'Bearer Auth': {
@@ -44,11 +123,35 @@ SWAGGER_AUTHORIZATIONS = {
     },
 }
 
+#Incoming bearer token cache. Only used if the REQUIRED_KEYROCK_APP_KEY is set to true.
+AUTH_CACHE_MAX_SIZE = 10000 #Maximum number of bearer tokens whose Keyrock validation is remembered.
+AUTH_CACHE_TTL = 300 #Seconds a valid token is trusted without asking Keyrock again (never beyond the token expiry).
+AUTH_CACHE_NEGATIVE_TTL = 30 #Seconds a token rejected by Keyrock is rejected without asking Keyrock again.
+AUTH_LOCAL_JWT_VERIFICATION = False #Validate JWT bearer tokens locally (signature, exp, aud). Opaque tokens are still validated by Keyrock.
+AUTH_JWKS_URL = '' #JWKS document with the keys of RS256/ES256-signed tokens. Leave empty if tokens are only HMAC-signed.
+AUTH_JWKS_REFRESH_INTERVAL = 3600 #Seconds after which the JWKS document is fetched again.
+AUTH_JWT_SECRET = '' #JWT secret of the Keyrock application, for HS256-signed tokens.
+AUTH_JWT_AUDIENCE = '' #Expected 'aud' claim. Leave empty to skip the audience check.
+AUTH_JWT_ALGORITHMS = ['HS256', 'RS256'] #Accepted signing algorithms.
+AUTH_JWT_LEEWAY = 0 #Seconds of clock skew tolerated when checking 'exp'.
+
 #Uncomment, fill and import the following constants only if the 'send_to_context_broker' and 'get_entity_from_context_broker' methods in the utils.py file are uncommented
 #ORION_IP = ''
 #ORION_PORT = ''
 
 DATA_MODEL_JSON_LD = f'{APP_URL}/api/dataModel.Agrifood'
+STATIC_DOCUMENT_MAX_AGE = 86400 #Seconds brokers and clients may reuse the @context and the schemas without revalidating them (Cache-Control: immutable). They are revalidated with their ETag afterwards.
+
+ENTITY_TYPES = ["AgriFarm", "AgriCarbonFootPrint", "AgriCrop", "AgriGreenHouse", "AgriParcel", "AgriParcelOperation", "AgriParcelRecord", "AgriSoil", "AgriSoilState", "AgriYeld"] #Listed by /context-broker/entity/types. Spelt as the types this service writes, e.g. AgriCarbonFootPrint and AgriYeld.
+
+#NGSI-LD subscriptions and local entity view
+SUBSCRIPTIONS_ENABLED = False #Subscribe to the ENTITY_TYPES in the broker and serve entity reads from a local view kept current by the notifications.
+KONG_SUBSCRIPTIONS = f'{KONG_ADMIN_URL}ngsi-ld/v1/subscriptions'
+SUBSCRIPTION_ID_PREFIX = 'urn:ngsi-ld:Subscription:cads-data-provider:' #The entity type is appended to build the id of each subscription.
+SUBSCRIPTION_NOTIFICATION_URL = f'{APP_URL}/context-broker/notifications' #Must be reachable from the broker.
+SUBSCRIPTION_NOTIFICATION_TOKEN = '' #Secret the broker sends in the X-Notification-Token header. Required by SUBSCRIPTIONS_ENABLED; notifications without it are rejected.
+ENTITY_VIEW_DB_NAME = 'entity_view.sqlite3' #SQLite (WAL) file of the view, created in the instance folder.
+ENTITY_VIEW_RESYNC_INTERVAL = 3600 #Seconds between two full snapshots of the subscribed types, to recover notifications lost while the service was down.
 
 
 AGRI_SOIL_STATE_URL = f'{APP_URL}/datamodel/AgriSoilState'
@@ -0,0 +1,97 @@
+import hashlib
+import json
+
+from app.cache import TTLCache
+from app.metrics import metrics
+
+
+def short_entity_type(entity_type):
+    """
+    This method returns the short name of an entity type that the broker may return expanded,
+    e.g. https://smartdatamodels.org/dataModel.Agrifood/AgriFarm -> AgriFarm.
+    """
+    return str(entity_type).rstrip("/").rsplit("/", 1)[-1].rsplit("#", 1)[-1]
+
+
+class EntityCache:
+    """
+    EntityCache class keeps recently read NGSI-LD entities, keyed by entity id, with a TTL per entity type.
+
+    Entities are held in an in-process LRU and, optionally, in a shared `cachelib` backend
+    (e.g. a FileSystemCache) so several worker processes reuse the same reads. With a shared backend
+    the in-process copy lives at most `local_ttl` seconds, which bounds how long a worker can
+    serve an entity that another worker has just written.
+
+    Every cached entity carries a strong ETag (unquoted) computed from its canonical JSON encoding.
+
+    Attributes:
+        - ttls (dict): TTL in seconds per entity type, e.g. {"AgriFarm": 600}. A TTL of 0 disables caching for the type.
+        - default_ttl (int): TTL of the types missing from `ttls`.
+        - max_size (int): Maximum number of entities kept in process.
+        - backend (cachelib.BaseCache): Optional shared cache.
+        - local_ttl (int): Maximum TTL of the in-process copy when a shared backend is used.
+    """
+
+    KEY_PREFIX = "entity:"
+
+    def __init__(self, ttls=None, default_ttl=60, max_size=1024, backend=None, local_ttl=5):
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.backend = backend
+        self.local_ttl = local_ttl
+        self._local = TTLCache("cache.entities", max_size=max_size, ttl=default_ttl)
+
+    @staticmethod
+    def compute_etag(entity):
+        encoded = json.dumps(entity, sort_keys=True, separators=(",", ":")).encode()
+        return hashlib.sha256(encoded).hexdigest()[:32]
+
+    def ttl_for(self, entity):
+        return self.ttls.get(short_entity_type(entity.get("type", "")), self.default_ttl)
+
+    def get(self, entity_id):
+        """
+        This method returns the cached (entity, etag) of an id, or None.
+        """
+        cached = self._local.get(entity_id)
+        if cached is None and self.backend is not None:
+            cached = self.backend.get(self.KEY_PREFIX + entity_id)
+            if cached is not None:
+                metrics.incr("cache.entities.shared_hits")
+                self._local.set(entity_id, cached, self.local_ttl)
+        return cached
+
+    def set(self, entity_id, entity):
+        """
+        This method caches an entity read from the broker and returns its ETag.
+        """
+        etag = self.compute_etag(entity)
+        ttl = self.ttl_for(entity)
+        if ttl > 0:
+            if self.backend is not None:
+                self.backend.set(self.KEY_PREFIX + entity_id, (entity, etag), timeout=ttl)
+                self._local.set(entity_id, (entity, etag), min(ttl, self.local_ttl))
+            else:
+                self._local.set(entity_id, (entity, etag), ttl)
+        return etag
+
+    def invalidate(self, entity_id):
+        """
+        This method drops an entity, e.g. because this service has just written it.
+        """
+        self._local.delete(entity_id)
+        if self.backend is not None:
+            self.backend.delete(self.KEY_PREFIX + entity_id)
+        metrics.incr("cache.entities.invalidations")
+
+
+def build_entity_cache_backend(name, directory, threshold):
+    """
+    This method builds the shared backend named by ENTITY_CACHE_BACKEND: "filesystem", or "" for none.
+    """
+    if not name:
+        return None
+    if name == "filesystem":
+        from cachelib import FileSystemCache
+        return FileSystemCache(directory, threshold=threshold)
+    raise ValueError(f"Unknown entity cache backend: {name}")
@@ -0,0 +1,142 @@
+import logging
+
+from app.cache import TTLCache
+from app.metrics import metrics
+
+# Never patched: the identity of the entity, its @context and the time it was created.
+FIXED_ATTRIBUTES = frozenset(("id", "type", "@context", "dateCreated"))
+WRITTEN_STATUSES = frozenset(("created", "updated", "upserted"))
+
+
+def diff_attributes(previous, entity):
+    """
+    This method returns the changes from `previous` to `entity` as a tuple (attributes, removed): the
+    attributes of `entity` that are missing from `previous` or have another value, and the names of the
+    attributes of `previous` that `entity` no longer has. It returns None when `entity` has another
+    type, which a PATCH cannot express.
+    """
+    if previous.get("type") != entity.get("type"):
+        return None
+    attributes = {name: value for name, value in entity.items() if name not in FIXED_ATTRIBUTES and (name not in previous or previous[name] != value)}
+    removed = [name for name in previous if name not in FIXED_ATTRIBUTES and name not in entity]
+    return attributes, removed
+
+
+class DifferentialWriter:
+    """
+    DifferentialWriter class sends the entities this service wrote recently as a PATCH of the attributes
+    that changed, e.g. dateModified and one measurement of an AgriParcelRecord, instead of the whole entity.
+
+    The last written version of each entity is kept in an in-process LRU or, when a shared `cachelib`
+    backend is given, only in the backend, so no worker process diffs against a version another one has
+    overwritten since. Every other write of the entity, e.g. a batch, must call `forget`, as
+    `app.utils.invalidate_entity` does for its listeners. The attributes an entity lost since that version
+    are removed from the broker. Entities whose last version is unknown are written whole. When such a create is rejected because the entity exists (409, e.g. after a restart),
+    all its attributes are patched instead; attributes it lost then cannot be known and stay in the broker.
+
+    Attributes:
+        - patch (callable): Function receiving an entity id and the attributes to replace and returning
+          the status code of the broker, as `app.utils.patch_entity_attributes` does.
+        - delete_attribute (callable): Function receiving an entity id and an attribute name and returning
+          the status code of the broker, as `app.utils.delete_entity_attribute` does.
+        - ttl (int): Seconds the last written version of an entity is kept.
+        - max_size (int): Maximum number of entities kept in process.
+        - backend (cachelib.BaseCache): Optional shared cache, required when several processes write.
+    """
+
+    KEY_PREFIX = "last-written:"
+
+    def __init__(self, patch, delete_attribute, ttl=600, max_size=10000, backend=None):
+        self.patch = patch
+        self.delete_attribute = delete_attribute
+        self.ttl = ttl
+        self.backend = backend
+        self._local = TTLCache("cache.last_written", max_size=max_size, ttl=ttl)
+
+    def get(self, entity_id):
+        if self.backend is not None:
+            return self.backend.get(self.KEY_PREFIX + entity_id)
+        return self._local.get(entity_id)
+
+    def remember(self, entity):
+        if self.backend is not None:
+            self.backend.set(self.KEY_PREFIX + entity["id"], entity, timeout=self.ttl)
+        else:
+            self._local.set(entity["id"], entity)
+
+    def forget(self, entity_id):
+        if self.backend is not None:
+            self.backend.delete(self.KEY_PREFIX + entity_id)
+        else:
+            self._local.delete(entity_id)
+
+    def _patch(self, entity, attributes, removed=()):
+        # Returns the result of the patch, or None when the entity is not in the broker.
+        try:
+            status_code = self.patch(entity["id"], attributes) if attributes else 204
+            if status_code == 404:
+                self.forget(entity["id"])
+                return None
+            for name in removed:
+                if status_code != 204:
+                    break
+                status_code = self.delete_attribute(entity["id"], name)
+                # 404: the attribute is already gone.
+                status_code = 204 if status_code == 404 else status_code
+        except Exception as e:
+            logging.warning(f"Error patching {entity['id']}: {e}")
+            self.forget(entity["id"])
+            return {"id": entity["id"], "status": "failed", "error": str(e)}
+        if status_code != 204:
+            self.forget(entity["id"])
+            return {"id": entity["id"], "status": "failed", "error": f"The broker answered {status_code}."}
+        self.remember(entity)
+        metrics.incr("diff.patches")
+        metrics.incr("diff.attributes_sent", len(attributes))
+        metrics.incr("diff.attributes_removed", len(removed))
+        result = {"id": entity["id"], "status": "updated", "attributes": sorted(attributes)}
+        if removed:
+            result["removed"] = sorted(removed)
+        return result
+
+    def write(self, entities, write):
+        """
+        This method writes entities, patching the changed attributes of those whose last version is known.
+
+        Parameters:
+            entities (list): NGSI-LD entities, each one with its "id" and "type".
+            write (callable): Function receiving a list of entities to write whole and returning one result
+                per entity, as `app.utils.upsert_to_kong` does. A failed result may carry the "status_code"
+                of the broker.
+
+        Returns:
+            A list with one result per entity, in the same order. Patched entities report "updated" and the
+            names of the attributes sent and removed, entities without changes "unchanged".
+        """
+        results = [None] * len(entities)
+        whole = []
+        for index, entity in enumerate(entities):
+            previous = self.get(entity["id"])
+            diff = None if previous is None else diff_attributes(previous, entity)
+            if diff is None:
+                whole.append(index)
+            elif not diff[0] and not diff[1]:
+                results[index] = {"id": entity["id"], "status": "unchanged"}
+                metrics.incr("diff.unchanged")
+            else:
+                results[index] = self._patch(entity, *diff)
+                if results[index] is None:
+                    whole.append(index)
+
+        written = write([entities[index] for index in whole]) if whole else []
+        metrics.incr("diff.whole_writes", len(whole))
+        for index, result in zip(whole, written):
+            entity = entities[index]
+            if result["status"] in WRITTEN_STATUSES:
+                self.remember(entity)
+            elif result.get("status_code") == 409:
+                # The entity exists but its last version is unknown: all its attributes are patched.
+                attributes = {name: value for name, value in entity.items() if name not in FIXED_ATTRIBUTES}
+                result = self._patch(entity, attributes) or result
+            results[index] = result
+        return results
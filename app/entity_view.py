@@ -0,0 +1,183 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from app.entity_cache import short_entity_type
+from app.metrics import metrics
+
+
+def check_entities(entities):
+    """
+    This method checks that every item of a notification is an NGSI-LD entity the view can store.
+
+    Raises:
+        ValueError: If an item is not an object with a string "id" and "type".
+    """
+    for index, entity in enumerate(entities):
+        if not isinstance(entity, dict) or not isinstance(entity.get("id"), str) or not isinstance(entity.get("type"), str):
+            raise ValueError(f"Item {index} is not an NGSI-LD entity with a string id and type.")
+
+
+class EntityView:
+    """
+    EntityView class is a local copy of the broker entities, kept in a SQLite database (WAL mode)
+    in the instance folder so that every worker process reads the same view.
+
+    It is filled with a snapshot of each subscribed type and then kept current by the broker
+    notifications. Entities are stored with their "modifiedAt" system attribute and an older
+    version never replaces a newer one, whichever of the snapshot and the notification arrives last.
+    A type is only served from the view once its first snapshot has completed.
+
+    Every row also keeps when a snapshot or a notification last carried it ("seen_at"). Once a
+    snapshot of a type is complete, the entities it did not carry and no notification touched since
+    it started are removed (`sweep`): they were deleted while no notification reached the view.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entity_view (
+            id TEXT PRIMARY KEY,
+            type TEXT NOT NULL,
+            entity TEXT NOT NULL,
+            modified_at TEXT NOT NULL DEFAULT '',
+            seen_at REAL NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS entity_view_type ON entity_view (type, id);
+        CREATE TABLE IF NOT EXISTS entity_view_types (
+            type TEXT PRIMARY KEY,
+            synced_at REAL NOT NULL
+        );
+    """
+
+    # An older version only marks the entity as seen.
+    UPSERT = """
+        INSERT INTO entity_view (id, type, entity, modified_at, seen_at) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (id) DO UPDATE SET
+            type = CASE WHEN excluded.modified_at >= entity_view.modified_at THEN excluded.type ELSE entity_view.type END,
+            entity = CASE WHEN excluded.modified_at >= entity_view.modified_at THEN excluded.entity ELSE entity_view.entity END,
+            modified_at = MAX(excluded.modified_at, entity_view.modified_at),
+            seen_at = excluded.seen_at
+    """
+
+    def __init__(self):
+        self.path = None
+        self._local = threading.local()
+
+    def init_app(self, app, filename):
+        """
+        This method places the view database in the instance folder and creates its tables.
+        """
+        os.makedirs(app.instance_path, exist_ok=True)
+        self.path = os.path.join(app.instance_path, filename)
+        with self._connection() as connection:
+            connection.executescript(self.SCHEMA)
+            # Views created before the sweep of the snapshots.
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(entity_view)")]
+            if "seen_at" not in columns:
+                connection.execute("ALTER TABLE entity_view ADD COLUMN seen_at REAL NOT NULL DEFAULT 0")
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def _connection(self):
+        # SQLite connections cannot be shared between threads, so every thread opens its own.
+        connection = getattr(self._local, "connection", None)
+        if connection is None or getattr(self._local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def apply(self, entities):
+        """
+        This method stores new versions of entities, e.g. the "data" of a notification.
+        Entities carrying a "deletedAt" attribute are removed from the view.
+
+        Raises:
+            ValueError: If an item is not an entity (see check_entities); nothing is stored then.
+        """
+        check_entities(entities)
+        now = time.time()
+        rows, deleted = [], []
+        for entity in entities:
+            if "deletedAt" in entity:
+                deleted.append((entity["id"],))
+                continue
+            rows.append((
+                entity["id"],
+                short_entity_type(entity.get("type", "")),
+                json.dumps(entity),
+                str(entity.get("modifiedAt", "")),
+                now
+            ))
+
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.executemany(self.UPSERT, rows)
+            connection.executemany("DELETE FROM entity_view WHERE id = ?", deleted)
+        metrics.incr("entity_view.applied", len(rows))
+        metrics.incr("entity_view.deleted", len(deleted))
+
+    def sweep(self, entity_type, started_at):
+        """
+        This method removes the entities of a type that were not seen since `started_at`, the time a
+        snapshot that has just completed started.
+        """
+        connection = self._connection()
+        with connection:
+            swept = connection.execute(
+                "DELETE FROM entity_view WHERE type = ? AND seen_at < ?",
+                (entity_type, started_at)
+            ).rowcount
+        metrics.incr("entity_view.swept", swept)
+
+    def reset_synced(self):
+        """
+        This method stops serving every type until its next snapshot, e.g. because the view missed the
+        notifications sent while no process ran the subscriptions.
+        """
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM entity_view_types")
+
+    def mark_synced(self, entity_type):
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO entity_view_types (type, synced_at) VALUES (?, ?)",
+                (entity_type, time.time())
+            )
+
+    def is_synced(self, entity_type):
+        if not self.enabled:
+            return False
+        row = self._connection().execute("SELECT 1 FROM entity_view_types WHERE type = ?", (entity_type,)).fetchone()
+        return row is not None
+
+    def get(self, entity_id):
+        """
+        This method returns the raw JSON of an entity, or None when it is not in the view.
+        """
+        if not self.enabled:
+            return None
+        row = self._connection().execute("SELECT entity FROM entity_view WHERE id = ?", (entity_id,)).fetchone()
+        metrics.incr("entity_view.hits" if row is not None else "entity_view.misses")
+        return row[0] if row is not None else None
+
+    def list(self, entity_type, offset=0, limit=None):
+        """
+        This method returns the raw JSON of the entities of a type, ordered by id.
+        """
+        rows = self._connection().execute(
+            "SELECT entity FROM entity_view WHERE type = ? ORDER BY id LIMIT ? OFFSET ?",
+            (entity_type, -1 if limit is None else limit, offset)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def count(self, entity_type):
+        return self._connection().execute("SELECT COUNT(*) FROM entity_view WHERE type = ?", (entity_type,)).fetchone()[0]
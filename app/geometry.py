@@ -0,0 +1,186 @@
+"""
+Parsing, validation and simplification of the geometries sent to the context broker.
+
+Flat payloads describe a geometry as "x,y;x,y;...", e.g. the ring of a cadastral parcel with
+thousands of vertices. The string is tokenised in one pass instead of splitting each position,
+and the coordinates are checked in bulk: every position has 2 or 3 numbers within the WGS84
+bounds, lines have 2 positions and the rings of a polygon are closed and have 4.
+"""
+from itertools import repeat
+from operator import itemgetter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Nesting of the coordinates of each type, as returned by convert_geojson: 0 for a position,
+# 1 for a list of positions...
+DEPTHS = {"Point": 0, "MultiPoint": 1, "LineString": 1, "MultiLineString": 2, "Polygon": 2, "MultiPolygon": 3}
+
+
+class GeometryError(ValueError):
+    """
+    Raised when the coordinates of a geometry are malformed or out of bounds.
+    """
+
+
+def parse_coordinates(text):
+    """
+    This method parses coordinates written as "x,y;x,y;...".
+
+    Returns:
+        A list of positions, or a single position when the text has no ";".
+
+    Raises:
+        GeometryError: If a coordinate is not a number or the positions have different sizes.
+    """
+    try:
+        values = list(map(float, text.replace(';', ',').split(',')))
+    except ValueError:
+        raise GeometryError(f"Coordinates must be numbers written as x,y;x,y, not {text[:40]!r}.")
+    count = text.count(';') + 1
+    dimension, remainder = divmod(len(values), count)
+    if remainder or dimension not in (2, 3):
+        raise GeometryError("Every position needs the same number of coordinates, 2 or 3.")
+    if count == 1:
+        return values
+
+    # Splitting on "," only, every position but the last ends in a token "y;x" (or "z;x"),
+    # which must hold exactly one ";" for the positions to have the same size.
+    boundaries = text.split(',')[dimension - 1:-1:dimension]
+    if set(map(str.count, boundaries, repeat(';', len(boundaries)))) != {1}:
+        raise GeometryError("Every position needs the same number of coordinates, 2 or 3.")
+    iterator = iter(values)
+    return list(map(list, zip(*[iterator] * dimension)))
+
+
+def check_positions(positions):
+    # Bulk checks over all the positions of a geometry.
+    if set(map(type, positions)) != {list}:
+        raise GeometryError("Every position must be a list of 2 or 3 numbers.")
+    try:
+        sizes = set(map(len, positions))
+        if not sizes <= {2, 3}:
+            raise GeometryError("Every position needs 2 or 3 coordinates.")
+        for name, index, limit in (("Longitude", 0, 180), ("Latitude", 1, 90)):
+            values = list(map(itemgetter(index), positions))
+            lowest, highest = min(values), max(values)
+            if lowest < -limit or highest > limit:
+                raise GeometryError(f"{name} {lowest if lowest < -limit else highest} is out of [-{limit}, {limit}].")
+    except TypeError:
+        raise GeometryError("Coordinates must be nested lists of numbers.")
+
+
+def validate_geometry(type_location, coordinates):
+    """
+    This method checks the coordinates of a geometry, nested as convert_geojson returns them.
+
+    Raises:
+        GeometryError: If the coordinates do not match the type, are out of bounds or a ring is open.
+    """
+    if type_location == "GeometryCollection":
+        for geometry in coordinates:
+            try:
+                validate_geometry(geometry["type"], geometry["coordinates"])
+            except (TypeError, KeyError):
+                raise GeometryError("Every geometry of a GeometryCollection needs a type and coordinates.")
+        return
+    if type_location not in DEPTHS:
+        return
+
+    # Lists of positions: lines, rings or the points of a MultiPoint.
+    lists = [coordinates]
+    for _ in range(DEPTHS[type_location] - 1):
+        if not all(isinstance(item, list) for item in lists):
+            raise GeometryError(f"The coordinates are not nested as a {type_location}.")
+        lists = [inner for item in lists for inner in item]
+    if type_location == "Point":
+        check_positions([coordinates])
+        return
+    if not all(isinstance(item, list) for item in lists):
+        raise GeometryError(f"The coordinates are not nested as a {type_location}.")
+
+    for positions in lists:
+        # The positions first, so coordinates missing a level of nesting are not taken for short rings.
+        check_positions(positions)
+        if type_location in ("Polygon", "MultiPolygon"):
+            if len(positions) < 4:
+                raise GeometryError("A polygon ring needs at least 4 positions.")
+            if positions[0] != positions[-1]:
+                raise GeometryError("A polygon ring must be closed: its first and last positions must be equal.")
+        elif type_location != "MultiPoint" and len(positions) < 2:
+            raise GeometryError("A line needs at least 2 positions.")
+
+
+def farthest_position(positions, points, first, last):
+    # Index and distance of the position farthest from the line through first and last.
+    if points is not None:
+        start = points[first]
+        segment = points[last] - start
+        offsets = points[first + 1:last] - start
+        length = np.hypot(*segment)
+        if length:
+            distances = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0]) / length
+        else:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        index = int(distances.argmax())
+        return first + 1 + index, float(distances[index])
+
+    (x1, y1), (x2, y2) = positions[first][:2], positions[last][:2]
+    dx, dy = x2 - x1, y2 - y1
+    length = (dx * dx + dy * dy) ** 0.5
+    farthest, distance = first, -1.0
+    for index in range(first + 1, last):
+        x, y = positions[index][:2]
+        if length:
+            current = abs(dx * (y - y1) - dy * (x - x1)) / length
+        else:
+            current = ((x - x1) ** 2 + (y - y1) ** 2) ** 0.5
+        if current > distance:
+            farthest, distance = index, current
+    return farthest, distance
+
+
+def simplify_line(positions, tolerance):
+    """
+    This method simplifies a line or a ring with the Douglas-Peucker algorithm: positions closer than
+    `tolerance` (in degrees) to the simplified line are dropped. The first and last positions are kept.
+    """
+    if len(positions) < 3:
+        return positions
+    points = np.array([position[:2] for position in positions], dtype=float) if np is not None else None
+    keep = [False] * len(positions)
+    keep[0] = keep[-1] = True
+    pending = [(0, len(positions) - 1)]
+    while pending:
+        first, last = pending.pop()
+        if last - first < 2:
+            continue
+        index, distance = farthest_position(positions, points, first, last)
+        if distance > tolerance:
+            keep[index] = True
+            pending.append((first, index))
+            pending.append((index, last))
+    return [position for position, kept in zip(positions, keep) if kept]
+
+
+def simplify_geometry(type_location, coordinates, tolerance):
+    """
+    This method simplifies the lines and rings of a geometry, nested as convert_geojson returns them.
+    Rings that would lose their area (fewer than 4 positions) are kept as they are.
+    """
+    if type_location == "LineString":
+        return simplify_line(coordinates, tolerance)
+    if type_location == "MultiLineString":
+        return [simplify_line(line, tolerance) for line in coordinates]
+    if type_location == "Polygon":
+        return [simplify_ring(ring, tolerance) for ring in coordinates]
+    if type_location == "MultiPolygon":
+        return [[simplify_ring(ring, tolerance) for ring in polygon] for polygon in coordinates]
+    return coordinates
+
+
+def simplify_ring(ring, tolerance):
+    simplified = simplify_line(ring, tolerance)
+    return simplified if len(simplified) >= 4 else ring
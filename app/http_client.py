@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.config import HTTP_BACKOFF_FACTOR, HTTP_CONNECT_TIMEOUT, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_READ_TIMEOUT, HTTP_RETRIES
+from app.metrics import metrics
+
+
+class HttpClient:
+    """
+    HttpClient class wraps one keep-alive `requests.Session` per worker process for the calls to Kong and Keyrock.
+
+    Connections are pooled per host, every call gets a connect/read timeout, idempotent methods
+    (GET, HEAD, PUT, DELETE, OPTIONS) are retried with exponential backoff on connection errors
+    and 502/503/504 responses, and the latency of each call is recorded per host.
+
+    Attributes:
+        - pool_connections (int): Number of hosts whose connection pools are kept.
+        - pool_maxsize (int): Maximum number of connections kept open per host.
+        - timeout (tuple): Default (connect, read) timeout in seconds.
+        - retries (int): Maximum number of retries of an idempotent call.
+        - backoff_factor (float): Base of the exponential backoff between retries, in seconds.
+    """
+
+    RETRY_STATUSES = (502, 503, 504)
+
+    def __init__(self, pool_connections=10, pool_maxsize=20, connect_timeout=5, read_timeout=30, retries=3, backoff_factor=0.3):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._lock = threading.Lock()
+        self._session = None
+        self._session_pid = None
+
+    @property
+    def session(self):
+        # Sockets must not be shared with the parent process after a fork.
+        if self._session is None or self._session_pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    self._session = self._build_session()
+                    self._session_pid = os.getpid()
+        return self._session
+
+    def _build_session(self):
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).netloc or "unknown"
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            metrics.incr(f"http.errors.{host}")
+            raise
+        finally:
+            metrics.observe(f"http.latency_ms.{host}", (time.perf_counter() - start) * 1000)
+        metrics.incr(f"http.responses.{host}.{response.status_code // 100}xx")
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+
+http_client = HttpClient(
+    pool_connections=HTTP_POOL_CONNECTIONS,
+    pool_maxsize=HTTP_POOL_MAXSIZE,
+    connect_timeout=HTTP_CONNECT_TIMEOUT,
+    read_timeout=HTTP_READ_TIMEOUT,
+    retries=HTTP_RETRIES,
+    backoff_factor=HTTP_BACKOFF_FACTOR
+)
@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import request
+
+from app.cache import TTLCache
+from app.metrics import metrics
+from app.utils import json_default
+
+# Compared by time rather than by value: an entity sent again unchanged but modified later is written.
+TIMESTAMP_ATTRIBUTE = "dateModified"
+# Results of a write that a repeated write of the same content can be answered with.
+RECORDED_STATUSES = frozenset(("created", "updated", "upserted", "unchanged", "queued"))
+# Responses replayed for a repeated Idempotency-Key. Errors and partial successes are not, so a retry can fix them.
+REPLAYED_STATUSES = (200, 201, 202)
+
+
+def content_hash(entity):
+    """
+    This method returns the SHA-256 of the canonical JSON encoding of an entity, leaving out TIMESTAMP_ATTRIBUTE.
+    """
+    content = {key: value for key, value in entity.items() if key != TIMESTAMP_ATTRIBUTE}
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=json_default).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def modified_at(entity):
+    """
+    This method returns the TIMESTAMP_ATTRIBUTE of an entity as an aware datetime (naive ones are UTC),
+    or None when it has none or it is not a date-time.
+    """
+    value = entity.get(TIMESTAMP_ATTRIBUTE)
+    if isinstance(value, dict):
+        value = value.get("value")
+    if isinstance(value, dict):
+        value = value.get("@value")
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def is_newer(modified, recorded):
+    # A timestamp that cannot be compared counts as newer, so the entity is written.
+    if modified is None or recorded is None:
+        return modified is not recorded
+    return modified > recorded
+
+
+class IdempotencyStore:
+    """
+    IdempotencyStore class remembers recent writes so that the retries of a client do not reach the
+    context broker again.
+
+    It keeps two kinds of entries:
+        - the response to each request sent with an `Idempotency-Key` header (see `idempotent`),
+          replayed when the same client repeats the key with the same body;
+        - the content hash, the dateModified and the result of the last write of each entity id
+          (see `write_changed`), so an entity sent again unchanged is answered without writing it.
+
+    Entries live in an in-process LRU and, optionally, in a shared `cachelib` backend (e.g. a
+    FileSystemCache) so a retry handled by another worker process is recognised too.
+
+    The Idempotency-Keys of the requests in progress are reserved in a SQLite table of the instance
+    folder (see `init_app`), whose primary key lets a single worker process handle a key at a time.
+    Without it they are reserved in process.
+
+    Attributes:
+        - key_ttl (int): Seconds the response to an Idempotency-Key is kept.
+        - content_ttl (int): Seconds the last written content of an entity is kept. 0 disables the deduplication by content.
+        - max_size (int): Maximum number of entries kept in process.
+        - backend (cachelib.BaseCache): Optional shared cache.
+        - pending_ttl (int): Seconds after which the reservation of a key is dropped, e.g. because its worker died.
+    """
+
+    KEY_PREFIX = "idempotency:"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS idempotency_pending (
+            key TEXT PRIMARY KEY,
+            expires_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, key_ttl=86400, content_ttl=300, max_size=100000, backend=None, pending_ttl=600):
+        self.key_ttl = key_ttl
+        self.content_ttl = content_ttl
+        self.backend = backend
+        self.pending_ttl = pending_ttl
+        self.path = None
+        self._local = TTLCache("cache.idempotency", max_size=max_size, ttl=key_ttl)
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._connections = threading.local()
+
+    def init_app(self, app, filename):
+        """
+        This method places the table of the reserved keys in the instance folder and creates it.
+        """
+        os.makedirs(app.instance_path, exist_ok=True)
+        self.path = os.path.join(app.instance_path, filename)
+        with self._connection() as connection:
+            connection.executescript(self.SCHEMA)
+
+    def _connection(self):
+        # SQLite connections cannot be shared between threads, so every thread opens its own.
+        connection = getattr(self._connections, "connection", None)
+        if connection is None or getattr(self._connections, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._connections.connection = connection
+            self._connections.pid = os.getpid()
+        return connection
+
+    def get(self, key):
+        value = self._local.get(key)
+        if value is None and self.backend is not None:
+            value = self.backend.get(self.KEY_PREFIX + key)
+        return value
+
+    def set(self, key, value, ttl):
+        self._local.set(key, value, ttl)
+        if self.backend is not None and ttl > 0:
+            self.backend.set(self.KEY_PREFIX + key, value, timeout=ttl)
+
+    def delete(self, key):
+        self._local.delete(key)
+        if self.backend is not None:
+            self.backend.delete(self.KEY_PREFIX + key)
+
+    def forget_entity(self, entity_id):
+        # The entity was written by another path: the content last written by `write_changed` may be outdated.
+        self.delete("written:" + entity_id)
+
+    def reserve(self, key):
+        """
+        This method marks a key as in progress, unless it already is.
+
+        Returns:
+            True if the key was reserved, False if another request holds it.
+        """
+        now = time.time()
+        if self.path is None:
+            with self._pending_lock:
+                if self._pending.get(key, 0) > now:
+                    return False
+                self._pending[key] = now + self.pending_ttl
+                return True
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute("DELETE FROM idempotency_pending WHERE key = ? AND expires_at <= ?", (key, now))
+            try:
+                connection.execute("INSERT INTO idempotency_pending (key, expires_at) VALUES (?, ?)", (key, now + self.pending_ttl))
+            except sqlite3.IntegrityError:
+                return False
+        return True
+
+    def release(self, key):
+        if self.path is None:
+            with self._pending_lock:
+                self._pending.pop(key, None)
+            return
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM idempotency_pending WHERE key = ?", (key,))
+
+    def write_changed(self, entities, write):
+        """
+        This method writes the entities whose content differs from the one last written for their id, or
+        whose dateModified is later than that of the last write.
+
+        Parameters:
+            entities (list): NGSI-LD entities, each one with its "id".
+            write (callable): Function receiving a list of entities and returning one result per entity,
+                as `app.utils.upsert_to_kong` does.
+
+        Returns:
+            A list with one result per entity, in the same order: the result of `write`, or the result
+            recorded when the same content was written.
+        """
+        if self.content_ttl <= 0:
+            return write(entities) if entities else []
+
+        results = [None] * len(entities)
+        changed = []
+        hashes = [content_hash(entity) for entity in entities]
+        modified = [modified_at(entity) for entity in entities]
+        for index, entity in enumerate(entities):
+            recorded = self.get("written:" + entity["id"])
+            if recorded is not None and recorded[0] == hashes[index] and not is_newer(modified[index], recorded[1]):
+                results[index] = recorded[2]
+                metrics.incr("idempotency.duplicate_entities")
+            else:
+                changed.append(index)
+
+        written = write([entities[index] for index in changed]) if changed else []
+        for index, result in zip(changed, written):
+            results[index] = result
+            key = "written:" + entities[index]["id"]
+            if result["status"] in RECORDED_STATUSES:
+                self.set(key, (hashes[index], modified[index], result), self.content_ttl)
+            else:
+                self.delete(key)
+        return results
+
+
+def idempotent(store):
+    """
+    This method returns a decorator for the `post` of a Resource that honours the `Idempotency-Key` header:
+    the response is kept and replayed, with an "Idempotent-Replayed: true" header, when the same client
+    sends the key again with the same body, and a 422 is returned when it sends the key with another body.
+    While a request with the key is in progress, the others are answered with 409.
+
+    Keys are scoped by the Authorization header and the path of the request.
+    """
+    def decorator(view):
+        @wraps(view)
+        def decorated_function(*args, **kwargs):
+            idempotency_key = request.headers.get("Idempotency-Key")
+            if not idempotency_key:
+                return view(*args, **kwargs)
+            if len(idempotency_key) > 255:
+                return {"error": "The Idempotency-Key header accepts at most 255 characters."}, 400
+
+            scope = hashlib.sha256(request.headers.get("Authorization", "").encode()).hexdigest()[:32]
+            key = f"request:{scope}:{request.path}:{idempotency_key}"
+            fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+            if not store.reserve(key):
+                metrics.incr("idempotency.conflicting_requests")
+                return {"error": "A request with this Idempotency-Key is in progress."}, 409, {"Retry-After": "1"}
+            try:
+                # Read once the key is reserved, so a request that has just finished is replayed.
+                stored = store.get(key)
+                if stored is not None:
+                    stored_fingerprint, body, status = stored
+                    if stored_fingerprint != fingerprint:
+                        return {"error": "The Idempotency-Key was already used with a different body."}, 422
+                    metrics.incr("idempotency.replayed_requests")
+                    return body, status, {"Idempotent-Replayed": "true"}
+
+                response = view(*args, **kwargs)
+                if isinstance(response, tuple) and response[1] in REPLAYED_STATUSES:
+                    store.set(key, (fingerprint, response[0], response[1]), store.key_ttl)
+                return response
+            finally:
+                store.release(key)
+
+        return decorated_function
+    return decorator
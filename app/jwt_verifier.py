@@ -0,0 +1,137 @@
+import logging
+import threading
+import time
+
+import jwt
+
+from app.http_client import http_client
+from app.metrics import metrics
+
+
+class JwksUnavailable(Exception):
+    """
+    Raised when the signing keys needed to verify a token cannot be obtained.
+    """
+
+
+class JwtVerifier:
+    """
+    JwtVerifier class validates JWT bearer tokens locally (signature, exp and aud) instead of asking Keyrock.
+
+    Asymmetric tokens are checked against the keys published at `jwks_url`, which are kept in memory
+    and fetched again every `refresh_interval` seconds or when a token names an unknown key id.
+    Symmetric tokens (HS256, as Keyrock signs them with the application JWT secret) are checked
+    against `secret`.
+
+    Attributes:
+        - jwks_url (str): URL of the JWKS document. Empty to disable asymmetric verification.
+        - secret (str): Shared secret of HMAC-signed tokens. Empty to disable symmetric verification.
+        - audience (str): Expected "aud" claim. Empty to skip the audience check.
+        - algorithms (list): Accepted signing algorithms.
+        - refresh_interval (int): Seconds after which the JWKS document is fetched again.
+        - leeway (int): Seconds of clock skew tolerated when checking "exp" and "nbf".
+    """
+
+    HMAC_ALGORITHMS = ("HS256", "HS384", "HS512")
+
+    # Unknown key ids trigger at most one JWKS fetch per this many seconds.
+    MIN_REFRESH_INTERVAL = 30
+
+    def __init__(self, jwks_url='', secret='', audience='', algorithms=("RS256",), refresh_interval=3600, leeway=0):
+        self.jwks_url = jwks_url
+        self.secret = secret
+        self.audience = audience
+        self.algorithms = list(algorithms)
+        self.refresh_interval = refresh_interval
+        self.leeway = leeway
+
+        self._lock = threading.Lock()
+        self._keys = {}
+        self._fetched_at = None
+
+    @staticmethod
+    def is_jwt(token):
+        """
+        This method tells whether a token looks like a JWT (three segments and a readable header),
+        as opposed to an opaque token that only Keyrock can validate.
+        """
+        if token.count(".") != 2:
+            return False
+        try:
+            jwt.get_unverified_header(token)
+        except jwt.PyJWTError:
+            return False
+        return True
+
+    def verify(self, token):
+        """
+        This method checks the signature, expiry and audience of a JWT.
+
+        Returns:
+            The claims of the token.
+
+        Raises:
+            jwt.PyJWTError: If the token is invalid.
+            JwksUnavailable: If the key needed to check the signature cannot be obtained.
+        """
+        header = jwt.get_unverified_header(token)
+        algorithm = header.get("alg")
+        if algorithm not in self.algorithms:
+            raise jwt.InvalidAlgorithmError(f"Algorithm not allowed: {algorithm}")
+
+        if algorithm in self.HMAC_ALGORITHMS:
+            if not self.secret:
+                raise JwksUnavailable("No secret configured for HMAC-signed tokens")
+            key = self.secret
+        else:
+            key = self._signing_key(header.get("kid"))
+
+        options = {"require": ["exp"], "verify_aud": bool(self.audience)}
+        return jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            audience=self.audience or None,
+            options=options,
+            leeway=self.leeway
+        )
+
+    def _signing_key(self, kid):
+        if not self.jwks_url:
+            raise JwksUnavailable("No JWKS URL configured")
+
+        now = time.monotonic()
+        stale = self._fetched_at is None or now - self._fetched_at >= self.refresh_interval
+        unknown = kid not in self._keys and (self._fetched_at is None or now - self._fetched_at >= self.MIN_REFRESH_INTERVAL)
+        if stale or unknown:
+            self.refresh()
+
+        keys = self._keys
+        if kid is None and len(keys) == 1:
+            return next(iter(keys.values()))
+        if kid not in keys:
+            raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+        return keys[kid]
+
+    def refresh(self):
+        """
+        This method fetches the JWKS document and replaces the keys held in memory.
+        When the fetch fails the previous keys are kept, if there are any.
+        """
+        with self._lock:
+            try:
+                response = http_client.get(self.jwks_url)
+                response.raise_for_status()
+                jwk_set = jwt.PyJWKSet.from_dict(response.json())
+            except Exception as e:
+                metrics.incr("auth.jwks.errors")
+                # Do not hammer the JWKS endpoint while it is down.
+                self._fetched_at = time.monotonic() - self.refresh_interval + self.MIN_REFRESH_INTERVAL
+                if not self._keys:
+                    raise JwksUnavailable(f"Could not fetch the JWKS from {self.jwks_url}: {e}")
+                logging.warning(f"Could not refresh the JWKS from {self.jwks_url}, keeping the previous keys: {e}")
+                return
+
+            self._keys = {key.key_id: key.key for key in jwk_set.keys}
+            self._fetched_at = time.monotonic()
+            metrics.incr("auth.jwks.refreshes")
@@ -0,0 +1,104 @@
+import base64
+import logging
+import os
+import threading
+import time
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.serialization.pkcs12 import load_key_and_certificates
+
+
+class KeyMaterial:
+    """
+    KeyMaterial class decrypts a PKCS#12 file once and keeps the loaded key in memory.
+
+    The private key is kept as a `cryptography` key object, which `jwt.encode` accepts directly,
+    and the `x5c` header is computed from the DER certificate, so signing a client assertion
+    needs neither file I/O nor PEM round-tripping.
+
+    Attributes:
+        - filepath (str): Path of the PKCS#12 file.
+        - password (str): Password of the PKCS#12 file.
+        - hot_reload (bool): Whether the file is loaded again when its modification time changes.
+        - reload_interval (int): Minimum number of seconds between two modification time checks.
+    """
+
+    def __init__(self, filepath, password, hot_reload=False, reload_interval=30):
+        self.filepath = filepath
+        self.password = password
+        self.hot_reload = hot_reload
+        self.reload_interval = reload_interval
+
+        self._lock = threading.Lock()
+        self._private_key = None
+        self._certificate = None
+        self._ca_certs = []
+        self._x5c = None
+        self._mtime = None
+        self._checked_at = 0.0
+
+    def load(self):
+        """
+        This method reads and decrypts the PKCS#12 file, replacing the key material held in memory.
+        """
+        with self._lock:
+            self._load()
+
+    def _load(self):
+        mtime = os.stat(self.filepath).st_mtime
+        with open(self.filepath, 'rb') as f:
+            p12_data = f.read()
+
+        private_key, certificate, ca_certs = load_key_and_certificates(p12_data, self.password.encode())
+
+        # The x5c header holds the base64 DER certificate, i.e. the body of its PEM encoding.
+        der_certificate = certificate.public_bytes(encoding=serialization.Encoding.DER)
+
+        self._private_key = private_key
+        self._certificate = certificate
+        self._ca_certs = ca_certs or []
+        self._x5c = [base64.b64encode(der_certificate).decode()]
+        self._mtime = mtime
+        self._checked_at = time.monotonic()
+        logging.info(f"Key material loaded from {self.filepath}")
+
+    def _current(self):
+        if self._private_key is None:
+            with self._lock:
+                if self._private_key is None:
+                    self._load()
+        elif self.hot_reload and time.monotonic() - self._checked_at >= self.reload_interval:
+            with self._lock:
+                self._checked_at = time.monotonic()
+                try:
+                    if os.stat(self.filepath).st_mtime != self._mtime:
+                        self._load()
+                except (OSError, ValueError) as e:
+                    # Keep signing with the key already loaded until the new file is readable.
+                    logging.warning(f"Could not reload key material from {self.filepath}: {e}")
+        return self
+
+    def signing_material(self):
+        """
+        This method returns the private key and its x5c header together, so a concurrent reload
+        never pairs a key with the certificate of another one.
+        """
+        current = self._current()
+        with current._lock:
+            return current._private_key, current._x5c
+
+    @property
+    def private_key(self):
+        return self._current()._private_key
+
+    @property
+    def certificate(self):
+        return self._current()._certificate
+
+    @property
+    def ca_certs(self):
+        return self._current()._ca_certs
+
+    @property
+    def x5c(self):
+        return self._current()._x5c
@@ -0,0 +1,78 @@
+import threading
+from bisect import bisect_left
+
+
+# Upper bounds (in milliseconds) of the latency histogram buckets.
+DEFAULT_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """
+    Histogram class keeps a fixed-bucket distribution of observed values.
+
+    Attributes:
+        - buckets (tuple): Upper bounds of the buckets, in ascending order.
+        - counts (list): Number of observations per bucket, the last one counting the values above every bound.
+        - count (int): Total number of observations.
+        - total (float): Sum of every observed value.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def to_dict(self):
+        labels = [f"le_{bound}" for bound in self.buckets] + ["le_inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "avg": round(self.total / self.count, 3) if self.count else 0,
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+
+class Metrics:
+    """
+    Metrics class is a thread-safe registry of counters and histograms shared by the whole process.
+    Names are dotted strings, e.g. "token.hits" or "http.latency_ms.kong.example.com".
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name, value, buckets=DEFAULT_BUCKETS):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(buckets)
+            histogram.observe(value)
+
+    def get(self, name):
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self):
+        """
+        This method returns a JSON serialisable copy of every counter and histogram.
+        """
+        with self._lock:
+            return {
+                "counters": dict(sorted(self._counters.items())),
+                "histograms": {name: histogram.to_dict() for name, histogram in sorted(self._histograms.items())}
+            }
+
+
+metrics = Metrics()
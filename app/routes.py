@@ -1,9 +1,9 @@
 
 from flask import current_app, make_response, redirect, request, jsonify, Blueprint, render_template, url_for, session
-from app.auth import load_user
+from app.auth import refresh_user
 from flask_login import current_user, login_required, login_user, logout_user
 from app.config import AGRI_CARBON_FOOTPRINT_URL, AGRI_CARBON_FOOTPRINT_URL_SCHEMA, AGRI_SOIL_STATE_URL, AGRI_SOIL_STATE_URL_SCHEMA, AGRI_YIELD_URL, AGRI_YIELD_URL_SCHEMA, KEYROCK_ACCES_TOKEN_URL, KEYROCK_AUTHORIZATION_URL, APP_CLIENT_ID, APP_CLIENT_SECRET, DEVELOPMENT,KEYROCK_BASE_URL,  APP_REDIRECT_URI, KEYROCK_LOGOUT, KEYROCK_USER_INFO_URL
-import requests
+from app.http_client import http_client
 import secrets
 from flask.sessions import SecureCookieSessionInterface
 
@@ -88,18 +88,19 @@ if DEVELOPMENT:
             'client_secret': APP_CLIENT_SECRET,
             'redirect_uri': APP_REDIRECT_URI,
         }
-        response = requests.post(KEYROCK_ACCES_TOKEN_URL, data=payload)
+        response = http_client.post(KEYROCK_ACCES_TOKEN_URL, data=payload)
 
         token_data = response.json()
         access_token = token_data.get('access_token')
         session['access_token'] = access_token
 
         headers = {'Authorization': f'Bearer {access_token}'}
-        user_response = requests.get(KEYROCK_USER_INFO_URL, headers=headers)
+        user_response = http_client.get(KEYROCK_USER_INFO_URL, headers=headers)
         user_data = user_response.json()
         session['user_data'] = user_data
         user_id = user_data.get('id')
-        user = load_user(user_id)
+        # Read the profile from Keyrock at every login so changes made there are picked up.
+        user = refresh_user(user_id)
         
         if user:
             login_user(user)  
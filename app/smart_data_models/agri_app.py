@@ -1,10 +1,11 @@
 from datetime import datetime
 
-from app.utils import generate_urn
+from app.utils import PayloadError, generate_urn
+from app.smart_data_models.converter import DateTime, Property, Relationship
+from app.smart_data_models.base import SmartDataModel
 
-ModelBase = object
 
-class AgriApp(ModelBase):
+class AgriApp(SmartDataModel):
     """
         AgriApp class represents a record of an agricultural application.
         
@@ -30,6 +31,12 @@ class AgriApp(ModelBase):
             - version (str, optional): Version of the app.
     """
 
+    __slots__ = (
+        'id', 'type', 'address', 'alternateName', 'areaServed', 'category', 'dataProvider', 'dateCreated',
+        'dateModified', 'description', 'endpoint', 'hasProvider', 'location', 'name', 'owner',
+        'relatedSource', 'seeAlso', 'source', 'version'
+    )
+
     def __init__(self, id, type, address=None, alternateName=None, areaServed=None, 
                  category=None, dataProvider=None, dateCreated=None, dateModified=None,
                  description=None, endpoint=None, hasProvider=None, location=None,
@@ -55,139 +62,60 @@ class AgriApp(ModelBase):
         self.source = source
         self.version = version
 
-    def __repr__(self):
-        """
-        This method returns a machine-readable string representation of the current object.
+    @classmethod
+    def from_flat_payload(cls, app_data):
         """
-        return f'<AgriApp {self.id}>'
+        This method builds a AgriApp object from the flat payload accepted by the API.
 
-    def to_smart_data_model(self):
-        """
-        This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
-        
-        Returns:
-            A dictionary representing the current Smart Data Model.
+        Raises:
+            PayloadError: If a required field is missing.
         """
-        agri_app_data = {
-            "id": self.id,
-            "type": self.type
-        }
-        
-        if self.address:
-            agri_app_data["address"] = {
-                "type": "Property",
-                "value": self.address
-            }
-
-        if self.alternateName:
-            agri_app_data["alternateName"] = {
-                "type": "Property",
-                "value": self.alternateName
-            }
-
-        if self.areaServed:
-            agri_app_data["areaServed"] = {
-                "type": "Property",
-                "value": self.areaServed
-            }
-
-        if self.category:
-            agri_app_data["category"] = {
-                "type": "Property",
-                "value": self.category
-            }
-
-        if self.dataProvider:
-            agri_app_data["dataProvider"] = {
-                "type": "Property",
-                "value": self.dataProvider
-            }
-
-        if self.dateCreated:
-            agri_app_data["dateCreated"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.dateCreated.isoformat()
-                }
-            }
-
-        if self.dateModified:
-            agri_app_data["dateModified"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.dateModified.isoformat()
-                }
-            }
-
-        if self.description:
-            agri_app_data["description"] = {
-                "type": "Property",
-                "value": self.description
-            }
-
-        if self.endpoint:
-            agri_app_data["endpoint"] = {
-                "type": "Property",
-                "value": self.endpoint
-            }
-
-        if self.hasProvider:
-            agri_app_data["hasProvider"] = {
-                "type": "Relationship",
-                "object": self.hasProvider
-            }
-
-        if self.location:
-            agri_app_data["location"] = {
-                "type": "Property",
-                "value": self.location
-            }
-
-        if self.name:
-            agri_app_data["name"] = {
-                "type": "Property",
-                "value": self.name
-            }
-
-        if self.owner:
-            agri_app_data["owner"] = {
-                "type": "Property",
-                "value": self.owner
-            }
-
-        if self.relatedSource:
-            agri_app_data["relatedSource"] = {
-                "type": "Property",
-                "value": self.relatedSource
-            }
-
-        if self.seeAlso:
-            agri_app_data["seeAlso"] = {
-                "type": "Property",
-                "value": self.seeAlso
-            }
-
-        if self.source:
-            agri_app_data["source"] = {
-                "type": "Property",
-                "value": self.source
-            }
-
-        if self.version:
-            agri_app_data["version"] = {
-                "type": "Property",
-                "value": self.version
-            }
-        
-        return agri_app_data
-
-
-    @staticmethod
-    def validate_smart_data_model(data):
-        required_fields = ['id', 'type']
-        for field in required_fields:
-            if field not in data:
-                return False, f'Required "{field}" does not exist'
-        return True, ''
+        error_messages = []
+        if 'id' not in app_data:
+            error_messages.append("ID is missing")
+        if 'type' not in app_data:
+            error_messages.append("Type is missing")
+
+        if error_messages:
+            raise PayloadError({"errors": error_messages})
+
+        return cls(id=app_data['id'], type=app_data['type'],
+                   address=app_data.get('address'),
+                   alternateName=app_data.get('alternateName'),
+                   areaServed=app_data.get('areaServed'),
+                   category=app_data.get('category'),
+                   dataProvider=app_data.get('dataProvider'),
+                   dateCreated=app_data.get('dateCreated'),
+                   dateModified=app_data.get('dateModified'),
+                   description=app_data.get('description'),
+                   endpoint=app_data.get('endpoint'),
+                   hasProvider=app_data.get('hasProvider'),
+                   location=app_data.get('location'),
+                   name=app_data.get('name'),
+                   owner=app_data.get('owner'),
+                   relatedSource=app_data.get('relatedSource'),
+                   seeAlso=app_data.get('seeAlso'),
+                   source=app_data.get('source'),
+                   version=app_data.get('version'))
+
+    ATTRIBUTES = (
+        Property("address", "address"),
+        Property("alternateName", "alternateName"),
+        Property("areaServed", "areaServed"),
+        Property("category", "category"),
+        Property("dataProvider", "dataProvider"),
+        DateTime("dateCreated", "dateCreated", isoformat=True),
+        DateTime("dateModified", "dateModified", isoformat=True),
+        Property("description", "description"),
+        Property("endpoint", "endpoint"),
+        Relationship("hasProvider", "hasProvider"),
+        Property("location", "location"),
+        Property("name", "name"),
+        Property("owner", "owner"),
+        Property("relatedSource", "relatedSource"),
+        Property("seeAlso", "seeAlso"),
+        Property("source", "source"),
+        Property("version", "version"),
+    )
+
+    REQUIRED_FIELDS = ['id', 'type']
@@ -1,11 +1,13 @@
 from datetime import datetime
+import logging
 
-from app.utils import generate_urn
+from app.utils import PayloadError, generate_urn
+from app.smart_data_models.converter import DateTime, Relationship, Structured
+from app.smart_data_models.base import SmartDataModel
+from app.smart_data_models.schemas import AGRI_CARBON_FOOTPRINT_SCHEMA
 
 
-ModelBase = object
-
-class AgriCarbonFootPrint(ModelBase):
+class AgriCarbonFootPrint(SmartDataModel):
     """
         AgriCarbonFootPrint class represents a record of the carbon footprint of agricultural activities.
             
@@ -21,6 +23,12 @@ class AgriCarbonFootPrint(ModelBase):
             - estimation_end_at (datetime): The end date of the estimation period.
     """
 
+    __slots__ = (
+        'id', 'type', 'has_agri_crop', 'has_agri_parcel', 'has_agri_yeld', 'carbon_footprint_value',
+        'carbon_footprint_accuracy_percent', 'carbon_footprint_min_value', 'carbon_footprint_unit_text',
+        'estimation_start_at', 'estimation_end_at'
+    )
+
     def __init__(self, id, carbon_footprint_value, estimation_start_at, estimation_end_at,
                  has_agri_crop=None, has_agri_parcel=None, has_agri_yeld=None,
                  carbon_footprint_accuracy_percent=None, carbon_footprint_min_value=None,
@@ -37,75 +45,74 @@ class AgriCarbonFootPrint(ModelBase):
         self.estimation_start_at = estimation_start_at
         self.estimation_end_at = estimation_end_at
 
-    def __repr__(self):
-        """
-        This method returns a machine-readable string representation of the current object.
+    @classmethod
+    def from_flat_payload(cls, carbon_footprint_data):
         """
-        return f'<AgriCarbonFootPrint {self.id}>'
+        This method builds a AgriCarbonFootPrint object from the flat payload accepted by the API.
 
-    def to_smart_data_model(self):
+        Raises:
+            PayloadError: If a required field is missing.
         """
-        This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
-        
-        Returns:
-            A dictionary representing the current Smart Data Model.
-        """
-        agri_carbon_footprint_data = {
-            "id": self.id,
-            "type": self.type,
-        }
-        if self.has_agri_crop:
-            agri_carbon_footprint_data["hasAgriCrop"] = {
-                "type": "Relationship",
-                "object": self.has_agri_crop
-            }
-
-        if self.has_agri_parcel:
-            agri_carbon_footprint_data["hasAgriParcel"] = {
-                "type": "Relationship",
-                "object": self.has_agri_parcel
-            }
-
-        if self.has_agri_yeld:
-            agri_carbon_footprint_data["hasAgriYeld"] = {
-                "type": "Relationship",
-                "object": self.has_agri_yeld
-            }
+        id = carbon_footprint_data.get('id')
+        carbon_footprint_value = carbon_footprint_data.get('carbon_footprint_value')
+        carbon_footprint_accuracy_percent = carbon_footprint_data.get('carbon_footprint_accuracy_percent')
+        carbon_footprint_min_value = carbon_footprint_data.get('carbon_footprint_min_value')
+        carbon_footprint_unit_text = carbon_footprint_data.get('carbon_footprint_unit_text')
+        estimation_start_at = carbon_footprint_data.get('estimation_start_at')
+        estimation_end_at = carbon_footprint_data.get('estimation_end_at')
 
-        if self.carbon_footprint_value:
-            agri_carbon_footprint_data["carbonFootprint"] = {
-                "type": "Property",
-                "value": {
-                    "value": self.carbon_footprint_value,
-                    "accuracyPercent": self.carbon_footprint_accuracy_percent,
-                    "minValue": self.carbon_footprint_min_value,
-                    "unitText": self.carbon_footprint_unit_text
-                }
-            }
+        error_messages = []
+        if not id:
+            logging.info("id")
+            error_messages.append("Id is missing")
+        if not carbon_footprint_value:
+            error_messages.append("Carbon footprint value is missing")
+        if not carbon_footprint_accuracy_percent:
+            error_messages.append("Carbon footprint accuracy percent is missing")
+        if not carbon_footprint_min_value:
+            error_messages.append("Carbon footprint min value is missing")
+        if not carbon_footprint_unit_text:
+            error_messages.append("Carbon footprint unit text is missing")
+        if not estimation_start_at:
+            error_messages.append("Estimation start date is missing")
+        if not estimation_end_at:
+            error_messages.append("Estimation end date is missing")
+        if error_messages:
+            raise PayloadError({"errors": error_messages})
+        has_agri_crop = carbon_footprint_data.get('has_agri_crop')
+        has_agri_parcel = carbon_footprint_data.get('has_agri_parcel')
+        has_agri_yeld = carbon_footprint_data.get('has_agri_yeld')
+        carbon_footprint_accuracy_percent = carbon_footprint_data.get('carbon_footprint_accuracy_percent')
+        carbon_footprint_min_value = carbon_footprint_data.get('carbon_footprint_min_value')
+        carbon_footprint_unit_text = carbon_footprint_data.get('carbon_footprint_unit_text')
 
-        if self.estimation_start_at:
-            agri_carbon_footprint_data["estimationStartAt"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.estimation_start_at
-                }
-            }
 
-        if self.estimation_end_at:
-            agri_carbon_footprint_data["estimationEndAt"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.estimation_end_at
-                }
-            }
-        return agri_carbon_footprint_data
+        return cls(
+            id=id,
+            has_agri_crop=has_agri_crop,
+            has_agri_parcel=has_agri_parcel,
+            has_agri_yeld=has_agri_yeld,
+            carbon_footprint_value=carbon_footprint_value,
+            carbon_footprint_accuracy_percent=carbon_footprint_accuracy_percent,
+            carbon_footprint_min_value=carbon_footprint_min_value,
+            carbon_footprint_unit_text=carbon_footprint_unit_text,
+            estimation_start_at=estimation_start_at,
+            estimation_end_at=estimation_end_at
+        )
 
+    ATTRIBUTES = (
+        Relationship("hasAgriCrop", "has_agri_crop"),
+        Relationship("hasAgriParcel", "has_agri_parcel"),
+        Relationship("hasAgriYeld", "has_agri_yeld"),
+        Structured("carbonFootprint", (
+            ("value", "carbon_footprint_value"),
+            ("accuracyPercent", "carbon_footprint_accuracy_percent"),
+            ("minValue", "carbon_footprint_min_value"),
+            ("unitText", "carbon_footprint_unit_text"),
+        ), when_attrs=("carbon_footprint_value",)),
+        DateTime("estimationStartAt", "estimation_start_at"),
+        DateTime("estimationEndAt", "estimation_end_at"),
+    )
 
-    def validate_smart_data_model(data):
-            required_fields = ['carbonFootprint', 'estimationStartAt', 'estimationEndAt']
-            for field in required_fields:
-                if field not in data:
-                    return False, f'Required "{field}" does not exist'
-            return True, ''
\ No newline at end of file
+    REQUIRED_FIELDS = ['carbonFootprint', 'estimationStartAt', 'estimationEndAt']
+    SCHEMA = AGRI_CARBON_FOOTPRINT_SCHEMA
@@ -1,11 +1,13 @@
 from datetime import datetime
+import logging
+from json import loads
 
-from app.utils import generate_urn
+from app.utils import PayloadError, generate_urn
+from app.smart_data_models.converter import DateTime, Raw, RelatedSource, Relationship, Url, Value
+from app.smart_data_models.base import SmartDataModel
 
 
-ModelBase = object
-
-class AgriCrop(ModelBase):
+class AgriCrop(SmartDataModel):
     """
         AgriCrop class represents an agricultural crop with its related properties.
         
@@ -25,6 +27,12 @@ class AgriCrop(ModelBase):
             - harvesting_interval (int, optional): The interval between successive harvests of this crop in days.
             - watering_frequency (int, optional): The frequency at which the crop should be watered in days.
     """
+
+    __slots__ = (
+        'id', 'type', 'name', 'date_created', 'date_modified', 'alternate_name', 'agro_voc_concept',
+        'see_also', 'description', 'related_source', 'has_agri_soil', 'has_agri_fertiliser',
+        'has_agri_pest', 'planting_from', 'harvesting_interval', 'watering_frequency'
+    )
     
     def __init__(self, id, name, has_agri_soil, planting_from, date_created=None, date_modified=None,
                  alternate_name=None, agro_voc_concept=None, see_also=None, description=None,
@@ -53,100 +61,88 @@ class AgriCrop(ModelBase):
         """
         return f'<AgriCrop {self.name}>'
 
-    def to_smart_data_model(self):
+    @classmethod
+    def from_flat_payload(cls, crop_data):
         """
-        This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
+        This method builds a AgriCrop object from the flat payload accepted by the API.
 
-        Returns:
-            A dictionary representing the current Smart Data Model.
+        Raises:
+            PayloadError: If a required field is missing.
         """
-        agri_crop_data = {
-            "id": self.id,
-            "type": self.type
-        }
-
-        if self.date_created:
-            agri_crop_data["dateCreated"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.date_created
-                }
-            }
-
-        if self.date_modified:
-            agri_crop_data["dateModified"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.date_modified
-                }
-            }
-
-        if self.name:
-            agri_crop_data["name"] = self.name
-
-        if self.alternate_name:
-            agri_crop_data["alternateName"] = self.alternate_name
-
-        if self.agro_voc_concept:
-            agri_crop_data["agroVocConcept"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "URL",
-                    "@value": self.agro_voc_concept
-                }
-            }
-
-        if self.description:
-            agri_crop_data["description"] = {
-                "value": self.description
-            }
-
-        if self.related_source:
-            agri_crop_data["relatedSource"] = {
-                "value": [
-                    {
-                        "application": self.related_source,
-                        "applicationEntityId": "app:crop1"
-                    }
-                ]
-            }
-
-        if self.has_agri_soil:
-            agri_crop_data["hasAgriSoil"] = {
-                "type": "Relationship",
-                "object": self.has_agri_soil.split(',') if isinstance(self.has_agri_soil, str) else self.has_agri_soil
-            }
-
-        if self.has_agri_fertiliser:
-            agri_crop_data["hasAgriFertiliser"] = {
-                "type": "Relationship",
-                "object": self.has_agri_fertiliser.split(',') if isinstance(self.has_agri_fertiliser, str) else self.has_agri_fertiliser
-            }
-
-        if self.has_agri_pest:
-            agri_crop_data["hasAgriPest"] = {
-                "type": "Relationship",
-                "object": self.has_agri_pest.split(',') if isinstance(self.has_agri_pest, str) else self.has_agri_pest
-            }
-
-        if self.planting_from:
-            agri_crop_data["plantingFrom"] = {"value": self.planting_from}
-
-        if self.harvesting_interval:
-            agri_crop_data["harvestingInterval"] = {"value": self.harvesting_interval}
-
-        if self.watering_frequency:
-            agri_crop_data["wateringFrequency"] = {"value": self.watering_frequency}
-
-        return agri_crop_data
-
-
-
-    def validate_smart_data_model(data):
-        required_fields = ['dateCreated', 'dateModified', 'name', 'hasAgriSoil', 'plantingFrom']
-        for field in required_fields:
-            if field not in data:
-                return False, f'Required "{field}" does not exist'
-        return True, ''
\ No newline at end of file
+        id = crop_data.get('id')
+        name = crop_data.get('name')
+        has_agri_soil_str = crop_data.get('has_agri_soil')
+        planting_from_str = crop_data.get('planting_from')
+
+        error_messages = []
+        if not id:
+            logging.info("id")
+            error_messages.append("Id is missing")
+        if not name:
+            logging.info("Name")
+            error_messages.append("Name is missing")
+        if not has_agri_soil_str:
+            logging.info("has_agri_soil")
+            error_messages.append("Has agri soil is missing")
+        if not planting_from_str:
+            logging.info("planting_from")
+            error_messages.append("Planting from is missing")
+        if error_messages:
+            raise PayloadError({"errors": error_messages})
+
+        has_agri_soil = has_agri_soil_str.split(',') if has_agri_soil_str else []
+        planting_from = loads(planting_from_str) if planting_from_str else []
+
+        alternate_name = crop_data.get('alternate_name')
+        agro_voc_concept = crop_data.get('agro_voc_concept')
+        description = crop_data.get('description')
+        date_created = crop_data.get('date_created')
+        date_modified = crop_data.get('date_modified')
+        see_also = crop_data.get('see_also')
+        related_source = crop_data.get('related_source')
+        has_agri_fertiliser_str = crop_data.get('has_agri_fertiliser')
+        has_agri_fertiliser = has_agri_fertiliser_str.split(',') if has_agri_fertiliser_str else []
+
+        has_agri_pest_str = crop_data.get('has_agri_pest')
+        has_agri_pest = has_agri_pest_str.split(',') if has_agri_pest_str else []
+
+        harvesting_interval_str = crop_data.get('harvesting_interval')
+        harvesting_interval = loads(harvesting_interval_str) if harvesting_interval_str else []
+
+        watering_frequency = crop_data.get('watering_frequency')
+
+        return cls(
+            id=id,
+            name=name,
+            alternate_name=alternate_name,
+            agro_voc_concept=agro_voc_concept,
+            description=description,
+            date_created=date_created,
+            date_modified=date_modified,
+            see_also=see_also,
+            related_source=related_source,
+            has_agri_soil=has_agri_soil,
+            has_agri_fertiliser=has_agri_fertiliser,
+            has_agri_pest=has_agri_pest,
+            planting_from=planting_from,
+            harvesting_interval=harvesting_interval,
+            watering_frequency=watering_frequency
+        )
+
+    ATTRIBUTES = (
+        DateTime("dateCreated", "date_created"),
+        DateTime("dateModified", "date_modified"),
+        Raw("name", "name"),
+        Raw("alternateName", "alternate_name"),
+        Url("agroVocConcept", "agro_voc_concept"),
+        Value("description", "description"),
+        RelatedSource("relatedSource", "related_source", "app:crop1"),
+        Relationship("hasAgriSoil", "has_agri_soil", split=True),
+        Relationship("hasAgriFertiliser", "has_agri_fertiliser", split=True),
+        Relationship("hasAgriPest", "has_agri_pest", split=True),
+        Value("plantingFrom", "planting_from"),
+        Value("harvestingInterval", "harvesting_interval"),
+        Value("wateringFrequency", "watering_frequency"),
+    )
+
+    REQUIRED_FIELDS = ['dateCreated', 'dateModified', 'name', 'hasAgriSoil', 'plantingFrom']
@@ -1,10 +1,12 @@
 from datetime import datetime
-from app.utils import convert_geojson, generate_urn
+import logging
+from app.geometry import parse_coordinates
+from app.utils import PayloadError, convert_geojson, generate_urn
+from app.smart_data_models.converter import DateTime, GeoProperty, Property, Raw, RelatedSource, Relationship, Structured
+from app.smart_data_models.base import SmartDataModel
 
 
-ModelBase = object
-
-class AgriFarm(ModelBase):
+class AgriFarm(SmartDataModel):
     """
     AgriFarm class represents a farm with its related properties.
 
@@ -26,6 +28,13 @@ class AgriFarm(ModelBase):
         - owned_by (str, optional): The owner of the farm.
         - has_building (str, optional): The building associated with the farm.
     """
+
+    __slots__ = (
+        'id', 'type', 'name', 'location_type', 'location', 'address_locality', 'address_country',
+        'address_street', 'contact_point_email', 'contact_point_telephone', 'has_agri_parcel',
+        'date_created', 'date_modified', 'description', 'related_source', 'see_also', 'land_location_type',
+        'land_location', 'owned_by', 'has_building'
+    )
     def __init__(self, id, name, location,location_type, address_locality, address_country, address_street, contact_point_email, contact_point_telephone, has_agri_parcel, date_created=None, date_modified=None,
                  description=None, related_source=None, see_also=None, land_location=None,land_location_type=None,
                  owned_by=None, has_building=None):
@@ -49,7 +58,6 @@ class AgriFarm(ModelBase):
         self.land_location = convert_geojson(self.land_location_type, land_location)
         self.owned_by = owned_by
         self.has_building = has_building
-        
 
     def __repr__(self):
         """
@@ -57,123 +65,118 @@ class AgriFarm(ModelBase):
         """
         return f'<AgriFarm {self.name}>'
 
-    def to_smart_data_model(self):
+    @classmethod
+    def from_flat_payload(cls, farm_data):
         """
-        This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
+        This method builds a AgriFarm object from the flat payload accepted by the API.
 
-        Returns:
-            A dictionary representing the current Smart Data Model.
+        Raises:
+            PayloadError: If a required field is missing.
         """
-        agri_farm_data = {
-            "id": self.id,
-            "type": self.type
-        }
-
-        if self.date_created:
-            agri_farm_data["dateCreated"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.date_created
-                }
-            }
-
-        if self.date_modified:
-            agri_farm_data["dateModified"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.date_modified
-                }
-            }
-
-        if self.name:
-            agri_farm_data["name"] = {
-                "type": "Property",
-                "value": self.name
-            }
-
-        if self.description:
-            agri_farm_data["description"] = {
-                "type": "Property",
-                "value": self.description
-            }
-
-        if self.related_source:
-            agri_farm_data["relatedSource"] = {
-                "type": "Property",
-                "value": [
-                    {
-                        "application": self.related_source,
-                        "applicationEntityId": "app:farm1"
-                    }
-                ]
-            }
-
-        if self.see_also:
-            agri_farm_data["seeAlso"] = self.see_also
-
-        if self.location_type and self.location:
-            agri_farm_data["location"] = {
-                "type": "GeoProperty",
-                "value": {
-                    "type": self.location_type,
-                    "coordinates": self.location
-                }
-            }
-
-        if self.land_location_type and self.land_location:
-            agri_farm_data["landLocation"] = {
-                "type": "GeoProperty",
-                "value": {
-                    "type": self.land_location_type,
-                    "coordinates": self.land_location
-                }
-            }
-
-        if self.address_locality or self.address_country or self.address_street:
-            agri_farm_data["address"] = {
-                "type": "Property",
-                "value": {
-                    "addressLocality": self.address_locality,
-                    "addressCountry": self.address_country,
-                    "streetAddress": self.address_street
-                }
-            }
-
-        if self.contact_point_email or self.contact_point_telephone:
-            agri_farm_data["contactPoint"] = {
-                "type": "Property",
-                "value": {
-                    "email": self.contact_point_email,
-                    "telephone": self.contact_point_telephone
-                }
-            }
-
-        if self.owned_by:
-            agri_farm_data["ownedBy"] = {
-                "type": "Relationship",
-                "object": self.owned_by
-            }
-
-        if self.has_building:
-            agri_farm_data["hasBuilding"] = {
-                "type": "Relationship",
-                "object": self.has_building.split(',') if isinstance(self.has_building, str) else self.has_building
-            }
-
-        if self.has_agri_parcel:
-            agri_farm_data["hasAgriParcel"] = {
-                "type": "Relationship",
-                "object": self.has_agri_parcel.split(',') if isinstance(self.has_agri_parcel, str) else self.has_agri_parcel
-            }
-
-        return agri_farm_data
-
-
-    def validate_smart_data_model(data):
-        required_fields = ['dateCreated', 'dateModified', 'name', 'location', 'address', 'contactPoint', 'hasAgriParcel']
-        for field in required_fields:
-            if field not in data:
-                return False, f'Required "{field}" does not exist'
-        return True, ''
+        id = farm_data.get('id')
+        name = farm_data.get('name')
+        location_str = farm_data.get('location')
+        type_location = farm_data.get('type_location')
+        address_locality = farm_data.get('address_locality')
+        address_country = farm_data.get('address_country')
+        address_street = farm_data.get('address_street')
+        contact_point_telephone = farm_data.get('contact_point_telephone')
+        contact_point_email = farm_data.get('contact_point_email')
+        has_building_str = farm_data.get('has_building')
+        has_agri_parcel_str = farm_data.get('has_agri_parcel')
+        see_also_str = farm_data.get('see_also')
+        land_location_str = farm_data.get('land_location')
+        land_location_type = farm_data.get('land_location_type')
+
+        error_messages = []
+        if not id:
+            logging.info("id")
+            error_messages.append("Id is missing")
+        if not name:
+            logging.info("name")
+            error_messages.append("Name is missing")
+        if not location_str:
+            logging.info("location")
+            error_messages.append("Location is missing")
+        if not type_location:
+            logging.info("type location")
+            error_messages.append("Location type is missing")
+        if not address_locality:
+            logging.info("address_locality")
+            error_messages.append("Address (locality) is missing")
+        if not address_country:
+            logging.info("address_country")
+            error_messages.append("Address (country) is missing")
+        if not address_street:
+            logging.info("address_street")
+            error_messages.append("Address (street) is missing")
+        if not contact_point_telephone:
+            logging.info("contact_point_telephone")
+            error_messages.append("Contact Point (telephone) is missing")
+        if not contact_point_email:
+            logging.info("contact_point_email")
+            error_messages.append("Contact Point (email) is missing")
+        if not has_agri_parcel_str:
+            logging.info("has_agri_parcel")
+            error_messages.append("Has agri parcel is missing")
+        if error_messages:
+            raise PayloadError({"errors": error_messages})
+        related_source_str = farm_data.get('related_source')
+        related_source = related_source_str.split(',') if related_source_str else []
+
+        location = {'coordinates': parse_coordinates(location_str)}
+        has_building = has_building_str.split(',') if has_building_str else []
+        has_agri_parcel = has_agri_parcel_str.split(',') if has_agri_parcel_str else []
+        see_also = see_also_str.split(',') if see_also_str else []
+        land_location = {'coordinates': parse_coordinates(land_location_str)}
+        date_created = farm_data.get('date_created')
+        date_modified = farm_data.get('date_modified')
+        description = farm_data.get('description')
+        owned_by = farm_data.get('owned_by')
+        has_building = farm_data.get('has_building')
+        return cls(
+            id=id,
+            name=name,
+            location= location,
+            location_type = type_location,
+            address_locality=address_locality,
+            address_country=address_country,
+            address_street=address_street,
+            contact_point_email=contact_point_email,
+            contact_point_telephone=contact_point_telephone,
+            has_agri_parcel=has_agri_parcel,
+            date_created=date_created,
+            date_modified=date_modified,
+            description=description,
+            related_source=related_source,
+            see_also=see_also,
+            land_location=land_location,
+            land_location_type=land_location_type,
+            owned_by=owned_by,
+            has_building=has_building
+        )
+
+    ATTRIBUTES = (
+        DateTime("dateCreated", "date_created"),
+        DateTime("dateModified", "date_modified"),
+        Property("name", "name"),
+        Property("description", "description"),
+        RelatedSource("relatedSource", "related_source", "app:farm1", typed=True),
+        Raw("seeAlso", "see_also"),
+        GeoProperty("location", "location", "location_type"),
+        GeoProperty("landLocation", "land_location", "land_location_type"),
+        Structured("address", (
+            ("addressLocality", "address_locality"),
+            ("addressCountry", "address_country"),
+            ("streetAddress", "address_street"),
+        )),
+        Structured("contactPoint", (
+            ("email", "contact_point_email"),
+            ("telephone", "contact_point_telephone"),
+        )),
+        Relationship("ownedBy", "owned_by"),
+        Relationship("hasBuilding", "has_building", split=True),
+        Relationship("hasAgriParcel", "has_agri_parcel", split=True),
+    )
+
+    REQUIRED_FIELDS = ['dateCreated', 'dateModified', 'name', 'location', 'address', 'contactPoint', 'hasAgriParcel']
@@ -1,11 +1,12 @@
 from datetime import datetime
+import logging
 
-from app.utils import generate_urn
+from app.utils import PayloadError, generate_urn
+from app.smart_data_models.converter import DateTime, Property, Raw, RelatedSource, Relationship, Structured
+from app.smart_data_models.base import SmartDataModel
 
 
-ModelBase = object
-
-class AgriGreenHouse(ModelBase):
+class AgriGreenHouse(SmartDataModel):
     """
         AgriGreenhouse class represents a greenhouse in agriculture.
         
@@ -29,6 +30,13 @@ class AgriGreenHouse(ModelBase):
             drain_flow_min_value (float, optional): The minimum drain flow in the greenhouse.
             has_device (str, optional): The device associated with the greenhouse.
     """
+
+    __slots__ = (
+        'id', 'type', 'date_created', 'date_modified', 'owned_by', 'related_source', 'see_also',
+        'belongs_to', 'has_agri_parcel_parent', 'has_agri_parcel_children', 'has_weather_observed',
+        'has_water_quality_observed', 'relative_humidity', 'leaf_temperature', 'co2', 'daily_light',
+        'drain_flow', 'drain_flow_max_value', 'drain_flow_min_value', 'has_device'
+    )
     def __init__(self, id, relative_humidity, co2, owned_by=None, related_source=None, see_also=None, belongs_to=None,
                  has_agri_parcel_parent=None, has_agri_parcel_children=None, has_weather_observed=None,
                  has_water_quality_observed=None, leaf_temperature=None, daily_light=None, drain_flow=None, drain_flow_max_value=None, 
@@ -60,107 +68,100 @@ class AgriGreenHouse(ModelBase):
         """
         return f'<AgriGreenhouse {self.id}>'
 
-    def to_smart_data_model(self):
+    @classmethod
+    def from_flat_payload(cls, greenhouse_data):
         """
-        This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
+        This method builds a AgriGreenHouse object from the flat payload accepted by the API.
 
-        Returns:
-            A dictionary representing the current Smart Data Model.
+        Raises:
+            PayloadError: If a required field is missing.
         """
-        agri_greenhouse_data = {
-            "id": self.id,
-            "type": self.type
-        }
-
-        if self.date_created:
-            agri_greenhouse_data["dateCreated"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.date_created
-                }
-            }
-
-        if self.date_modified:
-            agri_greenhouse_data["dateModified"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.date_modified
-                }
-            }
-
-        if self.owned_by:
-            agri_greenhouse_data["ownedBy"] = {
-                "type": "Relationship",
-                "object": self.owned_by
-            }
-
-        if self.related_source:
-            agri_greenhouse_data["relatedSource"] = {
-                "value": [
-                    {
-                        "application": self.related_source,
-                        "applicationEntityId": "app:greenhouse1"
-                    }
-                ]
-            }
-
-        if self.see_also:
-            agri_greenhouse_data["seeAlso"] = {
-                "type": "Relationship",
-                "object": self.see_also.split(',') if isinstance(self.see_also, str) else self.see_also
-            }
-
-        if self.belongs_to:
-            agri_greenhouse_data["belongsTo"] = self.belongs_to
-
-        # Repeated pattern for different properties
-        relationships = [
-            ("hasAgriParcelParent", self.has_agri_parcel_parent),
-            ("hasAgriParcelChildren", self.has_agri_parcel_children),
-            ("hasWeatherObserved", self.has_weather_observed),
-            ("hasWaterQualityObserved", self.has_water_quality_observed),
-            ("hasDevice", self.has_device)
-        ]
-
-        for rel, value in relationships:
-            if value:
-                agri_greenhouse_data[rel] = {
-                    "type": "Relationship",
-                    "object": value.split(',') if isinstance(value, str) else value
-                }
-
-        properties = [
-            ("relativeHumidity", self.relative_humidity),
-            ("leafTemperature", self.leaf_temperature),
-            ("co2", self.co2),
-            ("dailyLight", self.daily_light)
-        ]
-
-        for prop, value in properties:
-            if value:
-                agri_greenhouse_data[prop] = {
-                    "type": "Property",
-                    "value": value
-                }
-
-        if self.drain_flow or self.drain_flow_max_value or self.drain_flow_min_value:
-            agri_greenhouse_data["drainFlow"] = {
-                "type": "Property",
-                "value": {
-                    "value": self.drain_flow,
-                    "maxValue": self.drain_flow_max_value,
-                    "minValue": self.drain_flow_min_value
-                }
-            }
-
-        return agri_greenhouse_data
-
-
-    def validate_smart_data_model(data):
-        required_fields = ['dateCreated', 'dateModified', 'relativeHumidity', 'co2']
-        for field in required_fields:
-            if field not in data:
-                return False, f'Required "{field}" does not exist'
-        return True, ''   
\ No newline at end of file
+        id = greenhouse_data.get('id')
+        relative_humidity = greenhouse_data.get('relative_humidity')
+        co2 = greenhouse_data.get('co2')
+        error_messages = []
+        if not id:
+            logging.info("id")
+            error_messages.append("Id is missing")
+        if not relative_humidity:
+            logging.info("relative_humidity")
+            error_messages.append("Relative humidity is missing")
+        if not co2:
+            logging.info("co2")
+            error_messages.append("CO2 is missing")
+
+        if error_messages:
+            raise PayloadError({"errors": error_messages})
+
+        date_created = greenhouse_data.get('date_created')
+        date_modified = greenhouse_data.get('date_modified')
+        owned_by = greenhouse_data.get('owned_by')
+        belongs_to = greenhouse_data.get('belongs_to')
+        has_agri_parcel_parent_str = greenhouse_data.get('has_agri_parcel_parent')
+        has_agri_parcel_parent =  has_agri_parcel_parent_str.split(',') if has_agri_parcel_parent_str else []
+        has_weather_observed_str = greenhouse_data.get('has_weather_observed')
+        has_weather_observed =  has_weather_observed_str.split(',') if has_weather_observed_str else []
+        leaf_temperature = greenhouse_data.get('leaf_temperature')
+        daily_light = greenhouse_data.get('daily_light')
+        drain_flow = greenhouse_data.get('drain_flow')
+        drain_flow_max_value = greenhouse_data.get('drain_flow_max_value')
+        drain_flow_min_value = greenhouse_data.get('drain_flow_min_value')
+
+        related_source_str = greenhouse_data.get('related_source')
+        related_source = related_source_str.split(',') if related_source_str else []
+        see_also_str = greenhouse_data.get('see_also')
+        see_also =  see_also_str.split(',') if see_also_str else []
+        has_agri_parcel_children_str = greenhouse_data.get('has_agri_parcel_children')
+        has_agri_parcel_children =  has_agri_parcel_children_str.split(',') if has_agri_parcel_children_str else []
+        has_water_quality_observed_str = greenhouse_data.get('has_water_quality_observed')
+        has_water_quality_observed = has_water_quality_observed_str.split(',') if has_water_quality_observed_str else []
+        has_device_str = greenhouse_data.get('has_device')
+        has_device =  has_device_str.split(',') if has_device_str else []
+
+
+        return cls(
+            id=id,
+            date_created=date_created,
+            date_modified=date_modified,
+            owned_by=owned_by,
+            related_source=related_source,
+            see_also=see_also,
+            belongs_to=belongs_to,
+            has_agri_parcel_parent=has_agri_parcel_parent,
+            has_agri_parcel_children=has_agri_parcel_children,
+            has_weather_observed=has_weather_observed,
+            has_water_quality_observed=has_water_quality_observed,
+            relative_humidity=relative_humidity,
+            leaf_temperature=leaf_temperature,
+            co2=co2,
+            daily_light=daily_light,
+            drain_flow=drain_flow,
+            drain_flow_max_value=drain_flow_max_value,
+            drain_flow_min_value=drain_flow_min_value,
+            has_device=has_device
+        )
+
+    ATTRIBUTES = (
+        DateTime("dateCreated", "date_created"),
+        DateTime("dateModified", "date_modified"),
+        Relationship("ownedBy", "owned_by"),
+        RelatedSource("relatedSource", "related_source", "app:greenhouse1"),
+        Relationship("seeAlso", "see_also", split=True),
+        Raw("belongsTo", "belongs_to"),
+        Relationship("hasAgriParcelParent", "has_agri_parcel_parent", split=True),
+        Relationship("hasAgriParcelChildren", "has_agri_parcel_children", split=True),
+        Relationship("hasWeatherObserved", "has_weather_observed", split=True),
+        Relationship("hasWaterQualityObserved", "has_water_quality_observed", split=True),
+        Relationship("hasDevice", "has_device", split=True),
+        Property("relativeHumidity", "relative_humidity"),
+        Property("leafTemperature", "leaf_temperature"),
+        Property("co2", "co2"),
+        Property("dailyLight", "daily_light"),
+        Structured("drainFlow", (
+            ("value", "drain_flow"),
+            ("maxValue", "drain_flow_max_value"),
+            ("minValue", "drain_flow_min_value"),
+        )),
+    )
+
+    REQUIRED_FIELDS = ['dateCreated', 'dateModified', 'relativeHumidity', 'co2']
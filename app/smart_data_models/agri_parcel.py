@@ -1,12 +1,14 @@
 from datetime import datetime
+import logging
 import json
 
-from app.utils import convert_geojson, generate_urn
+from app.geometry import parse_coordinates
+from app.utils import PayloadError, convert_geojson, generate_urn
+from app.smart_data_models.converter import DateTime, GeoProperty, PropertyObject, RelatedSource, Relationship, Value
+from app.smart_data_models.base import SmartDataModel
 
 
-ModelBase = object
-
-class AgriParcel(ModelBase):
+class AgriParcel(SmartDataModel):
     """
         AgriParcel class represents an agricultural parcel record.
         
@@ -34,6 +36,13 @@ class AgriParcel(ModelBase):
             - irrigation_system_type (str, optional): The type of irrigation system on the parcel.
     """
 
+    __slots__ = (
+        'id', 'type', 'date_created', 'date_modified', 'type_location', 'location', 'area', 'description',
+        'category', 'belongs_to', 'related_source', 'see_also', 'owned_by', 'has_agri_parcel_parent',
+        'has_agri_parcel_children', 'has_agri_crop', 'has_air_quality_observed', 'crop_status',
+        'last_planted_at', 'has_agri_soil', 'has_device', 'soil_texture_type', 'irrigation_system_type'
+    )
+
     def __init__(self, id, location, type_location, area, description, category, belongs_to, has_agri_soil, date_created=None,
                  date_modified=None, related_source=None, see_also=None, owned_by=None, has_agri_parcel_parent=None,
                  has_agri_parcel_children=None, has_agri_crop=None, has_air_quality_observed=None, crop_status=None,
@@ -63,122 +72,116 @@ class AgriParcel(ModelBase):
         self.soil_texture_type = soil_texture_type
         self.irrigation_system_type = irrigation_system_type
 
-    def __repr__(self):
-        """
-        This method returns a machine-readable string representation of the current object.
+    @classmethod
+    def from_flat_payload(cls, parcel_data):
         """
-        return f'<AgriParcel {self.id}>'
-    
-    def to_smart_data_model(self):
-        """
-        This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
-        
-        Returns:
-            A dictionary representing the current Smart Data Model.
+        This method builds a AgriParcel object from the flat payload accepted by the API.
+
+        Raises:
+            PayloadError: If a required field is missing.
         """
-        agri_parcel_data = {
-            "id": self.id,
-            "type": self.type
-        }
-
-        # A continuación, se verifica cada atributo antes de añadirlo al diccionario:
-        if self.date_created:
-            agri_parcel_data["dateCreated"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.date_created
-                }
-            }
-
-        if self.date_modified:
-            agri_parcel_data["dateModified"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.date_modified
-                }
-            }
-
-        if self.type_location and self.location:
-            agri_parcel_data["location"] = {
-                "type": "GeoProperty",
-                "value": {
-                    "type": self.type_location,
-                    "coordinates": self.location
-                }
-            }
-
-        if self.area:
-            agri_parcel_data["area"] = {"value": self.area}
-
-        if self.description:
-            agri_parcel_data["description"] = {"value": self.description}
-
-        if self.category:
-            agri_parcel_data["category"] = {"value": self.category}
-
-        if self.related_source:
-            agri_parcel_data["relatedSource"] = {
-                "value": [
-                    {
-                        "application": self.related_source.split(',') if isinstance(self.related_source, str) else self.related_source,
-                        "applicationEntityId": "app:parcel1"
-                    }
-                ]
-            }
-
-        if self.see_also:
-            agri_parcel_data["seeAlso"] = {
-                "value": self.see_also.split(',') if isinstance(self.see_also, str) else self.see_also
-            }
-
-        # Similar checks for the remaining attributes:
-        for attr, key in [
-            (self.belongs_to, "belongsTo"),
-            (self.owned_by, "ownedBy"),
-            (self.has_agri_parcel_parent, "hasAgriParcelParent"),
-            (self.has_agri_crop, "hasAgriCrop"),
-            (self.has_air_quality_observed, "hasAirQualityObserved"),
-            (self.crop_status, "cropStatus"),
-            (self.has_agri_soil, "hasAgriSoil"),
-            (self.soil_texture_type, "soilTextureType"),
-            (self.irrigation_system_type, "irrigationSystemType")
-        ]:
-            if attr:
-                agri_parcel_data[key] = {
-                    "type": "Relationship" if "has" in key or "belongsTo" in key or "ownedBy" in key else "Property",
-                    "object": attr if "has" in key or "belongsTo" in key or "ownedBy" in key else {"value": attr}
-                }
-
-        if self.has_agri_parcel_children:
-            agri_parcel_data["hasAgriParcelChildren"] = {
-                "type": "Relationship",
-                "object": self.has_agri_parcel_children.split(',') if isinstance(self.has_agri_parcel_children, str) else self.has_agri_parcel_children
-            }
-
-        if self.last_planted_at:
-            agri_parcel_data["lastPlantedAt"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.last_planted_at
-                }
-            }
-
-        if self.has_device:
-            agri_parcel_data["hasDevice"] = {
-                "type": "Relationship",
-                "object": self.has_device.split(',') if isinstance(self.has_device, str) else self.has_device
-            }
-
-        return agri_parcel_data
-
-
-
-    def validate_smart_data_model(data):
-        required_fields = ['dateCreated', 'dateModified',  'location','area','description', 'category', 'belongsTo' ,'hasAgriSoil']
-        for field in required_fields:
-            if field not in data:
-                return False, f'Required "{field}" does not exist'
-        return True, ''
\ No newline at end of file
+        id = parcel_data.get('id')
+        location_str = parcel_data.get('location')
+        location_type = parcel_data.get('location_type')
+        area = parcel_data.get('area')
+        description = parcel_data.get('description')
+        category = parcel_data.get('category')
+        belongs_to = parcel_data.get('belongs_to')
+        has_agri_soil = parcel_data.get('has_agri_soil')
+
+        error_messages = []
+        if not id:
+            logging.info("id")
+            error_messages.append("Id is missing")
+        if not location_str:
+            error_messages.append("Location is missing")
+        if not location_type:
+            error_messages.append("Location type is missing")
+        if not area:
+            error_messages.append("Area is missing")
+        if not description:
+            error_messages.append("Description is missing")
+        if not category:
+            error_messages.append("Category is missing")
+        if not belongs_to:
+            error_messages.append("Belongs to is missing")
+        if not has_agri_soil:
+            error_messages.append("Has agri soil is missing")
+        if error_messages:
+            raise PayloadError({"errors": error_messages})
+
+        location = {'coordinates': parse_coordinates(location_str)}
+
+        date_created = parcel_data.get('date_created')
+        date_modified = parcel_data.get('date_modified')
+        has_agri_parcel_parent = parcel_data.get('has_agri_parcel_parent')
+        soil_texture_type = parcel_data.get('soil_texture_type')
+        related_source_str = parcel_data.get('related_source')
+        related_source = related_source_str.split(',') if related_source_str else None
+
+
+        see_also_str = parcel_data.get('see_also')
+        see_also = see_also_str.split(',') if see_also_str else None
+
+        owned_by = parcel_data.get('owned_by')
+        has_agri_parcel_children_str = parcel_data.get('has_agri_parcel_children')
+        has_agri_parcel_children = has_agri_parcel_children_str.split(',') if has_agri_parcel_children_str else None
+
+        has_agri_crop = parcel_data.get('has_agri_crop')
+        has_air_quality_observed = parcel_data.get('has_air_quality_observed')
+        crop_status = parcel_data.get('crop_status')
+        last_planted_at = parcel_data.get('last_planted_at')
+        has_device_str = parcel_data.get('has_device')
+        has_device = has_device_str.split(',') if has_device_str else None
+
+        irrigation_system_type = parcel_data.get('irrigation_system_type')
+
+        return cls(
+            id=id,
+            date_created=date_created,
+            date_modified=date_modified,
+            location= location,
+            type_location= location_type,
+            area=area,
+            description=description,
+            category=category,
+            belongs_to=belongs_to,
+            has_agri_parcel_parent=has_agri_parcel_parent,
+            has_agri_soil=has_agri_soil,
+            soil_texture_type=soil_texture_type,
+            related_source=related_source,
+            see_also=see_also,
+            owned_by=owned_by,
+            has_agri_parcel_children=has_agri_parcel_children,
+            has_agri_crop=has_agri_crop,
+            has_air_quality_observed=has_air_quality_observed,
+            crop_status=crop_status,
+            last_planted_at=last_planted_at,
+            has_device=has_device,
+            irrigation_system_type=irrigation_system_type
+        )
+
+    ATTRIBUTES = (
+        DateTime("dateCreated", "date_created"),
+        DateTime("dateModified", "date_modified"),
+        GeoProperty("location", "location", "type_location"),
+        Value("area", "area"),
+        Value("description", "description"),
+        Value("category", "category"),
+        RelatedSource("relatedSource", "related_source", "app:parcel1", split=True),
+        Value("seeAlso", "see_also", split=True),
+        Relationship("belongsTo", "belongs_to"),
+        Relationship("ownedBy", "owned_by"),
+        Relationship("hasAgriParcelParent", "has_agri_parcel_parent"),
+        Relationship("hasAgriCrop", "has_agri_crop"),
+        Relationship("hasAirQualityObserved", "has_air_quality_observed"),
+        PropertyObject("cropStatus", "crop_status"),
+        Relationship("hasAgriSoil", "has_agri_soil"),
+        PropertyObject("soilTextureType", "soil_texture_type"),
+        PropertyObject("irrigationSystemType", "irrigation_system_type"),
+        Relationship("hasAgriParcelChildren", "has_agri_parcel_children", split=True),
+        DateTime("lastPlantedAt", "last_planted_at"),
+        Relationship("hasDevice", "has_device", split=True),
+    )
+
+    REQUIRED_FIELDS = ['dateCreated', 'dateModified', 'location', 'area', 'description', 'category', 'belongsTo', 'hasAgriSoil']
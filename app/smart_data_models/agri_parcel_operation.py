@@ -1,11 +1,12 @@
 from datetime import datetime
+import logging
 
-from app.utils import generate_urn
+from app.utils import PayloadError, generate_urn
+from app.smart_data_models.converter import DateTime, Relationship, Structured, Url, Value
+from app.smart_data_models.base import SmartDataModel
 
 
-ModelBase = object
-
-class AgriParcelOperation(ModelBase):
+class AgriParcelOperation(SmartDataModel):
     """
         AgriParcelOperation class represents an operation on an agricultural parcel.
         
@@ -41,6 +42,17 @@ class AgriParcelOperation(ModelBase):
             gasoline_fuel_consumption_unit_text (str, optional): The unit of gasoline fuel consumption measurement.
     """
 
+    __slots__ = (
+        'id', 'type', 'date_created', 'date_modified', 'has_agri_parcel', 'operation_type', 'description',
+        'result', 'planned_start_at', 'planned_end_at', 'status', 'started_at', 'ended_at', 'reported_at',
+        'related_source', 'see_also', 'has_operator', 'has_agri_product_type', 'quantity', 'water_source',
+        'work_order', 'work_record', 'irrigation_record', 'diesel_fuel_consumption',
+        'gasoline_fuel_consumption', 'diesel_fuel_consumption_max_value',
+        'diesel_fuel_consumption_min_value', 'diesel_fuel_consumption_unit_text',
+        'gasoline_fuel_consumption_max_value', 'gasoline_fuel_consumption_min_value',
+        'gasoline_fuel_consumption_unit_text'
+    )
+
     def __init__(self, id, has_agri_parcel, operation_type, description, result, planned_start_at, planned_end_at,
                  status, started_at, ended_at, reported_at, quantity, diesel_fuel_consumption,
                  diesel_fuel_consumption_max_value, diesel_fuel_consumption_min_value, diesel_fuel_consumption_unit_text,
@@ -79,110 +91,161 @@ class AgriParcelOperation(ModelBase):
         self.gasoline_fuel_consumption_max_value = gasoline_fuel_consumption_max_value
         self.gasoline_fuel_consumption_min_value = gasoline_fuel_consumption_min_value
         self.gasoline_fuel_consumption_unit_text = gasoline_fuel_consumption_unit_text
-        
 
-    def __repr__(self):
+    @classmethod
+    def from_flat_payload(cls, operation_data):
         """
-        This method returns a machine-readable string representation of the current object.
-        """
-        return f'<AgriParcelOperation {self.id}>'
-    
+        This method builds a AgriParcelOperation object from the flat payload accepted by the API.
 
-    def to_smart_data_model(self):
+        Raises:
+            PayloadError: If a required field is missing.
         """
-        This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
-
-        Returns:
-            A dictionary representing the current Smart Data Model.
-        """
-        agri_parcel_operation_data = {
-            "id": self.id,
-            "type": self.type
-        }
-
-        # Helper function for datetime properties
-        def add_datetime_property(key, value):
-            if value:
-                agri_parcel_operation_data[key] = {
-                    "type": "Property",
-                    "value": {
-                        "@type": "DateTime",
-                        "@value": value
-                    }
-                }
-
-        # Handling datetime properties
-        datetime_props = ["dateCreated", "dateModified", "plannedStartAt", "plannedEndAt", "startedAt", "endedAt", "reportedAt"]
-        for prop in datetime_props:
-            attr_val = getattr(self, prop.lower())
-            add_datetime_property(prop, attr_val)
-
-        # Handling direct properties
-        direct_props = ["operationType", "description", "result", "status", "quantity", "waterSource"]
-        for prop in direct_props:
-            attr_val = getattr(self, prop.lower())
-            if attr_val:
-                agri_parcel_operation_data[prop] = {
-                    "value": attr_val
-                }
-
-        # Handling URL properties
-        url_props = ["workOrder", "workRecord", "irrigationRecord"]
-        for prop in url_props:
-            attr_val = getattr(self, prop.lower())
-            if attr_val:
-                agri_parcel_operation_data[prop] = {
-                    "type": "Property",
-                    "value": {
-                        "@type": "URL",
-                        "@value": attr_val
-                    }
-                }
-
-        # Handling complex properties
-        complex_props = [
-            ("dieselFuelConsumption", ["value", "maxValue", "minValue", "unitText"]),
-            ("gasolineFuelConsumption", ["value", "maxValue", "minValue", "unitText"])
-        ]
-
-        for prop, subprops in complex_props:
-            prop_data = {}
-            for subprop in subprops:
-                attr_val = getattr(self, f"{prop.lower()}_{subprop.lower()}")
-                if attr_val:
-                    prop_data[subprop] = attr_val
-            if prop_data:
-                agri_parcel_operation_data[prop] = {
-                    "type": "Property",
-                    "value": prop_data
-                }
-
-        # Handling relationship properties
-        relationships = ["hasAgriParcel", "hasOperator", "hasAgriProductType"]
-        for rel in relationships:
-            attr_val = getattr(self, rel.lower())
-            if attr_val:
-                agri_parcel_operation_data[rel] = {
-                    "type": "Relationship",
-                    "object": attr_val
-                }
-
-        # Handling list properties
-        list_props = ["relatedSource", "seeAlso"]
-        for prop in list_props:
-            attr_val = getattr(self, prop.lower())
-            if attr_val:
-                agri_parcel_operation_data[prop] = {
-                    "value": attr_val.split(',') if isinstance(attr_val, str) else attr_val
-                }
-
-        return agri_parcel_operation_data
-
-
-
-    def validate_smart_data_model(data):
-        required_fields = ['dateCreated', 'dateModified', 'hasAgriParcel', 'operationType', 'description', 'result', 'plannedStartAt',  'plannedEndAt' , 'status', 'startedAt', 'endedAt', 'reportedAt', 'quantity', 'dieselFuelConsumption', 'gasolineFuelConsumption']
-        for field in required_fields:
-            if field not in data:
-                return False, f'Required "{field}" does not exist'
-        return True, ''
\ No newline at end of file
+        id = operation_data.get('id')
+        has_agri_parcel = operation_data.get('has_agri_parcel')
+        operation_type = operation_data.get('operation_type')
+        description = operation_data.get('description')
+        result = operation_data.get('result')
+        planned_start_at = operation_data.get('planned_start_at')
+        planned_end_at = operation_data.get('planned_end_at')
+        status = operation_data.get('status')
+        started_at = operation_data.get('started_at')
+        ended_at = operation_data.get('ended_at')
+        reported_at = operation_data.get('reported_at')
+        quantity = operation_data.get('quantity')
+        diesel_fuel_consumption = operation_data.get('diesel_fuel_consumption')
+        gasoline_fuel_consumption = operation_data.get('gasoline_fuel_consumption')
+        diesel_fuel_consumption_max_value= operation_data.get('diesel_fuel_consumption_max_value')
+        diesel_fuel_consumption_min_value = operation_data.get('diesel_fuel_consumption_max_value')
+        diesel_fuel_consumption_unit_text = operation_data.get('diesel_fuel_consumption_unit_text')
+        gasoline_fuel_consumption_max_value = operation_data.get('gasoline_fuel_consumption_max_value')
+        gasoline_fuel_consumption_min_value = operation_data.get('gasoline_fuel_consumption_min_value')
+        gasoline_fuel_consumption_unit_text = operation_data.get('gasoline_fuel_consumption_unit_text')
+
+
+        error_messages = []
+        if not id:
+            logging.info("id")
+            error_messages.append("Id is missing")
+        if not has_agri_parcel:
+            error_messages.append("Has agri parcel is missing")
+        if not operation_type:
+            error_messages.append("Operation type is missing")
+        if not description:
+            error_messages.append("Description is missing")
+        if not result:
+            error_messages.append("Result is missing")
+        if not planned_start_at:
+            error_messages.append("Planned start at is missing")
+        if not planned_end_at:
+            error_messages.append("Planned end at is missing")
+        if not status:
+            error_messages.append("Status is missing")
+        if not started_at:
+            error_messages.append("Started at is missing")
+        if not ended_at:
+            error_messages.append("Ended at is missing")
+        if not reported_at:
+            error_messages.append("Reported at is missing")
+        if not quantity:
+            error_messages.append("Quantity is missing")
+        if not diesel_fuel_consumption:
+            error_messages.append("Diesel fuel consumption is missing")
+        if not gasoline_fuel_consumption:
+            error_messages.append("Gasoline fuel consumption is missing")
+        if not diesel_fuel_consumption_max_value:
+            error_messages.append("Diesel Max fuel consumption is missing")
+        if not diesel_fuel_consumption_min_value:
+            error_messages.append("Diesel Min fuel consumption is missing")
+        if not diesel_fuel_consumption_unit_text:
+            error_messages.append("Diesel Unit fuel consumption is missing")
+        if not gasoline_fuel_consumption_max_value:
+            error_messages.append("Gasoline Max fuel consumption is missing")
+        if not gasoline_fuel_consumption_min_value:
+            error_messages.append("Gasoline Min fuel consumption is missing")
+        if not gasoline_fuel_consumption_unit_text:
+            error_messages.append("Gasoline Unit fuel consumption is missing")
+        if error_messages:
+            raise PayloadError({"errors": error_messages})
+        date_created = operation_data.get('date_created')
+        date_modified = operation_data.get('date_modified')
+        related_source_str = operation_data.get('related_source')
+        related_source = related_source_str.split(',') if related_source_str else []
+        see_also_str = operation_data.get('see_also')
+        see_also = see_also_str.split(',') if see_also_str else []
+        has_operator = operation_data.get('has_operator')
+        has_agri_product_type = operation_data.get('has_agri_product_type')
+        water_source = operation_data.get('water_source')
+        work_order = operation_data.get('work_order')
+        work_record = operation_data.get('work_record')
+        irrigation_record = operation_data.get('irrigation_record')
+
+        return cls(
+            id=id,
+            date_created=date_created,
+            date_modified=date_modified,
+            has_agri_parcel=has_agri_parcel,
+            operation_type=operation_type,
+            description=description,
+            result=result,
+            planned_start_at=planned_start_at,
+            planned_end_at=planned_end_at,
+            status=status,
+            started_at=started_at,
+            ended_at=ended_at,
+            reported_at=reported_at,
+            quantity=quantity,
+            related_source=related_source,
+            see_also=see_also,
+            has_operator=has_operator,
+            has_agri_product_type=has_agri_product_type,
+            water_source=water_source,
+            work_order=work_order,
+            work_record=work_record,
+            irrigation_record=irrigation_record,
+            diesel_fuel_consumption=diesel_fuel_consumption,
+            gasoline_fuel_consumption=gasoline_fuel_consumption,
+            diesel_fuel_consumption_max_value=diesel_fuel_consumption_max_value,
+            diesel_fuel_consumption_min_value=diesel_fuel_consumption_min_value,
+            diesel_fuel_consumption_unit_text=diesel_fuel_consumption_unit_text,
+            gasoline_fuel_consumption_max_value=gasoline_fuel_consumption_max_value,
+            gasoline_fuel_consumption_min_value=gasoline_fuel_consumption_min_value,
+            gasoline_fuel_consumption_unit_text=gasoline_fuel_consumption_unit_text
+        )
+
+    ATTRIBUTES = (
+        DateTime("dateCreated", "date_created"),
+        DateTime("dateModified", "date_modified"),
+        DateTime("plannedStartAt", "planned_start_at"),
+        DateTime("plannedEndAt", "planned_end_at"),
+        DateTime("startedAt", "started_at"),
+        DateTime("endedAt", "ended_at"),
+        DateTime("reportedAt", "reported_at"),
+        Value("operationType", "operation_type"),
+        Value("description", "description"),
+        Value("result", "result"),
+        Value("status", "status"),
+        Value("quantity", "quantity"),
+        Value("waterSource", "water_source"),
+        Url("workOrder", "work_order"),
+        Url("workRecord", "work_record"),
+        Url("irrigationRecord", "irrigation_record"),
+        Structured("dieselFuelConsumption", (
+            ("value", "diesel_fuel_consumption"),
+            ("maxValue", "diesel_fuel_consumption_max_value"),
+            ("minValue", "diesel_fuel_consumption_min_value"),
+            ("unitText", "diesel_fuel_consumption_unit_text"),
+        ), skip_empty=True),
+        Structured("gasolineFuelConsumption", (
+            ("value", "gasoline_fuel_consumption"),
+            ("maxValue", "gasoline_fuel_consumption_max_value"),
+            ("minValue", "gasoline_fuel_consumption_min_value"),
+            ("unitText", "gasoline_fuel_consumption_unit_text"),
+        ), skip_empty=True),
+        Relationship("hasAgriParcel", "has_agri_parcel"),
+        Relationship("hasOperator", "has_operator"),
+        Relationship("hasAgriProductType", "has_agri_product_type"),
+        Value("relatedSource", "related_source", split=True),
+        Value("seeAlso", "see_also", split=True),
+    )
+
+    REQUIRED_FIELDS = ['dateCreated', 'dateModified', 'hasAgriParcel', 'operationType', 'description', 'result', 'plannedStartAt', 'plannedEndAt', 'status', 'startedAt', 'endedAt', 'reportedAt', 'quantity', 'dieselFuelConsumption', 'gasolineFuelConsumption']
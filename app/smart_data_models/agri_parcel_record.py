@@ -1,11 +1,13 @@
 from datetime import datetime
+import logging
 
-from app.utils import convert_geojson, generate_urn
+from app.geometry import parse_coordinates
+from app.utils import PayloadError, convert_geojson, generate_urn
+from app.smart_data_models.converter import DateTime, GeoProperty, Measure, Property, Raw, RelatedSource, Relationship, Value
+from app.smart_data_models.base import SmartDataModel
 
 
-ModelBase = object
-
-class AgriParcelRecord(ModelBase):
+class AgriParcelRecord(SmartDataModel):
     """
     AgriParcelRecord class represents an agricultural parcel record.
         
@@ -57,6 +59,20 @@ class AgriParcelRecord(ModelBase):
         - timestamp (datetime, optional): The timestamp for the record.
     """
 
+    __slots__ = (
+        'id', 'type', 'date_created', 'date_modified', 'has_agri_parcel', 'type_location', 'location',
+        'soil_temperature', 'soil_temperature_unit', 'air_temperature', 'air_temperature_unit',
+        'air_temperature_timestamp', 'relative_humidity', 'relative_humidity_unit',
+        'relative_humidity_timestamp', 'related_source', 'see_also', 'soil_moisture_vwc',
+        'soil_moisture_ec', 'soil_salinity', 'soil_salinity_unit', 'soil_salinity_timestamp',
+        'leaf_wetness', 'leaf_wetness_unit', 'leaf_wetness_timestamp', 'leaf_relative_humidity',
+        'leaf_relative_humidity_unit', 'leaf_relative_humidity_timestamp', 'leaf_temperature',
+        'leaf_temperature_unit', 'leaf_temperature_timestamp', 'solar_radiation', 'solar_radiation_unit',
+        'solar_radiation_timestamp', 'atmospheric_pressure', 'atmospheric_pressure_unit',
+        'atmospheric_pressure_timestamp', 'description', 'has_device', 'observed_at', 'depth', 'depth_unit',
+        'timestamp', 'soil_moisture_vwc_unit', 'soil_moisture_vwc_timestamp', 'soil_moisture_ec_unit',
+        'soil_moisture_ec_timestamp'
+    )
 
     def __init__(self, id, has_agri_parcel, location, type_location, soil_temperature, soil_temperature_unit, air_temperature, air_temperature_unit, air_temperature_timestamp, relative_humidity, relative_humidity_unit, relative_humidity_timestamp, 
                  date_created=None, date_modified=None, related_source=None, see_also=None, soil_moisture_vwc=None,
@@ -117,128 +133,169 @@ class AgriParcelRecord(ModelBase):
         self.soil_moisture_vwc_timestamp = soil_moisture_vwc_timestamp
         self.soil_moisture_ec_unit = soil_moisture_ec_unit
         self.soil_moisture_ec_timestamp = soil_moisture_ec_timestamp
-   
-
 
-
-    def __repr__(self):
-        """
-        This method returns a machine-readable string representation of the current object.
+    @classmethod
+    def from_flat_payload(cls, record_data):
         """
-        return f'<AgriParcelRecord {self.id}>'
+        This method builds a AgriParcelRecord object from the flat payload accepted by the API.
 
-    def to_smart_data_model(self):
+        Raises:
+            PayloadError: If a required field is missing.
         """
-        This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
-        
-        Returns:
-            A dictionary representing the current Smart Data Model.
-        """
-        agri_parcel_record_data = {
-            "id": self.id,
-            "type": self.type
-        }
-
-
-        if self.date_created:
-            agri_parcel_record_data["dateCreated"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.date_created
-                }
-            }
-
-        if self.date_modified:
-            agri_parcel_record_data["dateModified"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.date_modified
-                }
-            }
-
-        if self.related_source:
-            agri_parcel_record_data["relatedSource"] = {
-                "value": [
-                    {
-                        "application": self.related_source.split(',') if isinstance(self.related_source, str) else self.related_source,
-                        "applicationEntityId": "app:record1"
-                    }
-                ]
-            }
-
-        if self.see_also:
-            agri_parcel_record_data["seeAlso"] = {
-                "value": self.see_also.split(',') if isinstance(self.see_also, str) else self.see_also
-            }
-
-        if self.has_agri_parcel:
-            agri_parcel_record_data["hasAgriParcel"] = {
-                "type": "Relationship",
-                "object": self.has_agri_parcel
-            }
-
-        if self.type_location and self.location:
-            agri_parcel_record_data["location"] = {
-                "type": "GeoProperty",
-                "value": {
-                    "type": self.type_location,
-                    "coordinates": self.location
-                }
-            }
-
-        for attr, unit, timestamp, key in [
-            (self.soil_temperature, self.soil_temperature_unit, None, "soilTemperature"),
-            (self.depth, self.depth_unit, None, "depth"),
-            (self.soil_moisture_vwc, self.soil_moisture_vwc_unit, None, "soilMoistureVWC"),
-            (self.soil_moisture_ec, self.soil_moisture_ec_unit, self.soil_moisture_ec_timestamp, "soilMoistureEC"),
-            (self.soil_salinity, self.soil_salinity_unit, self.soil_salinity_timestamp, "soilSalinity"),
-            (self.leaf_wetness, self.leaf_wetness_unit, self.leaf_wetness_timestamp, "leafWetness"),
-            (self.leaf_relative_humidity, self.leaf_relative_humidity_unit, self.leaf_relative_humidity_timestamp, "leafRelativeHumidity"),
-            (self.leaf_temperature, self.leaf_temperature_unit, self.leaf_temperature_timestamp, "leafTemperature"),
-            (self.air_temperature, self.air_temperature_unit, self.air_temperature_timestamp, "airTemperature"),
-            (self.solar_radiation, self.solar_radiation_unit, self.solar_radiation_timestamp, "solarRadiation"),
-            (self.relative_humidity, self.relative_humidity_unit, self.relative_humidity_timestamp, "relativeHumidity"),
-            (self.atmospheric_pressure, self.atmospheric_pressure_unit, self.atmospheric_pressure_timestamp, "atmosphericPressure"),
-        ]:
-            if attr:
-                agri_parcel_record_data[key] = {
-                    "type": "Property",
-                    "value": attr,
-                    "unitCode": unit
-                }
-                if timestamp:
-                    agri_parcel_record_data[key]["timestamp"] = {
-                        "type": "Property",
-                        "value": {
-                            "@type": "DateTime",
-                            "@value": timestamp
-                        }
-                    }
-
-
-        if self.description:
-            agri_parcel_record_data["description"] = {
-                "type": "Property",
-                "value": self.description
-            }
-
-        if self.has_device:
-            agri_parcel_record_data["hasDevice"] = {
-                "type": "Relationship",
-                "object": self.has_device.split(',') if isinstance(self.has_device, str) else self.has_device
-            }
-
-        if self.observed_at:
-            agri_parcel_record_data["observedAt"] = self.observed_at
-
-        return agri_parcel_record_data
-
-
-    def validate_smart_data_model(data):
-        required_fields = ['dateCreated', 'dateModified',  'hasAgriParcel', 'location', 'soilTemperature']
-        for field in required_fields:
-            if field not in data:
-                return False, f'Required "{field}" does not exist'
-        return True, ''
\ No newline at end of file
+        id = record_data.get('id')
+        has_agri_parcel = record_data.get('has_agri_parcel')
+        location_str = record_data.get('location')
+        type_location = record_data.get('type_location')
+        soil_temperature = record_data.get('soil_temperature')
+        soil_temperature_unit = record_data.get('soil_temperature_unit')
+        air_temperature = record_data.get('air_temperature')
+        air_temperature_unit = record_data.get('air_temperature_unit')
+        air_temperature_timestamp = record_data.get('air_temperature_timestamp')
+        relative_humidity = record_data.get('relative_humidity')
+        relative_humidity_unit = record_data.get('relative_humidity_unit')
+        relative_humidity_timestamp = record_data.get('relative_humidity_timestamp')
+
+        error_messages = []
+        if not id:
+            logging.info("id")
+            error_messages.append("Id is missing")
+        if not has_agri_parcel:
+            error_messages.append("Has agri parcel is missing")
+        if not location_str:
+            error_messages.append("Location is missing")
+        if not type_location:
+            error_messages.append("Location Type is missing")
+        if not soil_temperature:
+            error_messages.append("Soil temperature is missing")
+        if not soil_temperature_unit:
+            error_messages.append("Soil temperature unit is missing")
+        if not air_temperature:
+            error_messages.append("Air temperature is missing")
+        if not air_temperature_unit:
+            error_messages.append("Air temperature unit is missing")
+        if not air_temperature_timestamp:
+            error_messages.append("Air temperature timestamp is missing")
+        if not relative_humidity:
+            error_messages.append("Relative humidity is missing")
+        if not relative_humidity_unit:
+            error_messages.append("Relative humidity unit is missing")
+        if not relative_humidity_timestamp:
+            error_messages.append("Relative humidity timestamp is missing")
+
+        if error_messages:
+            raise PayloadError({"errors": error_messages})
+
+        location = {'coordinates': parse_coordinates(location_str)}
+
+        date_created = record_data.get('date_created')
+        date_modified = record_data.get('date_modified')
+        related_source_str = record_data.get('related_source')
+        related_source = related_source_str.split(',') if related_source_str else []
+        see_also_str = record_data.get('see_also')
+        see_also = see_also_str.split(',') if see_also_str else []
+        description = record_data.get('description')
+        soil_moisture_vwc = record_data.get('soil_moisture_vwc')
+        soil_moisture_ec = record_data.get('soil_moisture_ec')
+        soil_salinity = record_data.get('soil_salinity')
+        leaf_wetness = record_data.get('leaf_wetness')
+        leaf_relative_humidity = record_data.get('leaf_relative_humidity')
+        leaf_temperature = record_data.get('leaf_temperature')
+        solar_radiation = record_data.get('solar_radiation')
+        atmospheric_pressure = record_data.get('atmospheric_pressure')
+        has_device_str = record_data.get('has_device')
+        has_device = has_device_str.split(',') if has_device_str else []
+        observed_at = record_data.get('observed_at')
+        soil_salinity_unit = record_data.get('soil_salinity_unit')
+        soil_salinity_timestamp = record_data.get('soil_salinity_timestamp')
+        leaf_wetness_unit = record_data.get('leaf_wetness_unit')
+        leaf_wetness_timestamp = record_data.get('leaf_wetness_timestamp')
+        leaf_temperature_unit = record_data.get('leaf_temperature_unit')
+        leaf_temperature_timestamp = record_data.get('leaf_temperature_timestamp')
+        solar_radiation_unit = record_data.get('solar_radiation_unit')
+        solar_radiation_timestamp = record_data.get('solar_radiation_timestamp')
+        atmospheric_pressure_unit = record_data.get('atmospheric_pressure_unit')
+        atmospheric_pressure_timestamp = record_data.get('atmospheric_pressure_timestamp')
+        soil_moisture_vwc_unit = record_data.get('soil_moisture_vwc_unit')
+        soil_moisture_vwc_timestamp = record_data.get('soil_moisture_vwc_timestamp')
+        soil_moisture_ec_unit = record_data.get('soil_moisture_ec_unit')
+        soil_moisture_ec_timestamp = record_data.get('soil_moisture_ec_timestamp')
+        leaf_relative_humidity_unit = record_data.get('leaf_relative_humidity_unit')
+        leaf_relative_humidity_timestamp = record_data.get('leaf_relative_humidity_timestamp')
+        depth = record_data.get('depth')
+        depth_unit_code = record_data.get('depth_unit_code')
+        timestamp = record_data.get('timestamp')
+
+        return cls(
+            id=id,
+            date_created=date_created,
+            date_modified=date_modified,
+            has_agri_parcel=has_agri_parcel,
+            type_location=type_location,
+            location = location,
+            soil_temperature=soil_temperature,
+            soil_temperature_unit=soil_temperature_unit,
+            air_temperature=air_temperature,
+            air_temperature_unit=air_temperature_unit,
+            air_temperature_timestamp = air_temperature_timestamp,
+            relative_humidity=relative_humidity,
+            relative_humidity_unit=relative_humidity_unit,
+            relative_humidity_timestamp=relative_humidity_timestamp,
+            description=description,
+            related_source=related_source,
+            see_also=see_also,
+            soil_moisture_vwc=soil_moisture_vwc,
+            soil_moisture_ec=soil_moisture_ec,
+            soil_salinity=soil_salinity,
+            leaf_wetness=leaf_wetness,
+            leaf_relative_humidity=leaf_relative_humidity,
+            leaf_temperature=leaf_temperature,
+            solar_radiation=solar_radiation,
+            atmospheric_pressure=atmospheric_pressure,
+            has_device=has_device,
+            observed_at=observed_at,
+            soil_salinity_unit= soil_salinity_unit,
+            soil_salinity_timestamp = soil_salinity_timestamp,
+            leaf_wetness_unit = leaf_wetness_unit,
+            leaf_wetness_timestamp = leaf_wetness_timestamp,
+            leaf_temperature_unit = leaf_temperature_unit,
+            leaf_temperature_timestamp = leaf_temperature_timestamp,
+            solar_radiation_unit = solar_radiation_unit,
+            solar_radiation_timestamp = solar_radiation_timestamp,
+            atmospheric_pressure_unit = atmospheric_pressure_unit,
+            atmospheric_pressure_timestamp = atmospheric_pressure_timestamp,
+            soil_moisture_vwc_unit = soil_moisture_vwc_unit,
+            soil_moisture_vwc_timestamp = soil_moisture_vwc_timestamp,
+            soil_moisture_ec_unit = soil_moisture_ec_unit,
+            soil_moisture_ec_timestamp = soil_moisture_ec_timestamp,
+            leaf_relative_humidity_unit = leaf_relative_humidity_unit,
+            leaf_relative_humidity_timestamp= leaf_relative_humidity_timestamp,
+            depth=depth,
+            depth_unit=depth_unit_code,
+            timestamp=timestamp
+        )
+
+    ATTRIBUTES = (
+        DateTime("dateCreated", "date_created"),
+        DateTime("dateModified", "date_modified"),
+        RelatedSource("relatedSource", "related_source", "app:record1", split=True),
+        Value("seeAlso", "see_also", split=True),
+        Relationship("hasAgriParcel", "has_agri_parcel"),
+        GeoProperty("location", "location", "type_location"),
+        Measure("soilTemperature", "soil_temperature", "soil_temperature_unit"),
+        Measure("depth", "depth", "depth_unit"),
+        Measure("soilMoistureVWC", "soil_moisture_vwc", "soil_moisture_vwc_unit"),
+        Measure("soilMoistureEC", "soil_moisture_ec", "soil_moisture_ec_unit", "soil_moisture_ec_timestamp"),
+        Measure("soilSalinity", "soil_salinity", "soil_salinity_unit", "soil_salinity_timestamp"),
+        Measure("leafWetness", "leaf_wetness", "leaf_wetness_unit", "leaf_wetness_timestamp"),
+        Measure("leafRelativeHumidity", "leaf_relative_humidity", "leaf_relative_humidity_unit", "leaf_relative_humidity_timestamp"),
+        Measure("leafTemperature", "leaf_temperature", "leaf_temperature_unit", "leaf_temperature_timestamp"),
+        Measure("airTemperature", "air_temperature", "air_temperature_unit", "air_temperature_timestamp"),
+        Measure("solarRadiation", "solar_radiation", "solar_radiation_unit", "solar_radiation_timestamp"),
+        Measure("relativeHumidity", "relative_humidity", "relative_humidity_unit", "relative_humidity_timestamp"),
+        Measure("atmosphericPressure", "atmospheric_pressure", "atmospheric_pressure_unit", "atmospheric_pressure_timestamp"),
+        Property("description", "description"),
+        Relationship("hasDevice", "has_device", split=True),
+        Raw("observedAt", "observed_at"),
+    )
+
+    REQUIRED_FIELDS = ['dateCreated', 'dateModified', 'hasAgriParcel', 'location', 'soilTemperature']
@@ -1,11 +1,12 @@
 from datetime import datetime
+import logging
 
-from app.utils import generate_urn
+from app.utils import PayloadError, generate_urn
+from app.smart_data_models.converter import DateTime, RelatedSource, Relationship, Url, Value
+from app.smart_data_models.base import SmartDataModel
 
 
-ModelBase = object
-
-class AgriSoil(ModelBase):
+class AgriSoil(SmartDataModel):
     """
         AgriSoil class represents a type of agricultural soil.
             
@@ -21,7 +22,11 @@ class AgriSoil(ModelBase):
             - has_agri_product_type (str, optional): Represents the relationship with the agricultural product type.
     """
 
-    
+    __slots__ = (
+        'id', 'type', 'name', 'date_created', 'date_modified', 'alternate_name', 'description',
+        'agro_voc_concept', 'see_also', 'related_source', 'has_agri_product_type'
+    )
+
     def __init__(self, id, name, date_created=None, date_modified=None, alternate_name=None,
                  description=None, agro_voc_concept=None, see_also=None, related_source=None, 
                  has_agri_product_type=None):
@@ -43,88 +48,58 @@ class AgriSoil(ModelBase):
         """
         return f'<AgriSoil {self.name}>'
 
-    def to_smart_data_model(self):
+    @classmethod
+    def from_flat_payload(cls, soil_data):
         """
-        This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
-        
-        Returns:
-            A dictionary representing the current Smart Data Model.
-        """
-        agri_soil_data = {
-            "id": self.id,
-            "type": self.type
-        }
-
-        if self.date_created:
-            agri_soil_data["dateCreated"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.date_created
-                }
-            }
-
-        if self.date_modified:
-            agri_soil_data["dateModified"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.date_modified
-                }
-            }
-
-        if self.name:
-            agri_soil_data["name"] = {
-                "value": self.name
-            }
-
-        if self.alternate_name:
-            agri_soil_data["alternateName"] = {
-                "value": self.alternate_name
-            }
-
-        if self.description:
-            agri_soil_data["description"] = {
-                "value": self.description
-            }
+        This method builds a AgriSoil object from the flat payload accepted by the API.
 
-        if self.agro_voc_concept:
-            agri_soil_data["agroVocConcept"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "URL",
-                    "@value": self.agro_voc_concept
-                }
-            }
-
-        if self.see_also:
-            agri_soil_data["seeAlso"] = {
-                "value": self.see_also.split(',') if isinstance(self.see_also, str) else self.see_also
-            }
-
-        if self.related_source:
-            agri_soil_data["relatedSource"] = {
-                "value": [
-                    {
-                        "application": self.related_source.split(',') if isinstance(self.related_source, str) else self.related_source,
-                        "applicationEntityId": "app:soil1"
-                    }
-                ]
-            }
-
-        if self.has_agri_product_type:
-            agri_soil_data["hasAgriProductType"] = {
-                "type": "Relationship",
-                "object": self.has_agri_product_type.split(',') if isinstance(self.has_agri_product_type, str) else self.has_agri_product_type
-            }
-
-        return agri_soil_data
-
-
-
-    def validate_smart_data_model(data):
-        required_fields = ['dateCreated', 'dateModified', 'name']
-        for field in required_fields:
-            if field not in data:
-                return False, f'Required "{field}" does not exist'
-        return True, ''
\ No newline at end of file
+        Raises:
+            PayloadError: If a required field is missing.
+        """
+        id = soil_data.get('id')
+        name = soil_data.get('name')
+
+        error_messages = []
+        if not id:
+            logging.info("id")
+            error_messages.append("Id is missing")
+        if not name:
+            error_messages.append("Name is missing")
+        if error_messages:
+            raise PayloadError({"errors": error_messages})
+        date_created = soil_data.get('date_created')
+        date_modified = soil_data.get('date_modified')
+        alternate_name = soil_data.get('alternate_name')
+        description = soil_data.get('description')
+        agro_voc_concept = soil_data.get('agro_voc_concept')
+        see_also = soil_data.get('see_also').split(',') if soil_data.get('see_also') else []
+        related_source = soil_data.get('related_source').split(',') if soil_data.get('related_source') else []
+        has_agri_product_type = soil_data.get('has_agri_product_type').split(',') if soil_data.get('has_agri_product_type') else []
+
+
+        return cls(
+            id=id,
+            date_created=date_created,
+            date_modified=date_modified,
+            name=name,
+            alternate_name=alternate_name,
+            description=description,
+            agro_voc_concept=agro_voc_concept,
+            see_also=see_also,
+            related_source=related_source,
+            has_agri_product_type=has_agri_product_type
+        )
+
+    ATTRIBUTES = (
+        DateTime("dateCreated", "date_created"),
+        DateTime("dateModified", "date_modified"),
+        Value("name", "name"),
+        Value("alternateName", "alternate_name"),
+        Value("description", "description"),
+        Url("agroVocConcept", "agro_voc_concept"),
+        Value("seeAlso", "see_also", split=True),
+        RelatedSource("relatedSource", "related_source", "app:soil1", split=True),
+        Relationship("hasAgriProductType", "has_agri_product_type", split=True),
+    )
+
+    REQUIRED_FIELDS = ['dateCreated', 'dateModified', 'name']
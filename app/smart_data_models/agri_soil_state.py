@@ -1,11 +1,13 @@
 from datetime import datetime
+import logging
 
-from app.utils import generate_urn
+from app.utils import PayloadError, generate_urn
+from app.smart_data_models.converter import DateTime, Measure, Relationship
+from app.smart_data_models.base import SmartDataModel
+from app.smart_data_models.schemas import AGRI_SOIL_STATE_SCHEMA
 
 
-ModelBase = object
-
-class AgriSoilState(ModelBase):
+class AgriSoilState(SmartDataModel):
     """
         AgriSoilState class represents a record of the state of agricultural soil.
             
@@ -29,6 +31,13 @@ class AgriSoilState(ModelBase):
             - density_unit (str, optional): The unit of the density measurement.
             - density_timestamp (str, optional): The timestamp when the density was measured.
     """
+
+    __slots__ = (
+        'id', 'type', 'date_created', 'date_modified', 'date_of_measurement', 'acidity', 'acidity_unit',
+        'acidity_timestamp', 'humus', 'electrical_conductivity', 'electrical_conductivity_unit',
+        'electrical_conductivity_timestamp', 'density', 'has_agri_soil', 'has_agri_parcel',
+        'has_agri_greenhouse', 'humus_unit', 'humus_timestamp', 'density_unit', 'density_timestamp'
+    )
     
     def __init__(self, id, date_of_measurement, acidity, acidity_unit, acidity_timestamp,  humus, humus_unit, humus_timestamp, electrical_conductivity=None, density=None,
                  has_agri_soil=None, has_agri_parcel=None, has_agri_greenhouse=None, date_created=None, date_modified=None,
@@ -55,133 +64,91 @@ class AgriSoilState(ModelBase):
         self.density_unit = density_unit
         self.density_timestamp = density_timestamp
 
-
-    def __repr__(self):
+    @classmethod
+    def from_flat_payload(cls, soil_state_data):
         """
-        This method returns a machine-readable string representation of the current object.
-        """
-        return f'<AgriSoilState {self.id}>'
+        This method builds a AgriSoilState object from the flat payload accepted by the API.
 
-    def to_smart_data_model(self):
-        """
-        This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
-        
-        Returns:
-            A dictionary representing the current Smart Data Model.
+        Raises:
+            PayloadError: If a required field is missing.
         """
-        agri_carbon_footprint_data = {
-            "id": self.id,
-            "type": self.type
-        }
-
-        if self.dateCreated:
-            agri_carbon_footprint_data["dateCreated"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.date_created
-                }
-            }
-
-        if self.dateModified:
-            agri_carbon_footprint_data["dateModified"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.date_modified
-                }
-            }
-
-        if self.dateOfMeasurement:
-            agri_carbon_footprint_data["dateOfMeasurement"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.date_of_measurement
-                }
-            }
-
-        # Asumo que si hay un valor, todos los subatributos también tendrán valores. Si no es el caso, se deben hacer comprobaciones adicionales.
-        if self.acidity:
-            agri_carbon_footprint_data["acidity"] = {
-                "type": "Property",
-                "value": self.acidity,
-                "unitCode": self.acidity_unit,
-                "timestamp": {
-                    "type": "Property",
-                    "value": {
-                        "@type": "DateTime",
-                        "@value": self.acidity_timestamp
-                    }
-                }
-            }
-
-        if self.electrical_conductivity:
-            agri_carbon_footprint_data["electricalConductivity"] = {
-                "type": "Property",
-                "value": self.electrical_conductivity,
-                "unitCode": self.electrical_conductivity_unit,
-                "timestamp": {
-                    "type": "Property",
-                    "value": {
-                        "@type": "DateTime",
-                        "@value": self.electrical_conductivity_timestamp
-                    }
-                }
-            }
-
-        if self.density:
-            agri_carbon_footprint_data["density"] = {
-                "type": "Property",
-                "value": self.density,
-                "unitCode": self.density_unit,
-                "timestamp": {
-                    "type": "Property",
-                    "value": {
-                        "@type": "DateTime",
-                        "@value": self.density_timestamp
-                    }
-                }
-            }
-
-        if self.humus:
-            agri_carbon_footprint_data["humus"] = {
-                "type": "Property",
-                "value": self.humus,
-                "unitCode": self.humus_unit,
-                "timestamp": {
-                    "type": "Property",
-                    "value": {
-                        "@type": "DateTime",
-                        "@value": self.humus_timestamp
-                    }
-                }
-            }
-
-        if self.has_agri_soil:
-            agri_carbon_footprint_data["hasAgriSoil"] = {
-                "type": "Relationship",
-                "object": self.has_agri_soil
-            }
-
-        if self.has_agri_parcel:
-            agri_carbon_footprint_data["hasAgriParcel"] = {
-                "type": "Relationship",
-                "object": self.has_agri_parcel
-            }
-
-        if self.has_agri_greenhouse:
-            agri_carbon_footprint_data["hasAgriGreenhouse"] = {
-                "type": "Relationship",
-                "object": self.has_agri_greenhouse
-            }
-
-        return agri_carbon_footprint_data
-
-
-    def validate_smart_data_model(data):
-        required_fields = ['dateCreated', 'dateModified', 'dateOfMeasurement', 'acidity', 'humus']
-        for field in required_fields:
-            if field not in data:
-                return False, f'Required "{field}" does not exist'
-        return True, ''
\ No newline at end of file
+        id = soil_state_data.get('id')
+        date_of_measurement = soil_state_data.get('date_of_measurement')
+        acidity = soil_state_data.get('acidity')
+        acidity_unit_code = soil_state_data.get('acidity_unit_code')
+        acidity_timestamp = soil_state_data.get('acidity_timestamp')
+        humus = soil_state_data.get('humus')
+        humus_unit_code = soil_state_data.get('humus_unit_code')
+        humus_timestamp = soil_state_data.get('humus_timestamp')
+
+
+        error_messages = []
+        if not id:
+            logging.info("id")
+            error_messages.append("Id is missing")
+        if not date_of_measurement:
+            error_messages.append("Date of measurement is missing")
+        if not acidity:
+            error_messages.append("Acidity is missing")
+        if not acidity_unit_code:
+            error_messages.append("Acidity Unit Code is missing")
+        if not acidity_timestamp:
+            error_messages.append("Acidity timestamp is missing")
+        if not humus:
+            error_messages.append("Humus is missing")
+        if not humus_unit_code:
+            error_messages.append("Humus Unit Code is missing")
+        if not humus_timestamp:
+            error_messages.append("Humus Timestamp is missing")
+        if error_messages:
+            raise PayloadError({"errors": error_messages})
+        date_created = soil_state_data.get('date_created')
+        date_modified = soil_state_data.get('date_modified')
+        electrical_conductivity = soil_state_data.get('electrical_conductivity')
+        electrical_conductivity_unit = soil_state_data.get('electrical_conductivity_unit')
+        electrical_conductivity_timestamp = soil_state_data.get('electrical_conductivity_timestamp')
+        density = soil_state_data.get('density')
+        density_unit = soil_state_data.get('density_unit')
+        density_timestamp = soil_state_data.get('density_timestamp')
+        has_agri_soil = soil_state_data.get('has_agri_soil')
+        has_agri_parcel = soil_state_data.get('has_agri_parcel')
+        has_agri_greenhouse = soil_state_data.get('has_agri_greenhouse')
+
+
+        return cls(
+            id=id,
+            date_created=date_created,
+            date_modified=date_modified,
+            date_of_measurement=date_of_measurement,
+            acidity=acidity,
+            acidity_unit=acidity_unit_code,
+            acidity_timestamp=acidity_timestamp,
+            humus=humus,
+            humus_unit=humus_unit_code,
+            humus_timestamp=humus_timestamp,
+            electrical_conductivity=electrical_conductivity,
+            electrical_conductivity_unit=electrical_conductivity_unit,
+            electrical_conductivity_timestamp=electrical_conductivity_timestamp,
+            density=density,
+            density_unit=density_unit,
+            density_timestamp=density_timestamp,
+            has_agri_soil=has_agri_soil,
+            has_agri_parcel=has_agri_parcel,
+            has_agri_greenhouse=has_agri_greenhouse
+        )
+
+    ATTRIBUTES = (
+        DateTime("dateCreated", "date_created"),
+        DateTime("dateModified", "date_modified"),
+        DateTime("dateOfMeasurement", "date_of_measurement"),
+        Measure("acidity", "acidity", "acidity_unit", "acidity_timestamp", always_timestamp=True),
+        Measure("electricalConductivity", "electrical_conductivity", "electrical_conductivity_unit", "electrical_conductivity_timestamp", always_timestamp=True),
+        Measure("density", "density", "density_unit", "density_timestamp", always_timestamp=True),
+        Measure("humus", "humus", "humus_unit", "humus_timestamp", always_timestamp=True),
+        Relationship("hasAgriSoil", "has_agri_soil"),
+        Relationship("hasAgriParcel", "has_agri_parcel"),
+        Relationship("hasAgriGreenhouse", "has_agri_greenhouse"),
+    )
+
+    REQUIRED_FIELDS = ['dateCreated', 'dateModified', 'dateOfMeasurement', 'acidity', 'humus']
+    SCHEMA = AGRI_SOIL_STATE_SCHEMA
@@ -1,11 +1,13 @@
 from datetime import datetime
+import logging
 
-from app.utils import generate_urn
+from app.utils import PayloadError, generate_urn
+from app.smart_data_models.converter import DateTime, Relationship, Structured
+from app.smart_data_models.base import SmartDataModel
+from app.smart_data_models.schemas import AGRI_YIELD_SCHEMA
 
 
-ModelBase = object
-
-class AgriYeld(ModelBase):
+class AgriYeld(SmartDataModel):
     """
         AgriYeld class represents a record of agricultural yeld.
             
@@ -20,6 +22,11 @@ class AgriYeld(ModelBase):
             - yeld_unit_text (str, optional): The unit of the yeld measurement. Default is "Tons per hectare".
     """
 
+    __slots__ = (
+        'id', 'type', 'has_agri_crop', 'has_agri_parcel', 'start_date_of_gathering_at',
+        'end_date_of_gathering_at', 'yeld_value', 'yeld_max_value', 'yeld_min_value', 'yeld_unit_text'
+    )
+
     def __init__(self, id, start_date_of_gathering_at, end_date_of_gathering_at, yeld_value,
                  has_agri_crop=None, has_agri_parcel=None, yeld_max_value=None, yeld_min_value=None,
                  yeld_unit_text="Tons per hectare"):
@@ -34,72 +41,69 @@ class AgriYeld(ModelBase):
         self.yeld_min_value = yeld_min_value
         self.yeld_unit_text = yeld_unit_text
 
-    def __repr__(self):
-        """
-        This method returns a machine-readable string representation of the current object.
+    @classmethod
+    def from_flat_payload(cls, yeld_data):
         """
-        return f'<AgriYeld {self.id}>'
+        This method builds a AgriYeld object from the flat payload accepted by the API.
 
-    def to_smart_data_model(self):
+        Raises:
+            PayloadError: If a required field is missing.
         """
-        This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
-        
-        Returns:
-            A dictionary representing the current Smart Data Model.
-        """
-        agri_yeld_data = {
-            "id": self.id,
-            "type": self.type
-        }
-
-        if self.has_agri_crop:
-            agri_yeld_data["hasAgriCrop"] = {
-                "type": "Relationship",
-                "object": self.has_agri_crop
-            }
-
-        if self.has_agri_parcel:
-            agri_yeld_data["hasAgriParcel"] = {
-                "type": "Relationship",
-                "object": self.has_agri_parcel
-            }
+        id = yeld_data.get('id')
+        start_date_of_gathering_at = yeld_data.get('start_date_of_gathering_at')
+        end_date_of_gathering_at = yeld_data.get('end_date_of_gathering_at')
+        yeld_value = yeld_data.get('yeld_value')
+        yeld_max_value = yeld_data.get('yeld_max_value')
+        yeld_min_value = yeld_data.get('yeld_min_value')
+        yeld_unit_text = yeld_data.get('yeld_unit_text')
 
-        if self.start_date_of_gathering_at:
-            agri_yeld_data["startDateOfGatheringAt"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.start_date_of_gathering_at
-                }
-            }
+        error_messages = []
+        if not id:
+            logging.info("id")
+            error_messages.append("Id is missing")
+        if not start_date_of_gathering_at:
+            error_messages.append("Start date of gathering is missing")
+        if not end_date_of_gathering_at:
+            error_messages.append("End date of gathering is missing")
+        if not yeld_value:
+            error_messages.append("Yeld value is missing")
+        if not yeld_max_value:
+            error_messages.append("Yeld max value is missing")
+        if not yeld_min_value:
+            error_messages.append("Yeld min value is missing")
+        if not yeld_unit_text:
+            error_messages.append("Yeld unit value is missing")
+        if error_messages:
+            raise PayloadError({"errors": error_messages})
+        has_agri_crop = yeld_data.get('has_agri_crop')
+        has_agri_parcel = yeld_data.get('has_agri_parcel')
 
-        if self.end_date_of_gathering_at:
-            agri_yeld_data["endDateOfGatheringAt"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.end_date_of_gathering_at
-                }
-            }
 
-        if self.yeld_value or self.yeld_max_value or self.yeld_min_value or self.yeld_unit_text:
-            yeld_data = {"type": "Property", "value": {}}
-            if self.yeld_value:
-                yeld_data["value"]["value"] = self.yeld_value
-            if self.yeld_max_value:
-                yeld_data["value"]["maxValue"] = self.yeld_max_value
-            if self.yeld_min_value:
-                yeld_data["value"]["minValue"] = self.yeld_min_value
-            if self.yeld_unit_text:
-                yeld_data["value"]["unitText"] = self.yeld_unit_text
-            agri_yeld_data["yeld"] = yeld_data
 
-        return agri_yeld_data
+        return cls(
+            id=id,
+            has_agri_crop=has_agri_crop,
+            has_agri_parcel=has_agri_parcel,
+            start_date_of_gathering_at=start_date_of_gathering_at,
+            end_date_of_gathering_at=end_date_of_gathering_at,
+            yeld_value=yeld_value,
+            yeld_max_value=yeld_max_value,
+            yeld_min_value=yeld_min_value,
+            yeld_unit_text=yeld_unit_text
+        )
 
+    ATTRIBUTES = (
+        Relationship("hasAgriCrop", "has_agri_crop"),
+        Relationship("hasAgriParcel", "has_agri_parcel"),
+        DateTime("startDateOfGatheringAt", "start_date_of_gathering_at"),
+        DateTime("endDateOfGatheringAt", "end_date_of_gathering_at"),
+        Structured("yeld", (
+            ("value", "yeld_value"),
+            ("maxValue", "yeld_max_value"),
+            ("minValue", "yeld_min_value"),
+            ("unitText", "yeld_unit_text"),
+        ), skip_empty=True),
+    )
 
-    def validate_smart_data_model(data):
-        required_fields = ['startDateOfGatheringAt', 'endDateOfGatheringAt', 'yeld']
-        for field in required_fields:
-            if field not in data:
-                return False, f'Required "{field}" does not exist'
-        return True, ''
\ No newline at end of file
+    REQUIRED_FIELDS = ['startDateOfGatheringAt', 'endDateOfGatheringAt', 'yeld']
+    SCHEMA = AGRI_YIELD_SCHEMA
@@ -0,0 +1,74 @@
+import inspect
+
+from app.smart_data_models.converter import build_converter
+from app.smart_data_models.schemas import SchemaValidator
+from app.utils import PayloadError
+
+
+class SmartDataModel:
+    """
+    SmartDataModel class is the base of the Smart Data Model classes.
+
+    Models declare their instance attributes in `__slots__`, so that an instance holds its values in a
+    fixed array instead of a per-instance `__dict__`, which matters when a batch import keeps many
+    of them in memory at once.
+
+    Subclasses describe themselves with:
+        - ATTRIBUTES (tuple): Attribute specs from which `to_smart_data_model` is built (see converter.py).
+        - REQUIRED_FIELDS (list): NGSI-LD attributes checked by `validate_smart_data_model`.
+        - FLAT_PAYLOAD_REQUIRED_FIELDS (list): Fields the default `from_flat_payload` requires.
+        - SCHEMA (dict, optional): JSON Schema also checked by `validate_smart_data_model` (see schemas.py).
+    """
+
+    __slots__ = ()
+
+    ATTRIBUTES = ()
+    REQUIRED_FIELDS = []
+    FLAT_PAYLOAD_REQUIRED_FIELDS = []
+    SCHEMA = None
+    _schema_validator = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "ATTRIBUTES" in cls.__dict__:
+            cls.to_smart_data_model = build_converter(cls.__name__, cls.ATTRIBUTES)
+        if cls.__dict__.get("SCHEMA") is not None:
+            cls._schema_validator = SchemaValidator(cls.SCHEMA)
+        cls._init_parameters = tuple(inspect.signature(cls.__init__).parameters)[1:]
+
+    def __repr__(self):
+        """
+        This method returns a machine-readable string representation of the current object.
+        """
+        return f'<{type(self).__name__} {self.id}>'
+
+    @classmethod
+    def from_flat_payload(cls, data):
+        """
+        This method builds an object from the flat payload accepted by the API, whose fields are
+        the parameters of the constructor. Models whose payload needs parsing override it.
+
+        Raises:
+            PayloadError: If a required field is missing.
+        """
+        error_messages = [f"{field} is missing" for field in cls.FLAT_PAYLOAD_REQUIRED_FIELDS if field not in data]
+        if error_messages:
+            raise PayloadError({"errors": error_messages})
+        return cls(**{name: data[name] for name in cls._init_parameters if name in data})
+
+    def to_smart_data_model(self):
+        """
+        This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def validate_smart_data_model(cls, data):
+        for field in cls.REQUIRED_FIELDS:
+            if field not in data:
+                return False, f'Required "{field}" does not exist'
+        if cls._schema_validator is not None:
+            error_message = cls._schema_validator.error(data)
+            if error_message:
+                return False, error_message
+        return True, ''
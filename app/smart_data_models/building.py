@@ -1,10 +1,11 @@
 from datetime import datetime
 
-from app.utils import generate_urn 
+from app.utils import generate_urn
+from app.smart_data_models.converter import Property
+from app.smart_data_models.base import SmartDataModel
 
-ModelBase = object
 
-class Building(ModelBase):
+class Building(SmartDataModel):
     """
     Building class represents a record of a building.
     
@@ -34,6 +35,13 @@ class Building(ModelBase):
         - source (str, optional): Original source of entity data as URL.
         - type (str): NGSI Entity type.
     """
+
+    __slots__ = (
+        'id', 'type', 'address', 'category', 'alternateName', 'areaServed', 'collapseRisk',
+        'containedInPlace', 'dataProvider', 'dateCreated', 'dateModified', 'description',
+        'floorsAboveGround', 'floorsBelowGround', 'location', 'name', 'occupier', 'openingHours', 'owner',
+        'peopleCapacity', 'peopleOccupancy', 'refMap', 'seeAlso', 'source'
+    )
     
     # This function initialization needs to be adjusted according to the attributes above
     def __init__(self, id, type, address, category, alternateName=None, areaServed=None, 
@@ -67,157 +75,30 @@ class Building(ModelBase):
         self.seeAlso = seeAlso
         self.source = source
 
-    def __repr__(self):
-        """
-        This method returns a machine-readable string representation of the current object.
-        """
-        return f'<Building {self.id}>'
-
-    def to_smart_data_model(self):
-        """
-        Convert the current object into a dictionary adhering to the Smart Data Model standard.
-        Returns a dictionary representing the current Smart Data Model.
-        """
-        building_data = {
-            "id": self.id,
-            "type": self.type,
-            "address": {
-                "type": "Property",
-                "value": self.address
-            },
-            "category": {
-                "type": "Property",
-                "value": self.category
-            }
-        }
-        
-        if self.alternateName:
-            building_data["alternateName"] = {
-                "type": "Property",
-                "value": self.alternateName
-            }
-
-        if self.areaServed:
-            building_data["areaServed"] = {
-                "type": "Property",
-                "value": self.areaServed
-            }
-
-        if self.collapseRisk is not None:
-            building_data["collapseRisk"] = {
-                "type": "Property",
-                "value": self.collapseRisk
-            }
-
-        if self.containedInPlace:
-            building_data["containedInPlace"] = {
-                "type": "Property",
-                "value": self.containedInPlace
-            }
-
-        if self.dataProvider:
-            building_data["dataProvider"] = {
-                "type": "Property",
-                "value": self.dataProvider
-            }
-
-        if self.dateCreated:
-            building_data["dateCreated"] = {
-                "type": "Property",
-                "value": self.dateCreated
-            }
-
-        if self.dateModified:
-            building_data["dateModified"] = {
-                "type": "Property",
-                "value": self.dateModified
-            }
-
-        if self.description:
-            building_data["description"] = {
-                "type": "Property",
-                "value": self.description
-            }
-
-        if self.floorsAboveGround is not None:
-            building_data["floorsAboveGround"] = {
-                "type": "Property",
-                "value": self.floorsAboveGround
-            }
-
-        if self.floorsBelowGround is not None:
-            building_data["floorsBelowGround"] = {
-                "type": "Property",
-                "value": self.floorsBelowGround
-            }
-
-        if self.location:
-            building_data["location"] = {
-                "type": "Property",
-                "value": self.location
-            }
-
-        if self.name:
-            building_data["name"] = {
-                "type": "Property",
-                "value": self.name
-            }
-
-        if self.occupier:
-            building_data["occupier"] = {
-                "type": "Property",
-                "value": self.occupier
-            }
-
-        if self.openingHours:
-            building_data["openingHours"] = {
-                "type": "Property",
-                "value": self.openingHours
-            }
-
-        if self.owner:
-            building_data["owner"] = {
-                "type": "Property",
-                "value": self.owner
-            }
-
-        if self.peopleCapacity is not None:
-            building_data["peopleCapacity"] = {
-                "type": "Property",
-                "value": self.peopleCapacity
-            }
-
-        if self.peopleOccupancy is not None:
-            building_data["peopleOccupancy"] = {
-                "type": "Property",
-                "value": self.peopleOccupancy
-            }
-
-        if self.refMap:
-            building_data["refMap"] = {
-                "type": "Property",
-                "value": self.refMap
-            }
-
-        if self.seeAlso:
-            building_data["seeAlso"] = {
-                "type": "Property",
-                "value": self.seeAlso
-            }
-
-        if self.source:
-            building_data["source"] = {
-                "type": "Property",
-                "value": self.source
-            }
-        
-        return building_data
-
-
-    @staticmethod
-    def validate_smart_data_model(data):
-        required_fields = ['id', 'type', 'address', 'category']
-        for field in required_fields:
-            if field not in data:
-                return False, f'Required "{field}" does not exist'
-        return True, ''
+    ATTRIBUTES = (
+        Property("address", "address", when="always"),
+        Property("category", "category", when="always"),
+        Property("alternateName", "alternateName"),
+        Property("areaServed", "areaServed"),
+        Property("collapseRisk", "collapseRisk", when="not_none"),
+        Property("containedInPlace", "containedInPlace"),
+        Property("dataProvider", "dataProvider"),
+        Property("dateCreated", "dateCreated"),
+        Property("dateModified", "dateModified"),
+        Property("description", "description"),
+        Property("floorsAboveGround", "floorsAboveGround", when="not_none"),
+        Property("floorsBelowGround", "floorsBelowGround", when="not_none"),
+        Property("location", "location"),
+        Property("name", "name"),
+        Property("occupier", "occupier"),
+        Property("openingHours", "openingHours"),
+        Property("owner", "owner"),
+        Property("peopleCapacity", "peopleCapacity", when="not_none"),
+        Property("peopleOccupancy", "peopleOccupancy", when="not_none"),
+        Property("refMap", "refMap"),
+        Property("seeAlso", "seeAlso"),
+        Property("source", "source"),
+    )
+
+    REQUIRED_FIELDS = ['id', 'type', 'address', 'category']
+    FLAT_PAYLOAD_REQUIRED_FIELDS = ['id', 'type', 'address', 'category']
@@ -0,0 +1,375 @@
+"""
+Columnar conversion of AgriParcelRecord sensor series.
+
+Bulk sensor uploads send one array per quantity instead of one flat payload per record:
+
+    {
+        "id": ["urn:ngsi-ld:AgriParcelRecord:1", "urn:ngsi-ld:AgriParcelRecord:2"],
+        "has_agri_parcel": "urn:ngsi-ld:AgriParcel:1",
+        "location": "-5.66,40.96", "type_location": "Point",
+        "observed_at": ["2024-05-01T12:00:00Z", 1714564800],
+        "soil_temperature": [18.5, 18.7], "soil_temperature_unit": "CEL",
+        ...
+    }
+
+Columns are named as the fields of the flat payload. A column is either an array with one value per
+record (a list, a NumPy array or anything with `to_numpy()`, e.g. an Arrow array) or a single
+value shared by every record. Values are parsed, unit codes validated and timestamps normalised
+to UTC ISO 8601 one column at a time with NumPy. The NGSI-LD entities are then written row by row
+from AgriParcelRecord.ATTRIBUTES (see write_entity), without building an AgriParcelRecord per record.
+
+Compared with the flat payload:
+    - a measure is sent whenever its value is present, so 0 is no longer dropped;
+    - a measure without its own timestamp takes the one of `observed_at`;
+    - timestamps are sent as UTC ISO 8601, e.g. "2024-05-01T12:00:00Z", whether they came as
+      ISO 8601 strings with any offset or as Unix epoch seconds.
+"""
+import warnings
+from datetime import datetime
+
+from app.geometry import parse_coordinates
+from app.smart_data_models.agri_parcel_record import AgriParcelRecord
+from app.smart_data_models.converter import GeoProperty, Measure
+from app.utils import PayloadError, convert_geojson
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+REQUIRED_COLUMNS = [
+    'id', 'has_agri_parcel', 'location', 'type_location', 'soil_temperature', 'soil_temperature_unit',
+    'air_temperature', 'air_temperature_unit', 'relative_humidity', 'relative_humidity_unit'
+]
+# Measures whose timestamp is required, unless "observed_at" is given.
+REQUIRED_TIMESTAMPS = ['air_temperature_timestamp', 'relative_humidity_timestamp']
+TIMESTAMP_COLUMNS = ('date_created', 'date_modified', 'observed_at')
+
+
+def write_entity(entity_id, row):
+    """
+    This method writes the NGSI-LD entity of a record from the values of its row, one per attribute of
+    AgriParcelRecord.ATTRIBUTES: a tuple (value, unit code, timestamp) for a Measure, (coordinates,
+    geometry type) for a GeoProperty and the value itself for the others. Values are written with the
+    same attribute specs as AgriParcelRecord.to_smart_data_model, but a measure is written whenever it
+    is not None.
+    """
+    data = {"id": entity_id, "type": AgriParcelRecord.__name__}
+    for spec, value in zip(AgriParcelRecord.ATTRIBUTES, row):
+        if isinstance(spec, Measure):
+            value, unit_code, timestamp = value
+            if value is not None:
+                data[spec.key] = spec.measure(value, unit_code, timestamp)
+        elif isinstance(spec, GeoProperty):
+            coordinates, geometry_type = value
+            if coordinates:
+                data[spec.key] = spec.geometry(coordinates, geometry_type)
+        elif value:
+            data[spec.key] = spec.value(value)
+    return data
+
+
+def available():
+    return np is not None
+
+
+def is_column(value):
+    return isinstance(value, (list, tuple)) or hasattr(value, "to_numpy") or (np is not None and isinstance(value, np.ndarray))
+
+
+def as_array(value):
+    """
+    This method returns a column as a NumPy array, typed when its values allow it. A single value
+    becomes an array of length 1, which NumPy broadcasts against the other columns.
+    """
+    if not is_column(value):
+        value = [value]
+    elif hasattr(value, "to_numpy"):
+        try:
+            value = value.to_numpy(zero_copy_only=False)
+        except TypeError:
+            value = value.to_numpy()
+    if isinstance(value, np.ndarray) and value.ndim == 1:
+        return value
+    try:
+        array = np.array(value)
+        if array.ndim == 1 and array.dtype.kind in "US" and not all(isinstance(item, (str, bytes)) for item in value):
+            # NumPy turns a list mixing strings and numbers (e.g. ISO 8601 strings and epoch seconds)
+            # into strings; the values keep their types instead.
+            return np.array(value, dtype=object)
+        if array.ndim == 1:
+            return array
+    except ValueError:
+        pass
+    # One list per record, e.g. coordinates.
+    array = np.empty(len(value), dtype=object)
+    array[:] = [item.tolist() if isinstance(item, np.ndarray) else item for item in value]
+    return array
+
+
+def split_missing(array):
+    """
+    This method returns the mask of the empty values of a column (None, NaN, NaT and "") and the
+    other values, typed again when the column mixed them with None.
+    """
+    kind = array.dtype.kind
+    if kind == "f":
+        empty = np.isnan(array)
+    elif kind == "M":
+        empty = np.isnat(array)
+    elif kind in "US":
+        empty = array == array.dtype.type()
+    elif kind == "O":
+        empty = np.equal(array, None) | np.equal(array, "") | (array != array)
+    else:
+        empty = np.zeros(len(array), dtype=bool)
+    values = array[~empty]
+    if kind == "O" and len(values):
+        values = as_array(values.tolist())
+    return empty, values
+
+
+def missing(array):
+    return split_missing(array)[0]
+
+
+def parse_numbers(array):
+    """
+    This method converts a column to float64, with NaN for empty values.
+
+    Returns:
+        A tuple (values, invalid) where invalid marks the values that are not numbers.
+    """
+    empty, values = split_missing(array)
+    numbers = np.full(len(array), np.nan)
+    invalid = np.zeros(len(array), dtype=bool)
+    try:
+        numbers[~empty] = values.astype(np.float64)
+    except (TypeError, ValueError):
+        converted = np.full(len(values), np.nan)
+        failed = np.zeros(len(values), dtype=bool)
+        for index, value in enumerate(values.tolist()):
+            try:
+                converted[index] = float(value)
+            except (TypeError, ValueError):
+                failed[index] = True
+        numbers[~empty] = converted
+        invalid[np.flatnonzero(~empty)[failed]] = True
+    return numbers, invalid
+
+
+def parse_datetimes(values):
+    """
+    This method parses ISO 8601 strings, Unix epoch seconds or datetime64 values into datetime64[ms] in UTC.
+
+    Raises:
+        ValueError: If a value is not a date-time.
+    """
+    kind = values.dtype.kind
+    if kind in "iuf":
+        return np.round(values.astype(np.float64) * 1000).astype(np.int64).astype("datetime64[ms]")
+    if kind == "M":
+        return values.astype("datetime64[ms]")
+    if kind in "US":
+        # "Z" is dropped so that NumPy reads the time as it is; other UTC offsets are converted by NumPy,
+        # which warns that datetime64 does not keep them.
+        values = np.char.rstrip(values, "Z")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return values.astype("datetime64[ms]")
+    return np.array([parse_datetimes(as_array([value]))[0] for value in values.tolist()], dtype="datetime64[ms]")
+
+
+def normalize_timestamps(array):
+    """
+    This method converts a column of ISO 8601 strings (with any UTC offset) or Unix epoch seconds
+    into UTC ISO 8601 strings ending in "Z", with None for empty values.
+
+    Returns:
+        A tuple (timestamps, invalid) where invalid marks the values that are not date-times.
+    """
+    empty, values = split_missing(array)
+    parsed = np.full(len(array), np.datetime64("NaT"), dtype="datetime64[ms]")
+    invalid = np.zeros(len(array), dtype=bool)
+    try:
+        parsed[~empty] = parse_datetimes(values)
+    except (TypeError, ValueError):
+        converted = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[ms]")
+        failed = np.zeros(len(values), dtype=bool)
+        for index, value in enumerate(values.tolist()):
+            try:
+                converted[index] = parse_datetimes(as_array([value]))[0]
+            except (TypeError, ValueError):
+                failed[index] = True
+        parsed[~empty] = converted
+        invalid[np.flatnonzero(~empty)[failed]] = True
+
+    unit = "ms" if (parsed[~np.isnat(parsed)].astype(np.int64) % 1000).any() else "s"
+    timestamps = np.char.add(np.datetime_as_string(parsed, unit=unit), "Z").astype(object)
+    timestamps[np.isnat(parsed)] = None
+    return timestamps, invalid
+
+
+def validate_unit_codes(array):
+    """
+    This method returns the mask of the values of a column that are not UN/CEFACT common codes
+    (two or three upper case letters and digits, e.g. CEL, P1, D10). Empty values are valid.
+    """
+    empty, values = split_missing(array)
+    codes = values.astype(str)
+    valid = np.char.isalnum(codes) & (np.char.upper(codes) == codes) & np.isin(np.char.str_len(codes), (2, 3))
+    invalid = np.zeros(len(array), dtype=bool)
+    invalid[np.flatnonzero(~empty)[~valid]] = True
+    return invalid
+
+
+def flat_location(location, type_location):
+    # Same conversion as AgriParcelRecord.from_flat_payload, e.g. "100,0;101,0;101,1;100,0".
+    if isinstance(location, str):
+        location = {'coordinates': parse_coordinates(location)}
+    elif isinstance(location, list):
+        # A column of coordinates, one list per record.
+        location = {'coordinates': location}
+    return convert_geojson(type_location=type_location, location=location)
+
+
+class ColumnarBatch:
+    """
+    ColumnarBatch class converts the columns of an AgriParcelRecord upload into NGSI-LD entities.
+
+    Attributes:
+        - columns (dict): Arrays or single values, keyed by the fields of the flat payload.
+        - length (int): Number of records.
+        - errors (dict): Error messages of the invalid records, keyed by record index.
+    """
+
+    def __init__(self, columns, max_rows=None):
+        if np is None:
+            raise RuntimeError("NumPy is required for columnar uploads.")
+        if not isinstance(columns, dict):
+            raise PayloadError({"error": "The body must be a JSON object of columns."})
+
+        if 'depth_unit_code' in columns:
+            # The flat payload names the unit of the depth "depth_unit_code".
+            columns = dict(columns)
+            columns['depth_unit'] = columns.pop('depth_unit_code')
+        known = set(AgriParcelRecord._init_parameters)
+        errors = [f"Unknown column: {name}" for name in columns if name not in known]
+        errors += [f"{name} is missing" for name in REQUIRED_COLUMNS if name not in columns]
+        if 'observed_at' not in columns:
+            errors += [f"{name} is missing" for name in REQUIRED_TIMESTAMPS if name not in columns]
+        if not is_column(columns.get('id', [])):
+            errors.append("id must be an array")
+        lengths = {len(value) for value in columns.values() if is_column(value)}
+        if len(lengths) > 1:
+            errors.append(f"Every column must have the same length, got {sorted(lengths)}")
+        if errors:
+            raise PayloadError({"errors": errors})
+
+        self.length = lengths.pop() if lengths else 0
+        if max_rows is not None and self.length > max_rows:
+            raise PayloadError({"error": f"A columnar upload accepts at most {max_rows} records."})
+        self.columns = {name: as_array(value) for name, value in columns.items()}
+        self.errors = {}
+        self._timestamps = []
+
+    def column(self, name):
+        return self.columns.get(name, np.array([None], dtype=object))
+
+    def expand(self, array):
+        # Single values are kept as arrays of length 1 until they are written.
+        return np.broadcast_to(array, (self.length,))
+
+    def reject(self, mask, message):
+        for index in np.flatnonzero(self.expand(mask)):
+            self.errors.setdefault(int(index), []).append(message)
+
+    def timestamps(self, name):
+        """
+        This method returns the normalised timestamps of a column. Sensor uploads often repeat the
+        same timestamps for every measure, so a column equal to one already normalised reuses it.
+        """
+        array = self.column(name)
+        for normalised, timestamps in self._timestamps:
+            if normalised.dtype == array.dtype and np.array_equal(normalised, array):
+                return timestamps
+        timestamps, invalid = normalize_timestamps(array)
+        self.reject(invalid, f"{name} is not a valid date-time")
+        self._timestamps.append((array, timestamps))
+        return timestamps
+
+    def measure(self, spec, observed_at):
+        """
+        This method returns the values, unit codes and timestamps of a measure as Python lists.
+        """
+        values, invalid = parse_numbers(self.column(spec.attr))
+        self.reject(invalid, f"{spec.attr} is not a number")
+        present = ~np.isnan(values)
+        if spec.attr in REQUIRED_COLUMNS:
+            self.reject(~present & ~invalid, f"{spec.attr} is missing")
+
+        units = self.column(spec.unit_attr)
+        self.reject(present & validate_unit_codes(units), f"{spec.unit_attr} is not a UN/CEFACT unit code")
+        if spec.unit_attr in REQUIRED_COLUMNS:
+            self.reject(present & missing(units), f"{spec.unit_attr} is missing")
+
+        timestamps = np.array([None], dtype=object)
+        if spec.timestamp_attr:
+            timestamps = self.timestamps(spec.timestamp_attr)
+            timestamps = np.where(np.equal(timestamps, None), observed_at, timestamps)
+            if spec.timestamp_attr in REQUIRED_TIMESTAMPS:
+                self.reject(present & np.equal(timestamps, None), f"{spec.timestamp_attr} is missing")
+        values = np.where(present, values, None)
+        return self.expand(values).tolist(), self.expand(units).tolist(), self.expand(timestamps).tolist()
+
+    def locations(self, spec):
+        locations = []
+        converted = {}
+        for index, (location, type_location) in enumerate(zip(self.expand(self.column(spec.attr)).tolist(), self.expand(self.column(spec.type_attr)).tolist())):
+            key = (str(location), type_location)
+            if key not in converted:
+                try:
+                    converted[key] = flat_location(location, type_location) if location and type_location else None
+                except (ValueError, TypeError, KeyError) as e:
+                    converted[key] = e
+            geometry = converted[key]
+            if isinstance(geometry, Exception):
+                self.errors.setdefault(index, []).append(f"{spec.attr} is not valid: {geometry}")
+                geometry = None
+            locations.append(geometry)
+        return locations
+
+    def to_smart_data_models(self):
+        """
+        This method converts the columns into NGSI-LD entities.
+
+        Returns:
+            A tuple (entities, errors): the valid entities as (index, entity) pairs, in record order,
+            and the error messages of the invalid records keyed by index.
+        """
+        ids = self.column('id')
+        self.reject(missing(ids), "id is missing")
+        for name in ('has_agri_parcel', 'type_location'):
+            self.reject(missing(self.column(name)), f"{name} is missing")
+
+        now = datetime.utcnow()
+        series = {}
+        for name in TIMESTAMP_COLUMNS:
+            series[name] = self.timestamps(name)
+        observed_at = series['observed_at']
+        for name in ('date_created', 'date_modified'):
+            series[name] = np.where(np.equal(series[name], None), now, series[name])
+
+        columns = []
+        for spec in AgriParcelRecord.ATTRIBUTES:
+            if isinstance(spec, Measure):
+                columns.append(zip(*self.measure(spec, observed_at)))
+            elif isinstance(spec, GeoProperty):
+                columns.append(zip(self.locations(spec), self.expand(self.column(spec.type_attr)).tolist()))
+            else:
+                values = series[spec.attr] if spec.attr in series else self.column(spec.attr)
+                columns.append(self.expand(values).tolist())
+        entities = list(map(write_entity, self.expand(ids).tolist(), zip(*columns)))
+
+        valid = [(index, entity) for index, entity in enumerate(entities) if index not in self.errors]
+        return valid, self.errors
@@ -0,0 +1,307 @@
+"""
+Declarative description of how the attributes of a model are written in NGSI-LD.
+
+Every model lists its attributes once, e.g.
+
+    ATTRIBUTES = (
+        DateTime("dateCreated", "date_created"),
+        Relationship("hasAgriParcel", "has_agri_parcel"),
+        Measure("soilTemperature", "soil_temperature", "soil_temperature_unit"),
+    )
+
+and `build_converter` precompiles the list, once per model when its class is defined, into the
+`to_smart_data_model` method of the model: a single straight-line function that writes the
+attributes in that order, reads every Python attribute directly and builds every NGSI-LD
+attribute as a literal, as a hand-written method would. Loops over the specs at conversion
+time cost 2-3 times as much (see benchmarks/converters_benchmark.py).
+
+The specs only generate the source from their own fixed templates; attribute names must be
+identifiers and NGSI-LD keys and constants are written with repr.
+"""
+
+
+def split(value):
+    # Comma-separated strings are sent as lists.
+    return value.split(',') if isinstance(value, str) else value
+
+
+def split_source(v):
+    # Source of split(v), inlined in the converters.
+    return f"({v}.split(',') if isinstance({v}, str) else {v})"
+
+
+class Attribute:
+    """
+    Attribute class is the base of the attribute specs.
+
+    Attributes:
+        - key (str): Name of the NGSI-LD attribute.
+        - attr (str): Name of the Python attribute holding the value.
+        - when (str): "truthy" (default) to skip empty values, "not_none" to skip only None, "always" to write it anyway.
+    """
+
+    CONDITIONS = {"truthy": "v := self.{}", "not_none": "(v := self.{}) is not None", "always": None}
+
+    def __init__(self, key, attr, when="truthy"):
+        self.key = key
+        self.attr = attr
+        self.when = when
+
+    def value(self, v):
+        """
+        This method returns the NGSI-LD attribute holding the Python value `v`.
+        """
+        raise NotImplementedError
+
+    def expression(self, v):
+        """
+        This method returns the Python expression of the NGSI-LD attribute, given the source `v` of the value.
+        """
+        raise NotImplementedError
+
+    def attrs(self):
+        """
+        This method returns the names of the Python attributes read by the source of the attribute.
+        """
+        return (self.attr,)
+
+    def literal(self):
+        """
+        This method returns the expression of an attribute that is always written, reading the Python
+        attribute itself, so that it can be part of the literal `data` starts with; None otherwise.
+        """
+        return self.expression(f"self.{self.attr}") if self.when == "always" else None
+
+    def source(self):
+        """
+        This method returns the lines of the converter that write the attribute into `data`.
+        """
+        condition = self.CONDITIONS[self.when]
+        if condition is None:
+            return [f"data[{self.key!r}] = {self.expression(f'self.{self.attr}')}"]
+        return [f"if {condition.format(self.attr)}:", f"    data[{self.key!r}] = {self.expression('v')}"]
+
+
+class Property(Attribute):
+    def value(self, v):
+        return {"type": "Property", "value": v}
+
+    def expression(self, v):
+        return '{"type": "Property", "value": %s}' % v
+
+
+class Value(Attribute):
+    """
+    Value class writes {"value": ...}, splitting comma-separated strings when `split` is True.
+    """
+
+    def __init__(self, key, attr, split=False):
+        super().__init__(key, attr)
+        self.split = split
+
+    def value(self, v):
+        return {"value": split(v) if self.split else v}
+
+    def expression(self, v):
+        return '{"value": %s}' % (split_source(v) if self.split else v)
+
+
+class Raw(Attribute):
+    def value(self, v):
+        return v
+
+    def expression(self, v):
+        return v
+
+
+class DateTime(Attribute):
+    def __init__(self, key, attr, isoformat=False):
+        super().__init__(key, attr)
+        self.isoformat = isoformat
+
+    def value(self, v):
+        return {"type": "Property", "value": {"@type": "DateTime", "@value": v.isoformat() if self.isoformat else v}}
+
+    def expression(self, v):
+        return '{"type": "Property", "value": {"@type": "DateTime", "@value": %s}}' % (f"{v}.isoformat()" if self.isoformat else v)
+
+
+class Url(Attribute):
+    def value(self, v):
+        return {"type": "Property", "value": {"@type": "URL", "@value": v}}
+
+    def expression(self, v):
+        return '{"type": "Property", "value": {"@type": "URL", "@value": %s}}' % v
+
+
+class Relationship(Attribute):
+    def __init__(self, key, attr, split=False):
+        super().__init__(key, attr)
+        self.split = split
+
+    def value(self, v):
+        return {"type": "Relationship", "object": split(v) if self.split else v}
+
+    def expression(self, v):
+        return '{"type": "Relationship", "object": %s}' % (split_source(v) if self.split else v)
+
+
+class PropertyObject(Attribute):
+    # Kept as the API has always sent these attributes of AgriParcel.
+    def value(self, v):
+        return {"type": "Property", "object": {"value": v}}
+
+    def expression(self, v):
+        return '{"type": "Property", "object": {"value": %s}}' % v
+
+
+class GeoProperty(Attribute):
+    """
+    GeoProperty class writes a GeoJSON geometry. With `type_attr` the value holds the coordinates and
+    `type_attr` the geometry type; without it the value is written as it is.
+    """
+
+    def __init__(self, key, attr, type_attr=None):
+        super().__init__(key, attr)
+        self.type_attr = type_attr
+
+    def value(self, v):
+        return {"type": "GeoProperty", "value": v}
+
+    def geometry(self, coordinates, geometry_type):
+        return {"type": "GeoProperty", "value": {"type": geometry_type, "coordinates": coordinates}}
+
+    def attrs(self):
+        return (self.attr, self.type_attr) if self.type_attr else (self.attr,)
+
+    def source(self):
+        if not self.type_attr:
+            return [f"if v := self.{self.attr}:", f'    data[{self.key!r}] = {{"type": "GeoProperty", "value": v}}']
+        return [
+            f"if (v := self.{self.attr}) and self.{self.type_attr}:",
+            f'    data[{self.key!r}] = {{"type": "GeoProperty", "value": {{"type": self.{self.type_attr}, "coordinates": v}}}}'
+        ]
+
+
+class RelatedSource(Attribute):
+    def __init__(self, key, attr, application_entity_id, split=False, typed=False):
+        super().__init__(key, attr)
+        self.application_entity_id = application_entity_id
+        self.split = split
+        self.typed = typed
+
+    def value(self, v):
+        value = [{"application": split(v) if self.split else v, "applicationEntityId": self.application_entity_id}]
+        return {"type": "Property", "value": value} if self.typed else {"value": value}
+
+    def expression(self, v):
+        value = '[{"application": %s, "applicationEntityId": %r}]' % (split_source(v) if self.split else v, self.application_entity_id)
+        return '{"type": "Property", "value": %s}' % value if self.typed else '{"value": %s}' % value
+
+
+class Measure(Attribute):
+    """
+    Measure class writes a Property with its unitCode and, when `timestamp_attr` is given, its timestamp.
+    With `always_timestamp` the timestamp is written even when it is empty.
+    """
+
+    def __init__(self, key, attr, unit_attr, timestamp_attr=None, always_timestamp=False):
+        super().__init__(key, attr)
+        self.unit_attr = unit_attr
+        self.timestamp_attr = timestamp_attr
+        self.always_timestamp = always_timestamp
+
+    def measure(self, v, unit_code, timestamp=None, always_timestamp=False):
+        data = {"type": "Property", "value": v, "unitCode": unit_code}
+        if timestamp or always_timestamp:
+            data["timestamp"] = {"type": "Property", "value": {"@type": "DateTime", "@value": timestamp}}
+        return data
+
+    def attrs(self):
+        return (self.attr, self.unit_attr) + ((self.timestamp_attr,) if self.timestamp_attr else ())
+
+    def source(self):
+        measure = f'{{"type": "Property", "value": v, "unitCode": self.{self.unit_attr}}}'
+        lines = [f"if v := self.{self.attr}:"]
+        if not self.timestamp_attr:
+            return lines + [f"    data[{self.key!r}] = {measure}"]
+        timestamp = '{"type": "Property", "value": {"@type": "DateTime", "@value": t}}'
+        lines += [f"    data[{self.key!r}] = m = {measure}", f"    t = self.{self.timestamp_attr}"]
+        if self.always_timestamp:
+            return lines + [f'    m["timestamp"] = {timestamp}']
+        return lines + ["    if t:", f'        m["timestamp"] = {timestamp}']
+
+
+class Structured(Attribute):
+    """
+    Structured class writes a Property whose value is an object built from several Python attributes.
+
+    Attributes:
+        - fields (tuple): Pairs (key, attr) of the value object.
+        - when_attrs (tuple): Attributes of which at least one must be set. Defaults to all the fields.
+        - skip_empty (bool): Whether empty fields are left out of the value object.
+    """
+
+    def __init__(self, key, fields, when_attrs=None, skip_empty=False):
+        super().__init__(key, None)
+        self.fields = fields
+        self.when_attrs = when_attrs or tuple(attr for _, attr in fields)
+        self.skip_empty = skip_empty
+
+    def attrs(self):
+        return tuple(attr for _, attr in self.fields) + tuple(self.when_attrs)
+
+    def source(self):
+        if self.skip_empty:
+            lines = ["value = {}"]
+            for field, attr in self.fields:
+                lines += [f"if v := self.{attr}:", f"    value[{field!r}] = v"]
+            return lines + ["if value:", f'    data[{self.key!r}] = {{"type": "Property", "value": value}}']
+        condition = " or ".join(f"self.{attr}" for attr in self.when_attrs)
+        value = ", ".join(f"{field!r}: self.{attr}" for field, attr in self.fields)
+        return [f"if {condition}:", f'    data[{self.key!r}] = {{"type": "Property", "value": {{{value}}}}}']
+
+
+def build_converter(model_name, attributes):
+    """
+    This method precompiles the `to_smart_data_model` method of a model from its attribute specs.
+
+    Parameters:
+        model_name (str): Name of the model, used in its docstring and tracebacks.
+        attributes (tuple): Attribute specs, in the order the NGSI-LD attributes are written.
+
+    Returns:
+        A function that converts an instance of the model into a dictionary that adheres to the Smart Data Model standard.
+
+    Raises:
+        ValueError: If a spec names a Python attribute that is not an identifier.
+    """
+    for attribute in attributes:
+        for name in attribute.attrs():
+            if not isinstance(name, str) or not name.isidentifier():
+                raise ValueError(f"{model_name}: {name!r} is not an attribute name.")
+
+    # The attributes always written before any conditional one are part of the first literal.
+    initial = ['"id": self.id', '"type": self.type']
+    position = 0
+    while position < len(attributes) and attributes[position].literal() is not None:
+        initial.append(f"{attributes[position].key!r}: {attributes[position].literal()}")
+        position += 1
+    lines = ["def to_smart_data_model(self):", f"    data = {{{', '.join(initial)}}}"]
+    for attribute in attributes[position:]:
+        lines += [f"    {line}" for line in attribute.source()]
+    lines.append("    return data")
+    source = "\n".join(lines)
+
+    namespace = {}
+    exec(compile(source, f"<{model_name}.to_smart_data_model>", "exec"), {"__builtins__": {"isinstance": isinstance, "str": str}}, namespace)
+    to_smart_data_model = namespace["to_smart_data_model"]
+    to_smart_data_model.__doc__ = f"""
+        This method converts the current {model_name} object into a dictionary that adheres to the Smart Data Model standard.
+
+        Returns:
+            A dictionary representing the current Smart Data Model.
+        """
+    to_smart_data_model.__qualname__ = f"{model_name}.to_smart_data_model"
+    to_smart_data_model.source = source
+    return to_smart_data_model
@@ -1,9 +1,10 @@
 from datetime import datetime
 
-ModelBase = object
+from app.smart_data_models.converter import DateTime, GeoProperty, Property
+from app.smart_data_models.base import SmartDataModel
 
 
-class Person(ModelBase):
+class Person(SmartDataModel):
     """
         Person class represents a record of a person.
         
@@ -29,6 +30,12 @@ class Person(ModelBase):
             - type (str): Type of data model.
     """
 
+    __slots__ = (
+        'id', 'type', 'additionalName', 'address', 'alternateName', 'areaServed', 'dataProvider',
+        'dateCreated', 'dateModified', 'description', 'email', 'familyName', 'givenName', 'location',
+        'name', 'owner', 'seeAlso', 'source', 'telephone'
+    )
+
     def __init__(self, id, type, additionalName=None, address=None, alternateName=None, 
                  areaServed=None, dataProvider=None, dateCreated=None, dateModified=None, 
                  description=None, email=None, familyName=None, givenName=None, 
@@ -54,140 +61,25 @@ class Person(ModelBase):
         self.source = source
         self.telephone = telephone
 
-    def __repr__(self):
-        """
-        This method returns a machine-readable string representation of the current object.
-        """
-        return f'<Person {self.id}>'
-
-    def to_smart_data_model(self):
-        """
-        This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
-        
-        Returns:
-            A dictionary representing the current Smart Data Model.
-        """
-        person_data = {
-            "id": self.id,
-            "type": self.type
-        }
-        
-        if self.additionalName:
-            person_data["additionalName"] = {
-                "type": "Property",
-                "value": self.additionalName
-            }
-
-        if self.address:
-            person_data["address"] = {
-                "type": "Property",
-                "value": self.address
-            }
-
-        if self.alternateName:
-            person_data["alternateName"] = {
-                "type": "Property",
-                "value": self.alternateName
-            }
-
-        if self.areaServed:
-            person_data["areaServed"] = {
-                "type": "Property",
-                "value": self.areaServed
-            }
-
-        if self.dataProvider:
-            person_data["dataProvider"] = {
-                "type": "Property",
-                "value": self.dataProvider
-            }
-
-        if self.dateCreated:
-            person_data["dateCreated"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.dateCreated.isoformat()
-                }
-            }
-
-        if self.dateModified:
-            person_data["dateModified"] = {
-                "type": "Property",
-                "value": {
-                    "@type": "DateTime",
-                    "@value": self.dateModified.isoformat()
-                }
-            }
-
-        if self.description:
-            person_data["description"] = {
-                "type": "Property",
-                "value": self.description
-            }
-
-        if self.email:
-            person_data["email"] = {
-                "type": "Property",
-                "value": self.email
-            }
-
-        if self.familyName:
-            person_data["familyName"] = {
-                "type": "Property",
-                "value": self.familyName
-            }
-
-        if self.givenName:
-            person_data["givenName"] = {
-                "type": "Property",
-                "value": self.givenName
-            }
-
-        if self.location:
-            person_data["location"] = {
-                "type": "GeoProperty",
-                "value": self.location
-            }
-
-        if self.name:
-            person_data["name"] = {
-                "type": "Property",
-                "value": self.name
-            }
-
-        if self.owner:
-            person_data["owner"] = {
-                "type": "Property",
-                "value": self.owner
-            }
-
-        if self.seeAlso:
-            person_data["seeAlso"] = {
-                "type": "Property",
-                "value": self.seeAlso
-            }
-
-        if self.source:
-            person_data["source"] = {
-                "type": "Property",
-                "value": self.source
-            }
-
-        if self.telephone:
-            person_data["telephone"] = {
-                "type": "Property",
-                "value": self.telephone
-            }
-
-        return person_data
-
-
-    @staticmethod
-    def validate_smart_data_model(data):
-        required_fields = ['id', 'type']
-        for field in required_fields:
-            if field not in data:
-                return False, f'Required "{field}" does not exist'
-        return True, ''
-
+    ATTRIBUTES = (
+        Property("additionalName", "additionalName"),
+        Property("address", "address"),
+        Property("alternateName", "alternateName"),
+        Property("areaServed", "areaServed"),
+        Property("dataProvider", "dataProvider"),
+        DateTime("dateCreated", "dateCreated", isoformat=True),
+        DateTime("dateModified", "dateModified", isoformat=True),
+        Property("description", "description"),
+        Property("email", "email"),
+        Property("familyName", "familyName"),
+        Property("givenName", "givenName"),
+        GeoProperty("location", "location"),
+        Property("name", "name"),
+        Property("owner", "owner"),
+        Property("seeAlso", "seeAlso"),
+        Property("source", "source"),
+        Property("telephone", "telephone"),
+    )
+
+    REQUIRED_FIELDS = ['id', 'type']
+    FLAT_PAYLOAD_REQUIRED_FIELDS = ['id', 'type', 'familyName', 'givenName']
@@ -0,0 +1,375 @@
+"""
+JSON Schemas of the Smart Data Models published at /api/dataModel.<Type>/schema.json, and the
+validators that check incoming NGSI-LD payloads against them.
+
+The schemas describe the keyValues form of an entity ("acidity": 6.5), so a normalized payload
+("acidity": {"type": "Property", "value": 6.5}) is reduced to that form before validation. Each
+validator is built once, when the model that declares the schema is defined: the references to
+the Smart Data Models common schema are replaced by a local copy, so no schema is ever fetched, and
+the format checks are memoised, since the dates of a batch tend to repeat.
+"""
+import copy
+import re
+from datetime import datetime
+from functools import lru_cache
+
+from jsonschema import Draft7Validator, FormatChecker
+from jsonschema.exceptions import best_match
+
+from app.config import AGRI_CARBON_FOOTPRINT_URL_SCHEMA, AGRI_SOIL_STATE_URL_SCHEMA, AGRI_YIELD_URL_SCHEMA
+
+COMMON_SCHEMA_URL = 'https://smart-data-models.github.io/data-models/common-schema.json'
+
+# Local copy of the definitions of the common schema that the models reference.
+COMMON_DEFINITIONS = {
+    "GSMA-Commons": {
+        "type": "object",
+        "properties": {
+            "id": {"type": "string", "minLength": 1, "maxLength": 256, "pattern": "^[\\w\\-\\.\\{\\}\\$\\+\\*\\[\\]`|~^@!,:\\\\]+$"},
+            "dateCreated": {"type": "string", "format": "date-time"},
+            "dateModified": {"type": "string", "format": "date-time"},
+            "source": {"type": "string"},
+            "name": {"type": "string"},
+            "alternateName": {"type": "string"},
+            "description": {"type": "string"},
+            "dataProvider": {"type": "string"},
+            "owner": {"type": "array", "items": {"type": "string", "format": "uri"}},
+            "seeAlso": {"oneOf": [{"type": "array", "minItems": 1, "items": {"type": "string", "format": "uri"}}, {"type": "string", "format": "uri"}]}
+        }
+    }
+}
+
+URI = re.compile(r'^[A-Za-z][A-Za-z0-9+.\-]*:\S+$')
+NGSI_LD_TYPES = ("Property", "Relationship", "GeoProperty")
+
+AGRI_SOIL_STATE_SCHEMA = {
+    "$schema": "http://json-schema.org/schema#",
+    "$schemaVersion": "0.0.4",
+    "modelTags": "",
+    "$id": AGRI_SOIL_STATE_URL_SCHEMA,
+    "title": "Smart Data Models - Agri Soil State",
+    "description": "This entity contains a harmonised description of the soil state primarily associated with the agricultural vertical.",
+    "type": "object",
+    "properties": {
+        "dateCreated": {
+        "type": "string",
+        "format": "date-time",
+        "description": "Property. DateTime when the soil state was created."
+        },
+        "dateModified": {
+        "type": "string",
+        "format": "date-time",
+        "description": "Property. DateTime when the soil state was last modified."
+        },
+        "dateOfMeasurement": {
+        "type": "string",
+        "format": "date-time",
+        "description": "Property. DateTime when the measurements were taken."
+        },
+        "acidity": {
+        "type": "number",
+        "description": "Property. Acidity level of the soil.",
+        "metadata": {
+            "unitCode": {
+            "type": "string",
+            "enum": ["pH"]
+            },
+            "timestamp": {
+            "type": "string",
+            "format": "date-time"
+            }
+        }
+        },
+        "electricalConductivity": {
+        "type": "number",
+        "description": "Property. Electrical conductivity of the soil.",
+        "metadata": {
+            "unitCode": {
+            "type": "string",
+            "enum": ["ohm/meter"]
+            },
+            "timestamp": {
+            "type": "string",
+            "format": "date-time"
+            }
+        }
+        },
+        "density": {
+        "type": "number",
+        "description": "Property. Density of the soil.",
+        "metadata": {
+            "unitCode": {
+            "type": "string",
+            "enum": ["kg/m3"]
+            },
+            "timestamp": {
+            "type": "string",
+            "format": "date-time"
+            }
+        }
+        },
+        "humus": {
+        "type": "number",
+        "description": "Property. Humus content in the soil.",
+        "metadata": {
+            "unitCode": {
+            "type": "string",
+            "enum": ["percent"]
+            },
+            "timestamp": {
+            "type": "string",
+            "format": "date-time"
+            }
+        }
+        },
+        "hasAgriSoil": {
+        "type": "string",
+        "format": "uri",
+        "description": "Relationship. Reference to the associated AgriSoil."
+        },
+        "hasAgriParcel": {
+        "type": "string",
+        "format": "uri",
+        "description": "Relationship. Reference to the associated AgriParcel."
+        },
+        "hasAgriGreenhouse": {
+        "type": "string",
+        "format": "uri",
+        "description": "Relationship. Reference to the associated AgriGreenhouse."
+        }
+    },
+    "required": ["dateCreated", "dateModified", "dateOfMeasurement", "acidity", "humus"]
+}
+
+AGRI_YIELD_SCHEMA = {
+    "$schema": "http://json-schema.org/schema#",
+    "$schemaVersion": "0.0.4",
+    "$id": AGRI_YIELD_URL_SCHEMA,
+    "title": "Smart Data Models - AgriYeld",
+    "description": "This entity contains a harmonised description of an agricultural yeld, capturing data about the produced amount from crops. It is associated with the agricultural vertical and IoT applications.",
+    "type": "object",
+    "allOf": [
+        {
+        "$ref": "https://smart-data-models.github.io/data-models/common-schema.json#/definitions/GSMA-Commons"
+        },
+        {
+        "properties": {
+            "type": {
+            "type": "string",
+            "enum": [
+                "AgriYeld"
+            ],
+            "description": "Property. NGSI Entity Type. It has to be AgriYeld."
+            },
+            "hasAgriCrop": {
+            "type": "string",
+            "format": "uri",
+            "description": "Relationship. Reference to the AgriCrop related to this yeld."
+            },
+            "hasAgriParcel": {
+            "type": "string",
+            "format": "uri",
+            "description": "Relationship. Reference to the AgriParcel where the yeld was produced."
+            },
+            "startDateOfGatheringAt": {
+            "type": "string",
+            "format": "dateTime",
+            "description": "Property. Start date of the gathering process."
+            },
+            "endDateOfGatheringAt": {
+            "type": "string",
+            "format": "dateTime",
+            "description": "Property. End date of the gathering process."
+            },
+            "yeld": {
+            "type": "object",
+            "description": "Property. Information about the amount of produced yeld.",
+            "properties": {
+                "value": {
+                "type": "number"
+                },
+                "maxValue": {
+                "type": "number"
+                },
+                "minValue": {
+                "type": "number"
+                },
+                "unitText": {
+                "type": "string",
+                "enum": ["Tons per hectare"]
+                }
+            },
+            "required": ["value", "maxValue", "minValue", "unitText"]
+            }
+        },
+        "required": [
+            "type",
+            "startDateOfGatheringAt",
+            "endDateOfGatheringAt",
+            "yeld"
+        ]
+        }
+    ]
+}
+
+AGRI_CARBON_FOOTPRINT_SCHEMA = {
+    "$schema": "http://json-schema.org/schema#",
+    "$schemaVersion": "0.0.4",
+    "$id": AGRI_CARBON_FOOTPRINT_URL_SCHEMA,
+    "title": "Smart Data Models - AgriCarbonFootprint",
+    "description": "This entity contains a harmonised description of the carbon footprint of an agricultural activity, capturing data related to the emission of greenhouse gases. It is associated with the agricultural vertical and IoT applications.",
+    "type": "object",
+    "allOf": [
+        {
+        "$ref": "https://smart-data-models.github.io/data-models/common-schema.json#/definitions/GSMA-Commons"
+        },
+        {
+        "properties": {
+            "type": {
+            "type": "string",
+            "enum": [
+                "AgriCarbonFootprint"
+            ],
+            "description": "Property. NGSI Entity Type. It has to be AgriCarbonFootprint."
+            },
+            "hasAgriCrop": {
+            "type": "string",
+            "format": "uri",
+            "description": "Relationship. Reference to the AgriCrop related to this carbon footprint."
+            },
+            "hasAgriParcel": {
+            "type": "string",
+            "format": "uri",
+            "description": "Relationship. Reference to the AgriParcel where the activity causing this carbon footprint took place."
+            },
+            "hasAgriYeld": {
+            "type": "string",
+            "format": "uri",
+            "description": "Relationship. Reference to the AgriYeld associated with this carbon footprint."
+            },
+            "carbonFootprint": {
+            "type": "object",
+            "description": "Property. Details about the carbon footprint value.",
+            "properties": {
+                "value": {
+                "type": "number"
+                },
+                "accuracyPercent": {
+                "type": "number"
+                },
+                "minValue": {
+                "type": "number"
+                },
+                "unitText": {
+                "type": "string",
+                "enum": ["Tons"]
+                }
+            },
+            "required": ["value", "accuracyPercent", "minValue", "unitText"]
+            },
+            "estimationStartAt": {
+            "type": "string",
+            "format": "dateTime",
+            "description": "Property. Start date of the carbon footprint estimation period."
+            },
+            "estimationEndAt": {
+            "type": "string",
+            "format": "dateTime",
+            "description": "Property. End date of the carbon footprint estimation period."
+            }
+        },
+        "required": [
+            "type",
+            "carbonFootprint",
+            "estimationStartAt",
+            "estimationEndAt"
+        ]
+        }
+    ]
+}
+
+
+@lru_cache(maxsize=4096)
+def is_date_time(value):
+    # A date alone is a "date", not a "date-time".
+    if len(value) < 16 or value[10] not in "Tt ":
+        return False
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+FORMAT_CHECKER = FormatChecker(())
+
+
+@FORMAT_CHECKER.checks("date-time")
+@FORMAT_CHECKER.checks("dateTime")
+def check_date_time(value):
+    # ISO 8601, with or without offset, as the converters write dates.
+    return not isinstance(value, str) or is_date_time(value)
+
+
+@FORMAT_CHECKER.checks("uri")
+def check_uri(value):
+    return not isinstance(value, str) or URI.match(value) is not None
+
+
+def inline_references(schema):
+    # Replaces the references to the common schema by the local copy of their definition.
+    if isinstance(schema, dict):
+        reference = schema.get("$ref", "")
+        if reference.startswith(f"{COMMON_SCHEMA_URL}#/definitions/"):
+            return copy.deepcopy(COMMON_DEFINITIONS[reference.rsplit("/", 1)[1]])
+        return {key: inline_references(value) for key, value in schema.items()}
+    if isinstance(schema, list):
+        return [inline_references(value) for value in schema]
+    return schema
+
+
+def to_key_values(entity):
+    """
+    This method reduces a normalized NGSI-LD entity to its keyValues form: every Property and
+    GeoProperty to its value, every Relationship to its object and every DateTime to its "@value".
+    """
+    data = {}
+    for key, value in entity.items():
+        if isinstance(value, dict) and value.get("type") in NGSI_LD_TYPES:
+            value = value.get("object") if value["type"] == "Relationship" else value.get("value")
+            if isinstance(value, dict) and "@value" in value:
+                value = value["@value"]
+        data[key] = value
+    return data
+
+
+def describe(error):
+    path = "/".join(map(str, error.absolute_path))
+    return f"{path}: {error.message}" if path else error.message
+
+
+class SchemaValidator:
+    """
+    SchemaValidator class checks NGSI-LD entities against a JSON Schema with a Draft7Validator built once.
+
+    Valid entities, the common case in a batch, only go through `is_valid`. The errors, to report
+    the most relevant one, are collected for the invalid entities alone.
+
+    Attributes:
+        - schema (dict): The schema, with its references to the common schema inlined.
+    """
+
+    def __init__(self, schema):
+        self.schema = inline_references(schema)
+        Draft7Validator.check_schema(self.schema)
+        self._validator = Draft7Validator(self.schema, format_checker=FORMAT_CHECKER)
+
+    def error(self, entity):
+        """
+        This method returns the message of the most relevant error of an entity, or None when it is valid.
+        """
+        data = to_key_values(entity)
+        if self._validator.is_valid(data):
+            return None
+        error = best_match(self._validator.iter_errors(data))
+        return describe(error) if error is not None else None
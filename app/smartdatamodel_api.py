@@ -1,7 +1,5 @@
-from json import loads
-import logging
-from flask import Blueprint, request, jsonify
-from app.config import AGRI_CARBON_FOOTPRINT_URL_SCHEMA, AGRI_SOIL_STATE_URL_SCHEMA, AGRI_YIELD_URL_SCHEMA, SWAGGER_AUTHORIZATIONS
+from flask import Blueprint, request
+from app.config import SWAGGER_AUTHORIZATIONS
 from app.config_example import AGRI_CARBON_FOOTPRINT_URL, AGRI_SOIL_STATE_URL, AGRI_YIELD_URL
 from app.smart_data_models.agri_app import AgriApp
 from app.smart_data_models.agri_carbon_footprint import AgriCarbonFootPrint
@@ -15,8 +13,18 @@ from app.smart_data_models.agri_soil import AgriSoil
 from app.smart_data_models.agri_soil_state import AgriSoilState
 from app.smart_data_models.agri_yeld import AgriYeld, AgriYeld
 from app.smart_data_models.building import Building
+from app.smart_data_models import columnar
 from app.smart_data_models.person import Person
-from app.utils import api_key_required, send_to_kong
+from app.smart_data_models.schemas import AGRI_CARBON_FOOTPRINT_SCHEMA, AGRI_SOIL_STATE_SCHEMA, AGRI_YIELD_SCHEMA
+from app.config import BATCH_MAX_ITEMS, BUNDLE_MAX_IN_FLIGHT, DIFF_UPDATES_BACKEND, DIFF_UPDATES_DIR, DIFF_UPDATES_ENABLED, DIFF_UPDATES_MAX_SIZE, DIFF_UPDATES_TTL, IDEMPOTENCY_BACKEND, IDEMPOTENCY_CONTENT_TTL, IDEMPOTENCY_DIR, IDEMPOTENCY_KEY_TTL, IDEMPOTENCY_MAX_SIZE, IDEMPOTENCY_PENDING_TTL, WRITE_BEHIND_BATCH_SIZE, WRITE_BEHIND_ENABLED, WRITE_BEHIND_MAX_ATTEMPTS, WRITE_BEHIND_RETENTION, WRITE_BEHIND_RETRY_DELAY, WRITE_BEHIND_WORKERS, STATIC_DOCUMENT_MAX_AGE, STREAM_MAX_LINE_LENGTH, STREAM_MAX_REPORTED_ERRORS, STREAM_WINDOW_SIZE
+from app.write_behind import WriteBehindQueue
+from app.bundle import BundleWriter
+from app.entity_cache import build_entity_cache_backend
+from app.entity_diff import DifferentialWriter
+from app.idempotency import IdempotencyStore, idempotent
+from app.geometry import GeometryError
+from app.static_documents import StaticDocument
+from app.utils import PayloadError, api_key_required, delete_entity_attribute, entity_invalidation_listeners, iter_ndjson, parse_ndjson, patch_entity_attributes, send_to_kong, upsert_to_kong
 from flask_restx import Namespace, Resource, fields
 
 smartdata_blueprint = Blueprint("smart_data", __name__)
@@ -38,6 +46,308 @@ def get_models():
             'AgriYeld': agri_yeld_model,
             'AgriCarbonFootprint': agri_carbon_footprint_model}
 
+
+# Smart Data Models accepted by the API, keyed by the entity type sent to the context broker.
+SMART_DATA_MODELS = {
+    'AgriFarm': AgriFarm,
+    'AgriCrop': AgriCrop,
+    'AgriGreenHouse': AgriGreenHouse,
+    'AgriParcel': AgriParcel,
+    'AgriParcelOperation': AgriParcelOperation,
+    'AgriParcelRecord': AgriParcelRecord,
+    'AgriSoil': AgriSoil,
+    'AgriSoilState': AgriSoilState,
+    'AgriYeld': AgriYeld,
+    'AgriCarbonFootPrint': AgriCarbonFootPrint,
+    'AgriApp': AgriApp,
+    'Building': Building,
+    'Person': Person,
+}
+_SMART_DATA_MODELS_LOWER = {name.lower(): name for name in SMART_DATA_MODELS}
+
+
+def get_smart_data_model(entity_type):
+    """
+    This method returns the broker entity type and the model class for an entity type, ignoring case
+    (so "AgriCarbonFootprint" resolves to "AgriCarbonFootPrint").
+
+    Raises:
+        PayloadError: If the entity type is not supported.
+    """
+    name = _SMART_DATA_MODELS_LOWER.get(str(entity_type).lower())
+    if name is None:
+        raise PayloadError({"error": f"Unsupported entity type: {entity_type}"})
+    return name, SMART_DATA_MODELS[name]
+
+
+def build_smart_data_model(model_class, data):
+    """
+    This method converts an incoming payload into a Smart Data Model. Payloads that already have an "id"
+    and a "type" are validated and passed through, any other payload is read as the flat format of the model.
+
+    Raises:
+        PayloadError: If the payload is not valid.
+    """
+    if not isinstance(data, dict):
+        raise PayloadError({"error": "The payload must be a JSON object."})
+
+    is_smart_data_model = 'id' in data and 'type' in data
+    if is_smart_data_model:
+        # Si ya está en formato Smart Data Model, entonces puedes pasar los datos directamente.
+        is_valid, error_message = model_class.validate_smart_data_model(data)
+        if not is_valid:
+            raise PayloadError({"error": error_message})
+        return data
+    try:
+        return model_class.from_flat_payload(data).to_smart_data_model()
+    except GeometryError as e:
+        raise PayloadError({"errors": [str(e)]})
+
+
+write_behind_queue = WriteBehindQueue(
+    upsert_to_kong,
+    workers=WRITE_BEHIND_WORKERS,
+    batch_size=WRITE_BEHIND_BATCH_SIZE,
+    max_attempts=WRITE_BEHIND_MAX_ATTEMPTS,
+    retry_delay=WRITE_BEHIND_RETRY_DELAY,
+    retention=WRITE_BEHIND_RETENTION
+)
+
+
+idempotency_store = IdempotencyStore(
+    key_ttl=IDEMPOTENCY_KEY_TTL,
+    content_ttl=IDEMPOTENCY_CONTENT_TTL,
+    max_size=IDEMPOTENCY_MAX_SIZE,
+    backend=build_entity_cache_backend(IDEMPOTENCY_BACKEND, IDEMPOTENCY_DIR, IDEMPOTENCY_MAX_SIZE),
+    pending_ttl=IDEMPOTENCY_PENDING_TTL
+)
+
+differential_writer = DifferentialWriter(
+    patch_entity_attributes,
+    delete_entity_attribute,
+    ttl=DIFF_UPDATES_TTL,
+    max_size=DIFF_UPDATES_MAX_SIZE,
+    backend=build_entity_cache_backend(DIFF_UPDATES_BACKEND, DIFF_UPDATES_DIR, DIFF_UPDATES_MAX_SIZE)
+)
+# The batch, stream, columnar, bundle and write-behind writes replace the version the next diff would start from,
+# and the content the next write_changed would compare with.
+entity_invalidation_listeners.append(differential_writer.forget)
+entity_invalidation_listeners.append(idempotency_store.forget_entity)
+
+
+def queued_response(tracking_id):
+    return {"status": "queued", "tracking_id": tracking_id, "status_url": f"/api/ingest-status/{tracking_id}"}
+
+
+def ingest_entity(entity_type, model_class, data):
+    try:
+        smart_data_model = build_smart_data_model(model_class, data)
+    except PayloadError as e:
+        return e.body, 400
+
+    entity = {"id": smart_data_model["id"], "type": entity_type}
+    entity.update(smart_data_model)
+    result, = idempotency_store.write_changed([entity], create_entities)
+    if result["status"] == "failed":
+        # Not a 2xx, so the idempotent decorator does not replay it and a retry writes the entity again.
+        return {"error": result["error"]}, 502
+    if result["status"] == "queued":
+        return queued_response(result["tracking_id"]), 202
+    return smart_data_model, 201
+
+
+def create_entities(entities):
+    # Writes of the single-entity endpoints: a create in the broker, a patch of the attributes that changed, or the write-behind queue.
+    if WRITE_BEHIND_ENABLED:
+        return queue_entities(entities)
+    if DIFF_UPDATES_ENABLED:
+        return differential_writer.write(entities, send_entities)
+    return send_entities(entities)
+
+
+def send_entities(entities):
+    results = []
+    for entity in entities:
+        status_code = send_to_kong(entity["type"], entity)
+        if status_code in (201, 204):
+            results.append({"id": entity["id"], "status": "created"})
+        else:
+            results.append({"id": entity["id"], "status": "failed", "error": f"The broker answered {status_code}.", "status_code": status_code})
+    return results
+
+
+def queue_entities(entities):
+    tracking_ids = write_behind_queue.enqueue([(entity["type"], entity) for entity in entities])
+    return [{"id": entity["id"], **queued_response(tracking_id)} for entity, tracking_id in zip(entities, tracking_ids)]
+
+
+def read_batch_items():
+    """
+    This method reads the entities of a batch request, sent either as a JSON array or as NDJSON (one entity per line).
+
+    Raises:
+        PayloadError: If the body is not a list of entities or has too many of them.
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/ndjson'):
+        items = parse_ndjson(request.get_data(as_text=True))
+    else:
+        items = request.get_json(silent=True)
+        if not isinstance(items, list):
+            raise PayloadError({"error": "The body must be a JSON array or NDJSON."})
+    if len(items) > BATCH_MAX_ITEMS:
+        raise PayloadError({"error": f"A batch accepts at most {BATCH_MAX_ITEMS} entities."})
+    return items
+
+
+def convert_and_upsert(numbered_items, resolve, key="index"):
+    """
+    This method converts payloads into Smart Data Models and upserts the valid ones in chunks.
+
+    Parameters:
+        numbered_items (list): Tuples (position, item). An item may be a PayloadError raised while reading it.
+        resolve (callable): Function receiving an item and returning a tuple (entity_type, model_class, data).
+        key (str): Name under which the position is reported in each result, e.g. "index" or "line".
+
+    Returns:
+        A list with one result per item, in the same order.
+    """
+    results = [None] * len(numbered_items)
+    entities = []
+    positions = []
+    for slot, (position, item) in enumerate(numbered_items):
+        try:
+            if isinstance(item, PayloadError):
+                raise item
+            entity_type, model_class, data = resolve(item)
+            smart_data_model = build_smart_data_model(model_class, data)
+        except PayloadError as e:
+            results[slot] = {key: position, "status": "invalid", **e.body}
+            continue
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            results[slot] = {key: position, "status": "invalid", "error": str(e)}
+            continue
+        entity = {"id": smart_data_model["id"], "type": entity_type}
+        entity.update(smart_data_model)
+        entities.append(entity)
+        positions.append(slot)
+
+    for slot, result in zip(positions, upsert_entities(entities)):
+        results[slot] = {key: numbered_items[slot][0], **result}
+    return results
+
+
+def upsert_entities(entities):
+    """
+    This method upserts NGSI-LD entities in chunks, or queues them when the write-behind queue is enabled.
+    Entities sent again with the content they were last written with are not written again (see IdempotencyStore).
+
+    Returns:
+        A list with one result per entity, in the same order.
+    """
+    return idempotency_store.write_changed(entities, queue_entities if WRITE_BEHIND_ENABLED else upsert_to_kong)
+
+
+def summarize(results, summary=None):
+    summary = {} if summary is None else summary
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+    return summary
+
+
+def ingest_batch(items, resolve):
+    """
+    This method converts a list of payloads into Smart Data Models and upserts the valid ones in chunks.
+
+    Returns:
+        A tuple (body, status) where body holds one result per item, in the same order, plus a summary.
+    """
+    return batch_response(convert_and_upsert(list(enumerate(items)), resolve))
+
+
+bundle_writer = BundleWriter(lambda entity: idempotency_store.write_changed([entity], upsert_to_kong)[0], max_in_flight=BUNDLE_MAX_IN_FLIGHT)
+
+
+def ingest_bundle(items):
+    """
+    This method converts the payloads of a bundle into Smart Data Models and writes them together, ordered
+    by their relationships (see app.bundle). Nothing is written unless every payload is valid and their ids are distinct.
+    The bundle is written directly, also when the write-behind queue is enabled, so that the order holds.
+
+    Returns:
+        A tuple (body, status) where body holds one result per item, in the same order, with its timing,
+        a summary and the time taken by the whole bundle.
+    """
+    entities = []
+    errors = []
+    ids = set()
+    for index, item in enumerate(items):
+        try:
+            entity_type, model_class, data = resolve_mixed_batch_item(item)
+            smart_data_model = build_smart_data_model(model_class, data)
+        except PayloadError as e:
+            errors.append({"index": index, **e.body})
+            continue
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            errors.append({"index": index, "error": str(e)})
+            continue
+        if smart_data_model["id"] in ids:
+            errors.append({"index": index, "error": f"Duplicated id: {smart_data_model['id']}"})
+            continue
+        ids.add(smart_data_model["id"])
+        entity = {"id": smart_data_model["id"], "type": entity_type}
+        entity.update(smart_data_model)
+        entities.append(entity)
+    if errors:
+        return {"errors": errors}, 400
+
+    results, elapsed_ms = bundle_writer.write_all(entities)
+    body, status = batch_response([{"index": index, **result} for index, result in enumerate(results)])
+    body["elapsed_ms"] = elapsed_ms
+    return body, status
+
+
+def batch_response(results):
+    summary = summarize(results)
+    status = 200 if not summary.get("invalid") and not summary.get("failed") else 207
+    if status == 200 and summary.get("queued"):
+        status = 202
+    return {"summary": summary, "results": results}, status
+
+
+def ingest_stream(stream, resolve):
+    """
+    This method reads NDJSON from the request stream and upserts it window by window, so at most
+    STREAM_WINDOW_SIZE entities are held in memory whatever the size of the body.
+
+    Only the counters and the first STREAM_MAX_REPORTED_ERRORS failures are kept for the response.
+
+    Returns:
+        A tuple (body, status) with the summary and the reported failures.
+    """
+    summary = {}
+    failures = []
+    window = []
+
+    def flush():
+        results = convert_and_upsert(window, resolve, key="line")
+        summarize(results, summary)
+        for result in results:
+            if result["status"] in ("invalid", "failed") and len(failures) < STREAM_MAX_REPORTED_ERRORS:
+                failures.append(result)
+        window.clear()
+
+    for line_number, item in iter_ndjson(stream, max_line_length=STREAM_MAX_LINE_LENGTH):
+        window.append((line_number, item))
+        if len(window) >= STREAM_WINDOW_SIZE:
+            flush()
+    if window:
+        flush()
+
+    status = 200 if not summary.get("invalid") and not summary.get("failed") else 207
+    if status == 200 and summary.get("queued"):
+        status = 202
+    return {"summary": summary, "errors": failures}, status
+
 agri_farm_model = ns_smart_data_models.model('AgriFarm', {
     'id': fields.String(required=True, description='Unique Identifier for the farm', example="urn:ngsi-ld:AgriFarm:12345"),
     'name': fields.String(required=True, description='Name of the farm', example="Wheat farm"),
@@ -65,114 +375,12 @@ agri_farm_model = ns_smart_data_models.model('AgriFarm', {
 @ns_smart_data_models.route('/agri-farm')
 class AgriFarmResource(Resource):
     @api_key_required
+    @idempotent(idempotency_store)
     @ns_smart_data_models.expect(agri_farm_model, validate=False)
     @ns_smart_data_models.response(201, 'AgriFarm successfully created.')
     def post(self):
         farm_data = request.get_json()
-
-        is_smart_data_model = 'id' in farm_data and 'type' in farm_data
-        if is_smart_data_model:
-            # Si ya está en formato Smart Data Model, entonces puedes pasar los datos directamente.
-            smart_data_model = farm_data
-            is_valid, error_message = AgriFarm.validate_smart_data_model(smart_data_model)
-            if not is_valid:
-                return jsonify({"error": error_message}), 400   
-        else:
-            id = farm_data.get('id')
-            name = farm_data.get('name')
-            location_str = farm_data.get('location')
-            type_location = farm_data.get('type_location')
-            address_locality = farm_data.get('address_locality')
-            address_country = farm_data.get('address_country')
-            address_street = farm_data.get('address_street')
-            contact_point_telephone = farm_data.get('contact_point_telephone')
-            contact_point_email = farm_data.get('contact_point_email')
-            has_building_str = farm_data.get('has_building')
-            has_agri_parcel_str = farm_data.get('has_agri_parcel')
-            see_also_str = farm_data.get('see_also')
-            land_location_str = farm_data.get('land_location')
-            land_location_type = farm_data.get('land_location_type')
-
-            error_messages = []
-            if not id:
-                logging.info("id")
-                error_messages.append("Id is missing")
-            if not name:
-                logging.info("name")
-                error_messages.append("Name is missing")
-            if not location_str:
-                logging.info("location")
-                error_messages.append("Location is missing")
-            if not type_location:
-                logging.info("type location")
-                error_messages.append("Location type is missing")
-            if not address_locality:
-                logging.info("address_locality")
-                error_messages.append("Address (locality) is missing")
-            if not address_country:
-                logging.info("address_country")
-                error_messages.append("Address (country) is missing")
-            if not address_street:
-                logging.info("address_street")
-                error_messages.append("Address (street) is missing")
-            if not contact_point_telephone:
-                logging.info("contact_point_telephone")
-                error_messages.append("Contact Point (telephone) is missing")
-            if not contact_point_email:
-                logging.info("contact_point_email")
-                error_messages.append("Contact Point (email) is missing")
-            if not has_agri_parcel_str:
-                logging.info("has_agri_parcel")
-                error_messages.append("Has agri parcel is missing")
-            if error_messages:
-                return jsonify({"errors": error_messages}), 400
-            related_source_str = farm_data.get('related_source')
-            related_source = related_source_str.split(',') if related_source_str else []
-
-            if ';' in location_str:
-                location = [list(map(float, pair.split(','))) for pair in location_str.split(';')]
-            else:
-                location = list(map(float, location_str.split(',')))
-            location = {'coordinates': location}  
-            has_building = has_building_str.split(',') if has_building_str else []
-            has_agri_parcel = has_agri_parcel_str.split(',') if has_agri_parcel_str else []
-            see_also = see_also_str.split(',') if see_also_str else []
-            land_location = [list(map(float, pair.split(','))) for pair in land_location_str.split(';')] if land_location_str else []
-            if ';' in land_location_str:
-                land_location = [list(map(float, pair.split(','))) for pair in land_location_str.split(';')]
-            else:
-                land_location = list(map(float, land_location_str.split(',')))
-            land_location = {'coordinates': land_location} 
-            date_created = farm_data.get('date_created')
-            date_modified = farm_data.get('date_modified')
-            description = farm_data.get('description')
-            owned_by = farm_data.get('owned_by')
-            has_building = farm_data.get('has_building')
-            new_farm_data = AgriFarm(
-                id=id,
-                name=name,
-                location= location,
-                location_type = type_location,
-                address_locality=address_locality,
-                address_country=address_country,
-                address_street=address_street,
-                contact_point_email=contact_point_email,
-                contact_point_telephone=contact_point_telephone,
-                has_agri_parcel=has_agri_parcel,
-                date_created=date_created,
-                date_modified=date_modified,
-                description=description,
-                related_source=related_source,
-                see_also=see_also,
-                land_location=land_location,
-                land_location_type=land_location_type,
-                owned_by=owned_by,
-                has_building=has_building
-            )
-            smart_data_model = new_farm_data.to_smart_data_model()
-
-        send_to_kong("AgriFarm", smart_data_model)
-        return smart_data_model, 201
+        return ingest_entity("AgriFarm", AgriFarm, farm_data)
 
 season_model = ns_smart_data_models.model('Season', {
     'dateRange': fields.String(required=True, description='Date range', example="-09-28/-10-12"),
@@ -202,81 +410,12 @@ agri_crop_model = ns_smart_data_models.model('AgriCrop', {
 @ns_smart_data_models.route('/agri_crop')
 class AgriCropResource(Resource):
     @api_key_required
+    @idempotent(idempotency_store)
     @ns_smart_data_models.expect(agri_crop_model, validate=False)
     @ns_smart_data_models.response(201, 'AgriCrop successfully created.')
     def post(self):
         crop_data = request.get_json()
-        is_smart_data_model = 'id' in crop_data and 'type' in crop_data
-        if is_smart_data_model:
-            smart_data_model = crop_data
-            is_valid, error_message = AgriCrop.validate_smart_data_model(smart_data_model)
-            if not is_valid:
-                return jsonify({"error": error_message}), 400
-        else:
-            id = crop_data.get('id')
-            name = crop_data.get('name')
-            has_agri_soil_str = crop_data.get('has_agri_soil')
-            planting_from_str = crop_data.get('planting_from')
-
-            error_messages = []
-            if not id:
-                logging.info("id")
-                error_messages.append("Id is missing")
-            if not name:
-                logging.append("Name")
-                error_messages.append("Name is missing")
-            if not has_agri_soil_str:
-                logging.append("has_agri_soil")
-                error_messages.append("Has agri soil is missing")
-            if not planting_from_str:
-                logging.append("planting_from")
-                error_messages.append("Planting from is missing")
-            if error_messages:
-                return jsonify({"errors": error_messages}), 400
-            
-            has_agri_soil = has_agri_soil_str.split(',') if has_agri_soil_str else []
-            planting_from = loads(planting_from_str) if planting_from_str else []
-
-            alternate_name = crop_data.get('alternate_name')
-            agro_voc_concept = crop_data.get('agro_voc_concept')
-            description = crop_data.get('description')
-            date_created = crop_data.get('date_created')
-            date_modified = crop_data.get('date_modified')
-            see_also = crop_data.get('see_also')
-            related_source = crop_data.get('related_source')
-            has_agri_fertiliser_str = crop_data.get('has_agri_fertiliser')
-            has_agri_fertiliser = has_agri_fertiliser_str.split(',') if has_agri_fertiliser_str else []
-
-            has_agri_pest_str = crop_data.get('has_agri_pest')
-            has_agri_pest = has_agri_pest_str.split(',') if has_agri_pest_str else []
-
-            harvesting_interval_str = crop_data.get('harvesting_interval')
-            harvesting_interval = loads(harvesting_interval_str) if harvesting_interval_str else []
-
-            watering_frequency = crop_data.get('watering_frequency')
-
-            new_crop = AgriCrop(
-                id=id,
-                name=name,
-                alternate_name=alternate_name,
-                agro_voc_concept=agro_voc_concept,
-                description=description,
-                date_created=date_created,
-                date_modified=date_modified,
-                see_also=see_also,
-                related_source=related_source,
-                has_agri_soil=has_agri_soil,
-                has_agri_fertiliser=has_agri_fertiliser,
-                has_agri_pest=has_agri_pest,
-                planting_from=planting_from,
-                harvesting_interval=harvesting_interval,
-                watering_frequency=watering_frequency
-            )
-            
-            smart_data_model = new_crop.to_smart_data_model()
-
-        send_to_kong("AgriCrop", smart_data_model)
-        return smart_data_model, 201
+        return ingest_entity("AgriCrop", AgriCrop, crop_data)
     
 
 agri_greenhouse_model = ns_smart_data_models.model('AgriGreenHouse', {
@@ -303,86 +442,12 @@ agri_greenhouse_model = ns_smart_data_models.model('AgriGreenHouse', {
 @ns_smart_data_models.route('/agri_green_house')
 class AgriGreenHouseResource(Resource):
     @api_key_required
+    @idempotent(idempotency_store)
     @ns_smart_data_models.expect(agri_greenhouse_model, validate=False)
     @ns_smart_data_models.response(201, 'AgriGreenHouse successfully created.')
     def post(self):
-        greenhouse_data  = request.get_json()
-        is_smart_data_model = 'id' in greenhouse_data and 'type' in greenhouse_data
-        if is_smart_data_model:
-            smart_data_model = greenhouse_data
-            is_valid, error_message = AgriGreenHouse.validate_smart_data_model(smart_data_model)
-            if not is_valid:
-                return jsonify({"error": error_message}), 400
-        else:
-            id = greenhouse_data.get('id')
-            relative_humidity = greenhouse_data.get('relative_humidity')
-            co2 = greenhouse_data.get('co2')
-            error_messages = []
-            if not id:
-                logging.info("id")
-                error_messages.append("Id is missing")
-            if not relative_humidity:
-                logging.info("relative_humidity")
-                error_messages.append("Relative humidity is missing")
-            if not co2:
-                logging.info("co2")
-                error_messages.append("CO2 is missing")
-
-            if error_messages:
-                return jsonify({"errors": error_messages}), 400
-            
-            date_created = greenhouse_data.get('date_created')
-            date_modified = greenhouse_data.get('date_modified')
-            owned_by = greenhouse_data.get('owned_by')
-            belongs_to = greenhouse_data.get('belongs_to')
-            has_agri_parcel_parent_str = greenhouse_data.get('has_agri_parcel_parent')
-            has_agri_parcel_parent =  has_agri_parcel_parent_str.split(',') if has_agri_parcel_parent_str else []
-            has_weather_observed_str = greenhouse_data.get('has_weather_observed')
-            has_weather_observed =  has_weather_observed_str.split(',') if has_weather_observed_str else []
-            leaf_temperature = greenhouse_data.get('leaf_temperature')
-            daily_light = greenhouse_data.get('daily_light')
-            drain_flow = greenhouse_data.get('drain_flow')
-            drain_flow_max_value = greenhouse_data.get('drain_flow_max_value')
-            drain_flow_min_value = greenhouse_data.get('drain_flow_min_value')
-
-            related_source_str = greenhouse_data.get('related_source')
-            related_source = related_source_str.split(',') if related_source_str else []
-            see_also_str = greenhouse_data.get('see_also')
-            see_also =  see_also_str.split(',') if see_also_str else []
-            has_agri_parcel_children_str = greenhouse_data.get('has_agri_parcel_children')
-            has_agri_parcel_children =  has_agri_parcel_children_str.split(',') if has_agri_parcel_children_str else []
-            has_water_quality_observed_str = greenhouse_data.get('has_water_quality_observed')
-            has_water_quality_observed = has_water_quality_observed_str.split(',') if has_water_quality_observed_str else []
-            has_device_str = greenhouse_data.get('has_device')
-            has_device =  has_device_str.split(',') if has_device_str else []
-            
-
-            new_greenhouse = AgriGreenHouse(
-                id=id,
-                date_created=date_created,
-                date_modified=date_modified,
-                owned_by=owned_by,
-                related_source=related_source,
-                see_also=see_also,
-                belongs_to=belongs_to,
-                has_agri_parcel_parent=has_agri_parcel_parent,
-                has_agri_parcel_children=has_agri_parcel_children,
-                has_weather_observed=has_weather_observed,
-                has_water_quality_observed=has_water_quality_observed,
-                relative_humidity=relative_humidity,
-                leaf_temperature=leaf_temperature,
-                co2=co2,
-                daily_light=daily_light,
-                drain_flow=drain_flow,
-                drain_flow_max_value=drain_flow_max_value,
-                drain_flow_min_value=drain_flow_min_value,
-                has_device=has_device
-            )
-            
-            smart_data_model = new_greenhouse.to_smart_data_model()
-
-        send_to_kong("AgriGreenHouse", smart_data_model)
-        return smart_data_model, 201
+        greenhouse_data = request.get_json()
+        return ingest_entity("AgriGreenHouse", AgriGreenHouse, greenhouse_data)
 
 
 agri_parcel_model = ns_smart_data_models.model('AgriParcel', {
@@ -414,106 +479,12 @@ agri_parcel_model = ns_smart_data_models.model('AgriParcel', {
 @ns_smart_data_models.route('/agri_parcel')
 class AgriParcelResource(Resource):
     @api_key_required
+    @idempotent(idempotency_store)
     @ns_smart_data_models.expect(agri_parcel_model, validate=False)
     @ns_smart_data_models.response(201, 'AgriParcel successfully created.')
     def post(self):
         parcel_data = request.get_json()
-        is_smart_data_model = 'id' in parcel_data and 'type' in parcel_data
-        if is_smart_data_model:
-            smart_data_model = parcel_data
-            is_valid, error_message = AgriParcel.validate_smart_data_model(smart_data_model)
-            if not is_valid:
-                return jsonify({"error": error_message}), 400
-        else:
-            id = parcel_data.get('id')
-            location_str = parcel_data.get('location')
-            location_type = parcel_data.get('location_type')
-            area = parcel_data.get('area')
-            description = parcel_data.get('description')
-            category = parcel_data.get('category')
-            belongs_to = parcel_data.get('belongs_to')
-            has_agri_soil = parcel_data.get('has_agri_soil')
-            
-            error_messages = []
-            if not id:
-                logging.info("id")
-                error_messages.append("Id is missing")
-            if not location_str:
-                error_messages.append("Location is missing")
-            if not location_type:
-                error_messages.append("Location type is missing")
-            if not area:
-                error_messages.append("Area is missing")
-            if not description:
-                error_messages.append("Description is missing")
-            if not category:
-                error_messages.append("Category is missing")
-            if not belongs_to:
-                error_messages.append("Belongs to is missing")
-            if not has_agri_soil:
-                error_messages.append("Has agri soil is missing")
-            if error_messages:
-                return jsonify({"errors": error_messages}), 400
-            
-            if ';' in location_str:
-                location = [list(map(float, pair.split(','))) for pair in location_str.split(';')]
-            else:
-                location = list(map(float, location_str.split(',')))
-            location = {'coordinates': location}  
-            
-            date_created = parcel_data.get('date_created')
-            date_modified = parcel_data.get('date_modified')
-            has_agri_parcel_parent = parcel_data.get('has_agri_parcel_parent')
-            soil_texture_type = parcel_data.get('soil_texture_type')
-            related_source_str = parcel_data.get('related_source')
-            related_source = related_source_str.split(',') if related_source_str else None
-
-
-            see_also_str = parcel_data.get('see_also')
-            see_also = see_also_str.split(',') if see_also_str else None
-            
-            owned_by = parcel_data.get('owned_by')
-            has_agri_parcel_children_str = parcel_data.get('has_agri_parcel_children')
-            has_agri_parcel_children = has_agri_parcel_children_str.split(',') if has_agri_parcel_children_str else None
-
-            has_agri_crop = parcel_data.get('has_agri_crop')
-            has_air_quality_observed = parcel_data.get('has_air_quality_observed')
-            crop_status = parcel_data.get('crop_status')
-            last_planted_at = parcel_data.get('last_planted_at')
-            has_device_str = parcel_data.get('has_device')
-            has_device = has_device_str.split(',') if has_device_str else None
-
-            irrigation_system_type = parcel_data.get('irrigation_system_type')
-
-            new_parcel = AgriParcel(
-                id=id,
-                date_created=date_created,
-                date_modified=date_modified,
-                location= location,
-                type_location= location_type,
-                area=area,
-                description=description,
-                category=category,
-                belongs_to=belongs_to,
-                has_agri_parcel_parent=has_agri_parcel_parent,
-                has_agri_soil=has_agri_soil,
-                soil_texture_type=soil_texture_type,
-                related_source=related_source,
-                see_also=see_also,
-                owned_by=owned_by,
-                has_agri_parcel_children=has_agri_parcel_children,
-                has_agri_crop=has_agri_crop,
-                has_air_quality_observed=has_air_quality_observed,
-                crop_status=crop_status,
-                last_planted_at=last_planted_at,
-                has_device=has_device,
-                irrigation_system_type=irrigation_system_type
-            )
-            
-            smart_data_model = new_parcel.to_smart_data_model()
-
-        send_to_kong("AgriParcel", smart_data_model)
-        return smart_data_model, 201
+        return ingest_entity("AgriParcel", AgriParcel, parcel_data)
 
 agri_parcel_operation_model = ns_smart_data_models.model('AgriParcelOperation', {
     'id': fields.String(required=True, description='Unique Identifier for the parcel operation', example="urn:ngsi-ld:AgriParcelOperation:12345"),
@@ -553,133 +524,12 @@ agri_parcel_operation_model = ns_smart_data_models.model('AgriParcelOperation',
 @ns_smart_data_models.route('/agri_parcel_operation')
 class AgriParcelOperationResource(Resource):
     @api_key_required
+    @idempotent(idempotency_store)
     @ns_smart_data_models.expect(agri_parcel_operation_model, validate=False)
     @ns_smart_data_models.response(201, 'AgriParcelOperation successfully created.')
     def post(self):
         operation_data = request.get_json()
-        is_smart_data_model = 'id' in operation_data and 'type' in operation_data
-        if is_smart_data_model:
-            smart_data_model = operation_data
-            is_valid, error_message = AgriParcelOperation.validate_smart_data_model(smart_data_model)
-            if not is_valid:
-                return jsonify({"error": error_message}), 400
-        else:
-            id = operation_data.get('id')
-            has_agri_parcel = operation_data.get('has_agri_parcel')
-            operation_type = operation_data.get('operation_type')
-            description = operation_data.get('description')
-            result = operation_data.get('result')
-            planned_start_at = operation_data.get('planned_start_at')
-            planned_end_at = operation_data.get('planned_end_at')
-            status = operation_data.get('status')
-            started_at = operation_data.get('started_at')
-            ended_at = operation_data.get('ended_at')
-            reported_at = operation_data.get('reported_at')
-            quantity = operation_data.get('quantity')
-            diesel_fuel_consumption = operation_data.get('diesel_fuel_consumption')
-            gasoline_fuel_consumption = operation_data.get('gasoline_fuel_consumption')
-            diesel_fuel_consumption_max_value= operation_data.get('diesel_fuel_consumption_max_value')
-            diesel_fuel_consumption_min_value = operation_data.get('diesel_fuel_consumption_max_value')
-            diesel_fuel_consumption_unit_text = operation_data.get('diesel_fuel_consumption_unit_text')
-            gasoline_fuel_consumption_max_value = operation_data.get('gasoline_fuel_consumption_max_value')
-            gasoline_fuel_consumption_min_value = operation_data.get('gasoline_fuel_consumption_min_value')
-            gasoline_fuel_consumption_unit_text = operation_data.get('gasoline_fuel_consumption_unit_text')
-
-            
-            error_messages = []
-            if not id:
-                logging.info("id")
-                error_messages.append("Id is missing")
-            if not has_agri_parcel:
-                error_messages.append("Has agri parcel is missing")
-            if not operation_type:
-                error_messages.append("Operation type is missing")
-            if not description:
-                error_messages.append("Description is missing")
-            if not result:
-                error_messages.append("Result is missing")
-            if not planned_start_at:
-                error_messages.append("Planned start at is missing")
-            if not planned_end_at:
-                error_messages.append("Planned end at is missing")
-            if not status:
-                error_messages.append("Status is missing")
-            if not started_at:
-                error_messages.append("Started at is missing")
-            if not ended_at:
-                error_messages.append("Ended at is missing")
-            if not reported_at:
-                error_messages.append("Reported at is missing")
-            if not quantity:
-                error_messages.append("Quantity is missing")
-            if not diesel_fuel_consumption:
-                error_messages.append("Diesel fuel consumption is missing")
-            if not gasoline_fuel_consumption:
-                error_messages.append("Gasoline fuel consumption is missing")
-            if not diesel_fuel_consumption_max_value:
-                error_messages.append("Diesel Max fuel consumption is missing")
-            if not diesel_fuel_consumption_min_value:
-                error_messages.append("Diesel Min fuel consumption is missing")
-            if not diesel_fuel_consumption_unit_text:
-                error_messages.append("Diesel Unit fuel consumption is missing")
-            if not gasoline_fuel_consumption_max_value:
-                error_messages.append("Gasoline Max fuel consumption is missing")
-            if not gasoline_fuel_consumption_min_value:
-                error_messages.append("Gasoline Min fuel consumption is missing")
-            if not gasoline_fuel_consumption_unit_text:
-                error_messages.append("Gasoline Unit fuel consumption is missing")
-            if error_messages:
-                return jsonify({"errors": error_messages}), 400
-            date_created = operation_data.get('date_created')
-            date_modified = operation_data.get('date_modified')
-            related_source_str = operation_data.get('related_source')
-            related_source = related_source_str.split(',') if related_source_str else []
-            see_also_str = operation_data.get('see_also')
-            see_also = see_also_str.split(',') if see_also_str else []
-            has_operator = operation_data.get('has_operator')
-            has_agri_product_type = operation_data.get('has_agri_product_type')
-            water_source = operation_data.get('water_source')
-            work_order = operation_data.get('work_order')
-            work_record = operation_data.get('work_record')
-            irrigation_record = operation_data.get('irrigation_record')
-
-            new_operation = AgriParcelOperation(
-                id=id,
-                date_created=date_created,
-                date_modified=date_modified,
-                has_agri_parcel=has_agri_parcel,
-                operation_type=operation_type,
-                description=description,
-                result=result,
-                planned_start_at=planned_start_at,
-                planned_end_at=planned_end_at,
-                status=status,
-                started_at=started_at,
-                ended_at=ended_at,
-                reported_at=reported_at,
-                quantity=quantity,
-                related_source=related_source,
-                see_also=see_also,
-                has_operator=has_operator,
-                has_agri_product_type=has_agri_product_type,
-                water_source=water_source,
-                work_order=work_order,
-                work_record=work_record,
-                irrigation_record=irrigation_record,
-                diesel_fuel_consumption=diesel_fuel_consumption,
-                gasoline_fuel_consumption=gasoline_fuel_consumption,
-                diesel_fuel_consumption_max_value=diesel_fuel_consumption_max_value,
-                diesel_fuel_consumption_min_value=diesel_fuel_consumption_min_value,
-                diesel_fuel_consumption_unit_text=diesel_fuel_consumption_unit_text,
-                gasoline_fuel_consumption_max_value=gasoline_fuel_consumption_max_value,
-                gasoline_fuel_consumption_min_value=gasoline_fuel_consumption_min_value,
-                gasoline_fuel_consumption_unit_text=gasoline_fuel_consumption_unit_text
-            )
-            
-            smart_data_model = new_operation.to_smart_data_model()
-        
-        send_to_kong("AgriParcelOperation", smart_data_model)
-        return smart_data_model, 201
+        return ingest_entity("AgriParcelOperation", AgriParcelOperation, operation_data)
 
 agri_parcel_record_model = ns_smart_data_models.model('AgriParcelRecord', {
     'id': fields.String(required=True, description='Unique Identifier for the parcel record', example="urn:ngsi-ld:AgriParcelRecord:12345"),
@@ -734,157 +584,34 @@ agri_parcel_record_model = ns_smart_data_models.model('AgriParcelRecord', {
 @ns_smart_data_models.route('/agri_parcel_record')
 class AgriParcelRecordResource(Resource):
     @api_key_required
+    @idempotent(idempotency_store)
     @ns_smart_data_models.expect(agri_parcel_record_model, validate=False)
     @ns_smart_data_models.response(201, 'AgriParcelRecord successfully created.')
     def post(self):
         record_data = request.get_json()
-        is_smart_data_model = 'id' in record_data and 'type' in record_data
-        if is_smart_data_model:
-            smart_data_model = record_data
-            is_valid, error_message = AgriParcelRecord.validate_smart_data_model(smart_data_model)
-            if not is_valid:
-                return jsonify({"error": error_message}), 400
-        else:
-            id = record_data.get('id')
-            has_agri_parcel = record_data.get('has_agri_parcel')
-            location_str = record_data.get('location')
-            type_location = record_data.get('type_location')
-            soil_temperature = record_data.get('soil_temperature')
-            soil_temperature_unit = record_data.get('soil_temperature_unit')
-            air_temperature = record_data.get('air_temperature')
-            air_temperature_unit = record_data.get('air_temperature_unit')
-            air_temperature_timestamp = record_data.get('air_temperature_timestamp')
-            relative_humidity = record_data.get('relative_humidity')
-            relative_humidity_unit = record_data.get('relative_humidity_unit')
-            relative_humidity_timestamp = record_data.get('relative_humidity_timestamp')
-
-            error_messages = []
-            if not id:
-                logging.info("id")
-                error_messages.append("Id is missing")
-            if not has_agri_parcel:
-                error_messages.append("Has agri parcel is missing")
-            if not location_str:
-                error_messages.append("Location is missing")
-            if not type_location:
-                error_messages.append("Location Type is missing")
-            if not soil_temperature:
-                error_messages.append("Soil temperature is missing")
-            if not soil_temperature_unit:
-                error_messages.append("Soil temperature unit is missing")
-            if not air_temperature:
-                error_messages.append("Air temperature is missing")
-            if not air_temperature_unit:
-                error_messages.append("Air temperature unit is missing")
-            if not air_temperature_timestamp:
-                error_messages.append("Air temperature timestamp is missing")
-            if not relative_humidity:
-                error_messages.append("Relative humidity is missing")
-            if not relative_humidity_unit:
-                error_messages.append("Relative humidity unit is missing")
-            if not relative_humidity_timestamp:
-                error_messages.append("Relative humidity timestamp is missing")
-
-            if error_messages:
-                return jsonify({"errors": error_messages}), 400
-            
-            if ';' in location_str:
-                location = [list(map(float, pair.split(','))) for pair in location_str.split(';')]
-            else:
-                location = list(map(float, location_str.split(',')))
-            location = {'coordinates': location} 
-
-            date_created = record_data.get('date_created')
-            date_modified = record_data.get('date_modified')
-            related_source_str = record_data.get('related_source')
-            related_source = related_source_str.split(',') if related_source_str else []
-            see_also_str = record_data.get('see_also')
-            see_also = see_also_str.split(',') if see_also_str else []
-            description = record_data.get('description')
-            soil_moisture_vwc = record_data.get('soil_moisture_vwc')
-            soil_moisture_ec = record_data.get('soil_moisture_ec')
-            soil_salinity = record_data.get('soil_salinity')
-            leaf_wetness = record_data.get('leaf_wetness')
-            leaf_relative_humidity = record_data.get('leaf_relative_humidity')
-            leaf_temperature = record_data.get('leaf_temperature')
-            solar_radiation = record_data.get('solar_radiation')
-            atmospheric_pressure = record_data.get('atmospheric_pressure')
-            has_device_str = record_data.get('has_device')
-            has_device = has_device_str.split(',') if has_device_str else []
-            observed_at = record_data.get('observed_at')
-            soil_salinity_unit = record_data.get('soil_salinity_unit')
-            soil_salinity_timestamp = record_data.get('soil_salinity_timestamp')
-            leaf_wetness_unit = record_data.get('leaf_wetness_unit')
-            leaf_wetness_timestamp = record_data.get('leaf_wetness_timestamp')
-            leaf_temperature_unit = record_data.get('leaf_temperature_unit')
-            leaf_temperature_timestamp = record_data.get('leaf_temperature_timestamp')
-            solar_radiation_unit = record_data.get('solar_radiation_unit')
-            solar_radiation_timestamp = record_data.get('solar_radiation_timestamp')
-            atmospheric_pressure_unit = record_data.get('atmospheric_pressure_unit')
-            atmospheric_pressure_timestamp = record_data.get('atmospheric_pressure_timestamp')
-            soil_moisture_vwc_unit = record_data.get('soil_moisture_vwc_unit')
-            soil_moisture_vwc_timestamp = record_data.get('soil_moisture_vwc_timestamp')
-            soil_moisture_ec_unit = record_data.get('soil_moisture_ec_unit')
-            soil_moisture_ec_timestamp = record_data.get('soil_moisture_ec_timestamp')
-            leaf_relative_humidity_unit = record_data.get('leaf_relative_humidity_unit')
-            leaf_relative_humidity_timestamp = record_data.get('leaf_relative_humidity_timestamp')
-            depth = record_data.get('depth')
-            depth_unit_code = record_data.get('depth_unit_code')
-            timestamp = record_data.get('timestamp')
-
-            new_record = AgriParcelRecord(
-                id=id,
-                date_created=date_created,
-                date_modified=date_modified,
-                has_agri_parcel=has_agri_parcel,
-                type_location=type_location,
-                location = location,
-                soil_temperature=soil_temperature,
-                soil_temperature_unit=soil_temperature_unit,
-                air_temperature=air_temperature,
-                air_temperature_unit=air_temperature_unit,
-                air_temperature_timestamp = air_temperature_timestamp,
-                relative_humidity=relative_humidity,
-                relative_humidity_unit=relative_humidity_unit,
-                relative_humidity_timestamp=relative_humidity_timestamp,
-                description=description,
-                related_source=related_source,
-                see_also=see_also,
-                soil_moisture_vwc=soil_moisture_vwc,
-                soil_moisture_ec=soil_moisture_ec,
-                soil_salinity=soil_salinity,
-                leaf_wetness=leaf_wetness,
-                leaf_relative_humidity=leaf_relative_humidity,
-                leaf_temperature=leaf_temperature,
-                solar_radiation=solar_radiation,
-                atmospheric_pressure=atmospheric_pressure,
-                has_device=has_device,
-                observed_at=observed_at,
-                soil_salinity_unit= soil_salinity_unit,
-                soil_salinity_timestamp = soil_salinity_timestamp,
-                leaf_wetness_unit = leaf_wetness_unit,
-                leaf_wetness_timestamp = leaf_wetness_timestamp,
-                leaf_temperature_unit = leaf_temperature_unit,
-                leaf_temperature_timestamp = leaf_temperature_timestamp,
-                solar_radiation_unit = solar_radiation_unit,
-                solar_radiation_timestamp = solar_radiation_timestamp,
-                atmospheric_pressure_unit = atmospheric_pressure_unit,
-                atmospheric_pressure_timestamp = atmospheric_pressure_timestamp,
-                soil_moisture_vwc_unit = soil_moisture_vwc_unit,
-                soil_moisture_vwc_timestamp = soil_moisture_vwc_timestamp,
-                soil_moisture_ec_unit = soil_moisture_ec_unit,
-                soil_moisture_ec_timestamp = soil_moisture_ec_timestamp,
-                leaf_relative_humidity_unit = leaf_relative_humidity_unit,
-                leaf_relative_humidity_timestamp= leaf_relative_humidity_timestamp,
-                depth=depth,
-                depth_unit=depth_unit_code,
-                timestamp=timestamp
-            )
-            
-            smart_data_model = new_record.to_smart_data_model()
-
-        send_to_kong("AgriParcelRecord", smart_data_model)
-        return smart_data_model, 201
+        return ingest_entity("AgriParcelRecord", AgriParcelRecord, record_data)
+
+
+@ns_smart_data_models.doc(security='Bearer Auth')
+@ns_smart_data_models.route('/agri_parcel_record/columns')
+class AgriParcelRecordColumnsResource(Resource):
+    @api_key_required
+    @idempotent(idempotency_store)
+    @ns_smart_data_models.response(200, 'Every record was upserted.')
+    @ns_smart_data_models.response(207, 'Some records were invalid or rejected by the context broker.')
+    @ns_smart_data_models.response(501, 'NumPy is not installed.')
+    def post(self):
+        if not columnar.available():
+            return {"error": "Columnar uploads need NumPy installed."}, 501
+        try:
+            entities, errors = columnar.ColumnarBatch(request.get_json(silent=True), max_rows=BATCH_MAX_ITEMS).to_smart_data_models()
+        except PayloadError as e:
+            return e.body, 400
+
+        results = [{"index": index, "status": "invalid", "errors": messages} for index, messages in errors.items()]
+        sent = upsert_entities([entity for _, entity in entities])
+        results += [{"index": index, **result} for (index, _), result in zip(entities, sent)]
+        return batch_response(sorted(results, key=lambda result: result["index"]))
 
 agri_soil_model = ns_smart_data_models.model('AgriSoil', {
     'id': fields.String(required=True, description='Unique Identifier for the soil', example="urn:ngsi-ld:AgriSoil:12345"),
@@ -904,55 +631,12 @@ agri_soil_model = ns_smart_data_models.model('AgriSoil', {
 @ns_smart_data_models.route('/agri_soil')
 class AgriSoilResource(Resource):
     @api_key_required
+    @idempotent(idempotency_store)
     @ns_smart_data_models.expect(agri_soil_model, validate=False)
     @ns_smart_data_models.response(201, 'AgriSoil successfully created.')
     def post(self):
         soil_data = request.get_json()
-        is_smart_data_model = 'id' in soil_data and 'type' in soil_data
-        if is_smart_data_model:
-            smart_data_model = soil_data
-            is_valid, error_message = AgriSoil.validate_smart_data_model(smart_data_model)
-            if not is_valid:
-                return jsonify({"error": error_message}), 400
-        else:
-            id = soil_data.get('id')
-            name = soil_data.get('name')
-
-            error_messages = []
-            if not id:
-                logging.info("id")
-                error_messages.append("Id is missing")
-            if not name:
-                error_messages.append("Name is missing")
-            if error_messages:
-                return jsonify({"errors": error_messages}), 400
-            date_created = soil_data.get('date_created')
-            date_modified = soil_data.get('date_modified')
-            alternate_name = soil_data.get('alternate_name')
-            description = soil_data.get('description')
-            agro_voc_concept = soil_data.get('agro_voc_concept')
-            see_also = soil_data.get('see_also').split(',') if soil_data.get('see_also') else []
-            related_source = soil_data.get('related_source').split(',') if soil_data.get('related_source') else []
-            has_agri_product_type = soil_data.get('has_agri_product_type').split(',') if soil_data.get('has_agri_product_type') else []
-            
-
-            new_soil = AgriSoil(
-                id=id,
-                date_created=date_created,
-                date_modified=date_modified,
-                name=name,
-                alternate_name=alternate_name,
-                description=description,
-                agro_voc_concept=agro_voc_concept,
-                see_also=see_also,
-                related_source=related_source,
-                has_agri_product_type=has_agri_product_type
-            )
-            
-            smart_data_model = new_soil.to_smart_data_model()
-        
-        send_to_kong("AgriSoil", smart_data_model)
-        return smart_data_model, 201
+        return ingest_entity("AgriSoil", AgriSoil, soil_data)
 
 agri_soil_state_model = ns_smart_data_models.model('AgriSoilState', {
     'id': fields.String(required=True, description='Unique Identifier for the Soil State', example="urn:ngsi-ld:AgriSoilState:12345"),
@@ -982,86 +666,12 @@ agri_soil_state_model = ns_smart_data_models.model('AgriSoilState', {
 @ns_smart_data_models.route('/agri_soil_state')
 class AgriSoilStateResource(Resource):
     @api_key_required
+    @idempotent(idempotency_store)
     @ns_smart_data_models.expect(agri_soil_state_model, validate=False)
     @ns_smart_data_models.response(201, 'AgriSoilState successfully created.')
     def post(self):
         soil_state_data = request.get_json()
-        is_smart_data_model = 'id' in soil_state_data and 'type' in soil_state_data
-        if is_smart_data_model:
-            smart_data_model = soil_state_data
-            is_valid, error_message = AgriSoilState.validate_smart_data_model(smart_data_model)
-            if not is_valid:
-                return jsonify({"error": error_message}), 400
-        else:
-            id = soil_state_data.get('id')
-            date_of_measurement = soil_state_data.get('date_of_measurement')
-            acidity = soil_state_data.get('acidity')
-            acidity_unit_code = soil_state_data.get('acidity_unit_code')
-            acidity_timestamp = soil_state_data.get('acidity_timestamp')
-            humus = soil_state_data.get('humus')
-            humus_unit_code = soil_state_data.get('humus_unit_code')
-            humus_timestamp = soil_state_data.get('humus_timestamp')
-
-
-            error_messages = []
-            if not id:
-                logging.info("id")
-                error_messages.append("Id is missing")
-            if not date_of_measurement:
-                error_messages.append("Date of measurement is missing")
-            if not acidity:
-                error_messages.append("Acidity is missing")
-            if not acidity_unit_code:
-                error_messages.append("Acidity Unit Code is missing")
-            if not acidity_timestamp:
-                error_messages.append("Acidity timestamp is missing")
-            if not humus:
-                error_messages.append("Humus is missing")
-            if not humus_unit_code:
-                error_messages.append("Humus Unit Code is missing")
-            if not humus_timestamp:
-                error_messages.append("Humus Timestamp is missing")
-            if error_messages:
-                return jsonify({"errors": error_messages}), 400
-            date_created = soil_state_data.get('date_created')
-            date_modified = soil_state_data.get('date_modified')
-            electrical_conductivity = soil_state_data.get('electrical_conductivity')
-            electrical_conductivity_unit = soil_state_data.get('electrical_conductivity_unit')
-            electrical_conductivity_timestamp = soil_state_data.get('electrical_conductivity_timestamp')
-            density = soil_state_data.get('density')
-            density_unit = soil_state_data.get('density_unit')
-            density_timestamp = soil_state_data.get('density_timestamp')
-            has_agri_soil = soil_state_data.get('has_agri_soil')
-            has_agri_parcel = soil_state_data.get('has_agri_parcel')
-            has_agri_greenhouse = soil_state_data.get('has_agri_greenhouse')
-            
-
-            new_soil_state = AgriSoilState(
-                id=id,
-                date_created=date_created,
-                date_modified=date_modified,
-                date_of_measurement=date_of_measurement,
-                acidity=acidity,
-                acidity_unit=acidity_unit_code,
-                acidity_timestamp=acidity_timestamp,
-                humus=humus,
-                humus_unit=humus_unit_code,
-                humus_timestamp=humus_timestamp,
-                electrical_conductivity=electrical_conductivity,
-                electrical_conductivity_unit=electrical_conductivity_unit,
-                electrical_conductivity_timestamp=electrical_conductivity_timestamp,
-                density=density,
-                density_unit=density_unit,
-                density_timestamp=density_timestamp,
-                has_agri_soil=has_agri_soil,
-                has_agri_parcel=has_agri_parcel,
-                has_agri_greenhouse=has_agri_greenhouse
-            )
-            
-            smart_data_model = new_soil_state.to_smart_data_model()
-
-        send_to_kong("AgriSoilState", smart_data_model)
-        return smart_data_model, 201
+        return ingest_entity("AgriSoilState", AgriSoilState, soil_state_data)
 
 
 agri_yeld_model = ns_smart_data_models.model('AgriYeld', {
@@ -1081,65 +691,12 @@ agri_yeld_model = ns_smart_data_models.model('AgriYeld', {
 @ns_smart_data_models.route('/agri_yeld')
 class AgriYeldResource(Resource):
     @api_key_required
+    @idempotent(idempotency_store)
     @ns_smart_data_models.expect(agri_yeld_model, validate=False)
     @ns_smart_data_models.response(201, 'AgriYeld successfully created.')
     def post(self):
         yeld_data = request.get_json()
-
-        is_smart_data_model = 'id' in yeld_data and 'type' in yeld_data
-        if is_smart_data_model:
-            smart_data_model = yeld_data
-            is_valid, error_message = AgriYeld.validate_smart_data_model(smart_data_model)
-            if not is_valid:
-                return jsonify({"error": error_message}), 400
-        else:
-            id = yeld_data.get('id')
-            start_date_of_gathering_at = yeld_data.get('start_date_of_gathering_at')
-            end_date_of_gathering_at = yeld_data.get('end_date_of_gathering_at')
-            yeld_value = yeld_data.get('yeld_value')
-            yeld_max_value = yeld_data.get('yeld_max_value')
-            yeld_min_value = yeld_data.get('yeld_min_value')
-            yeld_unit_text = yeld_data.get('yeld_unit_text')
-
-            error_messages = []
-            if not id:
-                logging.info("id")
-                error_messages.append("Id is missing")
-            if not start_date_of_gathering_at:
-                error_messages.append("Start date of gathering is missing")
-            if not end_date_of_gathering_at:
-                error_messages.append("End date of gathering is missing")
-            if not yeld_value:
-                error_messages.append("Yeld value is missing")
-            if not yeld_max_value:
-                error_messages.append("Yeld max value is missing")
-            if not yeld_min_value:
-                error_messages.append("Yeld min value is missing")
-            if not yeld_unit_text:
-                error_messages.append("Yeld unit value is missing")
-            if error_messages:
-                return jsonify({"errors": error_messages}), 400
-            has_agri_crop = yeld_data.get('has_agri_crop')
-            has_agri_parcel = yeld_data.get('has_agri_parcel')
-
-            
-
-            new_yeld = AgriYeld(
-                id=id,
-                has_agri_crop=has_agri_crop,
-                has_agri_parcel=has_agri_parcel,
-                start_date_of_gathering_at=start_date_of_gathering_at,
-                end_date_of_gathering_at=end_date_of_gathering_at,
-                yeld_value=yeld_value,
-                yeld_max_value=yeld_max_value,
-                yeld_min_value=yeld_min_value,
-                yeld_unit_text=yeld_unit_text
-            )
-
-            smart_data_model = new_yeld.to_smart_data_model()
-        
-        send_to_kong("AgriYeld", smart_data_model)
-        return smart_data_model, 201
+        return ingest_entity("AgriYeld", AgriYeld, yeld_data)
 
 agri_carbon_footprint_model = ns_smart_data_models.model('AgriCarbonFootprint', {
     'id': fields.String(required=True, description='Unique Identifier for the carbon footprint', example="urn:ngsi-ld:AgriCarbonFootprint:12345"),
@@ -1159,68 +716,12 @@ agri_carbon_footprint_model = ns_smart_data_models.model('AgriCarbonFootprint',
 @ns_smart_data_models.route('/agri_carbon_footprint')
 class AgriCarbonFootprintResource(Resource):
     @api_key_required
+    @idempotent(idempotency_store)
     @ns_smart_data_models.expect(agri_carbon_footprint_model, validate=False)
     @ns_smart_data_models.response(201, 'AgriCarbonFootprint successfully created.')
     def post(self):
         carbon_footprint_data = request.get_json()
-        is_smart_data_model = 'id' in carbon_footprint_data and 'type' in carbon_footprint_data
-        if is_smart_data_model:
-            smart_data_model = carbon_footprint_data
-            is_valid, error_message = AgriCarbonFootPrint.validate_smart_data_model(smart_data_model)
-            if not is_valid:
-                return jsonify({"error": error_message}), 400
-        else:
-            id = carbon_footprint_data.get('id')
-            carbon_footprint_value = carbon_footprint_data.get('carbon_footprint_value')
-            carbon_footprint_accuracy_percent = carbon_footprint_data.get('carbon_footprint_accuracy_percent')
-            carbon_footprint_min_value = carbon_footprint_data.get('carbon_footprint_min_value')
-            carbon_footprint_unit_text = carbon_footprint_data.get('carbon_footprint_unit_text')
-            estimation_start_at = carbon_footprint_data.get('estimation_start_at')
-            estimation_end_at = carbon_footprint_data.get('estimation_end_at')
-
-            error_messages = []
-            if not id:
-                logging.info("id")
-                error_messages.append("Id is missing")
-            if not carbon_footprint_value:
-                error_messages.append("Carbon footprint value is missing")
-            if not carbon_footprint_accuracy_percent:
-                error_messages.append("Carbon footprint accuracy percent is missing")
-            if not carbon_footprint_min_value:
-                error_messages.append("Carbon footprint min value is missing")
-            if not carbon_footprint_unit_text:
-                error_messages.append("Carbon footprint unit text is missing")
-            if not estimation_start_at:
-                error_messages.append("Estimation start date is missing")
-            if not estimation_end_at:
-                error_messages.append("Estimation end date is missing")
-            if error_messages:
-                return jsonify({"errors": error_messages}), 400
-            has_agri_crop = carbon_footprint_data.get('has_agri_crop')
-            has_agri_parcel = carbon_footprint_data.get('has_agri_parcel')
-            has_agri_yeld = carbon_footprint_data.get('has_agri_yeld')
-            carbon_footprint_accuracy_percent = carbon_footprint_data.get('carbon_footprint_accuracy_percent')
-            carbon_footprint_min_value = carbon_footprint_data.get('carbon_footprint_min_value')
-            carbon_footprint_unit_text = carbon_footprint_data.get('carbon_footprint_unit_text')
-
-
-            new_carbon_footprint_data = AgriCarbonFootPrint(
-                id=id,
-                has_agri_crop=has_agri_crop,
-                has_agri_parcel=has_agri_parcel,
-                has_agri_yeld=has_agri_yeld,
-                carbon_footprint_value=carbon_footprint_value,
-                carbon_footprint_accuracy_percent=carbon_footprint_accuracy_percent,
-                carbon_footprint_min_value=carbon_footprint_min_value,
-                carbon_footprint_unit_text=carbon_footprint_unit_text,
-                estimation_start_at=estimation_start_at,
-                estimation_end_at=estimation_end_at
-            )
-
-            smart_data_model = new_carbon_footprint_data.to_smart_data_model()
-        
-        send_to_kong("AgriCarbonFootPrint", smart_data_model)
-        return smart_data_model, 201
+        return ingest_entity("AgriCarbonFootPrint", AgriCarbonFootPrint, carbon_footprint_data)
 
 
 agri_app_model = ns_smart_data_models.model('AgriApp', {
@@ -1250,51 +751,12 @@ agri_app_model = ns_smart_data_models.model('AgriApp', {
 @ns_smart_data_models.route('/agri_app')
 class AgriAppResource(Resource):
     @api_key_required
+    @idempotent(idempotency_store)
     @ns_smart_data_models.expect(agri_app_model, validate=False)
     @ns_smart_data_models.response(201, 'AgriApp successfully created.')
     def post(self):
         app_data = request.get_json()
-        is_smart_data_model = 'id' in app_data and 'type' in app_data
-        if is_smart_data_model:
-            smart_data_model = app_data
-            is_valid, error_message = AgriApp.validate_smart_data_model(smart_data_model)
-            if not is_valid:
-                return jsonify({"error": error_message}), 400
-        else:
-            error_messages = []
-            if 'id' not in app_data:
-                error_messages.append("ID is missing")
-            if 'type' not in app_data:
-                error_messages.append("Type is missing")
-
-            if error_messages:
-                return jsonify({"errors": error_messages}), 400
-
-
-            new_app_data = AgriApp(id=app_data['id'], type=app_data['type'],
-                       address=app_data.get('address'),
-                       alternateName=app_data.get('alternateName'),
-                       areaServed=app_data.get('areaServed'),
-                       category=app_data.get('category'),
-                       dataProvider=app_data.get('dataProvider'),
-                       dateCreated=app_data.get('dateCreated'),
-                       dateModified=app_data.get('dateModified'),
-                       description=app_data.get('description'),
-                       endpoint=app_data.get('endpoint'),
-                       hasProvider=app_data.get('hasProvider'),
-                       location=app_data.get('location'),
-                       name=app_data.get('name'),
-                       owner=app_data.get('owner'),
-                       relatedSource=app_data.get('relatedSource'),
-                       seeAlso=app_data.get('seeAlso'),
-                       source=app_data.get('source'),
-                       version=app_data.get('version'))
-
-
-            smart_data_model = new_app_data.to_smart_data_model()
-
-        send_to_kong("AgriApp", smart_data_model)
-        return smart_data_model, 201
+        return ingest_entity("AgriApp", AgriApp, app_data)
 
 
 building_model = ns_smart_data_models.model('Building', {
@@ -1329,57 +791,12 @@ building_model = ns_smart_data_models.model('Building', {
 @ns_smart_data_models.route('/building')
 class BuildingResource(Resource):
     @api_key_required
+    @idempotent(idempotency_store)
     @ns_smart_data_models.expect(building_model, validate=False)  
     @ns_smart_data_models.response(201, 'Building successfully created.')
     def post(self):
         building_data = request.get_json()
-        is_smart_data_model = 'id' in building_data and 'type' in building_data
-        if is_smart_data_model:
-            smart_data_model = building_data
-            is_valid, error_message = Building.validate_smart_data_model(smart_data_model)
-            if not is_valid:
-                return jsonify({"error": error_message}), 400
-        else:
-            error_messages = []
-
-            for field in ['id', 'type', 'address', 'category']:
-                if field not in building_data:
-                    error_messages.append(f"{field} is missing")
-
-            if error_messages:
-                return jsonify({"errors": error_messages}), 400
-
-            new_building_data = Building(
-                id=building_data['id'],
-                type=building_data['type'],
-                address=building_data['address'],
-                category=building_data['category'],
-                alternateName=building_data.get('alternateName'),
-                areaServed=building_data.get('areaServed'),
-                collapseRisk=building_data.get('collapseRisk'),
-                containedInPlace=building_data.get('containedInPlace'),
-                dataProvider=building_data.get('dataProvider'),
-                dateCreated=building_data.get('dateCreated'),
-                dateModified=building_data.get('dateModified'),
-                description=building_data.get('description'),
-                floorsAboveGround=building_data.get('floorsAboveGround'),
-                floorsBelowGround=building_data.get('floorsBelowGround'),
-                location=building_data.get('location'),
-                name=building_data.get('name'),
-                occupier=building_data.get('occupier'),
-                openingHours=building_data.get('openingHours'),
-                owner=building_data.get('owner'),
-                peopleCapacity=building_data.get('peopleCapacity'),
-                peopleOccupancy=building_data.get('peopleOccupancy'),
-                refMap=building_data.get('refMap'),
-                seeAlso=building_data.get('seeAlso'),
-                source=building_data.get('source')
-            )
-
-            smart_data_model = new_building_data.to_smart_data_model()
-
-        send_to_kong("Building", smart_data_model)  
-        return smart_data_model, 201
+        return ingest_entity("Building", Building, building_data)
     
 person_model = ns_smart_data_models.model('Person', {
     'additionalName': fields.String(description='An additional name for a person', example='John Jr.'),
@@ -1409,412 +826,253 @@ person_model = ns_smart_data_models.model('Person', {
 class PersonResource(Resource):
 
     @api_key_required
+    @idempotent(idempotency_store)
     @ns_smart_data_models.expect(person_model, validate=False)
     @ns_smart_data_models.response(201, 'Person successfully created.')
     def post(self):
         person_data = request.get_json()
-        is_smart_data_model = 'id' in person_data and 'type' in person_data
-        if is_smart_data_model:
-            smart_data_model = person_data
-            is_valid, error_message = Person.validate_smart_data_model(smart_data_model)
-            if not is_valid:
-                return jsonify({"error": error_message}), 400
-        else:
-            error_messages = []
-
-            for field in ['id', 'type', 'familyName', 'givenName']:
-                if field not in person_data:
-                    error_messages.append(f"{field} is missing")
-
-            if error_messages:
-                return jsonify({"errors": error_messages}), 400
-
-            new_person_data = Person(
-                id=person_data['id'],
-                type=person_data['type'],
-                additionalName=person_data.get('additionalName'),
-                address=person_data.get('address'),
-                alternateName=person_data.get('alternateName'),
-                areaServed=person_data.get('areaServed'),
-                dataProvider=person_data.get('dataProvider'),
-                dateCreated=person_data.get('dateCreated'),
-                dateModified=person_data.get('dateModified'),
-                description=person_data.get('description'),
-                email=person_data.get('email'),
-                familyName=person_data['familyName'],
-                givenName=person_data['givenName'],
-                location=person_data.get('location'),
-                name=person_data.get('name'),
-                owner=person_data.get('owner'),
-                seeAlso=person_data.get('seeAlso'),
-                source=person_data.get('source'),
-                telephone=person_data.get('telephone')
-            )
-
-            smart_data_model = new_person_data.to_smart_data_model()
-
-        send_to_kong("Person", smart_data_model)  
-        return smart_data_model, 201
+        return ingest_entity("Person", Person, person_data)
+
+
+
+@ns_smart_data_models.doc(security='Bearer Auth')
+@ns_smart_data_models.route('/batch/<entity_type>')
+@ns_smart_data_models.param('entity_type', 'Entity type of every item, e.g. AgriParcelRecord')
+class BatchResource(Resource):
+    @api_key_required
+    @idempotent(idempotency_store)
+    @ns_smart_data_models.response(200, 'Every entity was upserted.')
+    @ns_smart_data_models.response(207, 'Some entities were invalid or rejected by the context broker.')
+    def post(self, entity_type):
+        try:
+            entity_type, model_class = get_smart_data_model(entity_type)
+            items = read_batch_items()
+        except PayloadError as e:
+            return e.body, 400
+        return ingest_batch(items, lambda item: (entity_type, model_class, item))
+
+
+def resolve_mixed_batch_item(item):
+    # Flat payloads name their model in "entity_type", NGSI-LD entities in "type".
+    if not isinstance(item, dict):
+        raise PayloadError({"error": "The payload must be a JSON object."})
+    if 'entity_type' in item:
+        data = dict(item)
+        entity_type, model_class = get_smart_data_model(data.pop('entity_type'))
+        return entity_type, model_class, data
+    if 'type' in item:
+        entity_type, model_class = get_smart_data_model(item['type'])
+        return entity_type, model_class, item
+    raise PayloadError({"error": "Each item needs an \"entity_type\" or a \"type\"."})
+
+
+@ns_smart_data_models.doc(security='Bearer Auth')
+@ns_smart_data_models.route('/batch')
+class MixedBatchResource(Resource):
+    @api_key_required
+    @idempotent(idempotency_store)
+    @ns_smart_data_models.response(200, 'Every entity was upserted.')
+    @ns_smart_data_models.response(207, 'Some entities were invalid or rejected by the context broker.')
+    def post(self):
+        try:
+            items = read_batch_items()
+        except PayloadError as e:
+            return e.body, 400
+        return ingest_batch(items, resolve_mixed_batch_item)
+
+
+@ns_smart_data_models.doc(security='Bearer Auth')
+@ns_smart_data_models.route('/bundle')
+class BundleResource(Resource):
+    @api_key_required
+    @idempotent(idempotency_store)
+    @ns_smart_data_models.response(200, 'Every entity was written.')
+    @ns_smart_data_models.response(207, 'Some entities were rejected by the context broker, or skipped because an entity they reference was.')
+    @ns_smart_data_models.response(400, 'Some payloads are not valid; nothing was written.')
+    def post(self):
+        try:
+            items = read_batch_items()
+        except PayloadError as e:
+            return e.body, 400
+        return ingest_bundle(items)
+
+
+
 
+@ns_smart_data_models.doc(security='Bearer Auth')
+@ns_smart_data_models.route('/stream/<entity_type>')
+@ns_smart_data_models.param('entity_type', 'Entity type of every line, e.g. AgriParcelRecord')
+class StreamResource(Resource):
+    @api_key_required
+    @ns_smart_data_models.response(200, 'Every line was upserted.')
+    @ns_smart_data_models.response(207, 'Some lines were invalid or rejected by the context broker.')
+    def post(self, entity_type):
+        try:
+            entity_type, model_class = get_smart_data_model(entity_type)
+        except PayloadError as e:
+            return e.body, 400
+        return ingest_stream(request.stream, lambda item: (entity_type, model_class, item))
+
+
+@ns_smart_data_models.doc(security='Bearer Auth')
+@ns_smart_data_models.route('/stream')
+class MixedStreamResource(Resource):
+    @api_key_required
+    @ns_smart_data_models.response(200, 'Every line was upserted.')
+    @ns_smart_data_models.response(207, 'Some lines were invalid or rejected by the context broker.')
+    def post(self):
+        return ingest_stream(request.stream, resolve_mixed_batch_item)
+
+
+
+
+@ns_smart_data_models.doc(security='Bearer Auth')
+@ns_smart_data_models.route('/ingest-status/<tracking_id>')
+@ns_smart_data_models.param('tracking_id', 'Tracking id returned when the entity was queued')
+class IngestStatusResource(Resource):
+    @api_key_required
+    @ns_smart_data_models.response(200, 'State of the queued entity.')
+    @ns_smart_data_models.response(404, 'Unknown tracking id.')
+    def get(self, tracking_id):
+        if not WRITE_BEHIND_ENABLED:
+            return {"error": "The write-behind queue is disabled."}, 404
+        status = write_behind_queue.status(tracking_id)
+        if status is None:
+            return {"error": f"Unknown tracking id: {tracking_id}"}, 404
+        return status, 200
+
+
+
+
+AGRIFOOD_CONTEXT = {
+    "@context": {
+        "AgriFarm": "https://smartdatamodels.org/dataModel.Agrifood/AgriFarm",
+        "AgriCrop": "https://smartdatamodels.org/dataModel.Agrifood/AgriCrop",
+        "AgriParcel": "https://smartdatamodels.org/dataModel.Agrifood/AgriParcel",
+        "AgriParcelOperation": "https://smartdatamodels.org/dataModel.Agrifood/AgriParcelOperation",
+        "AgriParcelRecord": "https://smartdatamodels.org/dataModel.Agrifood/AgriParcelRecord",
+        "AgriSoil": "https://smartdatamodels.org/dataModel.Agrifood/AgriSoil",
+        "AgriSoilState": AGRI_SOIL_STATE_URL,
+        "AgriGreenhouse": "https://smartdatamodels.org/dataModel.Agrifood/AgriGreenhouse",
+        "AgriYeld": AGRI_YIELD_URL,
+        "AgriCarbonFootprint": AGRI_CARBON_FOOTPRINT_URL,
+        "AgriApp": "https://smartdatamodels.org/dataModel.Agrifood/AgriApp",
+        "AgriPest": "https://smartdatamodels.org/dataModel.Agrifood/AgriPest",
+        "AgriProductType": "https://smartdatamodels.org/dataModel.Agrifood/AgriProductType",
+        "address": "https://smartdatamodels.org/address",
+        "agroVocConcept": "https://smartdatamodels.org/dataModel.Agrifood/agroVocConcept",
+        "alternateName": "https://smartdatamodels.org/alternateName",
+        "atmosphericPressure": "https://smartdatamodels.org/dataModel.Agrifood/atmosphericPressure",
+        "belongsTo": "https://smartdatamodels.org/dataModel.Agrifood/belongsTo",
+        "buildingId": "https://smartdatamodels.org/dataModel.Agrifood/buildingId",
+        "category": "https://smartdatamodels.org/dataModel.Agrifood/category",
+        "co2": "https://smartdatamodels.org/dataModel.Agrifood/co2",
+        "contactPoint": "https://smartdatamodels.org/contactPoint",
+        "cropStatus": "https://smartdatamodels.org/dataModel.Agrifood/cropStatus",
+        "dailyLight": "https://smartdatamodels.org/dataModel.Agrifood/dailyLight",
+        "date": "https://smartdatamodels.org/dataModel.Agrifood/date",
+        "dateCreated": "https://smartdatamodels.org/dateCreated",
+        "dateModified": "https://smartdatamodels.org/dateModified",
+        "depth": "https://smartdatamodels.org/dataModel.Agrifood/depth",
+        "description": "http://purl.org/dc/terms/description",
+        "drainFlow": "https://smartdatamodels.org/dataModel.Agrifood/drainFlow",
+        "endedAt": "https://smartdatamodels.org/dataModel.Agrifood/endedAt",
+        "farm": "https://smartdatamodels.org/dataModel.Agrifood/farm",
+        "farmId": "https://smartdatamodels.org/dataModel.Agrifood/farmId",
+        "harvestingInterval": "https://smartdatamodels.org/dataModel.Agrifood/harvestingInterval",
+        "hasAgriCrop": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriCrop",
+        "hasAgriFertiliser": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriFertiliser",
+        "hasAgriParcel": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriParcel",
+        "hasAgriParcelChildren": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriParcelChildren",
+        "hasAgriParcelParent": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriParcelParent",
+        "hasAgriPest": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriPest",
+        "hasAgriProductType": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriProductType",
+        "hasAgriProductTypeChildren": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriProductTypeChildren",
+        "hasAgriProductTypeParent": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriProductTypeParent",
+        "hasAgriSoil": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriSoil",
+        "hasAirQualityObserved": "https://smartdatamodels.org/dataModel.Agrifood/hasAirQualityObserved",
+        "hasBuilding": "https://smartdatamodels.org/dataModel.Agrifood/hasBuilding",
+        "hasDevice": "https://smartdatamodels.org/dataModel.Agrifood/hasDevice",
+        "hasOperator": "https://smartdatamodels.org/dataModel.Agrifood/hasOperator",
+        "hasWaterQualityObserved": "https://smartdatamodels.org/dataModel.Agrifood/hasWaterQualityObserved",
+        "hasWeatherObserved": "https://smartdatamodels.org/dataModel.Agrifood/hasWeatherObserved",
+        "humidity": "https://smartdatamodels.org/dataModel.Agrifood/humidity",
+        "irrigationRecord": "https://smartdatamodels.org/dataModel.Agrifood/irrigationRecord",
+        "irrigationSystemType": "https://smartdatamodels.org/dataModel.Agrifood/irrigationSystemType",
+        "landLocation": "https://smartdatamodels.org/dataModel.Agrifood/landLocation",
+        "lastPlantedAt": "https://smartdatamodels.org/dataModel.Agrifood/lastPlantedAt",
+        "leafRelativeHumidity": "https://smartdatamodels.org/dataModel.Agrifood/leafRelativeHumidity",
+        "leafTemperature": "https://smartdatamodels.org/dataModel.Agrifood/leafTemperature",
+        "leafWetness": "https://smartdatamodels.org/dataModel.Agrifood/leafWetness",
+        "location": "ngsi-ld:location",
+        "name": "https://smartdatamodels.org/name",
+        "ngsi-ld": "https://uri.etsi.org/ngsi-ld/",
+        "operationType": "https://smartdatamodels.org/dataModel.Agrifood/operationType",
+        "ownedBy": "https://smartdatamodels.org/dataModel.Agrifood/ownedBy",
+        "owner": "https://smartdatamodels.org/owner",
+        "parcel": "https://smartdatamodels.org/dataModel.Agrifood/parcel",
+        "plannedEndAt": "https://smartdatamodels.org/dataModel.Agrifood/plannedEndAt",
+        "plannedStartAt": "https://smartdatamodels.org/dataModel.Agrifood/plannedStartAt",
+        "plantingFrom": "https://smartdatamodels.org/dataModel.Agrifood/plantingFrom",
+        "quantity": "https://smartdatamodels.org/dataModel.Agrifood/quantity",
+        "relatedSource": "https://smartdatamodels.org/dataModel.Agrifood/relatedSource",
+        "relativeHumidity": "https://smartdatamodels.org/dataModel.Agrifood/relativeHumidity",
+        "reportedAt": "https://smartdatamodels.org/dataModel.Agrifood/reportedAt",
+        "result": "https://smartdatamodels.org/dataModel.Agrifood/result",
+        "seeAlso": "https://smartdatamodels.org/seeAlso",
+        "soilMoistureEC": "https://smartdatamodels.org/dataModel.Agrifood/soilMoistureEC",
+        "soilMoistureVwc": "https://smartdatamodels.org/dataModel.Agrifood/soilMoistureVwc",
+        "soilSalinity": "https://smartdatamodels.org/dataModel.Agrifood/soilSalinity",
+        "soilTemperature": "https://smartdatamodels.org/dataModel.Agrifood/soilTemperature",
+        "soilTextureType": "https://smartdatamodels.org/dataModel.Agrifood/soilTextureType",
+        "solarRadiation": "https://smartdatamodels.org/dataModel.Agrifood/solarRadiation",
+        "source": "https://smartdatamodels.org/source",
+        "startedAt": "https://smartdatamodels.org/dataModel.Agrifood/startedAt",
+        "status": "ngsi-ld:status",
+        "temperature": "https://smartdatamodels.org/dataModel.Agrifood/temperature",
+        "type": "@type",
+        "waterSource": "https://smartdatamodels.org/dataModel.Agrifood/waterSource",
+        "weight": "https://smartdatamodels.org/dataModel.Agrifood/weight",
+        "workRecord": "https://smartdatamodels.org/dataModel.Agrifood/workRecord",
+        "Person": "https://smartdatamodels.org/dataModel.Organization/Person",
+
+    }
+}
+
+agrifood_context = StaticDocument(AGRIFOOD_CONTEXT, mimetype="application/ld+json", max_age=STATIC_DOCUMENT_MAX_AGE)
+agri_soil_state_schema = StaticDocument(AGRI_SOIL_STATE_SCHEMA, max_age=STATIC_DOCUMENT_MAX_AGE)
+agri_yield_schema = StaticDocument(AGRI_YIELD_SCHEMA, max_age=STATIC_DOCUMENT_MAX_AGE)
+agri_carbon_footprint_schema = StaticDocument(AGRI_CARBON_FOOTPRINT_SCHEMA, max_age=STATIC_DOCUMENT_MAX_AGE)
 
 
 @ns_smart_data_models.route('/dataModel.Agrifood')
 class AgrifoodResource(Resource):
     @ns_smart_data_models.response(200, 'AgriFood model data successfully retrieved.')
+    @ns_smart_data_models.response(304, 'The document still matches the ETag sent in If-None-Match.')
     def get(self):
-        return {
-            "@context": {
-                "AgriFarm": "https://smartdatamodels.org/dataModel.Agrifood/AgriFarm",
-                "AgriCrop": "https://smartdatamodels.org/dataModel.Agrifood/AgriCrop",
-                "AgriParcel": "https://smartdatamodels.org/dataModel.Agrifood/AgriParcel",
-                "AgriParcelOperation": "https://smartdatamodels.org/dataModel.Agrifood/AgriParcelOperation",
-                "AgriParcelRecord": "https://smartdatamodels.org/dataModel.Agrifood/AgriParcelRecord",
-                "AgriSoil": "https://smartdatamodels.org/dataModel.Agrifood/AgriSoil",
-                "AgriSoilState": AGRI_SOIL_STATE_URL,
-                "AgriGreenhouse": "https://smartdatamodels.org/dataModel.Agrifood/AgriGreenhouse",
-                "AgriYeld": AGRI_YIELD_URL,
-                "AgriCarbonFootprint": AGRI_CARBON_FOOTPRINT_URL,
-                "AgriApp": "https://smartdatamodels.org/dataModel.Agrifood/AgriApp",
-                "AgriPest": "https://smartdatamodels.org/dataModel.Agrifood/AgriPest",
-                "AgriProductType": "https://smartdatamodels.org/dataModel.Agrifood/AgriProductType",
-                "address": "https://smartdatamodels.org/address",
-                "agroVocConcept": "https://smartdatamodels.org/dataModel.Agrifood/agroVocConcept",
-                "alternateName": "https://smartdatamodels.org/alternateName",
-                "atmosphericPressure": "https://smartdatamodels.org/dataModel.Agrifood/atmosphericPressure",
-                "belongsTo": "https://smartdatamodels.org/dataModel.Agrifood/belongsTo",
-                "buildingId": "https://smartdatamodels.org/dataModel.Agrifood/buildingId",
-                "category": "https://smartdatamodels.org/dataModel.Agrifood/category",
-                "co2": "https://smartdatamodels.org/dataModel.Agrifood/co2",
-                "contactPoint": "https://smartdatamodels.org/contactPoint",
-                "cropStatus": "https://smartdatamodels.org/dataModel.Agrifood/cropStatus",
-                "dailyLight": "https://smartdatamodels.org/dataModel.Agrifood/dailyLight",
-                "date": "https://smartdatamodels.org/dataModel.Agrifood/date",
-                "dateCreated": "https://smartdatamodels.org/dateCreated",
-                "dateModified": "https://smartdatamodels.org/dateModified",
-                "depth": "https://smartdatamodels.org/dataModel.Agrifood/depth",
-                "description": "http://purl.org/dc/terms/description",
-                "drainFlow": "https://smartdatamodels.org/dataModel.Agrifood/drainFlow",
-                "endedAt": "https://smartdatamodels.org/dataModel.Agrifood/endedAt",
-                "farm": "https://smartdatamodels.org/dataModel.Agrifood/farm",
-                "farmId": "https://smartdatamodels.org/dataModel.Agrifood/farmId",
-                "harvestingInterval": "https://smartdatamodels.org/dataModel.Agrifood/harvestingInterval",
-                "hasAgriCrop": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriCrop",
-                "hasAgriFertiliser": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriFertiliser",
-                "hasAgriParcel": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriParcel",
-                "hasAgriParcelChildren": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriParcelChildren",
-                "hasAgriParcelParent": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriParcelParent",
-                "hasAgriPest": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriPest",
-                "hasAgriProductType": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriProductType",
-                "hasAgriProductTypeChildren": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriProductTypeChildren",
-                "hasAgriProductTypeParent": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriProductTypeParent",
-                "hasAgriSoil": "https://smartdatamodels.org/dataModel.Agrifood/hasAgriSoil",
-                "hasAirQualityObserved": "https://smartdatamodels.org/dataModel.Agrifood/hasAirQualityObserved",
-                "hasBuilding": "https://smartdatamodels.org/dataModel.Agrifood/hasBuilding",
-                "hasDevice": "https://smartdatamodels.org/dataModel.Agrifood/hasDevice",
-                "hasOperator": "https://smartdatamodels.org/dataModel.Agrifood/hasOperator",
-                "hasWaterQualityObserved": "https://smartdatamodels.org/dataModel.Agrifood/hasWaterQualityObserved",
-                "hasWeatherObserved": "https://smartdatamodels.org/dataModel.Agrifood/hasWeatherObserved",
-                "humidity": "https://smartdatamodels.org/dataModel.Agrifood/humidity",
-                "irrigationRecord": "https://smartdatamodels.org/dataModel.Agrifood/irrigationRecord",
-                "irrigationSystemType": "https://smartdatamodels.org/dataModel.Agrifood/irrigationSystemType",
-                "landLocation": "https://smartdatamodels.org/dataModel.Agrifood/landLocation",
-                "lastPlantedAt": "https://smartdatamodels.org/dataModel.Agrifood/lastPlantedAt",
-                "leafRelativeHumidity": "https://smartdatamodels.org/dataModel.Agrifood/leafRelativeHumidity",
-                "leafTemperature": "https://smartdatamodels.org/dataModel.Agrifood/leafTemperature",
-                "leafWetness": "https://smartdatamodels.org/dataModel.Agrifood/leafWetness",
-                "location": "ngsi-ld:location",
-                "name": "https://smartdatamodels.org/name",
-                "ngsi-ld": "https://uri.etsi.org/ngsi-ld/",
-                "operationType": "https://smartdatamodels.org/dataModel.Agrifood/operationType",
-                "ownedBy": "https://smartdatamodels.org/dataModel.Agrifood/ownedBy",
-                "owner": "https://smartdatamodels.org/owner",
-                "parcel": "https://smartdatamodels.org/dataModel.Agrifood/parcel",
-                "plannedEndAt": "https://smartdatamodels.org/dataModel.Agrifood/plannedEndAt",
-                "plannedStartAt": "https://smartdatamodels.org/dataModel.Agrifood/plannedStartAt",
-                "plantingFrom": "https://smartdatamodels.org/dataModel.Agrifood/plantingFrom",
-                "quantity": "https://smartdatamodels.org/dataModel.Agrifood/quantity",
-                "relatedSource": "https://smartdatamodels.org/dataModel.Agrifood/relatedSource",
-                "relativeHumidity": "https://smartdatamodels.org/dataModel.Agrifood/relativeHumidity",
-                "reportedAt": "https://smartdatamodels.org/dataModel.Agrifood/reportedAt",
-                "result": "https://smartdatamodels.org/dataModel.Agrifood/result",
-                "seeAlso": "https://smartdatamodels.org/seeAlso",
-                "soilMoistureEC": "https://smartdatamodels.org/dataModel.Agrifood/soilMoistureEC",
-                "soilMoistureVwc": "https://smartdatamodels.org/dataModel.Agrifood/soilMoistureVwc",
-                "soilSalinity": "https://smartdatamodels.org/dataModel.Agrifood/soilSalinity",
-                "soilTemperature": "https://smartdatamodels.org/dataModel.Agrifood/soilTemperature",
-                "soilTextureType": "https://smartdatamodels.org/dataModel.Agrifood/soilTextureType",
-                "solarRadiation": "https://smartdatamodels.org/dataModel.Agrifood/solarRadiation",
-                "source": "https://smartdatamodels.org/source",
-                "startedAt": "https://smartdatamodels.org/dataModel.Agrifood/startedAt",
-                "status": "ngsi-ld:status",
-                "temperature": "https://smartdatamodels.org/dataModel.Agrifood/temperature",
-                "type": "@type",
-                "waterSource": "https://smartdatamodels.org/dataModel.Agrifood/waterSource",
-                "weight": "https://smartdatamodels.org/dataModel.Agrifood/weight",
-                "workRecord": "https://smartdatamodels.org/dataModel.Agrifood/workRecord",
-                "Person": "https://smartdatamodels.org/dataModel.Organization/Person",
-
-            }
-        }
+        return agrifood_context.response()
 
 
 
 @ns_smart_data_models.route('/dataModel.AgriSoilState/schema.json')
 class AgriSoilStateResource(Resource):
     @ns_smart_data_models.response(200, 'AgriSoilState model schema successfully retrieved.')
+    @ns_smart_data_models.response(304, 'The document still matches the ETag sent in If-None-Match.')
     def get(self):
-        return {
-                    "$schema": "http://json-schema.org/schema#",
-                    "$schemaVersion": "0.0.4",
-                    "modelTags": "",
-                    "$id": AGRI_SOIL_STATE_URL_SCHEMA,
-                    "title": "Smart Data Models - Agri Soil State",
-                    "description": "This entity contains a harmonised description of the soil state primarily associated with the agricultural vertical.",
-                    "type": "object",
-                    "properties": {
-                        "dateCreated": {
-                        "type": "string",
-                        "format": "date-time",
-                        "description": "Property. DateTime when the soil state was created."
-                        },
-                        "dateModified": {
-                        "type": "string",
-                        "format": "date-time",
-                        "description": "Property. DateTime when the soil state was last modified."
-                        },
-                        "dateOfMeasurement": {
-                        "type": "string",
-                        "format": "date-time",
-                        "description": "Property. DateTime when the measurements were taken."
-                        },
-                        "acidity": {
-                        "type": "number",
-                        "description": "Property. Acidity level of the soil.",
-                        "metadata": {
-                            "unitCode": {
-                            "type": "string",
-                            "enum": ["pH"]
-                            },
-                            "timestamp": {
-                            "type": "string",
-                            "format": "date-time"
-                            }
-                        }
-                        },
-                        "electricalConductivity": {
-                        "type": "number",
-                        "description": "Property. Electrical conductivity of the soil.",
-                        "metadata": {
-                            "unitCode": {
-                            "type": "string",
-                            "enum": ["ohm/meter"]
-                            },
-                            "timestamp": {
-                            "type": "string",
-                            "format": "date-time"
-                            }
-                        }
-                        },
-                        "density": {
-                        "type": "number",
-                        "description": "Property. Density of the soil.",
-                        "metadata": {
-                            "unitCode": {
-                            "type": "string",
-                            "enum": ["kg/m3"]
-                            },
-                            "timestamp": {
-                            "type": "string",
-                            "format": "date-time"
-                            }
-                        }
-                        },
-                        "humus": {
-                        "type": "number",
-                        "description": "Property. Humus content in the soil.",
-                        "metadata": {
-                            "unitCode": {
-                            "type": "string",
-                            "enum": ["percent"]
-                            },
-                            "timestamp": {
-                            "type": "string",
-                            "format": "date-time"
-                            }
-                        }
-                        },
-                        "hasAgriSoil": {
-                        "type": "string",
-                        "format": "uri",
-                        "description": "Relationship. Reference to the associated AgriSoil."
-                        },
-                        "hasAgriParcel": {
-                        "type": "string",
-                        "format": "uri",
-                        "description": "Relationship. Reference to the associated AgriParcel."
-                        },
-                        "hasAgriGreenhouse": {
-                        "type": "string",
-                        "format": "uri",
-                        "description": "Relationship. Reference to the associated AgriGreenhouse."
-                        }
-                    },
-                    "required": ["dateCreated", "dateModified", "dateOfMeasurement", "acidity", "humus"]
-                }
+        return agri_soil_state_schema.response()
 
 
 @ns_smart_data_models.route('/dataModel.AgriYeld/schema.json')
 class AgriYeldResource(Resource):
     @ns_smart_data_models.response(200, 'AgriYeld model schema successfully retrieved.')
+    @ns_smart_data_models.response(304, 'The document still matches the ETag sent in If-None-Match.')
     def get(self):
-        return {
-                    "$schema": "http://json-schema.org/schema#",
-                    "$schemaVersion": "0.0.4",
-                    "$id": AGRI_YIELD_URL_SCHEMA,
-                    "title": "Smart Data Models - AgriYeld",
-                    "description": "This entity contains a harmonised description of an agricultural yeld, capturing data about the produced amount from crops. It is associated with the agricultural vertical and IoT applications.",
-                    "type": "object",
-                    "allOf": [
-                        {
-                        "$ref": "https://smart-data-models.github.io/data-models/common-schema.json#/definitions/GSMA-Commons"
-                        },
-                        {
-                        "properties": {
-                            "type": {
-                            "type": "string",
-                            "enum": [
-                                "AgriYeld"
-                            ],
-                            "description": "Property. NGSI Entity Type. It has to be AgriYeld."
-                            },
-                            "hasAgriCrop": {
-                            "type": "string",
-                            "format": "uri",
-                            "description": "Relationship. Reference to the AgriCrop related to this yeld."
-                            },
-                            "hasAgriParcel": {
-                            "type": "string",
-                            "format": "uri",
-                            "description": "Relationship. Reference to the AgriParcel where the yeld was produced."
-                            },
-                            "startDateOfGatheringAt": {
-                            "type": "string",
-                            "format": "dateTime",
-                            "description": "Property. Start date of the gathering process."
-                            },
-                            "endDateOfGatheringAt": {
-                            "type": "string",
-                            "format": "dateTime",
-                            "description": "Property. End date of the gathering process."
-                            },
-                            "yeld": {
-                            "type": "object",
-                            "description": "Property. Information about the amount of produced yeld.",
-                            "properties": {
-                                "value": {
-                                "type": "number"
-                                },
-                                "maxValue": {
-                                "type": "number"
-                                },
-                                "minValue": {
-                                "type": "number"
-                                },
-                                "unitText": {
-                                "type": "string",
-                                "enum": ["Tons per hectare"]
-                                }
-                            },
-                            "required": ["value", "maxValue", "minValue", "unitText"]
-                            }
-                        },
-                        "required": [
-                            "type",
-                            "startDateOfGatheringAt",
-                            "endDateOfGatheringAt",
-                            "yeld"
-                        ]
-                        }
-                    ]
-                }
+        return agri_yield_schema.response()
 
 
 @ns_smart_data_models.route('/dataModel.AgriCarbonFootprint/schema.json')
 class AgriCarbonFootprintResource(Resource):
     @ns_smart_data_models.response(200, 'AgriCarbonFootprint model schema successfully retrieved.')
+    @ns_smart_data_models.response(304, 'The document still matches the ETag sent in If-None-Match.')
     def get(self):
-        return {
-                    "$schema": "http://json-schema.org/schema#",
-                    "$schemaVersion": "0.0.4",
-                    "$id": AGRI_CARBON_FOOTPRINT_URL_SCHEMA,
-                    "title": "Smart Data Models - AgriCarbonFootprint",
-                    "description": "This entity contains a harmonised description of the carbon footprint of an agricultural activity, capturing data related to the emission of greenhouse gases. It is associated with the agricultural vertical and IoT applications.",
-                    "type": "object",
-                    "allOf": [
-                        {
-                        "$ref": "https://smart-data-models.github.io/data-models/common-schema.json#/definitions/GSMA-Commons"
-                        },
-                        {
-                        "properties": {
-                            "type": {
-                            "type": "string",
-                            "enum": [
-                                "AgriCarbonFootprint"
-                            ],
-                            "description": "Property. NGSI Entity Type. It has to be AgriCarbonFootprint."
-                            },
-                            "hasAgriCrop": {
-                            "type": "string",
-                            "format": "uri",
-                            "description": "Relationship. Reference to the AgriCrop related to this carbon footprint."
-                            },
-                            "hasAgriParcel": {
-                            "type": "string",
-                            "format": "uri",
-                            "description": "Relationship. Reference to the AgriParcel where the activity causing this carbon footprint took place."
-                            },
-                            "hasAgriYeld": {
-                            "type": "string",
-                            "format": "uri",
-                            "description": "Relationship. Reference to the AgriYeld associated with this carbon footprint."
-                            },
-                            "carbonFootprint": {
-                            "type": "object",
-                            "description": "Property. Details about the carbon footprint value.",
-                            "properties": {
-                                "value": {
-                                "type": "number"
-                                },
-                                "accuracyPercent": {
-                                "type": "number"
-                                },
-                                "minValue": {
-                                "type": "number"
-                                },
-                                "unitText": {
-                                "type": "string",
-                                "enum": ["Tons"]
-                                }
-                            },
-                            "required": ["value", "accuracyPercent", "minValue", "unitText"]
-                            },
-                            "estimationStartAt": {
-                            "type": "string",
-                            "format": "dateTime",
-                            "description": "Property. Start date of the carbon footprint estimation period."
-                            },
-                            "estimationEndAt": {
-                            "type": "string",
-                            "format": "dateTime",
-                            "description": "Property. End date of the carbon footprint estimation period."
-                            }
-                        },
-                        "required": [
-                            "type",
-                            "carbonFootprint",
-                            "estimationStartAt",
-                            "estimationEndAt"
-                        ]
-                        }
-                    ]
-                }
+        return agri_carbon_footprint_schema.response()
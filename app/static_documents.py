@@ -0,0 +1,83 @@
+import gzip
+import hashlib
+import json
+
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class PublicResponse(Response):
+    """
+    PublicResponse class marks the answers that may be stored by shared caches, so that the session
+    is not saved and its cookie not set on them (see exclude_public_responses).
+    """
+
+
+def exclude_public_responses(session_interface):
+    """
+    This method keeps a session interface from saving the session on PublicResponse answers. Flask-Session
+    otherwise writes a session and sets its cookie on every anonymous request, e.g. each time a broker
+    dereferences the @context, and proxies do not cache responses that set cookies.
+    """
+    save_session = session_interface.save_session
+
+    def save_session_unless_public(app, session, response):
+        if not isinstance(response, PublicResponse):
+            save_session(app, session, response)
+
+    session_interface.save_session = save_session_unless_public
+    return session_interface
+
+
+class StaticDocument:
+    """
+    StaticDocument class serves a JSON document that does not change while the service runs, such as
+    the @context the broker dereferences on every write, from bytes prepared once.
+
+    The document is serialised and compressed (gzip and, when the `brotli` package is installed,
+    Brotli) when the object is built. Every encoding has its own strong ETag, and a request whose
+    If-None-Match holds any of them is answered with 304.
+
+    Attributes:
+        - mimetype (str): Content type of the document, e.g. "application/ld+json".
+        - max_age (int): Seconds clients and proxies may reuse the document without revalidating it.
+        - encodings (dict): (body, etag) per content coding, "identity" for the uncompressed body.
+    """
+
+    def __init__(self, document, mimetype="application/json", max_age=86400):
+        self.mimetype = mimetype
+        self.max_age = max_age
+        body = json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode()
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        self.encodings = {"identity": (body, etag)}
+        compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed["br"] = brotli.compress(body, quality=11)
+        for coding, data in compressed.items():
+            if len(data) < len(body):
+                self.encodings[coding] = (data, f"{etag}-{coding}")
+
+    def headers(self, coding):
+        headers = {
+            "ETag": f'"{self.encodings[coding][1]}"',
+            "Cache-Control": f"public, max-age={self.max_age}, immutable",
+            "Vary": "Accept-Encoding",
+        }
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+        return headers
+
+    def response(self):
+        """
+        This method answers the current request with the document, in the best encoding the client accepts.
+        """
+        for coding, (_, etag) in self.encodings.items():
+            if request.if_none_match.contains(etag):
+                return PublicResponse(status=304, headers=self.headers(coding))
+        accepted = [coding for coding in ("br", "gzip") if coding in self.encodings and request.accept_encodings[coding]]
+        coding = max(accepted, key=lambda coding: request.accept_encodings[coding], default="identity")
+        return PublicResponse(self.encodings[coding][0], mimetype=self.mimetype, headers=self.headers(coding))
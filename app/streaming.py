@@ -0,0 +1,97 @@
+import json
+import re
+
+
+class JsonArraySplitter:
+    """
+    JsonArraySplitter class cuts a JSON array received in chunks into the raw bytes of its elements,
+    without decoding them, so a large broker answer can be forwarded element by element.
+
+    Only the structural characters are inspected: quotes and backslashes inside strings, and
+    brackets, braces and commas outside of them.
+    """
+
+    _STRUCTURAL = re.compile(rb'["\\\[\]{},]')
+    _IN_STRING = re.compile(rb'["\\]')
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._start = None
+
+    def feed(self, chunk):
+        """
+        This method consumes a chunk of the array and returns the elements completed by it.
+        """
+        buffer = self._buffer
+        position = len(buffer)
+        buffer += chunk
+        elements = []
+
+        while position < len(buffer):
+            if self._escape:
+                self._escape = False
+                position += 1
+                continue
+
+            pattern = self._IN_STRING if self._in_string else self._STRUCTURAL
+            match = pattern.search(buffer, position)
+            if match is None:
+                break
+            position = match.start()
+            char = buffer[position]
+
+            if self._in_string:
+                if char == ord('\\'):
+                    self._escape = True
+                else:
+                    self._in_string = False
+            elif char == ord('"'):
+                self._in_string = True
+            elif char in b'[{':
+                self._depth += 1
+                if self._depth == 1:
+                    self._start = position + 1
+            elif char in b']}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(elements, position)
+                    self._start = None
+            elif self._depth == 1:
+                self._emit(elements, position)
+                self._start = position + 1
+            position += 1
+
+        # Keep only the element that is still incomplete.
+        if self._start is None:
+            buffer.clear()
+        elif self._start > 0:
+            del buffer[:self._start]
+            self._start = 0
+        return elements
+
+    def _emit(self, elements, end):
+        element = bytes(self._buffer[self._start:end]).strip()
+        if element:
+            elements.append(element)
+
+
+def iter_json_array(chunks):
+    """
+    This method yields the raw bytes of every element of a JSON array read from an iterable of chunks.
+    """
+    splitter = JsonArraySplitter()
+    for chunk in chunks:
+        yield from splitter.feed(chunk)
+
+
+def ndjson_line(element):
+    """
+    This method turns the raw bytes of a JSON element into one NDJSON line, re-encoding it only
+    when the broker pretty-printed it over several lines.
+    """
+    if b"\n" in element or b"\r" in element:
+        element = json.dumps(json.loads(element)).encode()
+    return element + b"\n"
@@ -0,0 +1,169 @@
+import logging
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from app.config import BROKER_PAGE_SIZE, ENTITY_TYPES, ENTITY_VIEW_RESYNC_INTERVAL, KONG_ENTITIES_TYPE, KONG_SUBSCRIPTIONS, SUBSCRIPTION_ID_PREFIX, SUBSCRIPTION_NOTIFICATION_TOKEN, SUBSCRIPTION_NOTIFICATION_URL
+from app.entity_view import EntityView
+from app.http_client import http_client
+from app.metrics import metrics
+from app.utils import ishare_token_manager, kong_read_headers, kong_write_headers
+
+
+class SubscriptionManager:
+    """
+    SubscriptionManager class registers one NGSI-LD subscription per entity type and fills the local
+    EntityView with a snapshot of each type, again every `resync_interval` seconds, from a background thread.
+
+    Every worker process starts the thread, but only the one holding an exclusive lock on `lock_path`
+    subscribes and takes the snapshots; the others keep trying to take the lock over, in case that
+    process exits. Without `fcntl` (e.g. on Windows) every process runs them. The process that takes
+    the lock serves no type from the view until it has taken a new snapshot of it, as notifications
+    may have been missed while no process was subscribed.
+
+    Attributes:
+        - view (EntityView): View updated by the snapshots.
+        - entity_types (list): Entity types to subscribe to.
+        - notification_url (str): Endpoint of this service that receives the notifications.
+        - notification_token (str): Secret sent back by the broker in the X-Notification-Token header.
+        - resync_interval (int): Seconds between two snapshots.
+        - lock_path (str): File locked by the process that runs the subscriptions, set by `start`.
+    """
+
+    # Seconds between two attempts of a standby process to take the lock.
+    LOCK_RETRY_INTERVAL = 30
+
+    def __init__(self, view, entity_types, notification_url, notification_token='', resync_interval=3600):
+        self.view = view
+        self.entity_types = entity_types
+        self.notification_url = notification_url
+        self.notification_token = notification_token
+        self.resync_interval = resync_interval
+        self._lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+        self._stopped = threading.Event()
+        self.lock_path = None
+        self._lock_file = None
+
+    def subscription(self, entity_type):
+        endpoint = {"uri": self.notification_url, "accept": "application/json"}
+        if self.notification_token:
+            endpoint["receiverInfo"] = [{"key": "X-Notification-Token", "value": self.notification_token}]
+        return {
+            "id": f"{SUBSCRIPTION_ID_PREFIX}{entity_type}",
+            "type": "Subscription",
+            "entities": [{"type": entity_type}],
+            "notification": {"format": "normalized", "sysAttrs": True, "endpoint": endpoint}
+        }
+
+    def subscribe(self, entity_type):
+        """
+        This method creates the subscription of a type, or updates its notification endpoint if it already exists.
+
+        Returns:
+            True if the broker accepted the subscription.
+        """
+        headers = kong_write_headers(ishare_token_manager.get_token())
+        subscription = self.subscription(entity_type)
+        response = http_client.post(KONG_SUBSCRIPTIONS, headers=headers, json=subscription)
+        if response.status_code == 409:
+            response = http_client.patch(
+                f"{KONG_SUBSCRIPTIONS}/{subscription['id']}",
+                headers=headers,
+                json={"notification": subscription["notification"]}
+            )
+        if response.status_code not in (201, 204):
+            logging.warning(f"Error subscribing to {entity_type}: {response.status_code} - {response.text}")
+            return False
+        return True
+
+    def sync(self, entity_type):
+        """
+        This method copies every entity of a type into the view, one broker page at a time, and then
+        removes from the view the entities of the type the broker no longer has.
+        """
+        headers = kong_read_headers(ishare_token_manager.get_token())
+        started_at = time.time()
+        offset = 0
+        while True:
+            params = {"limit": BROKER_PAGE_SIZE, "offset": offset, "options": "sysAttrs"}
+            response = http_client.get(f"{KONG_ENTITIES_TYPE}{entity_type}", headers=headers, params=params)
+            if response.status_code != 200:
+                logging.warning(f"Error reading {entity_type} from the broker: {response.status_code} - {response.text}")
+                return False
+            entities = response.json()
+            self.view.apply(entities)
+            offset += len(entities)
+            if len(entities) < BROKER_PAGE_SIZE:
+                break
+        self.view.sweep(entity_type, started_at)
+        self.view.mark_synced(entity_type)
+        metrics.incr("entity_view.syncs")
+        return True
+
+    def start(self, lock_path=None):
+        # Threads do not survive a fork, so every worker process starts its own.
+        if self._thread is not None and self._thread.is_alive() and self._thread_pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._thread_pid == os.getpid():
+                return
+            self.lock_path = lock_path
+            self._thread_pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="ngsi-ld-subscriptions", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def acquire_lock(self):
+        """
+        This method takes the lock that elects the process running the subscriptions, without waiting.
+
+        Returns:
+            True if this process holds the lock.
+        """
+        if fcntl is None or self.lock_path is None:
+            return True
+        if self._lock_file is None:
+            self._lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        # The lock is released when the process exits and its file is closed.
+        return True
+
+    def _run(self):
+        while not self.acquire_lock():
+            if self._stopped.wait(self.LOCK_RETRY_INTERVAL):
+                return
+        logging.info(f"Process {os.getpid()} runs the NGSI-LD subscriptions")
+        self.view.reset_synced()
+        subscribed = set()
+        while not self._stopped.is_set():
+            for entity_type in self.entity_types:
+                try:
+                    if entity_type not in subscribed and self.subscribe(entity_type):
+                        subscribed.add(entity_type)
+                    self.sync(entity_type)
+                except Exception as e:
+                    logging.warning(f"Error synchronising {entity_type}: {e}")
+            self._stopped.wait(self.resync_interval)
+
+
+entity_view = EntityView()
+
+subscription_manager = SubscriptionManager(
+    entity_view,
+    ENTITY_TYPES,
+    SUBSCRIPTION_NOTIFICATION_URL,
+    notification_token=SUBSCRIPTION_NOTIFICATION_TOKEN,
+    resync_interval=ENTITY_VIEW_RESYNC_INTERVAL
+)
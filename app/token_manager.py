@@ -0,0 +1,150 @@
+import logging
+import os
+import threading
+import time
+
+from app.metrics import metrics
+
+
+class TokenError(Exception):
+    """
+    Raised when a token could not be obtained from the identity provider.
+    """
+
+
+class TokenManager:
+    """
+    TokenManager class keeps a bearer token in memory and refreshes it before it expires.
+
+    Concurrent callers that find the token missing or stale share a single refresh (single-flight),
+    and an optional daemon thread renews the token `refresh_margin` seconds before `expires_in`,
+    so the hot path only reads two attributes.
+
+    Attributes:
+        - name (str): Prefix used for the metrics of this manager, e.g. "token.ishare".
+        - fetch_token (callable): Function returning a tuple (access_token, expires_in). It must raise TokenError on failure.
+        - refresh_margin (int): Seconds before expiry at which the token is renewed.
+        - background_refresh (bool): Whether a daemon thread renews the token ahead of time.
+        - retry_interval (int): Seconds the background thread waits after a failed refresh.
+    """
+
+    # A token this close to its expiry is never handed out.
+    EXPIRY_SKEW = 5
+
+    def __init__(self, name, fetch_token, refresh_margin=60, background_refresh=True, retry_interval=10):
+        self.name = name
+        self.fetch_token = fetch_token
+        self.refresh_margin = refresh_margin
+        self.background_refresh = background_refresh
+        self.retry_interval = retry_interval
+
+        self._token = None
+        self._valid_until = 0.0
+        self._refresh_at = 0.0
+
+        self._lock = threading.Lock()
+        self._refreshed = threading.Condition(self._lock)
+        self._in_flight = False
+        self._last_error = None
+
+        self._thread = None
+        self._thread_pid = None
+        self._stopped = threading.Event()
+
+    def get_token(self):
+        """
+        This method returns a valid token, fetching a new one only when the cached one is missing or stale.
+
+        Raises:
+            TokenError: If the identity provider could not issue a token.
+        """
+        now = time.monotonic()
+        token = self._token
+        if token is not None and now < self._valid_until and (self._background_running() or now < self._refresh_at):
+            metrics.incr(f"{self.name}.hits")
+            return token
+
+        metrics.incr(f"{self.name}.misses")
+        token = self.refresh()
+        self._ensure_background_thread()
+        return token
+
+    def refresh(self):
+        """
+        This method fetches a new token. When a refresh is already running the caller waits for its result
+        instead of issuing a second request.
+        """
+        with self._lock:
+            if self._in_flight:
+                metrics.incr(f"{self.name}.waits")
+                while self._in_flight:
+                    self._refreshed.wait()
+                if self._last_error is not None:
+                    raise self._last_error
+                return self._token
+            self._in_flight = True
+
+        token, error = None, None
+        try:
+            token, expires_in = self.fetch_token()
+            metrics.incr(f"{self.name}.refreshes")
+        except TokenError as e:
+            error = e
+            metrics.incr(f"{self.name}.refresh_errors")
+        except Exception as e:
+            error = TokenError(str(e))
+            metrics.incr(f"{self.name}.refresh_errors")
+
+        with self._lock:
+            if error is None:
+                now = time.monotonic()
+                expires_in = float(expires_in)
+                self._token = token
+                self._valid_until = now + expires_in - min(self.EXPIRY_SKEW, expires_in / 4)
+                self._refresh_at = now + expires_in - min(self.refresh_margin, expires_in / 2)
+            self._last_error = error
+            self._in_flight = False
+            self._refreshed.notify_all()
+
+        if error is not None:
+            raise error
+        return token
+
+    def invalidate(self):
+        """
+        This method drops the cached token, e.g. after the upstream service rejected it.
+        """
+        with self._lock:
+            self._token = None
+            self._valid_until = 0.0
+            self._refresh_at = 0.0
+
+    def stop(self):
+        self._stopped.set()
+
+    def _background_running(self):
+        return self._thread is not None and self._thread.is_alive() and self._thread_pid == os.getpid()
+
+    def _ensure_background_thread(self):
+        # Threads do not survive a fork, so every worker process starts its own refresher.
+        if not self.background_refresh or self._background_running():
+            return
+        with self._lock:
+            if self._background_running():
+                return
+            self._thread_pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-refresher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            delay = self._refresh_at - time.monotonic()
+            if delay > 0:
+                self._stopped.wait(delay)
+                continue
+            try:
+                self.refresh()
+                metrics.incr(f"{self.name}.background_refreshes")
+            except TokenError as e:
+                logging.warning(f"Background refresh of {self.name} failed: {e}")
+                self._stopped.wait(self.retry_interval)
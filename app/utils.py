@@ -1,22 +1,126 @@
+import asyncio
+import hashlib
 import json
+import logging
 import time
+from datetime import datetime
 import uuid
 from functools import wraps
-import requests
-from app.config import DATA_MODEL_JSON_LD, KEYROCK_ACCES_TOKEN_URL, KEYROCK_AR_DELEGATION_ENDPOINT, KEYROCK_AR_POLICY, APP_CLIENT_ID, APP_CLIENT_SECRET, KONG_ENTITIES, P12_FILE_PASS, P12_FILE_PATH, REQUIRED_KEYROCK_APP_KEY, USER_SERVICE_PROVIDER_EORI, KEYROCK_TOKEN_URL, USER_EORI, KEYROCK_USER_INFO_URL, USER_EORI
+from urllib.parse import quote
+from app.async_http_client import async_http_client
+from app.http_client import http_client
+from app.config import APP_KEYROCK_PASSWORD, ASYNC_BROKER_ENABLED, APP_KEYROCK_USERNAME, AUTH_CACHE_MAX_SIZE, AUTH_CACHE_NEGATIVE_TTL, AUTH_CACHE_TTL, AUTH_JWKS_REFRESH_INTERVAL, AUTH_JWKS_URL, AUTH_JWT_ALGORITHMS, AUTH_JWT_AUDIENCE, AUTH_JWT_LEEWAY, AUTH_JWT_SECRET, AUTH_LOCAL_JWT_VERIFICATION, DATA_MODEL_JSON_LD, ENTITY_CACHE_BACKEND, ENTITY_CACHE_DEFAULT_TTL, ENTITY_CACHE_DIR, ENTITY_CACHE_LOCAL_TTL, ENTITY_CACHE_MAX_SIZE, ENTITY_CACHE_TTLS, GEOMETRY_SIMPLIFY_TOLERANCE, ISHARE_TOKEN_BACKGROUND_REFRESH, ISHARE_TOKEN_DEFAULT_EXPIRES_IN, ISHARE_TOKEN_REFRESH_MARGIN, KEYROCK_ADMIN_TOKEN_DEFAULT_EXPIRES_IN, KEYROCK_ADMIN_TOKEN_REFRESH_MARGIN, KEYROCK_ACCES_TOKEN_URL, KEYROCK_AR_DELEGATION_ENDPOINT, KEYROCK_AR_POLICY, KONG_COMPRESS_LEVEL, KONG_COMPRESS_MIN_SIZE, KONG_COMPRESS_REQUESTS, APP_CLIENT_ID, APP_CLIENT_SECRET, KONG_BATCH_CHUNK_SIZE, KONG_ENTITIES, KONG_ENTITY_OPERATIONS_UPSERT, KONG_VERIFY_DELAY, KONG_VERIFY_QUEUE_SIZE, KONG_VERIFY_SAMPLE_RATE, P12_FILE_PASS, P12_FILE_PATH, P12_HOT_RELOAD, P12_RELOAD_INTERVAL, REQUIRED_KEYROCK_APP_KEY, USER_SERVICE_PROVIDER_EORI, KEYROCK_TOKEN_URL, USER_EORI, KEYROCK_USER_INFO_URL, USER_EORI
 import jwt
-from cryptography.hazmat.primitives.serialization.pkcs12 import load_key_and_certificates
-from cryptography.hazmat.primitives import serialization
+from app.cache import TTLCache
+from app.entity_cache import EntityCache, build_entity_cache_backend
+from app.geometry import parse_coordinates, simplify_geometry, validate_geometry
+from app.jwt_verifier import JwksUnavailable, JwtVerifier
+from app.key_material import KeyMaterial
+from app.compression import compress_body
+from app.metrics import metrics
+from app.token_manager import TokenError, TokenManager
+from app.verification import VerificationQueue
 
 
 from flask import jsonify, request
 
 
+class PayloadError(ValueError):
+    """
+    Raised when an incoming payload cannot be converted into a Smart Data Model.
+
+    Attributes:
+        - body (dict): The error body returned to the client, e.g. {"errors": ["Id is missing"]}.
+    """
+
+    def __init__(self, body):
+        super().__init__(body)
+        self.body = body
+
+
 def generate_urn(entity_type: str) -> str:
     entity_id = uuid.uuid4()
     return f"urn:ngsi-ld:{entity_type}:{entity_id}"
 
 
+introspection_cache = TTLCache("auth.introspection", max_size=AUTH_CACHE_MAX_SIZE, ttl=AUTH_CACHE_TTL)
+
+
+def token_ttl(access_token, ttl):
+    """
+    This method caps a cache TTL by the expiry of the token when the token is a JWT.
+    Opaque tokens keep the given TTL.
+    """
+    token = access_token.split(" ", 1)[-1]
+    try:
+        claims = jwt.decode(token, options={"verify_signature": False})
+    except jwt.PyJWTError:
+        return ttl
+    exp = claims.get("exp")
+    if not isinstance(exp, (int, float)):
+        return ttl
+    return min(ttl, exp - time.time())
+
+
+def introspect_access_token(access_token):
+    """
+    This method checks an Authorization header against Keyrock, caching the outcome under a hash of the token.
+
+    Valid tokens are cached for AUTH_CACHE_TTL seconds (never beyond their own expiry) and tokens
+    rejected by Keyrock for AUTH_CACHE_NEGATIVE_TTL seconds. Keyrock errors are not cached.
+
+    Returns:
+        True if the token is valid, False otherwise.
+    """
+    key = hashlib.sha256(access_token.encode()).hexdigest()
+    valid = introspection_cache.get(key)
+    if valid is not None:
+        return valid
+
+    response = http_client.get(KEYROCK_USER_INFO_URL, headers={"Authorization": access_token})
+    if response.status_code == 200:
+        introspection_cache.set(key, True, token_ttl(access_token, AUTH_CACHE_TTL))
+        return True
+    if 400 <= response.status_code < 500:
+        introspection_cache.set(key, False, AUTH_CACHE_NEGATIVE_TTL)
+    return False
+
+
+jwt_verifier = JwtVerifier(
+    jwks_url=AUTH_JWKS_URL,
+    secret=AUTH_JWT_SECRET,
+    audience=AUTH_JWT_AUDIENCE,
+    algorithms=AUTH_JWT_ALGORITHMS,
+    refresh_interval=AUTH_JWKS_REFRESH_INTERVAL,
+    leeway=AUTH_JWT_LEEWAY
+)
+
+
+def verify_access_token(access_token):
+    """
+    This method validates an Authorization header. With AUTH_LOCAL_JWT_VERIFICATION, JWTs are checked
+    locally against the cached signing keys; opaque tokens, and JWTs whose signing key is not
+    available, are checked against Keyrock.
+
+    Returns:
+        True if the token is valid, False otherwise.
+    """
+    if AUTH_LOCAL_JWT_VERIFICATION:
+        token = access_token.split(" ", 1)[-1]
+        if jwt_verifier.is_jwt(token):
+            try:
+                jwt_verifier.verify(token)
+                metrics.incr("auth.jwt.verified")
+                return True
+            except jwt.PyJWTError:
+                metrics.incr("auth.jwt.rejected")
+                return False
+            except JwksUnavailable as e:
+                logging.warning(f"Falling back to Keyrock introspection: {e}")
+        metrics.incr("auth.jwt.fallbacks")
+    return introspect_access_token(access_token)
+
+
 def api_key_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -25,9 +129,7 @@ def api_key_required(f):
             if not access_token:
                 return {"error": "Access token is missing."}, 401
 
-            headers = {"Authorization": access_token}
-            response = requests.get(KEYROCK_USER_INFO_URL, headers=headers)
-            if response.status_code != 200:
+            if not verify_access_token(access_token):
                 return {"error": "Access token is invalid."}, 401
 
             return f(*args, **kwargs)
@@ -55,7 +157,7 @@ def get_token(username, password):
         "password": password
     }
 
-    response = requests.post(KEYROCK_ACCES_TOKEN_URL, auth=auth, data=payload, headers=headers)
+    response = http_client.post(KEYROCK_ACCES_TOKEN_URL, auth=auth, data=payload, headers=headers)
 
     if response.status_code == 200:
         access_token = response.json().get("access_token")
@@ -78,7 +180,7 @@ def get_x_auth_token(username, password):
         "Content-Type": "application/json"
     }
 
-    response = requests.post(KEYROCK_TOKEN_URL, json=payload, headers=headers)
+    response = http_client.post(KEYROCK_TOKEN_URL, json=payload, headers=headers)
 
     if response.status_code == 201:
         access_token = response.headers.get("x-subject-token")
@@ -87,50 +189,93 @@ def get_x_auth_token(username, password):
         print(f"Error: {response.status_code} - {response.text}")
         return None
 
-def p12_read(filepath, password):
-    # Leer el archivo PKCS12
-    with open(filepath, 'rb') as f:
-        p12_data = f.read()
+def request_admin_x_auth_token():
+    """
+    This method requests an X-Auth token for the administrator account of the application (APP_KEYROCK_USERNAME).
 
-    # Cargar clave privada, certificado y CA certs
-    private_key, certificate, ca_certs = load_key_and_certificates(p12_data, password.encode())
+    Returns:
+        A tuple (x_auth_token, expires_in), where expires_in is read from the "expires_at" field of the Keyrock answer.
 
-    # Convertir la clave privada a formato PEM
-    private_key_pem = private_key.private_bytes(
-        encoding=serialization.Encoding.PEM,
-        format=serialization.PrivateFormat.PKCS8,
-        encryption_algorithm=serialization.NoEncryption()
-    ).decode()
+    Raises:
+        TokenError: If Keyrock does not issue the token.
+    """
+    if not APP_KEYROCK_USERNAME or not APP_KEYROCK_PASSWORD:
+        raise TokenError("APP_KEYROCK_USERNAME and APP_KEYROCK_PASSWORD are required.")
 
-    # Convertir el certificado a formato PEM
-    certificate_pem = certificate.public_bytes(encoding=serialization.Encoding.PEM).decode()
+    payload = {
+        "name": APP_KEYROCK_USERNAME,
+        "password": APP_KEYROCK_PASSWORD
+    }
 
-    # Convertir los certificados de CA a formato PEM
-    ca_certs_pem = [ca_cert.public_bytes(encoding=serialization.Encoding.PEM).decode() for ca_cert in ca_certs]
+    headers = {
+        "Content-Type": "application/json"
+    }
 
-    return certificate_pem, private_key_pem, ca_certs_pem
+    response = http_client.post(KEYROCK_TOKEN_URL, json=payload, headers=headers)
+    if response.status_code != 201 or not response.headers.get("x-subject-token"):
+        raise TokenError(f"Error: {response.status_code} - {response.text}")
 
+    expires_in = KEYROCK_ADMIN_TOKEN_DEFAULT_EXPIRES_IN
+    try:
+        expires_at = response.json()["token"]["expires_at"]
+        expires_in = datetime.fromisoformat(expires_at.replace("Z", "+00:00")).timestamp() - time.time()
+    except (ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return response.headers.get("x-subject-token"), expires_in
 
-def x5c_read(certificate_pem):  
 
-    # Convertir PEM a base64 (eliminar encabezado y pie de página y juntar líneas)
-    b64_cert = certificate_pem.replace("-----BEGIN CERTIFICATE-----", "").replace("-----END CERTIFICATE-----", "").replace("\n", "")
+keyrock_admin_token_manager = TokenManager(
+    "token.keyrock_admin",
+    request_admin_x_auth_token,
+    refresh_margin=KEYROCK_ADMIN_TOKEN_REFRESH_MARGIN,
+    background_refresh=False
+)
 
-    # El campo x5c contiene el certificado en base64
-    x5c = [b64_cert]
-    
-    return x5c
 
+def get_admin_x_auth_token():
+    """
+    This method returns the administrator X-Auth token, reusing it until it expires.
 
+    Returns:
+        The X-Auth token, or None if Keyrock did not issue it.
+    """
+    try:
+        return keyrock_admin_token_manager.get_token()
+    except TokenError as e:
+        print(e)
+        return None
 
 
-def get_token_with_jwt():
-    certificate, private_key, ca_certs = p12_read(P12_FILE_PATH, P12_FILE_PASS)
-    #print("Certificate:", certificate)
-    #print("Private Key:", private_key)
-    #print("CA Certificates:", ca_certs)
+def keyrock_admin_request(method, url, headers=None, **kwargs):
+    """
+    This method calls the Keyrock API with the administrator X-Auth token. When Keyrock rejects the
+    cached token (e.g. it was revoked) a new one is requested and the call is made once more.
+    """
+    headers = dict(headers or {})
+    response = None
+    for attempt in range(2):
+        headers['X-Auth-token'] = get_admin_x_auth_token()
+        response = http_client.request(method, url, headers=headers, **kwargs)
+        if response.status_code != 401:
+            break
+        keyrock_admin_token_manager.invalidate()
+    return response
+
+
+ishare_key_material = KeyMaterial(P12_FILE_PATH, P12_FILE_PASS, hot_reload=P12_HOT_RELOAD, reload_interval=P12_RELOAD_INTERVAL)
 
-    x5c = x5c_read(certificate)
+
+def request_token_with_jwt():
+    """
+    This method requests a new iSHARE access token from Keyrock using a signed client assertion.
+
+    Returns:
+        A tuple (access_token, expires_in).
+
+    Raises:
+        TokenError: If Keyrock does not issue the token.
+    """
+    private_key, x5c = ishare_key_material.signing_material()
 
     header = {
         "typ": "JWT",
@@ -164,13 +309,28 @@ def get_token_with_jwt():
         "client_assertion": client_assertion
     }
 
-    response = requests.post(KEYROCK_ACCES_TOKEN_URL, headers=post_headers, data=post_parameters)
+    response = http_client.post(KEYROCK_ACCES_TOKEN_URL, headers=post_headers, data=post_parameters)
     if response.status_code in (200, 201, 202):
-        access_token = response.json()["access_token"]
-        return access_token
+        token_data = response.json()
+        return token_data["access_token"], token_data.get("expires_in", ISHARE_TOKEN_DEFAULT_EXPIRES_IN)
     else:
-        print(f"Error: {response.status_code}")
-        return jsonify({"error": f"{response.status_code} - {response.text}"}), 400
+        raise TokenError(f"{response.status_code} - {response.text}")
+
+
+ishare_token_manager = TokenManager(
+    "token.ishare",
+    request_token_with_jwt,
+    refresh_margin=ISHARE_TOKEN_REFRESH_MARGIN,
+    background_refresh=ISHARE_TOKEN_BACKGROUND_REFRESH
+)
+
+
+def get_token_with_jwt():
+    try:
+        return ishare_token_manager.get_token()
+    except TokenError as e:
+        print(f"Error: {e}")
+        return jsonify({"error": str(e)}), 400
 
 '''
 def send_to_context_broker(entity,agri_farm_data):
@@ -227,29 +387,103 @@ def get_entity_from_kong(entity_id):
         "fiware-service": "openiot",
         "fiware-servicepath": "/",
     }'''
-    token = get_token_with_jwt()
+    try:
+        token = ishare_token_manager.get_token()
+    except TokenError as e:
+        print(f"Error getting token for Kong: {e}")
+        return False
     headers = {
         "Authorization" : f'Bearer {token}',
         "Content-Type" :  "application/json"
     }
     url = f"{KONG_ENTITIES}/{entity_id}"
 
-    response = requests.get(url, headers=headers)
+    response = http_client.get(url, headers=headers)
 
     if response.status_code == 200:
         print(f"Entity found: {response.text}")
+        return True
     else:
         print(f"Error getting entity from Kong: {response.status_code} - {response.text}")
+        return False
 
 
-def send_to_kong(entity, agri_farm_data):
-    token = get_token_with_jwt()
-    headers = {
+# Reads written entities back from Kong in the background instead of sleeping on the request path.
+kong_verification_queue = VerificationQueue(
+    get_entity_from_kong,
+    delay=KONG_VERIFY_DELAY,
+    sample_rate=KONG_VERIFY_SAMPLE_RATE,
+    max_size=KONG_VERIFY_QUEUE_SIZE
+)
+
+
+def json_default(value):
+    # Dates filled in by the models (datetime.utcnow()) are sent as ISO 8601 strings.
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def serialize_entity(payload):
+    return json.dumps(payload, default=json_default)
+
+
+def kong_write_headers(token):
+    return {
         "Authorization" : f'Bearer {token}',
         "Content-Type" :  "application/json",
         "Link": f'<{DATA_MODEL_JSON_LD}>; rel="http://www.w3.org/ns/json-ld#context"; type="application/ld+json"'
     }
-    print( headers)
+
+
+def kong_write_request(token, payload):
+    """
+    This method builds the headers and the body of a write to the broker. With KONG_COMPRESS_REQUESTS,
+    bodies of at least KONG_COMPRESS_MIN_SIZE bytes are compressed with gzip.
+
+    Returns:
+        A tuple (headers, body).
+    """
+    headers = kong_write_headers(token)
+    body = serialize_entity(payload).encode()
+    if KONG_COMPRESS_REQUESTS and len(body) >= KONG_COMPRESS_MIN_SIZE:
+        body = compress_body(body, KONG_COMPRESS_LEVEL)
+        headers["Content-Encoding"] = "gzip"
+    return headers, body
+
+
+def kong_read_headers(token):
+    return {
+        "Authorization" : f'Bearer {token}',
+        "Accept": "application/json",
+        "Link": f'<{DATA_MODEL_JSON_LD}>; rel="http://www.w3.org/ns/json-ld#context"; type="application/ld+json"'
+    }
+
+
+entity_cache = EntityCache(
+    ttls=ENTITY_CACHE_TTLS,
+    default_ttl=ENTITY_CACHE_DEFAULT_TTL,
+    max_size=ENTITY_CACHE_MAX_SIZE,
+    backend=build_entity_cache_backend(ENTITY_CACHE_BACKEND, ENTITY_CACHE_DIR, ENTITY_CACHE_MAX_SIZE),
+    local_ttl=ENTITY_CACHE_LOCAL_TTL
+)
+
+# Functions called with the id of every entity invalidated, e.g. the differential writer forgetting its last version.
+entity_invalidation_listeners = []
+
+
+def invalidate_entity(entity_id):
+    """
+    This method drops everything this service keeps of an entity because it has just been written, by this
+    service or, as a notification tells, by another one: its cached reads and what the listeners keep.
+    """
+    entity_cache.invalidate(entity_id)
+    for listener in entity_invalidation_listeners:
+        listener(entity_id)
+
+
+def send_to_kong(entity, agri_farm_data):
+    token = get_token_with_jwt()
  
     url = f"{KONG_ENTITIES}"
     entity_id = f"{agri_farm_data['id']}"
@@ -261,14 +495,209 @@ def send_to_kong(entity, agri_farm_data):
     for key, value in agri_farm_data.items():
         payload[key] = value
 
-    response = requests.post(url, headers=headers, json=payload)
+    headers, body = kong_write_request(token, payload)
+    response = http_client.post(url, headers=headers, data=body)
+    invalidate_entity(entity_id)
 
     if response.status_code not in (201, 204):
         print(f"Error sending data to Kong: {response.status_code} - {response.text}")
     else:
         print(f"{entity_id} sucessfully submitted: {response.status_code} - {response.text}")
-        time.sleep(3)
-        get_entity_from_kong(entity_id)
+        kong_verification_queue.submit(entity_id)
+    return response.status_code
+
+
+def patch_entity_attributes(entity_id, attributes):
+    """
+    This method updates some attributes of an entity through PATCH /entities/{id}/attrs, leaving the others as they are.
+
+    Parameters:
+        entity_id (str): Id of the entity.
+        attributes (dict): NGSI-LD attributes to replace, keyed by name.
+
+    Returns:
+        The status code of the broker: 204 when every attribute was updated, 404 when the entity does not exist.
+
+    Raises:
+        TokenError: If the iSHARE token cannot be obtained.
+    """
+    token = ishare_token_manager.get_token()
+    headers, body = kong_write_request(token, attributes)
+    response = http_client.patch(f"{KONG_ENTITIES}/{entity_id}/attrs", headers=headers, data=body)
+    invalidate_entity(entity_id)
+    if response.status_code != 204:
+        print(f"Error updating {entity_id} in Kong: {response.status_code} - {response.text}")
+    else:
+        kong_verification_queue.submit(entity_id)
+    return response.status_code
+
+
+def delete_entity_attribute(entity_id, name):
+    """
+    This method removes an attribute from an entity through DELETE /entities/{id}/attrs/{name}.
+
+    Returns:
+        The status code of the broker: 204 when the attribute was removed, 404 when the entity or the attribute does not exist.
+
+    Raises:
+        TokenError: If the iSHARE token cannot be obtained.
+    """
+    token = ishare_token_manager.get_token()
+    response = http_client.delete(f"{KONG_ENTITIES}/{entity_id}/attrs/{quote(name, safe='')}", headers=kong_write_headers(token))
+    invalidate_entity(entity_id)
+    if response.status_code != 204:
+        print(f"Error removing {name} from {entity_id} in Kong: {response.status_code} - {response.text}")
+    return response.status_code
+
+
+def upsert_to_kong(entities, chunk_size=KONG_BATCH_CHUNK_SIZE):
+    """
+    This method creates or replaces several entities through the NGSI-LD batch upsert operation, `chunk_size`
+    entities per request.
+
+    Parameters:
+        entities (list): NGSI-LD entities, each one with its "id" and "type".
+        chunk_size (int): Maximum number of entities sent in a single request.
+
+    Returns:
+        A list with one dictionary per entity, in the same order: {"id": ..., "status": "created" | "updated" | "upserted" | "failed", "error": ...}.
+        "upserted" is used when the broker reports a partial success and does not tell creations from updates.
+    """
+    if ASYNC_BROKER_ENABLED and async_http_client.available() and len(entities) > chunk_size:
+        return async_http_client.run(async_upsert_to_kong(entities, chunk_size))
+    results = []
+    for start in range(0, len(entities), chunk_size):
+        chunk = entities[start:start + chunk_size]
+        results.extend(_upsert_chunk_to_kong(chunk))
+    return results
+
+
+def _upsert_chunk_to_kong(chunk):
+    ids = [entity["id"] for entity in chunk]
+    try:
+        token = ishare_token_manager.get_token()
+    except TokenError as e:
+        return [{"id": entity_id, "status": "failed", "error": f"Error getting token: {e}"} for entity_id in ids]
+
+    headers, body = kong_write_request(token, chunk)
+    response = http_client.post(KONG_ENTITY_OPERATIONS_UPSERT, headers=headers, data=body)
+    return _upsert_results(chunk, response)
+
+
+def _upsert_results(chunk, response):
+    # Maps the answer of the broker (a requests or an httpx response) to one result per entity of the chunk.
+    ids = [entity["id"] for entity in chunk]
+    for entity_id in ids:
+        invalidate_entity(entity_id)
+    metrics.incr("kong.upsert.requests")
+    metrics.incr("kong.upsert.entities", len(chunk))
+
+    if response.status_code == 204:
+        statuses = {entity_id: ("updated", None) for entity_id in ids}
+    elif response.status_code == 201:
+        # The body lists the ids of the entities that did not exist before.
+        created = set(response.json() or [])
+        statuses = {entity_id: ("created" if entity_id in created else "updated", None) for entity_id in ids}
+    elif response.status_code == 207:
+        body = response.json()
+        statuses = {entity_id: ("upserted", None) for entity_id in body.get("success", [])}
+        for error in body.get("errors", []):
+            statuses[error.get("entityId")] = ("failed", error.get("error"))
+    else:
+        print(f"Error sending batch to Kong: {response.status_code} - {response.text}")
+        statuses = {entity_id: ("failed", f"{response.status_code} - {response.text}") for entity_id in ids}
+
+    results = []
+    for entity_id in ids:
+        status, error = statuses.get(entity_id, ("failed", "Missing from the broker response"))
+        result = {"id": entity_id, "status": status}
+        if error is not None:
+            result["error"] = error
+            metrics.incr("kong.upsert.failed")
+        else:
+            kong_verification_queue.submit(entity_id)
+        results.append(result)
+    return results
+
+
+async def async_upsert_to_kong(entities, chunk_size=KONG_BATCH_CHUNK_SIZE):
+    """
+    This method is the awaitable upsert_to_kong: every chunk is sent at once over the shared async client,
+    which bounds how many are in flight (ASYNC_BROKER_MAX_IN_FLIGHT).
+
+    Returns:
+        The same results as upsert_to_kong. The entities of a chunk that could not be sent are "failed".
+    """
+    ids = [entity["id"] for entity in entities]
+    try:
+        token = await asyncio.to_thread(ishare_token_manager.get_token)
+    except TokenError as e:
+        return [{"id": entity_id, "status": "failed", "error": f"Error getting token: {e}"} for entity_id in ids]
+
+    chunks = [entities[start:start + chunk_size] for start in range(0, len(entities), chunk_size)]
+    writes = [kong_write_request(token, chunk) for chunk in chunks]
+    responses = await asyncio.gather(
+        *(async_http_client.post(KONG_ENTITY_OPERATIONS_UPSERT, headers=headers, content=body) for headers, body in writes),
+        return_exceptions=True
+    )
+    results = []
+    for chunk, response in zip(chunks, responses):
+        if isinstance(response, BaseException):
+            # The chunk may have reached the broker before the connection failed.
+            print(f"Error sending batch to Kong: {response!r}")
+            metrics.incr("kong.upsert.failed", len(chunk))
+            for entity in chunk:
+                invalidate_entity(entity["id"])
+                results.append({"id": entity["id"], "status": "failed", "error": f"Error sending the batch: {response!r}"})
+        else:
+            results.extend(_upsert_results(chunk, response))
+    return results
+
+
+def iter_ndjson(stream, max_line_length=1048576):
+    """
+    This method reads newline-delimited JSON from a binary stream one line at a time, skipping blank lines.
+
+    Yields:
+        Tuples (line_number, item). A line that cannot be parsed yields a PayloadError instead of the item,
+        so the caller can report it and carry on with the next lines.
+    """
+    line_number = 0
+    while True:
+        line = stream.readline(max_line_length + 1)
+        if not line:
+            return
+        line_number += 1
+        if len(line) > max_line_length:
+            yield line_number, PayloadError({"error": f"Line longer than {max_line_length} bytes"})
+            # Skip the rest of the oversized line.
+            while line and not line.endswith(b"\n"):
+                line = stream.readline(max_line_length + 1)
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, PayloadError({"error": f"Invalid JSON: {e}"})
+
+
+def parse_ndjson(data):
+    """
+    This method parses a newline-delimited JSON body into a list of objects, skipping blank lines.
+
+    Raises:
+        PayloadError: If a line is not valid JSON.
+    """
+    items = []
+    for number, line in enumerate(data.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            items.append(json.loads(line))
+        except ValueError as e:
+            raise PayloadError({"error": f"Invalid JSON on line {number}: {e}"})
+    return items
 
 
 def add_policy(entity_type, action, allowed_attributes):
@@ -353,7 +782,7 @@ def store_policy_in_ar(policy):
         'Authorization': f'Bearer {access_token}',
         'Content-Type': 'application/json'
     }
-    response = requests.post(KEYROCK_AR_DELEGATION_ENDPOINT, headers=headers, data=json.dumps(policy))
+    response = http_client.post(KEYROCK_AR_DELEGATION_ENDPOINT, headers=headers, data=json.dumps(policy))
 
     if response.status_code == 200:
         return {"message": "Policy stored"}, 200
@@ -368,7 +797,7 @@ def list_policies():
         'Authorization': f'Bearer {access_token}',
         'Content-Type': 'application/json'
     }
-    response = requests.post(KEYROCK_AR_DELEGATION_ENDPOINT, headers=headers)
+    response = http_client.post(KEYROCK_AR_DELEGATION_ENDPOINT, headers=headers)
 
     if response.status_code == 200:
         policies = response.json()
@@ -384,33 +813,35 @@ def convert_geojson(type_location, location):
 
     Parameters:
         type_location (str): The type of the location. e.g. "Polygon", "Point", "LineString", etc.
-        location_json (str): The location data as a GeoJSON string.
+        location (str or dict): The coordinates as "x,y;x,y;..." or a dict whose "coordinates" are a list or a JSON string.
 
     Returns:
-        A Python list or dictionary representing the converted location data.
+        A Python list or dictionary representing the converted location data. Lines and rings are
+        simplified when GEOMETRY_SIMPLIFY_TOLERANCE is set.
 
     Raises:
+        GeometryError: If the coordinates are malformed, out of bounds or a ring is not closed.
         ValueError: If `type_location` is not a supported GeoJSON type.
     """
     if isinstance(location, str):
-        if type_location == "Polygon":
-            # Convert the string to a list of coordinate pairs
-            coordinates = [list(map(float, pair.split(','))) for pair in location.split(';')]
-            location = {"coordinates": [coordinates]}  # Wrap the list of coordinates in another list to match the Polygon format
-        else:
-            raise ValueError(f"String input is only supported for Polygon types, not {type_location}")
-    elif isinstance(location["coordinates"], str):
+        location = {"coordinates": parse_coordinates(location)}
+    elif isinstance(location.get("coordinates"), str):
         location["coordinates"] = json.loads(location["coordinates"])
 
     if type_location == "Polygon":
-        return [location["coordinates"]]
+        coordinates = [location["coordinates"]]
     elif type_location in ["Point", "MultiPoint", "LineString", "MultiLineString", "MultiPolygon"]:
-        return location["coordinates"]
+        coordinates = location["coordinates"]
     elif type_location == "GeometryCollection":
-        return location["geometries"]
+        coordinates = location["geometries"]
     else:
         raise ValueError(f"Unsupported location type: {type_location}")
 
+    validate_geometry(type_location, coordinates)
+    if GEOMETRY_SIMPLIFY_TOLERANCE:
+        coordinates = simplify_geometry(type_location, coordinates, GEOMETRY_SIMPLIFY_TOLERANCE)
+    return coordinates
+
 
 def test_policy():
     access_token = get_token_with_jwt()
@@ -466,7 +897,7 @@ def test_policy():
                     ]
                 }
                 }
-    response = requests.post(KEYROCK_AR_POLICY, headers=headers, data=post_data)
+    response = http_client.post(KEYROCK_AR_POLICY, headers=headers, data=post_data)
     if response.status_code == 200:
         return {"message": "Policy stored"}, 200
 
@@ -0,0 +1,76 @@
+import logging
+import os
+import queue
+import random
+import threading
+import time
+
+from app.metrics import metrics
+
+
+class VerificationQueue:
+    """
+    VerificationQueue class reads entities back from the context broker after they were written,
+    from a background thread, so the ingest request does not wait for the check.
+
+    Attributes:
+        - verify (callable): Function receiving an entity id and returning True when the entity is found.
+        - delay (float): Seconds to wait after the write before reading the entity back.
+        - sample_rate (float): Fraction of the writes that are verified, between 0 (disabled) and 1 (all).
+        - max_size (int): Maximum number of pending verifications. Extra writes are not verified.
+    """
+
+    def __init__(self, verify, delay=3, sample_rate=0.0, max_size=1000):
+        self.verify = verify
+        self.delay = delay
+        self.sample_rate = sample_rate
+        self._queue = queue.Queue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+
+    def submit(self, entity_id):
+        """
+        This method schedules the verification of an entity, subject to the sampling rate.
+        """
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            metrics.incr("verification.skipped")
+            return
+        try:
+            self._queue.put_nowait((time.monotonic() + self.delay, entity_id))
+            metrics.incr("verification.queued")
+        except queue.Full:
+            metrics.incr("verification.dropped")
+            return
+        self._ensure_worker()
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive() and self._thread_pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._thread_pid == os.getpid():
+                return
+            self._thread_pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="kong-verification", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            due, entity_id = self._queue.get()
+            # Items share the same delay, so they leave the queue in due order.
+            wait = due - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                if self.verify(entity_id):
+                    metrics.incr("verification.found")
+                else:
+                    metrics.incr("verification.missing")
+            except Exception as e:
+                metrics.incr("verification.errors")
+                logging.warning(f"Verification of {entity_id} failed: {e}")
+            finally:
+                self._queue.task_done()
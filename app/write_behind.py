@@ -0,0 +1,253 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from app.metrics import metrics
+from app.utils import json_default
+
+
+class WriteBehindQueue:
+    """
+    WriteBehindQueue class stores validated Smart Data Models in a local SQLite database (WAL mode)
+    and forwards them to the context broker from a pool of worker threads.
+
+    The ingest request only waits for the local insert. Workers claim pending items in batches,
+    upsert them, retry failures with exponential backoff and keep the outcome of each item so it
+    can be read back with its tracking id. The items of an entity are sent one at a time in the order
+    they were queued: an item is not claimed while an older one of the same entity is pending or in
+    flight, so a retried version never overwrites a newer one. Items left "in_flight" by a crashed worker are picked
+    up again after `claim_timeout` seconds.
+
+    Attributes:
+        - upsert (callable): Function receiving a list of entities and returning one result per entity,
+          as `app.utils.upsert_to_kong` does.
+        - workers (int): Number of worker threads per process.
+        - batch_size (int): Maximum number of items claimed and sent together.
+        - max_attempts (int): Attempts before an item is marked as failed.
+        - retry_delay (float): Base delay in seconds of the exponential backoff between attempts.
+        - poll_interval (float): Seconds an idle worker waits before looking for new items.
+        - claim_timeout (float): Seconds after which an unfinished claim is considered abandoned.
+        - retention (float): Seconds that finished items are kept for the status endpoint.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS ingest_queue (
+            id TEXT PRIMARY KEY,
+            entity_id TEXT NOT NULL,
+            entity_type TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            result TEXT,
+            error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            next_attempt_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS ingest_queue_pending ON ingest_queue (status, next_attempt_at);
+        CREATE INDEX IF NOT EXISTS ingest_queue_entity ON ingest_queue (entity_id, status);
+    """
+
+    def __init__(self, upsert, workers=2, batch_size=100, max_attempts=5, retry_delay=5, poll_interval=0.5,
+                 claim_timeout=300, retention=86400):
+        self.upsert = upsert
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        self.claim_timeout = claim_timeout
+        self.retention = retention
+        self.path = None
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._threads = []
+        self._threads_pid = None
+
+    def init_app(self, app, filename):
+        """
+        This method places the queue database next to the application database (in the instance folder)
+        and creates its table.
+        """
+        os.makedirs(app.instance_path, exist_ok=True)
+        self.path = os.path.join(app.instance_path, filename)
+        with self._connection() as connection:
+            connection.executescript(self.SCHEMA)
+
+    def _connection(self):
+        # SQLite connections cannot be shared between threads, so every thread opens its own.
+        connection = getattr(self._local, "connection", None)
+        if connection is None or getattr(self._local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def enqueue(self, entities):
+        """
+        This method stores entities to be sent to the broker.
+
+        Parameters:
+            entities (list): Tuples (entity_type, smart_data_model).
+
+        Returns:
+            The list of tracking ids, in the same order.
+        """
+        now = time.time()
+        rows = []
+        for entity_type, smart_data_model in entities:
+            tracking_id = uuid.uuid4().hex
+            payload = json.dumps(smart_data_model, default=json_default)
+            rows.append((tracking_id, smart_data_model["id"], entity_type, payload, "pending", now, now, now))
+
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.executemany(
+                "INSERT INTO ingest_queue (id, entity_id, entity_type, payload, status, created_at, updated_at, next_attempt_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        metrics.incr("write_behind.enqueued", len(rows))
+        self._ensure_workers()
+        self._wakeup.set()
+        return [row[0] for row in rows]
+
+    def status(self, tracking_id):
+        """
+        This method returns the state of a queued item, or None when the tracking id is unknown.
+        """
+        row = self._connection().execute(
+            "SELECT id, entity_id, entity_type, status, attempts, result, error, created_at, updated_at FROM ingest_queue WHERE id = ?",
+            (tracking_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "tracking_id": row["id"],
+            "entity_id": row["entity_id"],
+            "entity_type": row["entity_type"],
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "result": row["result"],
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"]
+        }
+
+    def counts(self):
+        rows = self._connection().execute("SELECT status, COUNT(*) FROM ingest_queue GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def _claim(self):
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            # Give back the items of workers that died while sending them.
+            connection.execute(
+                "UPDATE ingest_queue SET status = 'pending' WHERE status = 'in_flight' AND updated_at < ?",
+                (now - self.claim_timeout,)
+            )
+            # The rowid follows the order of the inserts.
+            rows = connection.execute(
+                "SELECT id, entity_type, payload, attempts FROM ingest_queue AS item "
+                "WHERE status = 'pending' AND next_attempt_at <= ? AND NOT EXISTS ("
+                "SELECT 1 FROM ingest_queue AS older WHERE older.entity_id = item.entity_id "
+                "AND older.status IN ('pending', 'in_flight') AND older.rowid < item.rowid"
+                ") ORDER BY next_attempt_at LIMIT ?",
+                (now, self.batch_size)
+            ).fetchall()
+            if rows:
+                connection.executemany(
+                    "UPDATE ingest_queue SET status = 'in_flight', updated_at = ? WHERE id = ?",
+                    [(now, row["id"]) for row in rows]
+                )
+        return rows
+
+    def _process(self, rows):
+        entities = []
+        for row in rows:
+            entity = {"type": row["entity_type"]}
+            entity.update(json.loads(row["payload"]))
+            entities.append(entity)
+
+        try:
+            results = self.upsert(entities)
+        except Exception as e:
+            logging.warning(f"Write-behind batch failed: {e}")
+            results = [{"status": "failed", "error": str(e)} for _ in rows]
+
+        now = time.time()
+        updates = []
+        for row, result in zip(rows, results):
+            attempts = row["attempts"] + 1
+            if result["status"] != "failed":
+                updates.append(("done", attempts, result["status"], None, now, now, row["id"]))
+                metrics.incr("write_behind.delivered")
+            elif attempts >= self.max_attempts:
+                updates.append(("failed", attempts, None, str(result.get("error")), now, now, row["id"]))
+                metrics.incr("write_behind.failed")
+            else:
+                next_attempt_at = now + self.retry_delay * 2 ** (attempts - 1)
+                updates.append(("pending", attempts, None, str(result.get("error")), now, next_attempt_at, row["id"]))
+                metrics.incr("write_behind.retried")
+
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.executemany(
+                "UPDATE ingest_queue SET status = ?, attempts = ?, result = ?, error = ?, updated_at = ?, next_attempt_at = ? WHERE id = ?",
+                updates
+            )
+
+    def _purge(self):
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "DELETE FROM ingest_queue WHERE status IN ('done', 'failed') AND updated_at < ?",
+                (time.time() - self.retention,)
+            )
+
+    def _ensure_workers(self):
+        if self._threads_pid == os.getpid() and all(thread.is_alive() for thread in self._threads):
+            return
+        with self._lock:
+            if self._threads_pid == os.getpid() and all(thread.is_alive() for thread in self._threads):
+                return
+            self._threads_pid = os.getpid()
+            self._threads = [
+                threading.Thread(target=self._run, name=f"write-behind-{number}", daemon=True)
+                for number in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def start(self):
+        # Also drains the items left pending by a previous run of the application.
+        self._ensure_workers()
+
+    def _run(self):
+        last_purge = 0.0
+        while True:
+            try:
+                rows = self._claim()
+                if rows:
+                    self._process(rows)
+                    continue
+                if time.monotonic() - last_purge > 60:
+                    self._purge()
+                    last_purge = time.monotonic()
+            except sqlite3.Error as e:
+                logging.warning(f"Write-behind queue error: {e}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
@@ -0,0 +1,92 @@
+"""
+Benchmark of the async broker path (app/async_http_client.py) against the synchronous one, with
+stub_broker.py standing in for the context broker and adding a fixed latency to every response.
+
+It starts the stub in its own process (so that its threads do not compete with the client for the
+GIL) on the host and port of KONG_ENTITIES in app/config.py and times, from a single thread, a
+batch upsert of --entities entities in chunks of --chunk-size, with upsert_to_kong sending one chunk
+after another and with async_upsert_to_kong, as upsert_to_kong does with ASYNC_BROKER_ENABLED.
+
+    python benchmarks/async_broker_benchmark.py --latency 20 --entities 5000 --chunk-size 50
+"""
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import utils
+from app.async_http_client import async_http_client
+from app.config import KONG_ENTITIES
+
+
+def entity(index, prefix):
+    return {
+        "id": f"urn:ngsi-ld:AgriParcelRecord:{prefix}-{index}",
+        "type": "AgriParcelRecord",
+        "soilTemperature": {"type": "Property", "value": 18.5, "unitCode": "CEL"},
+        "hasAgriParcel": {"type": "Relationship", "object": "urn:ngsi-ld:AgriParcel:1"},
+    }
+
+
+def timed(function):
+    start = time.perf_counter()
+    # upsert_to_kong prints the errors of the broker.
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=20, help="Milliseconds the stub broker adds to every response.")
+    parser.add_argument("--entities", type=int, default=5000, help="Entities of the batch upsert.")
+    parser.add_argument("--chunk-size", type=int, default=50, help="Entities per batch upsert request.")
+    args = parser.parse_args()
+
+    if not async_http_client.available():
+        sys.exit("httpx is not installed.")
+    address = urlsplit(KONG_ENTITIES)
+    stub = subprocess.Popen(
+        [sys.executable, "-u", os.path.join(ROOT, "stub_broker.py"), "--host", address.hostname, "--port", str(address.port), "--latency", str(args.latency)],
+        stdout=subprocess.PIPE, text=True
+    )
+    stub.stdout.readline()
+    try:
+        run(args)
+    finally:
+        stub.terminate()
+
+
+def run(args):
+    # The identity provider is not part of the benchmark.
+    utils.ishare_token_manager.fetch_token = lambda: ("benchmark-token", 3600)
+    utils.kong_verification_queue.submit = lambda entity_id: None
+    # upsert_to_kong must take its synchronous path whatever the configuration says.
+    utils.ASYNC_BROKER_ENABLED = False
+
+    print(f"broker latency {args.latency:.0f} ms, at most {async_http_client.max_in_flight} requests in flight")
+    print(f"{'operation':<38}{'sync (s)':>10}{'async (s)':>11}{'speed-up':>10}")
+
+    # Both paths open their connections before being timed.
+    warm_up = [entity(index, "warm-up") for index in range(async_http_client.max_in_flight)]
+    timed(lambda: utils.upsert_to_kong(warm_up[:1]))
+    timed(lambda: async_http_client.run(utils.async_upsert_to_kong(warm_up, 1)))
+
+    batch = [entity(index, "sync") for index in range(args.entities)]
+    sync_time, sync_results = timed(lambda: utils.upsert_to_kong(batch, args.chunk_size))
+    batch = [entity(index, "async") for index in range(args.entities)]
+    async_time, async_results = timed(lambda: async_http_client.run(utils.async_upsert_to_kong(batch, args.chunk_size)))
+    assert [result["status"] for result in sync_results] == [result["status"] for result in async_results]
+    label = f"upsert {args.entities} in chunks of {args.chunk_size}"
+    print(f"{label:<38}{sync_time:>10.2f}{async_time:>11.2f}{sync_time / async_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Sizes and costs of compressing the NGSI-LD bodies this service sends and receives (app/compression.py).
+
+It builds a batch of --entities normalized AgriParcelRecord entities, serialised as serialize_entity
+does, and for gzip at several levels (and zstd, when the `zstandard` package is installed) prints the
+compressed size, the ratio, the time to compress the batch and the time to read it back through
+DecompressingStream with the size limit of the ingest endpoints (REQUEST_DECOMPRESSION_MAX_SIZE):
+
+    python benchmarks/compression_benchmark.py --entities 1000
+"""
+import argparse
+import gzip
+import io
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.compression import DecompressingStream, RequestDecompressionMiddleware, zstandard
+
+# Default of REQUEST_DECOMPRESSION_MAX_SIZE.
+MAX_SIZE = RequestDecompressionMiddleware(None).max_size
+from app.utils import serialize_entity
+
+
+def record(index):
+    def measure(value, unit):
+        return {"type": "Property", "value": value, "unitCode": unit, "observedAt": f"2024-05-01T12:{index % 60:02d}:00Z"}
+
+    def date(value):
+        return {"type": "Property", "value": {"@type": "DateTime", "@value": value}}
+
+    return {
+        "id": f"urn:ngsi-ld:AgriParcelRecord:{index}",
+        "type": "AgriParcelRecord",
+        "dateCreated": date("2024-05-01T12:00:00Z"),
+        "dateModified": date(f"2024-05-01T12:{index % 60:02d}:00Z"),
+        "location": {"type": "GeoProperty", "value": {"type": "Point", "coordinates": [-5.66 + index * 1e-5, 40.96]}},
+        "soilTemperature": measure(18.5 + index % 7 / 10, "CEL"),
+        "airTemperature": measure(21.0 + index % 5 / 10, "CEL"),
+        "relativeHumidity": measure(0.55 + index % 9 / 100, "P1"),
+        "depth": measure(10, "CMT"),
+        "hasAgriParcel": {"type": "Relationship", "object": f"urn:ngsi-ld:AgriParcel:{index % 20}"},
+    }
+
+
+def best(statement, number):
+    return min(timeit.repeat(statement, number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entities", type=int, default=1000, help="Entities of the batch.")
+    args = parser.parse_args()
+
+    body = serialize_entity([record(index) for index in range(args.entities)]).encode()
+    codecs = {f"gzip -{level}": ("gzip", lambda data, level=level: gzip.compress(data, compresslevel=level, mtime=0)) for level in (1, 5, 9)}
+    if zstandard is not None:
+        for level in (3, 10):
+            codecs[f"zstd -{level}"] = ("zstd", zstandard.ZstdCompressor(level=level).compress)
+
+    number = max(1, 2000 // args.entities)
+    print(f"{args.entities} entities, {len(body)} bytes uncompressed")
+    print(f"{'codec':<10}{'bytes':>10}{'ratio':>8}{'compress (ms)':>15}{'decompress (ms)':>17}")
+    for name, (encoding, compress) in codecs.items():
+        compressed = compress(body)
+        assert DecompressingStream(io.BytesIO(compressed), encoding, MAX_SIZE).read() == body
+        compress_time = best(lambda: compress(body), number)
+        decompress_time = best(lambda: DecompressingStream(io.BytesIO(compressed), encoding, MAX_SIZE).read(), number)
+        print(f"{name:<10}{len(compressed):>10}{len(compressed) / len(body):>8.3f}{compress_time * 1e3:>15.2f}{decompress_time * 1e3:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
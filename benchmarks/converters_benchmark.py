@@ -0,0 +1,100 @@
+"""
+Micro-benchmark of the compiled to_smart_data_model converters against the hand-written methods
+they replaced (benchmarks/legacy_converters.py).
+
+For every model it builds one object with every attribute set and one with only the required ones,
+checks that both converters return the same dictionary and times them, alternating between the two
+and keeping the best of the repeats so that the noise of the machine does not favour either:
+
+    python benchmarks/converters_benchmark.py --number 20000 --repeat 7
+
+AgriParcelOperation and AgriSoilState are timed without baseline: their hand-written methods read
+attributes the models do not have and raised AttributeError.
+"""
+import argparse
+import inspect
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.smart_data_models.agri_app import AgriApp
+from app.smart_data_models.agri_carbon_footprint import AgriCarbonFootPrint
+from app.smart_data_models.agri_crop import AgriCrop
+from app.smart_data_models.agri_farm import AgriFarm
+from app.smart_data_models.agri_greenhouse import AgriGreenHouse
+from app.smart_data_models.agri_parcel import AgriParcel
+from app.smart_data_models.agri_parcel_operation import AgriParcelOperation
+from app.smart_data_models.agri_parcel_record import AgriParcelRecord
+from app.smart_data_models.agri_soil import AgriSoil
+from app.smart_data_models.agri_soil_state import AgriSoilState
+from app.smart_data_models.agri_yeld import AgriYeld
+from app.smart_data_models.building import Building
+from app.smart_data_models.person import Person
+from legacy_converters import LEGACY_CONVERTERS
+
+# Geometries are converted when the object is built, so they are always given.
+GEOMETRY_PARAMETERS = ("location", "land_location", "type_location", "location_type", "land_location_type")
+MODELS = (AgriApp, AgriCarbonFootPrint, AgriCrop, AgriFarm, AgriGreenHouse, AgriParcel, AgriParcelOperation,
+          AgriParcelRecord, AgriSoil, AgriSoilState, AgriYeld, Building, Person)
+BROKEN_LEGACY = ("AgriParcelOperation", "AgriSoilState")
+
+
+def sample_value(name):
+    if name in ("location", "land_location"):
+        return "-5.66,40.96;-5.65,40.96;-5.65,40.97;-5.66,40.96"
+    if name in GEOMETRY_PARAMETERS:
+        return "Polygon"
+    if "date" in name.lower():
+        return datetime(2024, 5, 1, 12, 0, 0)
+    if name.startswith("has") or name in ("see_also", "related_source"):
+        return f"urn:ngsi-ld:{name}:1,urn:ngsi-ld:{name}:2"
+    return f"{name} value"
+
+
+def build(model, full=True):
+    parameters = list(inspect.signature(model.__init__).parameters.values())[1:]
+    arguments = {}
+    for parameter in parameters:
+        if parameter.name == "id":
+            arguments["id"] = f"urn:ngsi-ld:{model.__name__}:1"
+        elif full or parameter.default is inspect.Parameter.empty or parameter.name in GEOMETRY_PARAMETERS:
+            arguments[parameter.name] = sample_value(parameter.name)
+    return model(**arguments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="Conversions timed per model and converter.")
+    parser.add_argument("--repeat", type=int, default=7, help="Timings per converter, the best one is kept.")
+    args = parser.parse_args()
+
+    print(f"{'model':<22}{'legacy (us)':>14}{'compiled (us)':>16}{'speed-up':>10}")
+    for model in MODELS:
+        instances = [build(model), build(model, full=False)]
+        legacy = LEGACY_CONVERTERS[model.__name__]
+        if model.__name__ not in BROKEN_LEGACY:
+            for instance in instances:
+                assert legacy(instance) == instance.to_smart_data_model(), f"{model.__name__} converters differ"
+
+        # Both are called as plain functions, as a method call costs the same whichever function it binds.
+        converter = model.to_smart_data_model
+        compiled = lambda: [converter(instance) for instance in instances]
+        if model.__name__ in BROKEN_LEGACY:
+            compiled_time = min(timeit.repeat(compiled, number=args.number, repeat=args.repeat))
+            compiled_us = compiled_time / args.number / len(instances) * 1e6
+            print(f"{model.__name__:<22}{'-':>14}{compiled_us:>16.2f}{'-':>10}")
+            continue
+        legacy_time = compiled_time = float("inf")
+        for _ in range(args.repeat):
+            legacy_time = min(legacy_time, timeit.timeit(lambda: [legacy(instance) for instance in instances], number=args.number))
+            compiled_time = min(compiled_time, timeit.timeit(compiled, number=args.number))
+        legacy_us = legacy_time / args.number / len(instances) * 1e6
+        compiled_us = compiled_time / args.number / len(instances) * 1e6
+        print(f"{model.__name__:<22}{legacy_us:>14.2f}{compiled_us:>16.2f}{legacy_us / compiled_us:>9.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark of the geometry parser (app/geometry.py) over large polygons, such as the parcels of a
+cadastral export, against the per-position split that from_flat_payload used before.
+
+For every size it times the parsing of a "x,y;x,y;..." ring, the validation of its bounds and
+closure, and its Douglas-Peucker simplification:
+
+    python benchmarks/geometry_benchmark.py --sizes 1000 10000 100000 --tolerance 0.00001
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.geometry import parse_coordinates, simplify_geometry, validate_geometry
+
+
+def legacy_parse(location_str):
+    if ';' in location_str:
+        return [list(map(float, pair.split(','))) for pair in location_str.split(';')]
+    return list(map(float, location_str.split(',')))
+
+
+def polygon_string(size, seed=0):
+    # A noisy ring of about 1 km around Salamanca, closed on its first vertex.
+    generator = random.Random(seed)
+    vertices = []
+    for index in range(size - 1):
+        angle = 2 * math.pi * index / (size - 1)
+        radius = 0.01 * (1 + 0.05 * math.sin(7 * angle)) + generator.uniform(-1e-6, 1e-6)
+        vertices.append(f"{-5.66 + radius * math.cos(angle):.7f},{40.96 + radius * math.sin(angle):.7f}")
+    vertices.append(vertices[0])
+    return ";".join(vertices)
+
+
+def best(statement, number):
+    return min(timeit.repeat(statement, number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Vertices of the polygons.")
+    parser.add_argument("--tolerance", type=float, default=0.00001, help="Simplification tolerance in degrees.")
+    args = parser.parse_args()
+
+    print(f"{'vertices':>9}{'legacy (ms)':>13}{'parse (ms)':>12}{'speed-up':>10}{'validate (ms)':>15}{'simplify (ms)':>15}{'kept':>8}")
+    for size in args.sizes:
+        text = polygon_string(size)
+        assert parse_coordinates(text) == legacy_parse(text)
+        number = max(1, 200000 // size)
+        legacy = best(lambda: legacy_parse(text), number)
+        parse = best(lambda: parse_coordinates(text), number)
+        polygon = [parse_coordinates(text)]
+        validate = best(lambda: validate_geometry("Polygon", polygon), number)
+        simplify = best(lambda: simplify_geometry("Polygon", polygon, args.tolerance), max(1, number // 10))
+        kept = len(simplify_geometry("Polygon", polygon, args.tolerance)[0])
+        print(f"{size:>9}{legacy * 1e3:>13.2f}{parse * 1e3:>12.2f}{legacy / parse:>9.2f}x"
+              f"{validate * 1e3:>15.2f}{simplify * 1e3:>15.2f}{kept:>8}")
+
+
+if __name__ == "__main__":
+    main()
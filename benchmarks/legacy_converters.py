@@ -0,0 +1,1329 @@
+"""
+The hand-written to_smart_data_model methods the models had before their converters were compiled
+from attribute specs, kept verbatim as the baseline of converters_benchmark.py.
+"""
+
+
+def agri_app(self):
+    """
+    This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
+
+    Returns:
+        A dictionary representing the current Smart Data Model.
+    """
+    agri_app_data = {
+        "id": self.id,
+        "type": self.type
+    }
+
+    if self.address:
+        agri_app_data["address"] = {
+            "type": "Property",
+            "value": self.address
+        }
+
+    if self.alternateName:
+        agri_app_data["alternateName"] = {
+            "type": "Property",
+            "value": self.alternateName
+        }
+
+    if self.areaServed:
+        agri_app_data["areaServed"] = {
+            "type": "Property",
+            "value": self.areaServed
+        }
+
+    if self.category:
+        agri_app_data["category"] = {
+            "type": "Property",
+            "value": self.category
+        }
+
+    if self.dataProvider:
+        agri_app_data["dataProvider"] = {
+            "type": "Property",
+            "value": self.dataProvider
+        }
+
+    if self.dateCreated:
+        agri_app_data["dateCreated"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.dateCreated.isoformat()
+            }
+        }
+
+    if self.dateModified:
+        agri_app_data["dateModified"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.dateModified.isoformat()
+            }
+        }
+
+    if self.description:
+        agri_app_data["description"] = {
+            "type": "Property",
+            "value": self.description
+        }
+
+    if self.endpoint:
+        agri_app_data["endpoint"] = {
+            "type": "Property",
+            "value": self.endpoint
+        }
+
+    if self.hasProvider:
+        agri_app_data["hasProvider"] = {
+            "type": "Relationship",
+            "object": self.hasProvider
+        }
+
+    if self.location:
+        agri_app_data["location"] = {
+            "type": "Property",
+            "value": self.location
+        }
+
+    if self.name:
+        agri_app_data["name"] = {
+            "type": "Property",
+            "value": self.name
+        }
+
+    if self.owner:
+        agri_app_data["owner"] = {
+            "type": "Property",
+            "value": self.owner
+        }
+
+    if self.relatedSource:
+        agri_app_data["relatedSource"] = {
+            "type": "Property",
+            "value": self.relatedSource
+        }
+
+    if self.seeAlso:
+        agri_app_data["seeAlso"] = {
+            "type": "Property",
+            "value": self.seeAlso
+        }
+
+    if self.source:
+        agri_app_data["source"] = {
+            "type": "Property",
+            "value": self.source
+        }
+
+    if self.version:
+        agri_app_data["version"] = {
+            "type": "Property",
+            "value": self.version
+        }
+
+    return agri_app_data
+
+
+def agri_carbon_footprint(self):
+    """
+    This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
+
+    Returns:
+        A dictionary representing the current Smart Data Model.
+    """
+    agri_carbon_footprint_data = {
+        "id": self.id,
+        "type": self.type,
+    }
+    if self.has_agri_crop:
+        agri_carbon_footprint_data["hasAgriCrop"] = {
+            "type": "Relationship",
+            "object": self.has_agri_crop
+        }
+
+    if self.has_agri_parcel:
+        agri_carbon_footprint_data["hasAgriParcel"] = {
+            "type": "Relationship",
+            "object": self.has_agri_parcel
+        }
+
+    if self.has_agri_yeld:
+        agri_carbon_footprint_data["hasAgriYeld"] = {
+            "type": "Relationship",
+            "object": self.has_agri_yeld
+        }
+
+    if self.carbon_footprint_value:
+        agri_carbon_footprint_data["carbonFootprint"] = {
+            "type": "Property",
+            "value": {
+                "value": self.carbon_footprint_value,
+                "accuracyPercent": self.carbon_footprint_accuracy_percent,
+                "minValue": self.carbon_footprint_min_value,
+                "unitText": self.carbon_footprint_unit_text
+            }
+        }
+
+    if self.estimation_start_at:
+        agri_carbon_footprint_data["estimationStartAt"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.estimation_start_at
+            }
+        }
+
+    if self.estimation_end_at:
+        agri_carbon_footprint_data["estimationEndAt"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.estimation_end_at
+            }
+        }
+    return agri_carbon_footprint_data
+
+
+def agri_crop(self):
+    """
+    This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
+
+    Returns:
+        A dictionary representing the current Smart Data Model.
+    """
+    agri_crop_data = {
+        "id": self.id,
+        "type": self.type
+    }
+
+    if self.date_created:
+        agri_crop_data["dateCreated"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.date_created
+            }
+        }
+
+    if self.date_modified:
+        agri_crop_data["dateModified"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.date_modified
+            }
+        }
+
+    if self.name:
+        agri_crop_data["name"] = self.name
+
+    if self.alternate_name:
+        agri_crop_data["alternateName"] = self.alternate_name
+
+    if self.agro_voc_concept:
+        agri_crop_data["agroVocConcept"] = {
+            "type": "Property",
+            "value": {
+                "@type": "URL",
+                "@value": self.agro_voc_concept
+            }
+        }
+
+    if self.description:
+        agri_crop_data["description"] = {
+            "value": self.description
+        }
+
+    if self.related_source:
+        agri_crop_data["relatedSource"] = {
+            "value": [
+                {
+                    "application": self.related_source,
+                    "applicationEntityId": "app:crop1"
+                }
+            ]
+        }
+
+    if self.has_agri_soil:
+        agri_crop_data["hasAgriSoil"] = {
+            "type": "Relationship",
+            "object": self.has_agri_soil.split(',') if isinstance(self.has_agri_soil, str) else self.has_agri_soil
+        }
+
+    if self.has_agri_fertiliser:
+        agri_crop_data["hasAgriFertiliser"] = {
+            "type": "Relationship",
+            "object": self.has_agri_fertiliser.split(',') if isinstance(self.has_agri_fertiliser, str) else self.has_agri_fertiliser
+        }
+
+    if self.has_agri_pest:
+        agri_crop_data["hasAgriPest"] = {
+            "type": "Relationship",
+            "object": self.has_agri_pest.split(',') if isinstance(self.has_agri_pest, str) else self.has_agri_pest
+        }
+
+    if self.planting_from:
+        agri_crop_data["plantingFrom"] = {"value": self.planting_from}
+
+    if self.harvesting_interval:
+        agri_crop_data["harvestingInterval"] = {"value": self.harvesting_interval}
+
+    if self.watering_frequency:
+        agri_crop_data["wateringFrequency"] = {"value": self.watering_frequency}
+
+    return agri_crop_data
+
+
+def agri_farm(self):
+    """
+    This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
+
+    Returns:
+        A dictionary representing the current Smart Data Model.
+    """
+    agri_farm_data = {
+        "id": self.id,
+        "type": self.type
+    }
+
+    if self.date_created:
+        agri_farm_data["dateCreated"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.date_created
+            }
+        }
+
+    if self.date_modified:
+        agri_farm_data["dateModified"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.date_modified
+            }
+        }
+
+    if self.name:
+        agri_farm_data["name"] = {
+            "type": "Property",
+            "value": self.name
+        }
+
+    if self.description:
+        agri_farm_data["description"] = {
+            "type": "Property",
+            "value": self.description
+        }
+
+    if self.related_source:
+        agri_farm_data["relatedSource"] = {
+            "type": "Property",
+            "value": [
+                {
+                    "application": self.related_source,
+                    "applicationEntityId": "app:farm1"
+                }
+            ]
+        }
+
+    if self.see_also:
+        agri_farm_data["seeAlso"] = self.see_also
+
+    if self.location_type and self.location:
+        agri_farm_data["location"] = {
+            "type": "GeoProperty",
+            "value": {
+                "type": self.location_type,
+                "coordinates": self.location
+            }
+        }
+
+    if self.land_location_type and self.land_location:
+        agri_farm_data["landLocation"] = {
+            "type": "GeoProperty",
+            "value": {
+                "type": self.land_location_type,
+                "coordinates": self.land_location
+            }
+        }
+
+    if self.address_locality or self.address_country or self.address_street:
+        agri_farm_data["address"] = {
+            "type": "Property",
+            "value": {
+                "addressLocality": self.address_locality,
+                "addressCountry": self.address_country,
+                "streetAddress": self.address_street
+            }
+        }
+
+    if self.contact_point_email or self.contact_point_telephone:
+        agri_farm_data["contactPoint"] = {
+            "type": "Property",
+            "value": {
+                "email": self.contact_point_email,
+                "telephone": self.contact_point_telephone
+            }
+        }
+
+    if self.owned_by:
+        agri_farm_data["ownedBy"] = {
+            "type": "Relationship",
+            "object": self.owned_by
+        }
+
+    if self.has_building:
+        agri_farm_data["hasBuilding"] = {
+            "type": "Relationship",
+            "object": self.has_building.split(',') if isinstance(self.has_building, str) else self.has_building
+        }
+
+    if self.has_agri_parcel:
+        agri_farm_data["hasAgriParcel"] = {
+            "type": "Relationship",
+            "object": self.has_agri_parcel.split(',') if isinstance(self.has_agri_parcel, str) else self.has_agri_parcel
+        }
+
+    return agri_farm_data
+
+
+def agri_greenhouse(self):
+    """
+    This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
+
+    Returns:
+        A dictionary representing the current Smart Data Model.
+    """
+    agri_greenhouse_data = {
+        "id": self.id,
+        "type": self.type
+    }
+
+    if self.date_created:
+        agri_greenhouse_data["dateCreated"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.date_created
+            }
+        }
+
+    if self.date_modified:
+        agri_greenhouse_data["dateModified"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.date_modified
+            }
+        }
+
+    if self.owned_by:
+        agri_greenhouse_data["ownedBy"] = {
+            "type": "Relationship",
+            "object": self.owned_by
+        }
+
+    if self.related_source:
+        agri_greenhouse_data["relatedSource"] = {
+            "value": [
+                {
+                    "application": self.related_source,
+                    "applicationEntityId": "app:greenhouse1"
+                }
+            ]
+        }
+
+    if self.see_also:
+        agri_greenhouse_data["seeAlso"] = {
+            "type": "Relationship",
+            "object": self.see_also.split(',') if isinstance(self.see_also, str) else self.see_also
+        }
+
+    if self.belongs_to:
+        agri_greenhouse_data["belongsTo"] = self.belongs_to
+
+    # Repeated pattern for different properties
+    relationships = [
+        ("hasAgriParcelParent", self.has_agri_parcel_parent),
+        ("hasAgriParcelChildren", self.has_agri_parcel_children),
+        ("hasWeatherObserved", self.has_weather_observed),
+        ("hasWaterQualityObserved", self.has_water_quality_observed),
+        ("hasDevice", self.has_device)
+    ]
+
+    for rel, value in relationships:
+        if value:
+            agri_greenhouse_data[rel] = {
+                "type": "Relationship",
+                "object": value.split(',') if isinstance(value, str) else value
+            }
+
+    properties = [
+        ("relativeHumidity", self.relative_humidity),
+        ("leafTemperature", self.leaf_temperature),
+        ("co2", self.co2),
+        ("dailyLight", self.daily_light)
+    ]
+
+    for prop, value in properties:
+        if value:
+            agri_greenhouse_data[prop] = {
+                "type": "Property",
+                "value": value
+            }
+
+    if self.drain_flow or self.drain_flow_max_value or self.drain_flow_min_value:
+        agri_greenhouse_data["drainFlow"] = {
+            "type": "Property",
+            "value": {
+                "value": self.drain_flow,
+                "maxValue": self.drain_flow_max_value,
+                "minValue": self.drain_flow_min_value
+            }
+        }
+
+    return agri_greenhouse_data
+
+
+def agri_parcel(self):
+    """
+    This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
+
+    Returns:
+        A dictionary representing the current Smart Data Model.
+    """
+    agri_parcel_data = {
+        "id": self.id,
+        "type": self.type
+    }
+
+    # A continuación, se verifica cada atributo antes de añadirlo al diccionario:
+    if self.date_created:
+        agri_parcel_data["dateCreated"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.date_created
+            }
+        }
+
+    if self.date_modified:
+        agri_parcel_data["dateModified"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.date_modified
+            }
+        }
+
+    if self.type_location and self.location:
+        agri_parcel_data["location"] = {
+            "type": "GeoProperty",
+            "value": {
+                "type": self.type_location,
+                "coordinates": self.location
+            }
+        }
+
+    if self.area:
+        agri_parcel_data["area"] = {"value": self.area}
+
+    if self.description:
+        agri_parcel_data["description"] = {"value": self.description}
+
+    if self.category:
+        agri_parcel_data["category"] = {"value": self.category}
+
+    if self.related_source:
+        agri_parcel_data["relatedSource"] = {
+            "value": [
+                {
+                    "application": self.related_source.split(',') if isinstance(self.related_source, str) else self.related_source,
+                    "applicationEntityId": "app:parcel1"
+                }
+            ]
+        }
+
+    if self.see_also:
+        agri_parcel_data["seeAlso"] = {
+            "value": self.see_also.split(',') if isinstance(self.see_also, str) else self.see_also
+        }
+
+    # Similar checks for the remaining attributes:
+    for attr, key in [
+        (self.belongs_to, "belongsTo"),
+        (self.owned_by, "ownedBy"),
+        (self.has_agri_parcel_parent, "hasAgriParcelParent"),
+        (self.has_agri_crop, "hasAgriCrop"),
+        (self.has_air_quality_observed, "hasAirQualityObserved"),
+        (self.crop_status, "cropStatus"),
+        (self.has_agri_soil, "hasAgriSoil"),
+        (self.soil_texture_type, "soilTextureType"),
+        (self.irrigation_system_type, "irrigationSystemType")
+    ]:
+        if attr:
+            agri_parcel_data[key] = {
+                "type": "Relationship" if "has" in key or "belongsTo" in key or "ownedBy" in key else "Property",
+                "object": attr if "has" in key or "belongsTo" in key or "ownedBy" in key else {"value": attr}
+            }
+
+    if self.has_agri_parcel_children:
+        agri_parcel_data["hasAgriParcelChildren"] = {
+            "type": "Relationship",
+            "object": self.has_agri_parcel_children.split(',') if isinstance(self.has_agri_parcel_children, str) else self.has_agri_parcel_children
+        }
+
+    if self.last_planted_at:
+        agri_parcel_data["lastPlantedAt"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.last_planted_at
+            }
+        }
+
+    if self.has_device:
+        agri_parcel_data["hasDevice"] = {
+            "type": "Relationship",
+            "object": self.has_device.split(',') if isinstance(self.has_device, str) else self.has_device
+        }
+
+    return agri_parcel_data
+
+
+def agri_parcel_operation(self):
+    """
+    This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
+
+    Returns:
+        A dictionary representing the current Smart Data Model.
+    """
+    agri_parcel_operation_data = {
+        "id": self.id,
+        "type": self.type
+    }
+
+    # Helper function for datetime properties
+    def add_datetime_property(key, value):
+        if value:
+            agri_parcel_operation_data[key] = {
+                "type": "Property",
+                "value": {
+                    "@type": "DateTime",
+                    "@value": value
+                }
+            }
+
+    # Handling datetime properties
+    datetime_props = ["dateCreated", "dateModified", "plannedStartAt", "plannedEndAt", "startedAt", "endedAt", "reportedAt"]
+    for prop in datetime_props:
+        attr_val = getattr(self, prop.lower())
+        add_datetime_property(prop, attr_val)
+
+    # Handling direct properties
+    direct_props = ["operationType", "description", "result", "status", "quantity", "waterSource"]
+    for prop in direct_props:
+        attr_val = getattr(self, prop.lower())
+        if attr_val:
+            agri_parcel_operation_data[prop] = {
+                "value": attr_val
+            }
+
+    # Handling URL properties
+    url_props = ["workOrder", "workRecord", "irrigationRecord"]
+    for prop in url_props:
+        attr_val = getattr(self, prop.lower())
+        if attr_val:
+            agri_parcel_operation_data[prop] = {
+                "type": "Property",
+                "value": {
+                    "@type": "URL",
+                    "@value": attr_val
+                }
+            }
+
+    # Handling complex properties
+    complex_props = [
+        ("dieselFuelConsumption", ["value", "maxValue", "minValue", "unitText"]),
+        ("gasolineFuelConsumption", ["value", "maxValue", "minValue", "unitText"])
+    ]
+
+    for prop, subprops in complex_props:
+        prop_data = {}
+        for subprop in subprops:
+            attr_val = getattr(self, f"{prop.lower()}_{subprop.lower()}")
+            if attr_val:
+                prop_data[subprop] = attr_val
+        if prop_data:
+            agri_parcel_operation_data[prop] = {
+                "type": "Property",
+                "value": prop_data
+            }
+
+    # Handling relationship properties
+    relationships = ["hasAgriParcel", "hasOperator", "hasAgriProductType"]
+    for rel in relationships:
+        attr_val = getattr(self, rel.lower())
+        if attr_val:
+            agri_parcel_operation_data[rel] = {
+                "type": "Relationship",
+                "object": attr_val
+            }
+
+    # Handling list properties
+    list_props = ["relatedSource", "seeAlso"]
+    for prop in list_props:
+        attr_val = getattr(self, prop.lower())
+        if attr_val:
+            agri_parcel_operation_data[prop] = {
+                "value": attr_val.split(',') if isinstance(attr_val, str) else attr_val
+            }
+
+    return agri_parcel_operation_data
+
+
+def agri_parcel_record(self):
+    """
+    This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
+
+    Returns:
+        A dictionary representing the current Smart Data Model.
+    """
+    agri_parcel_record_data = {
+        "id": self.id,
+        "type": self.type
+    }
+
+
+    if self.date_created:
+        agri_parcel_record_data["dateCreated"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.date_created
+            }
+        }
+
+    if self.date_modified:
+        agri_parcel_record_data["dateModified"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.date_modified
+            }
+        }
+
+    if self.related_source:
+        agri_parcel_record_data["relatedSource"] = {
+            "value": [
+                {
+                    "application": self.related_source.split(',') if isinstance(self.related_source, str) else self.related_source,
+                    "applicationEntityId": "app:record1"
+                }
+            ]
+        }
+
+    if self.see_also:
+        agri_parcel_record_data["seeAlso"] = {
+            "value": self.see_also.split(',') if isinstance(self.see_also, str) else self.see_also
+        }
+
+    if self.has_agri_parcel:
+        agri_parcel_record_data["hasAgriParcel"] = {
+            "type": "Relationship",
+            "object": self.has_agri_parcel
+        }
+
+    if self.type_location and self.location:
+        agri_parcel_record_data["location"] = {
+            "type": "GeoProperty",
+            "value": {
+                "type": self.type_location,
+                "coordinates": self.location
+            }
+        }
+
+    for attr, unit, timestamp, key in [
+        (self.soil_temperature, self.soil_temperature_unit, None, "soilTemperature"),
+        (self.depth, self.depth_unit, None, "depth"),
+        (self.soil_moisture_vwc, self.soil_moisture_vwc_unit, None, "soilMoistureVWC"),
+        (self.soil_moisture_ec, self.soil_moisture_ec_unit, self.soil_moisture_ec_timestamp, "soilMoistureEC"),
+        (self.soil_salinity, self.soil_salinity_unit, self.soil_salinity_timestamp, "soilSalinity"),
+        (self.leaf_wetness, self.leaf_wetness_unit, self.leaf_wetness_timestamp, "leafWetness"),
+        (self.leaf_relative_humidity, self.leaf_relative_humidity_unit, self.leaf_relative_humidity_timestamp, "leafRelativeHumidity"),
+        (self.leaf_temperature, self.leaf_temperature_unit, self.leaf_temperature_timestamp, "leafTemperature"),
+        (self.air_temperature, self.air_temperature_unit, self.air_temperature_timestamp, "airTemperature"),
+        (self.solar_radiation, self.solar_radiation_unit, self.solar_radiation_timestamp, "solarRadiation"),
+        (self.relative_humidity, self.relative_humidity_unit, self.relative_humidity_timestamp, "relativeHumidity"),
+        (self.atmospheric_pressure, self.atmospheric_pressure_unit, self.atmospheric_pressure_timestamp, "atmosphericPressure"),
+    ]:
+        if attr:
+            agri_parcel_record_data[key] = {
+                "type": "Property",
+                "value": attr,
+                "unitCode": unit
+            }
+            if timestamp:
+                agri_parcel_record_data[key]["timestamp"] = {
+                    "type": "Property",
+                    "value": {
+                        "@type": "DateTime",
+                        "@value": timestamp
+                    }
+                }
+
+
+    if self.description:
+        agri_parcel_record_data["description"] = {
+            "type": "Property",
+            "value": self.description
+        }
+
+    if self.has_device:
+        agri_parcel_record_data["hasDevice"] = {
+            "type": "Relationship",
+            "object": self.has_device.split(',') if isinstance(self.has_device, str) else self.has_device
+        }
+
+    if self.observed_at:
+        agri_parcel_record_data["observedAt"] = self.observed_at
+
+    return agri_parcel_record_data
+
+
+def agri_soil(self):
+    """
+    This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
+
+    Returns:
+        A dictionary representing the current Smart Data Model.
+    """
+    agri_soil_data = {
+        "id": self.id,
+        "type": self.type
+    }
+
+    if self.date_created:
+        agri_soil_data["dateCreated"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.date_created
+            }
+        }
+
+    if self.date_modified:
+        agri_soil_data["dateModified"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.date_modified
+            }
+        }
+
+    if self.name:
+        agri_soil_data["name"] = {
+            "value": self.name
+        }
+
+    if self.alternate_name:
+        agri_soil_data["alternateName"] = {
+            "value": self.alternate_name
+        }
+
+    if self.description:
+        agri_soil_data["description"] = {
+            "value": self.description
+        }
+
+    if self.agro_voc_concept:
+        agri_soil_data["agroVocConcept"] = {
+            "type": "Property",
+            "value": {
+                "@type": "URL",
+                "@value": self.agro_voc_concept
+            }
+        }
+
+    if self.see_also:
+        agri_soil_data["seeAlso"] = {
+            "value": self.see_also.split(',') if isinstance(self.see_also, str) else self.see_also
+        }
+
+    if self.related_source:
+        agri_soil_data["relatedSource"] = {
+            "value": [
+                {
+                    "application": self.related_source.split(',') if isinstance(self.related_source, str) else self.related_source,
+                    "applicationEntityId": "app:soil1"
+                }
+            ]
+        }
+
+    if self.has_agri_product_type:
+        agri_soil_data["hasAgriProductType"] = {
+            "type": "Relationship",
+            "object": self.has_agri_product_type.split(',') if isinstance(self.has_agri_product_type, str) else self.has_agri_product_type
+        }
+
+    return agri_soil_data
+
+
+def agri_soil_state(self):
+    """
+    This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
+
+    Returns:
+        A dictionary representing the current Smart Data Model.
+    """
+    agri_carbon_footprint_data = {
+        "id": self.id,
+        "type": self.type
+    }
+
+    if self.dateCreated:
+        agri_carbon_footprint_data["dateCreated"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.date_created
+            }
+        }
+
+    if self.dateModified:
+        agri_carbon_footprint_data["dateModified"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.date_modified
+            }
+        }
+
+    if self.dateOfMeasurement:
+        agri_carbon_footprint_data["dateOfMeasurement"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.date_of_measurement
+            }
+        }
+
+    # Asumo que si hay un valor, todos los subatributos también tendrán valores. Si no es el caso, se deben hacer comprobaciones adicionales.
+    if self.acidity:
+        agri_carbon_footprint_data["acidity"] = {
+            "type": "Property",
+            "value": self.acidity,
+            "unitCode": self.acidity_unit,
+            "timestamp": {
+                "type": "Property",
+                "value": {
+                    "@type": "DateTime",
+                    "@value": self.acidity_timestamp
+                }
+            }
+        }
+
+    if self.electrical_conductivity:
+        agri_carbon_footprint_data["electricalConductivity"] = {
+            "type": "Property",
+            "value": self.electrical_conductivity,
+            "unitCode": self.electrical_conductivity_unit,
+            "timestamp": {
+                "type": "Property",
+                "value": {
+                    "@type": "DateTime",
+                    "@value": self.electrical_conductivity_timestamp
+                }
+            }
+        }
+
+    if self.density:
+        agri_carbon_footprint_data["density"] = {
+            "type": "Property",
+            "value": self.density,
+            "unitCode": self.density_unit,
+            "timestamp": {
+                "type": "Property",
+                "value": {
+                    "@type": "DateTime",
+                    "@value": self.density_timestamp
+                }
+            }
+        }
+
+    if self.humus:
+        agri_carbon_footprint_data["humus"] = {
+            "type": "Property",
+            "value": self.humus,
+            "unitCode": self.humus_unit,
+            "timestamp": {
+                "type": "Property",
+                "value": {
+                    "@type": "DateTime",
+                    "@value": self.humus_timestamp
+                }
+            }
+        }
+
+    if self.has_agri_soil:
+        agri_carbon_footprint_data["hasAgriSoil"] = {
+            "type": "Relationship",
+            "object": self.has_agri_soil
+        }
+
+    if self.has_agri_parcel:
+        agri_carbon_footprint_data["hasAgriParcel"] = {
+            "type": "Relationship",
+            "object": self.has_agri_parcel
+        }
+
+    if self.has_agri_greenhouse:
+        agri_carbon_footprint_data["hasAgriGreenhouse"] = {
+            "type": "Relationship",
+            "object": self.has_agri_greenhouse
+        }
+
+    return agri_carbon_footprint_data
+
+
+def agri_yeld(self):
+    """
+    This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
+
+    Returns:
+        A dictionary representing the current Smart Data Model.
+    """
+    agri_yeld_data = {
+        "id": self.id,
+        "type": self.type
+    }
+
+    if self.has_agri_crop:
+        agri_yeld_data["hasAgriCrop"] = {
+            "type": "Relationship",
+            "object": self.has_agri_crop
+        }
+
+    if self.has_agri_parcel:
+        agri_yeld_data["hasAgriParcel"] = {
+            "type": "Relationship",
+            "object": self.has_agri_parcel
+        }
+
+    if self.start_date_of_gathering_at:
+        agri_yeld_data["startDateOfGatheringAt"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.start_date_of_gathering_at
+            }
+        }
+
+    if self.end_date_of_gathering_at:
+        agri_yeld_data["endDateOfGatheringAt"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.end_date_of_gathering_at
+            }
+        }
+
+    if self.yeld_value or self.yeld_max_value or self.yeld_min_value or self.yeld_unit_text:
+        yeld_data = {"type": "Property", "value": {}}
+        if self.yeld_value:
+            yeld_data["value"]["value"] = self.yeld_value
+        if self.yeld_max_value:
+            yeld_data["value"]["maxValue"] = self.yeld_max_value
+        if self.yeld_min_value:
+            yeld_data["value"]["minValue"] = self.yeld_min_value
+        if self.yeld_unit_text:
+            yeld_data["value"]["unitText"] = self.yeld_unit_text
+        agri_yeld_data["yeld"] = yeld_data
+
+    return agri_yeld_data
+
+
+def building(self):
+    """
+    Convert the current object into a dictionary adhering to the Smart Data Model standard.
+    Returns a dictionary representing the current Smart Data Model.
+    """
+    building_data = {
+        "id": self.id,
+        "type": self.type,
+        "address": {
+            "type": "Property",
+            "value": self.address
+        },
+        "category": {
+            "type": "Property",
+            "value": self.category
+        }
+    }
+
+    if self.alternateName:
+        building_data["alternateName"] = {
+            "type": "Property",
+            "value": self.alternateName
+        }
+
+    if self.areaServed:
+        building_data["areaServed"] = {
+            "type": "Property",
+            "value": self.areaServed
+        }
+
+    if self.collapseRisk is not None:
+        building_data["collapseRisk"] = {
+            "type": "Property",
+            "value": self.collapseRisk
+        }
+
+    if self.containedInPlace:
+        building_data["containedInPlace"] = {
+            "type": "Property",
+            "value": self.containedInPlace
+        }
+
+    if self.dataProvider:
+        building_data["dataProvider"] = {
+            "type": "Property",
+            "value": self.dataProvider
+        }
+
+    if self.dateCreated:
+        building_data["dateCreated"] = {
+            "type": "Property",
+            "value": self.dateCreated
+        }
+
+    if self.dateModified:
+        building_data["dateModified"] = {
+            "type": "Property",
+            "value": self.dateModified
+        }
+
+    if self.description:
+        building_data["description"] = {
+            "type": "Property",
+            "value": self.description
+        }
+
+    if self.floorsAboveGround is not None:
+        building_data["floorsAboveGround"] = {
+            "type": "Property",
+            "value": self.floorsAboveGround
+        }
+
+    if self.floorsBelowGround is not None:
+        building_data["floorsBelowGround"] = {
+            "type": "Property",
+            "value": self.floorsBelowGround
+        }
+
+    if self.location:
+        building_data["location"] = {
+            "type": "Property",
+            "value": self.location
+        }
+
+    if self.name:
+        building_data["name"] = {
+            "type": "Property",
+            "value": self.name
+        }
+
+    if self.occupier:
+        building_data["occupier"] = {
+            "type": "Property",
+            "value": self.occupier
+        }
+
+    if self.openingHours:
+        building_data["openingHours"] = {
+            "type": "Property",
+            "value": self.openingHours
+        }
+
+    if self.owner:
+        building_data["owner"] = {
+            "type": "Property",
+            "value": self.owner
+        }
+
+    if self.peopleCapacity is not None:
+        building_data["peopleCapacity"] = {
+            "type": "Property",
+            "value": self.peopleCapacity
+        }
+
+    if self.peopleOccupancy is not None:
+        building_data["peopleOccupancy"] = {
+            "type": "Property",
+            "value": self.peopleOccupancy
+        }
+
+    if self.refMap:
+        building_data["refMap"] = {
+            "type": "Property",
+            "value": self.refMap
+        }
+
+    if self.seeAlso:
+        building_data["seeAlso"] = {
+            "type": "Property",
+            "value": self.seeAlso
+        }
+
+    if self.source:
+        building_data["source"] = {
+            "type": "Property",
+            "value": self.source
+        }
+
+    return building_data
+
+
+def person(self):
+    """
+    This method converts the current object into a dictionary that adheres to the Smart Data Model standard.
+
+    Returns:
+        A dictionary representing the current Smart Data Model.
+    """
+    person_data = {
+        "id": self.id,
+        "type": self.type
+    }
+
+    if self.additionalName:
+        person_data["additionalName"] = {
+            "type": "Property",
+            "value": self.additionalName
+        }
+
+    if self.address:
+        person_data["address"] = {
+            "type": "Property",
+            "value": self.address
+        }
+
+    if self.alternateName:
+        person_data["alternateName"] = {
+            "type": "Property",
+            "value": self.alternateName
+        }
+
+    if self.areaServed:
+        person_data["areaServed"] = {
+            "type": "Property",
+            "value": self.areaServed
+        }
+
+    if self.dataProvider:
+        person_data["dataProvider"] = {
+            "type": "Property",
+            "value": self.dataProvider
+        }
+
+    if self.dateCreated:
+        person_data["dateCreated"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.dateCreated.isoformat()
+            }
+        }
+
+    if self.dateModified:
+        person_data["dateModified"] = {
+            "type": "Property",
+            "value": {
+                "@type": "DateTime",
+                "@value": self.dateModified.isoformat()
+            }
+        }
+
+    if self.description:
+        person_data["description"] = {
+            "type": "Property",
+            "value": self.description
+        }
+
+    if self.email:
+        person_data["email"] = {
+            "type": "Property",
+            "value": self.email
+        }
+
+    if self.familyName:
+        person_data["familyName"] = {
+            "type": "Property",
+            "value": self.familyName
+        }
+
+    if self.givenName:
+        person_data["givenName"] = {
+            "type": "Property",
+            "value": self.givenName
+        }
+
+    if self.location:
+        person_data["location"] = {
+            "type": "GeoProperty",
+            "value": self.location
+        }
+
+    if self.name:
+        person_data["name"] = {
+            "type": "Property",
+            "value": self.name
+        }
+
+    if self.owner:
+        person_data["owner"] = {
+            "type": "Property",
+            "value": self.owner
+        }
+
+    if self.seeAlso:
+        person_data["seeAlso"] = {
+            "type": "Property",
+            "value": self.seeAlso
+        }
+
+    if self.source:
+        person_data["source"] = {
+            "type": "Property",
+            "value": self.source
+        }
+
+    if self.telephone:
+        person_data["telephone"] = {
+            "type": "Property",
+            "value": self.telephone
+        }
+
+    return person_data
+
+
+
+LEGACY_CONVERTERS = {
+    'AgriApp': agri_app,
+    'AgriCarbonFootPrint': agri_carbon_footprint,
+    'AgriCrop': agri_crop,
+    'AgriFarm': agri_farm,
+    'AgriGreenHouse': agri_greenhouse,
+    'AgriParcel': agri_parcel,
+    'AgriParcelOperation': agri_parcel_operation,
+    'AgriParcelRecord': agri_parcel_record,
+    'AgriSoil': agri_soil,
+    'AgriSoilState': agri_soil_state,
+    'AgriYeld': agri_yeld,
+    'Building': building,
+    'Person': person,
+}
@@ -0,0 +1,87 @@
+"""
+Memory footprint of AgriParcelRecord objects with __slots__ against the same objects holding their
+attributes in a per-instance __dict__, as the models did before they derived from SmartDataModel.
+
+Both variants run the same AgriParcelRecord.__init__ on the same payload; the memory reported is
+what the objects allocate, measured with tracemalloc:
+
+    python benchmarks/memory_benchmark.py --count 100000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.smart_data_models.agri_parcel_record import AgriParcelRecord
+
+PAYLOAD = {
+    "has_agri_parcel": "urn:ngsi-ld:AgriParcel:1",
+    "location": "-5.66,40.96;-5.65,40.96;-5.65,40.97;-5.66,40.96",
+    "type_location": "Polygon",
+    "soil_temperature": 18.5,
+    "soil_temperature_unit": "CEL",
+    "air_temperature": 21.3,
+    "air_temperature_unit": "CEL",
+    "air_temperature_timestamp": "2024-05-01T12:00:00Z",
+    "relative_humidity": 0.61,
+    "relative_humidity_unit": "P1",
+    "relative_humidity_timestamp": "2024-05-01T12:00:00Z",
+    "soil_moisture_vwc": 0.23,
+    "soil_moisture_vwc_unit": "P1",
+    "leaf_wetness": 0.1,
+    "leaf_wetness_unit": "P1",
+    "leaf_wetness_timestamp": "2024-05-01T12:00:00Z",
+    "observed_at": "2024-05-01T12:00:00Z",
+}
+
+
+class DictAgriParcelRecord:
+    """
+    DictAgriParcelRecord class holds the attributes of an AgriParcelRecord in its __dict__.
+    """
+
+
+def build_slots(index):
+    return AgriParcelRecord(id=f"urn:ngsi-ld:AgriParcelRecord:{index}", **PAYLOAD)
+
+
+def build_dict(index):
+    record = DictAgriParcelRecord()
+    AgriParcelRecord.__init__(record, id=f"urn:ngsi-ld:AgriParcelRecord:{index}", **PAYLOAD)
+    return record
+
+
+def measure(build, count):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    records = [build(index) for index in range(count)]
+    elapsed = time.perf_counter() - start
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    record = records[0]
+    shallow = sys.getsizeof(record) + (sys.getsizeof(record.__dict__) if hasattr(record, "__dict__") else 0)
+    return allocated, shallow, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000, help="Number of records built per variant.")
+    args = parser.parse_args()
+
+    print(f"{args.count} AgriParcelRecord objects ({len(AgriParcelRecord.__slots__)} attributes)")
+    print(f"{'variant':<10}{'total (MiB)':>14}{'per object (B)':>17}{'object only (B)':>18}{'build (s)':>12}")
+    results = {}
+    for name, build in (("__dict__", build_dict), ("__slots__", build_slots)):
+        allocated, shallow, elapsed = measure(build, args.count)
+        results[name] = allocated
+        print(f"{name:<10}{allocated / 2 ** 20:>14.1f}{allocated / args.count:>17.0f}{shallow:>18}{elapsed:>12.2f}")
+    print(f"__slots__ saves {1 - results['__slots__'] / results['__dict__']:.0%} of the memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Per-entity cost of validating NGSI-LD payloads against the published JSON Schemas
+(app/smart_data_models/schemas.py).
+
+For every model with a schema it validates one valid and one invalid normalized entity in two ways:
+    - jsonschema.validate, which builds a validator and checks the schema on every call;
+    - SchemaValidator.error, as validate_smart_data_model does: is_valid of a Draft7Validator built
+      once, and its errors collected only for the invalid entity.
+
+    python benchmarks/schema_validation_benchmark.py --number 2000
+"""
+import argparse
+import copy
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jsonschema
+
+from app.smart_data_models.agri_carbon_footprint import AgriCarbonFootPrint
+from app.smart_data_models.agri_soil_state import AgriSoilState
+from app.smart_data_models.agri_yeld import AgriYeld
+from app.smart_data_models.schemas import FORMAT_CHECKER, to_key_values
+
+
+def date(value):
+    return {"type": "Property", "value": {"@type": "DateTime", "@value": value}}
+
+
+def measure(value, unit):
+    return {"type": "Property", "value": value, "unitCode": unit, "observedAt": "2024-05-01T12:00:00Z"}
+
+
+ENTITIES = {
+    AgriSoilState: {
+        "id": "urn:ngsi-ld:AgriSoilState:1", "type": "AgriSoilState",
+        "dateCreated": date("2024-05-01T12:00:00"), "dateModified": date("2024-05-01T12:00:00"),
+        "dateOfMeasurement": date("2024-05-01T11:00:00Z"),
+        "acidity": measure(6.5, "pH"), "electricalConductivity": measure(0.3, "ohm/meter"),
+        "density": measure(1.3, "kg/m3"), "humus": measure(3.2, "percent"),
+        "hasAgriSoil": {"type": "Relationship", "object": "urn:ngsi-ld:AgriSoil:1"},
+        "hasAgriParcel": {"type": "Relationship", "object": "urn:ngsi-ld:AgriParcel:1"},
+    },
+    AgriYeld: {
+        "id": "urn:ngsi-ld:AgriYeld:1", "type": "AgriYeld",
+        "hasAgriCrop": {"type": "Relationship", "object": "urn:ngsi-ld:AgriCrop:1"},
+        "hasAgriParcel": {"type": "Relationship", "object": "urn:ngsi-ld:AgriParcel:1"},
+        "startDateOfGatheringAt": date("2024-05-01T08:00:00Z"), "endDateOfGatheringAt": date("2024-05-03T18:00:00Z"),
+        "yeld": {"type": "Property", "value": {"value": 7.5, "maxValue": 9, "minValue": 6, "unitText": "Tons per hectare"}},
+    },
+    AgriCarbonFootPrint: {
+        "id": "urn:ngsi-ld:AgriCarbonFootprint:1", "type": "AgriCarbonFootprint",
+        "hasAgriParcel": {"type": "Relationship", "object": "urn:ngsi-ld:AgriParcel:1"},
+        "carbonFootprint": {"type": "Property", "value": {"value": 12.4, "accuracyPercent": 5, "minValue": 11, "unitText": "Tons"}},
+        "estimationStartAt": date("2024-01-01T00:00:00Z"), "estimationEndAt": date("2024-12-31T00:00:00Z"),
+    },
+}
+# Attribute made invalid in the second entity of every model.
+INVALID = {AgriSoilState: ("humus", {"type": "Property", "value": "high"}),
+           AgriYeld: ("hasAgriCrop", {"type": "Relationship", "object": "crop 1"}),
+           AgriCarbonFootPrint: ("estimationEndAt", date("end of year"))}
+
+
+def per_entity_us(function, entities, number):
+    return min(timeit.repeat(lambda: [function(entity) for entity in entities], number=number, repeat=3)) / number / len(entities) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="Validations timed per model and method.")
+    args = parser.parse_args()
+
+    print(f"{'model':<22}{'entity':<9}{'validate (us)':>15}{'SchemaValidator (us)':>22}{'speed-up':>10}")
+    for model, valid in ENTITIES.items():
+        invalid = copy.deepcopy(valid)
+        name, value = INVALID[model]
+        invalid[name] = value
+        assert model.validate_smart_data_model(valid) == (True, '')
+        assert not model.validate_smart_data_model(invalid)[0]
+
+        schema = model._schema_validator.schema
+
+        def validate(entity):
+            try:
+                jsonschema.validate(to_key_values(entity), schema, format_checker=FORMAT_CHECKER)
+            except jsonschema.ValidationError:
+                pass
+
+        for label, entity in (("valid", valid), ("invalid", invalid)):
+            naive = per_entity_us(validate, [entity], max(1, args.number // 50))
+            fast = per_entity_us(model._schema_validator.error, [entity], args.number)
+            print(f"{model.__name__:<22}{label:<9}{naive:>15.1f}{fast:>22.1f}{naive / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
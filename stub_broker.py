@@ -0,0 +1,317 @@
+"""
+Local stand-in for the NGSI-LD context broker behind Kong, for development and tests.
+
+It keeps the entities in memory and implements the subset of the NGSI-LD API used by this service:
+entity creation, retrieval (by id and by type, with limit/offset/count/options), attribute updates
+and removals, deletion, batch upsert and subscriptions, whose notifications are POSTed to the
+registered endpoint.
+
+Run it and point KONG_ADMIN_URL at it:
+
+    python stub_broker.py --port 1026 --latency 20
+    KONG_ADMIN_URL = 'http://localhost:1026/'
+"""
+import argparse
+import gzip
+import json
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import requests
+
+PREFIX = "/ngsi-ld/v1"
+SYSTEM_ATTRIBUTES = ("createdAt", "modifiedAt")
+
+
+def now():
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def short_type(entity_type):
+    return str(entity_type).rstrip("/").rsplit("/", 1)[-1].rsplit("#", 1)[-1]
+
+
+class StubBroker:
+    """
+    StubBroker class holds the state of the stand-in broker: entities, subscriptions and the queue of
+    notifications waiting to be delivered.
+
+    Tests can read the requests it received (`requests`, as (method, path) pairs) and make it answer
+    the next ones with an error (`fail`).
+
+    Attributes:
+        - latency (float): Seconds added to every response, to imitate a remote broker.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.entities = {}
+        self.subscriptions = {}
+        self.requests = []
+        self.failures = []
+        self.lock = threading.Lock()
+        self.notifications = queue.Queue()
+        threading.Thread(target=self._notify, name="stub-broker-notifications", daemon=True).start()
+
+    def fail(self, status, count=1, method=None):
+        """
+        This method makes the broker answer the next `count` requests (of `method`, or of any method) with `status`.
+        """
+        with self.lock:
+            self.failures.extend([(method, status)] * count)
+
+    def take_failure(self, method):
+        with self.lock:
+            for index, (failing_method, status) in enumerate(self.failures):
+                if failing_method in (None, method):
+                    del self.failures[index]
+                    return status
+        return None
+
+    def reset(self):
+        with self.lock:
+            self.entities.clear()
+            self.subscriptions.clear()
+            self.requests.clear()
+            self.failures.clear()
+
+    def store(self, entity, replace=True):
+        """
+        This method creates or replaces an entity and returns True if it did not exist before.
+        """
+        with self.lock:
+            previous = self.entities.get(entity["id"])
+            if previous is not None and not replace:
+                return False
+            stored = {key: value for key, value in entity.items() if key not in SYSTEM_ATTRIBUTES and key != "@context"}
+            stored["createdAt"] = previous["createdAt"] if previous else now()
+            stored["modifiedAt"] = now()
+            self.entities[entity["id"]] = stored
+        self.changed(stored)
+        return previous is None
+
+    def update_attributes(self, entity_id, attributes):
+        with self.lock:
+            entity = self.entities.get(entity_id)
+            if entity is None:
+                return False
+            entity.update({key: value for key, value in attributes.items() if key not in ("id", "type", "@context")})
+            entity["modifiedAt"] = now()
+            stored = dict(entity)
+        self.changed(stored)
+        return True
+
+    def delete_attribute(self, entity_id, name):
+        with self.lock:
+            entity = self.entities.get(entity_id)
+            if entity is None or name not in entity or name in ("id", "type"):
+                return False
+            del entity[name]
+            entity["modifiedAt"] = now()
+            stored = dict(entity)
+        self.changed(stored)
+        return True
+
+    def delete(self, entity_id):
+        with self.lock:
+            entity = self.entities.pop(entity_id, None)
+        if entity is not None:
+            self.changed({"id": entity_id, "type": entity["type"], "deletedAt": now()})
+        return entity is not None
+
+    def query(self, entity_type):
+        with self.lock:
+            return [entity for entity in self.entities.values() if short_type(entity["type"]) == short_type(entity_type)]
+
+    def changed(self, entity):
+        for subscription in list(self.subscriptions.values()):
+            if any(short_type(selector.get("type")) == short_type(entity["type"]) for selector in subscription.get("entities", [])):
+                self.notifications.put((subscription, entity))
+
+    def _notify(self):
+        while True:
+            subscription, entity = self.notifications.get()
+            endpoint = subscription["notification"]["endpoint"]
+            headers = {"Content-Type": "application/json"}
+            for info in endpoint.get("receiverInfo", []):
+                headers[info["key"]] = info["value"]
+            data = entity if subscription["notification"].get("sysAttrs") else present(entity, {})
+            notification = {
+                "id": f"urn:ngsi-ld:Notification:{time.time_ns()}",
+                "type": "Notification",
+                "subscriptionId": subscription["id"],
+                "notifiedAt": now(),
+                "data": [data]
+            }
+            try:
+                requests.post(endpoint["uri"], headers=headers, data=json.dumps(notification), timeout=10)
+            except requests.RequestException as e:
+                print(f"Notification to {endpoint['uri']} failed: {e}")
+
+
+def present(entity, params):
+    """
+    This method applies the attrs and options (sysAttrs, keyValues) query parameters to an entity.
+    """
+    options = params.get("options", "").split(",")
+    attrs = params.get("attrs")
+    selected = {}
+    for key, value in entity.items():
+        if key in SYSTEM_ATTRIBUTES and "sysAttrs" not in options:
+            continue
+        if attrs and key not in ("id", "type") and key not in SYSTEM_ATTRIBUTES and key not in attrs.split(","):
+            continue
+        if "keyValues" in options and isinstance(value, dict) and key not in ("id", "type"):
+            value = value.get("value", value.get("object"))
+        selected[key] = value
+    return selected
+
+
+class StubBrokerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # The headers and the body are written separately; Nagle would hold the body back on kept-alive connections.
+    disable_nagle_algorithm = True
+    broker = None
+
+    def log_message(self, *args):
+        pass
+
+    def send(self, status, body=None, headers=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        if body is not None:
+            self.send_header("Content-Type", "application/json")
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        data = self.rfile.read(length)
+        if self.headers.get("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        return json.loads(data or b"null")
+
+    def failed(self):
+        # Answers the request with the error set by StubBroker.fail, if any.
+        status = self.broker.take_failure(self.command)
+        if status is None:
+            return False
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send(status, {"title": "Injected failure"})
+        return True
+
+    def route(self):
+        if self.broker.latency:
+            time.sleep(self.broker.latency)
+        url = urlsplit(self.path)
+        self.broker.requests.append((self.command, url.path))
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if not url.path.startswith(PREFIX):
+            return None, [], params
+        parts = [unquote(part) for part in url.path[len(PREFIX):].strip("/").split("/")]
+        return parts[0], parts[1:], params
+
+    def do_GET(self):
+        resource, rest, params = self.route()
+        if self.failed():
+            return
+        if resource == "entities" and not rest:
+            if "type" not in params:
+                return self.send(400, {"title": "type is required"})
+            entities = self.broker.query(params["type"])
+            offset, limit = int(params.get("offset", 0)), int(params.get("limit", 20))
+            if limit > 1000:
+                return self.send(400, {"title": "limit must not exceed 1000"})
+            headers = {"NGSILD-Results-Count": str(len(entities))} if params.get("count") == "true" else {}
+            return self.send(200, [present(entity, params) for entity in entities[offset:offset + limit]], headers)
+        if resource == "entities" and len(rest) == 1:
+            entity = self.broker.entities.get(rest[0])
+            if entity is None:
+                return self.send(404, {"title": "Entity not found", "detail": rest[0]})
+            return self.send(200, present(entity, params))
+        if resource == "subscriptions" and not rest:
+            return self.send(200, list(self.broker.subscriptions.values()))
+        self.send(404, {"title": "Not found"})
+
+    def do_POST(self):
+        resource, rest, params = self.route()
+        if self.failed():
+            return
+        body = self.read_json()
+        if resource == "entities" and not rest:
+            if not self.broker.store(body, replace=False):
+                return self.send(409, {"title": "Entity already exists", "detail": body["id"]})
+            return self.send(201, headers={"Location": f"{PREFIX}/entities/{body['id']}"})
+        if resource == "entityOperations" and rest == ["upsert"]:
+            created = [entity["id"] for entity in body if self.broker.store(entity)]
+            return self.send(201, created) if created else self.send(204)
+        if resource == "subscriptions" and not rest:
+            if body["id"] in self.broker.subscriptions:
+                return self.send(409, {"title": "Subscription already exists", "detail": body["id"]})
+            self.broker.subscriptions[body["id"]] = body
+            return self.send(201, headers={"Location": f"{PREFIX}/subscriptions/{body['id']}"})
+        self.send(404, {"title": "Not found"})
+
+    def do_PATCH(self):
+        resource, rest, params = self.route()
+        if self.failed():
+            return
+        body = self.read_json()
+        if resource == "entities" and len(rest) == 2 and rest[1] == "attrs":
+            if not self.broker.update_attributes(rest[0], body):
+                return self.send(404, {"title": "Entity not found", "detail": rest[0]})
+            return self.send(204)
+        if resource == "subscriptions" and len(rest) == 1 and rest[0] in self.broker.subscriptions:
+            self.broker.subscriptions[rest[0]].update(body)
+            return self.send(204)
+        self.send(404, {"title": "Not found"})
+
+    def do_DELETE(self):
+        resource, rest, params = self.route()
+        if self.failed():
+            return
+        if resource == "entities" and len(rest) == 1:
+            return self.send(204) if self.broker.delete(rest[0]) else self.send(404, {"title": "Entity not found"})
+        if resource == "entities" and len(rest) == 3 and rest[1] == "attrs":
+            return self.send(204) if self.broker.delete_attribute(rest[0], rest[2]) else self.send(404, {"title": "Attribute not found"})
+        if resource == "subscriptions" and len(rest) == 1 and self.broker.subscriptions.pop(rest[0], None):
+            return self.send(204)
+        self.send(404, {"title": "Not found"})
+
+
+def start(host="127.0.0.1", port=1026, latency=0.0):
+    """
+    This method starts the stand-in broker in a background thread and returns (server, broker).
+    """
+    broker = StubBroker(latency=latency)
+    handler = type("Handler", (StubBrokerHandler,), {"broker": broker})
+    server = ThreadingHTTPServer((host, port), handler, bind_and_activate=False)
+    # Room for the connections opened at once by the async broker path.
+    server.request_queue_size = 256
+    server.server_bind()
+    server.server_activate()
+    threading.Thread(target=server.serve_forever, name="stub-broker", daemon=True).start()
+    return server, broker
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in NGSI-LD context broker.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1026)
+    parser.add_argument("--latency", type=float, default=0.0, help="Milliseconds added to every response.")
+    args = parser.parse_args()
+
+    server, broker = start(args.host, args.port, args.latency / 1000)
+    print(f"Stub NGSI-LD broker listening on http://{args.host}:{args.port}{PREFIX}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,70 @@
+"""
+Fixtures shared by the tests: the application, configured against stub_broker.py listening on a free port.
+
+The settings below replace those of app/config.py before any other module of the application reads
+them, so the tests do not depend on the local configuration.
+"""
+import pytest
+
+import app.config as config
+import stub_broker
+
+broker_server, stub = stub_broker.start("127.0.0.1", 0)
+BROKER_URL = f"http://127.0.0.1:{broker_server.server_address[1]}/"
+
+TEST_SETTINGS = {
+    "DEVELOPMENT": False,
+    "REQUIRED_KEYROCK_APP_KEY": False,
+    "P12_FILE_PATH": "",
+    "KONG_ADMIN_URL": BROKER_URL,
+    "KONG_ENTITIES_TYPE": f"{BROKER_URL}ngsi-ld/v1/entities?type=",
+    "KONG_ENTITIES": f"{BROKER_URL}ngsi-ld/v1/entities",
+    "KONG_ENTITY_OPERATIONS_UPSERT": f"{BROKER_URL}ngsi-ld/v1/entityOperations/upsert",
+    "KONG_SUBSCRIPTIONS": f"{BROKER_URL}ngsi-ld/v1/subscriptions",
+    "KONG_BATCH_CHUNK_SIZE": 100,
+    "KONG_VERIFY_SAMPLE_RATE": 0.0,
+    "KONG_COMPRESS_REQUESTS": False,
+    "ASYNC_BROKER_ENABLED": False,
+    "ISHARE_TOKEN_BACKGROUND_REFRESH": False,
+    "AUTH_LOCAL_JWT_VERIFICATION": False,
+    "ENTITY_CACHE_ENABLED": True,
+    "ENTITY_CACHE_BACKEND": "",
+    "WRITE_BEHIND_ENABLED": False,
+    "SUBSCRIPTIONS_ENABLED": False,
+    "SUBSCRIPTION_NOTIFICATION_TOKEN": "notification-secret",
+    "IDEMPOTENCY_CONTENT_TTL": 300,
+    "IDEMPOTENCY_BACKEND": "",
+    "DIFF_UPDATES_ENABLED": False,
+    "DIFF_UPDATES_BACKEND": "",
+    "BROKER_PAGE_SIZE": 1000,
+}
+for name, value in TEST_SETTINGS.items():
+    setattr(config, name, value)
+
+from app import create_app, utils
+from app.smartdatamodel_api import differential_writer, idempotency_store
+
+# The identity provider is not part of the tests.
+utils.ishare_token_manager.fetch_token = lambda: ("test-token", 3600)
+
+
+@pytest.fixture(scope="session")
+def app():
+    application = create_app()
+    application.config["TESTING"] = True
+    return application
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(autouse=True)
+def broker():
+    # Every test starts with an empty broker and without anything this service remembers of earlier writes.
+    stub.reset()
+    idempotency_store._local.clear()
+    differential_writer._local.clear()
+    utils.entity_cache._local.clear()
+    return stub
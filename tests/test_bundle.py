@@ -0,0 +1,67 @@
+from app.bundle import BundleWriter, dependency_order, entity_references
+
+
+def entity(entity_id, *references):
+    data = {"id": entity_id, "type": "AgriSoil"}
+    for position, reference in enumerate(references):
+        data[f"ref{position}"] = {"type": "Relationship", "object": reference}
+    return data
+
+
+def test_entity_references():
+    farm = {"id": "farm", "hasAgriParcel": {"type": "Relationship", "object": ["parcel:1", "parcel:2"]},
+            "name": {"type": "Property", "value": "parcel:3"}}
+
+    assert list(entity_references(farm)) == ["parcel:1", "parcel:2"]
+
+
+def test_dependency_order_follows_the_relationships():
+    entities = [entity("state", "soil", "parcel"), entity("soil"), entity("parcel", "outside")]
+
+    assert dependency_order(entities) == [[1, 2], [], []]
+
+
+def test_dependency_order_breaks_cycles_in_bundle_order():
+    entities = [entity("farm", "parcel"), entity("parcel", "farm"), entity("crop", "parcel")]
+
+    assert dependency_order(entities) == [[], [0], [1]]
+
+
+def test_write_all_writes_dependencies_first_and_skips_after_failures():
+    written = []
+
+    def write(data):
+        written.append(data["id"])
+        return {"id": data["id"], "status": "failed" if data["id"] == "soil" else "created"}
+
+    entities = [entity("state", "soil"), entity("soil"), entity("crop", "parcel"), entity("parcel")]
+    results, elapsed_ms = BundleWriter(write, max_in_flight=1).write_all(entities)
+
+    assert [result["status"] for result in results] == ["skipped", "failed", "created", "created"]
+    assert results[0]["depends_on"] == ["soil"]
+    assert written.index("parcel") < written.index("crop")
+    assert "state" not in written
+    assert elapsed_ms >= 0
+
+
+def soil(entity_id, name, **attributes):
+    date = {"type": "Property", "value": {"@type": "DateTime", "@value": "2024-05-01T12:00:00Z"}}
+    return {"id": entity_id, "type": "AgriSoil", "dateCreated": date, "dateModified": date,
+            "name": {"type": "Property", "value": name}, **attributes}
+
+
+def test_bundle_endpoint(client, broker):
+    loam = soil("urn:ngsi-ld:AgriSoil:1", "Loam")
+    clay = soil("urn:ngsi-ld:AgriSoil:2", "Clay", seeAlso={"type": "Relationship", "object": "urn:ngsi-ld:AgriSoil:1"})
+    broker.fail(503, method="POST")
+
+    response = client.post("/api/bundle", json=[clay, loam])
+
+    assert response.status_code == 207
+    assert [result["status"] for result in response.get_json()["results"]] == ["skipped", "failed"]
+    assert broker.entities == {}
+
+    response = client.post("/api/bundle", json=[clay, loam])
+
+    assert response.status_code == 200
+    assert set(broker.entities) == {"urn:ngsi-ld:AgriSoil:1", "urn:ngsi-ld:AgriSoil:2"}
@@ -0,0 +1,79 @@
+import pytest
+
+from app.smart_data_models.columnar import ColumnarBatch
+from app.utils import PayloadError
+
+
+def columns(**overrides):
+    data = {
+        "id": ["urn:ngsi-ld:AgriParcelRecord:1", "urn:ngsi-ld:AgriParcelRecord:2"],
+        "has_agri_parcel": "urn:ngsi-ld:AgriParcel:1",
+        "location": "-5.66,40.96", "type_location": "Point",
+        "observed_at": ["2024-05-01T12:00:00Z", 1714564800],
+        "soil_temperature": [18.5, 0], "soil_temperature_unit": "CEL",
+        "air_temperature": [21.0, 21.5], "air_temperature_unit": "CEL",
+        "relative_humidity": [0.4, 0.45], "relative_humidity_unit": "P1",
+    }
+    data.update(overrides)
+    return data
+
+
+def test_columns_are_written_as_entities():
+    entities, errors = ColumnarBatch(columns()).to_smart_data_models()
+
+    assert errors == {}
+    assert [index for index, _ in entities] == [0, 1]
+    second = entities[1][1]
+    assert second["soilTemperature"] == {"type": "Property", "value": 0.0, "unitCode": "CEL"}
+    assert second["airTemperature"]["timestamp"]["value"]["@value"] == "2024-05-01T12:00:00Z"
+    assert second["location"] == {"type": "GeoProperty", "value": {"type": "Point", "coordinates": [-5.66, 40.96]}}
+
+
+def test_invalid_values_reject_only_their_records():
+    entities, errors = ColumnarBatch(columns(
+        soil_temperature=["hot", 18.7],
+        relative_humidity_unit=["P1", "percent"],
+        observed_at=["2024-05-01T12:00:00Z", "yesterday"],
+    )).to_smart_data_models()
+
+    assert entities == []
+    assert errors[0] == ["soil_temperature is not a number"]
+    assert "observed_at is not a valid date-time" in errors[1]
+    assert "relative_humidity_unit is not a UN/CEFACT unit code" in errors[1]
+
+
+def test_missing_values_are_reported():
+    entities, errors = ColumnarBatch(columns(
+        id=["urn:ngsi-ld:AgriParcelRecord:1", None],
+        air_temperature=[None, 21.5],
+        observed_at=[None, "2024-05-01T12:00:00Z"],
+    )).to_smart_data_models()
+
+    assert entities == []
+    assert errors[0] == ["air_temperature is missing", "relative_humidity_timestamp is missing"]
+    assert errors[1] == ["id is missing"]
+
+
+@pytest.mark.parametrize("data, expected", [
+    (columns(color=["red", "blue"]), {"errors": ["Unknown column: color"]}),
+    ({name: value for name, value in columns().items() if name != "air_temperature"}, {"errors": ["air_temperature is missing"]}),
+    (columns(soil_temperature=[18.5]), {"errors": ["Every column must have the same length, got [1, 2]"]}),
+    (columns(id="urn:ngsi-ld:AgriParcelRecord:1"), {"errors": ["id must be an array"]}),
+    ([], {"error": "The body must be a JSON object of columns."}),
+])
+def test_malformed_uploads_are_rejected_whole(data, expected):
+    with pytest.raises(PayloadError) as error:
+        ColumnarBatch(data)
+    assert error.value.body == expected
+
+
+def test_columns_endpoint(client, broker):
+    response = client.post("/api/agri_parcel_record/columns", json=columns(soil_temperature=[18.5, "hot"]))
+
+    assert response.status_code == 207
+    assert [result["status"] for result in response.get_json()["results"]] == ["created", "invalid"]
+    assert list(broker.entities) == ["urn:ngsi-ld:AgriParcelRecord:1"]
+
+    response = client.post("/api/agri_parcel_record/columns", json=columns(soil_temperature=[18.5]))
+
+    assert response.status_code == 400
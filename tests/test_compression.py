@@ -0,0 +1,87 @@
+import gzip
+import io
+import json
+
+import pytest
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from app.compression import ZSTD_BLOCK_SIZE, DecompressingStream, zstandard
+
+SOIL = {
+    "id": "urn:ngsi-ld:AgriSoil:1", "type": "AgriSoil",
+    "dateCreated": {"type": "Property", "value": {"@type": "DateTime", "@value": "2024-05-01T12:00:00Z"}},
+    "dateModified": {"type": "Property", "value": {"@type": "DateTime", "@value": "2024-05-01T12:00:00Z"}},
+    "name": {"type": "Property", "value": "Loam"},
+}
+
+
+def post(client, body, encoding="gzip"):
+    headers = {"Content-Type": "application/json", "Content-Encoding": encoding}
+    return client.post("/api/agri_soil", data=body, headers=headers)
+
+
+def test_gzip_body_is_decompressed(client, broker):
+    response = post(client, gzip.compress(json.dumps(SOIL).encode()))
+
+    assert response.status_code == 201
+    assert broker.entities["urn:ngsi-ld:AgriSoil:1"]["name"]["value"] == "Loam"
+
+
+def test_unsupported_encoding_is_answered_with_415(client):
+    response = post(client, b"{}", encoding="br")
+
+    assert response.status_code == 415
+    assert response.get_json() == {"error": "Unsupported Content-Encoding: br"}
+
+
+def test_corrupt_body_is_answered_with_json_400(client, broker):
+    response = post(client, b"not gzip at all")
+
+    assert response.status_code == 400
+    assert response.get_json()["error"].startswith("The body is not valid gzip")
+    assert broker.entities == {}
+
+
+def test_truncated_body_is_answered_with_json_400(client):
+    response = post(client, gzip.compress(json.dumps(SOIL).encode())[:-8])
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "The compressed body is truncated."}
+
+
+def test_oversized_body_is_answered_with_json_413(app, client, monkeypatch, broker):
+    monkeypatch.setattr(app.wsgi_app, "max_size", 64)
+
+    response = post(client, gzip.compress(json.dumps(SOIL).encode()))
+
+    assert response.status_code == 413
+    assert response.get_json() == {"error": "The decompressed body exceeds 64 bytes."}
+    assert broker.entities == {}
+
+
+def zstd_compress(data):
+    return zstandard.ZstdCompressor().compress(data)
+
+
+ENCODINGS = [("gzip", gzip.compress), pytest.param("zstd", zstd_compress, marks=pytest.mark.skipif(zstandard is None, reason="zstandard is not installed"))]
+
+
+@pytest.mark.parametrize("encoding, compress", ENCODINGS)
+def test_bomb_is_stopped_at_the_limit(encoding, compress):
+    # 64 MiB of zeros fit in a single compressed chunk.
+    body = DecompressingStream(io.BytesIO(compress(bytes(64 * 1048576))), encoding, max_size=1000)
+
+    with pytest.raises(RequestEntityTooLarge):
+        body.read()
+    assert body.bytes_in <= body.chunk_size
+    assert body.bytes_out <= 1000 + ZSTD_BLOCK_SIZE
+
+
+@pytest.mark.parametrize("encoding, compress", ENCODINGS)
+def test_concatenated_members_are_read_whole(encoding, compress):
+    data = b"".join(b'{"line": %d}\n' % number for number in range(50000))
+    compressed = compress(data[:300000]) + compress(data[300000:])
+
+    body = DecompressingStream(io.BytesIO(compressed), encoding, max_size=len(data), chunk_size=4096)
+
+    assert b"".join(body) == data
@@ -0,0 +1,76 @@
+import inspect
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from app.smart_data_models.agri_app import AgriApp
+from app.smart_data_models.agri_carbon_footprint import AgriCarbonFootPrint
+from app.smart_data_models.agri_crop import AgriCrop
+from app.smart_data_models.agri_farm import AgriFarm
+from app.smart_data_models.agri_greenhouse import AgriGreenHouse
+from app.smart_data_models.agri_parcel import AgriParcel
+from app.smart_data_models.agri_parcel_operation import AgriParcelOperation
+from app.smart_data_models.agri_parcel_record import AgriParcelRecord
+from app.smart_data_models.agri_soil import AgriSoil
+from app.smart_data_models.agri_soil_state import AgriSoilState
+from app.smart_data_models.agri_yeld import AgriYeld
+from app.smart_data_models.building import Building
+from app.smart_data_models.person import Person
+from app.utils import json_default
+
+# Output of the hand-written to_smart_data_model methods the attribute specs replaced, for the objects
+# built below. AgriParcelOperation and AgriSoilState hold the output of the specs: their hand-written
+# methods read attributes the models do not have.
+LEGACY_OUTPUT = os.path.join(os.path.dirname(__file__), "data", "legacy_converters.json")
+GEOMETRY_PARAMETERS = ("location", "land_location", "type_location", "location_type", "land_location_type")
+MODELS = (AgriApp, AgriCarbonFootPrint, AgriCrop, AgriFarm, AgriGreenHouse, AgriParcel, AgriParcelOperation,
+          AgriParcelRecord, AgriSoil, AgriSoilState, AgriYeld, Building, Person)
+
+
+def sample_value(name):
+    if name in ("location", "land_location"):
+        return "-5.66,40.96;-5.65,40.96;-5.65,40.97;-5.66,40.96"
+    if name in GEOMETRY_PARAMETERS:
+        return "Polygon"
+    if "date" in name.lower():
+        return datetime(2024, 5, 1, 12, 0, 0)
+    if name.startswith("has") or name in ("see_also", "related_source"):
+        return f"urn:ngsi-ld:{name}:1,urn:ngsi-ld:{name}:2"
+    return f"{name} value"
+
+
+def build(model, full):
+    # With full=False, only the required parameters, the geometries and the dates are given.
+    arguments = {}
+    for parameter in list(inspect.signature(model.__init__).parameters.values())[1:]:
+        if parameter.name == "id":
+            arguments["id"] = f"urn:ngsi-ld:{model.__name__}:1"
+        elif full or parameter.default is inspect.Parameter.empty or parameter.name in GEOMETRY_PARAMETERS or "date" in parameter.name.lower():
+            arguments[parameter.name] = sample_value(parameter.name)
+    return model(**arguments)
+
+
+@pytest.fixture(scope="module")
+def legacy_output():
+    with open(LEGACY_OUTPUT) as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("variant", ["full", "required"])
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: model.__name__)
+def test_converter_matches_legacy_output(model, variant, legacy_output):
+    entity = build(model, variant == "full").to_smart_data_model()
+    assert json.loads(json.dumps(entity, default=json_default)) == legacy_output[model.__name__][variant]
+
+
+def test_building_writes_empty_values_by_rule():
+    building = build(Building, False)
+    building.address = None
+    building.collapseRisk = 0
+    building.floorsAboveGround = None
+    entity = building.to_smart_data_model()
+    assert entity["address"] == {"type": "Property", "value": None}
+    assert entity["collapseRisk"] == {"type": "Property", "value": 0}
+    assert "floorsAboveGround" not in entity
@@ -0,0 +1,103 @@
+from cachelib import FileSystemCache
+
+from app import smartdatamodel_api, utils
+from app.entity_diff import DifferentialWriter, diff_attributes
+from app.smartdatamodel_api import send_entities
+
+
+def soil(**attributes):
+    entity = {"id": "urn:ngsi-ld:AgriSoil:1", "type": "AgriSoil"}
+    entity.update({name: {"type": "Property", "value": value} for name, value in attributes.items()})
+    return entity
+
+
+def writer():
+    return DifferentialWriter(utils.patch_entity_attributes, utils.delete_entity_attribute)
+
+
+def sent(broker, method):
+    return [path for request_method, path in broker.requests if request_method == method]
+
+
+def test_diff_attributes():
+    assert diff_attributes(soil(name="Loam", humus=3), soil(name="Clay", humus=3)) == ({"name": {"type": "Property", "value": "Clay"}}, [])
+    assert diff_attributes(soil(name="Loam", humus=3), soil(name="Loam")) == ({}, ["humus"])
+    assert diff_attributes(soil(name="Loam"), dict(soil(name="Loam"), type="AgriParcel")) is None
+
+
+def test_write_patches_only_the_changed_attributes(broker):
+    differential = writer()
+    assert differential.write([soil(name="Loam", humus=3)], send_entities)[0]["status"] == "created"
+    broker.requests.clear()
+
+    result = differential.write([soil(name="Clay", humus=3)], send_entities)[0]
+
+    assert result == {"id": "urn:ngsi-ld:AgriSoil:1", "status": "updated", "attributes": ["name"]}
+    assert sent(broker, "PATCH") == ["/ngsi-ld/v1/entities/urn:ngsi-ld:AgriSoil:1/attrs"]
+    assert broker.entities["urn:ngsi-ld:AgriSoil:1"]["name"]["value"] == "Clay"
+    assert differential.write([soil(name="Clay", humus=3)], send_entities)[0]["status"] == "unchanged"
+
+
+def test_write_removes_dropped_attributes(broker):
+    differential = writer()
+    differential.write([soil(name="Loam", humus=3)], send_entities)
+
+    result = differential.write([soil(name="Loam")], send_entities)[0]
+
+    assert result == {"id": "urn:ngsi-ld:AgriSoil:1", "status": "updated", "attributes": [], "removed": ["humus"]}
+    assert sent(broker, "DELETE") == ["/ngsi-ld/v1/entities/urn:ngsi-ld:AgriSoil:1/attrs/humus"]
+    assert "humus" not in broker.entities["urn:ngsi-ld:AgriSoil:1"]
+
+
+def test_write_falls_back_to_a_whole_write_when_the_entity_is_gone(broker):
+    differential = writer()
+    differential.write([soil(name="Loam")], send_entities)
+    broker.delete("urn:ngsi-ld:AgriSoil:1")
+
+    assert differential.write([soil(name="Clay")], send_entities)[0]["status"] == "created"
+    assert broker.entities["urn:ngsi-ld:AgriSoil:1"]["name"]["value"] == "Clay"
+
+
+def test_write_patches_every_attribute_of_an_existing_unknown_entity(broker):
+    broker.store(soil(name="Loam"))
+
+    result = writer().write([soil(name="Clay", humus=3)], send_entities)[0]
+
+    assert result == {"id": "urn:ngsi-ld:AgriSoil:1", "status": "updated", "attributes": ["humus", "name"]}
+    assert broker.entities["urn:ngsi-ld:AgriSoil:1"]["name"]["value"] == "Clay"
+
+
+def test_write_does_not_patch_after_other_failures(broker):
+    broker.fail(503, method="POST")
+
+    result = writer().write([soil(name="Loam")], send_entities)[0]
+
+    assert result["status"] == "failed"
+    assert result["status_code"] == 503
+    assert sent(broker, "PATCH") == []
+
+
+def dated_soil(name):
+    date = {"type": "Property", "value": {"@type": "DateTime", "@value": "2024-05-01T12:00:00Z"}}
+    return {"id": "urn:ngsi-ld:AgriSoil:1", "type": "AgriSoil", "dateCreated": date, "dateModified": date,
+            "name": {"type": "Property", "value": name}}
+
+
+def test_batch_write_forgets_the_last_version(client, broker, monkeypatch):
+    monkeypatch.setattr(smartdatamodel_api, "DIFF_UPDATES_ENABLED", True)
+    assert client.post("/api/agri_soil", json=dated_soil("Loam")).status_code == 201
+    assert client.post("/api/batch/AgriSoil", json=[dated_soil("Clay")]).status_code == 200
+
+    assert client.post("/api/agri_soil", json=dated_soil("Loam")).status_code == 201
+    assert broker.entities["urn:ngsi-ld:AgriSoil:1"]["name"]["value"] == "Loam"
+
+
+def test_shared_backend_is_the_only_copy(broker, tmp_path):
+    # Two worker processes: the batch handled by the second one is seen by the first.
+    first, second = (DifferentialWriter(utils.patch_entity_attributes, utils.delete_entity_attribute, backend=FileSystemCache(str(tmp_path))) for _ in range(2))
+    first.write([soil(name="Loam")], send_entities)
+    second.forget("urn:ngsi-ld:AgriSoil:1")
+    broker.store(soil(name="Clay"))
+
+    assert first.write([soil(name="Loam")], send_entities)[0]["status"] == "updated"
+    assert broker.entities["urn:ngsi-ld:AgriSoil:1"]["name"]["value"] == "Loam"
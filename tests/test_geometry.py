@@ -0,0 +1,53 @@
+import pytest
+
+from app.geometry import GeometryError, parse_coordinates, simplify_geometry, validate_geometry
+
+RING = [[-5.66, 40.96], [-5.65, 40.96], [-5.65, 40.97], [-5.66, 40.97], [-5.66, 40.96]]
+
+
+def test_parse_coordinates():
+    assert parse_coordinates("-5.66,40.96") == [-5.66, 40.96]
+    assert parse_coordinates("-5.66,40.96;-5.65,40.97") == [[-5.66, 40.96], [-5.65, 40.97]]
+    assert parse_coordinates("1,2,3;4,5,6") == [[1, 2, 3], [4, 5, 6]]
+
+
+@pytest.mark.parametrize("text", ["1,a;3,4", "1,2;3", "1", "1,2,3;4,5;6", "1;2,3,4"])
+def test_parse_coordinates_rejects_malformed_text(text):
+    with pytest.raises(GeometryError):
+        parse_coordinates(text)
+
+
+@pytest.mark.parametrize("type_location, coordinates", [
+    ("Point", [-5.66, 40.96]),
+    ("LineString", [[-5.66, 40.96], [-5.65, 40.97]]),
+    ("Polygon", [RING]),
+    ("MultiPolygon", [[RING], [RING]]),
+    ("GeometryCollection", [{"type": "Point", "coordinates": [0, 0]}, {"type": "Polygon", "coordinates": [RING]}]),
+])
+def test_validate_geometry_accepts_valid_geometries(type_location, coordinates):
+    validate_geometry(type_location, coordinates)
+
+
+@pytest.mark.parametrize("type_location, coordinates, message", [
+    ("Point", [200, 40], "Longitude 200 is out of [-180, 180]."),
+    ("Point", [-5.66, -95], "Latitude -95 is out of [-90, 90]."),
+    ("Point", [1, 2, 3, 4], "Every position needs 2 or 3 coordinates."),
+    ("LineString", [[-5.66, 40.96]], "A line needs at least 2 positions."),
+    ("Polygon", [RING[:-1]], "A polygon ring must be closed: its first and last positions must be equal."),
+    ("Polygon", [RING[:2] + RING[:1]], "A polygon ring needs at least 4 positions."),
+    ("Polygon", RING, "Every position must be a list of 2 or 3 numbers."),
+    ("Polygon", [[RING]], "Every position needs 2 or 3 coordinates."),
+    ("LineString", [[0, "a"], [1, 1]], "Coordinates must be nested lists of numbers."),
+    ("GeometryCollection", [{"coordinates": [0, 0]}], "Every geometry of a GeometryCollection needs a type and coordinates."),
+])
+def test_validate_geometry_rejects_invalid_geometries(type_location, coordinates, message):
+    with pytest.raises(GeometryError) as error:
+        validate_geometry(type_location, coordinates)
+    assert str(error.value) == message
+
+
+def test_simplify_geometry_drops_positions_within_the_tolerance():
+    line = [[0, 0], [1, 0.001], [2, 0], [3, 1]]
+
+    assert simplify_geometry("LineString", line, 0.01) == [[0, 0], [2, 0], [3, 1]]
+    assert simplify_geometry("Polygon", [RING], 1) == [RING]
@@ -0,0 +1,139 @@
+import threading
+
+from app import smartdatamodel_api
+from app.idempotency import IdempotencyStore, content_hash
+
+
+def soil(name="Loam", modified="2024-05-01T12:00:00Z"):
+    return {
+        "id": "urn:ngsi-ld:AgriSoil:1", "type": "AgriSoil",
+        "dateCreated": {"type": "Property", "value": {"@type": "DateTime", "@value": "2024-05-01T12:00:00Z"}},
+        "dateModified": {"type": "Property", "value": {"@type": "DateTime", "@value": modified}},
+        "name": {"type": "Property", "value": name},
+    }
+
+
+def creates(broker):
+    return [request for request in broker.requests if request == ("POST", "/ngsi-ld/v1/entities")]
+
+
+def upserts(broker):
+    return [request for request in broker.requests if request == ("POST", "/ngsi-ld/v1/entityOperations/upsert")]
+
+
+def test_content_hash_ignores_date_modified():
+    assert content_hash(soil()) == content_hash(soil(modified="2024-06-01T00:00:00Z"))
+    assert content_hash(soil()) != content_hash(soil(name="Clay"))
+
+
+def test_write_changed_skips_unchanged_entities():
+    store = IdempotencyStore()
+    written = []
+
+    def write(entities):
+        written.extend(entity["name"]["value"] for entity in entities)
+        return [{"id": entity["id"], "status": "created"} for entity in entities]
+
+    assert store.write_changed([soil()], write) == [{"id": "urn:ngsi-ld:AgriSoil:1", "status": "created"}]
+    store.write_changed([soil(modified="2024-05-01T12:00:00+00:00")], write)
+    store.write_changed([soil(modified="2024-04-01T12:00:00Z")], write)
+    store.write_changed([soil(name="Clay")], write)
+    assert written == ["Loam", "Clay"]
+
+
+def test_write_changed_writes_a_later_date_modified():
+    store = IdempotencyStore()
+    written = []
+
+    def write(entities):
+        written.extend(entity["dateModified"]["value"]["@value"] for entity in entities)
+        return [{"id": entity["id"], "status": "updated"} for entity in entities]
+
+    store.write_changed([soil()], write)
+    store.write_changed([soil(modified="2024-06-01T00:00:00Z")], write)
+    assert written == ["2024-05-01T12:00:00Z", "2024-06-01T00:00:00Z"]
+
+
+def test_write_changed_does_not_record_failures():
+    store = IdempotencyStore()
+    calls = []
+
+    def write(entities):
+        calls.append(len(entities))
+        return [{"id": entity["id"], "status": "failed", "error": "503"} for entity in entities]
+
+    store.write_changed([soil()], write)
+    store.write_changed([soil()], write)
+    assert calls == [1, 1]
+
+
+def test_unchanged_entity_is_not_sent_again(client, broker):
+    assert client.post("/api/agri_soil", json=soil()).status_code == 201
+    assert client.post("/api/agri_soil", json=soil()).status_code == 201
+    assert len(creates(broker)) == 1
+
+
+def test_entity_modified_later_is_sent_again(client, broker):
+    client.post("/api/batch/AgriSoil", json=[soil()])
+
+    assert client.post("/api/batch/AgriSoil", json=[soil(modified="2024-06-01T00:00:00Z")]).status_code == 200
+    assert len(upserts(broker)) == 2
+    assert broker.entities["urn:ngsi-ld:AgriSoil:1"]["dateModified"]["value"]["@value"] == "2024-06-01T00:00:00Z"
+
+
+def test_idempotency_key_replays_the_response(client, broker):
+    headers = {"Idempotency-Key": "key-1"}
+    first = client.post("/api/agri_soil", json=soil(), headers=headers)
+    second = client.post("/api/agri_soil", json=soil(), headers=headers)
+    assert first.status_code == second.status_code == 201
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.get_json() == first.get_json()
+    assert len(creates(broker)) == 1
+
+
+def test_idempotency_key_with_another_body(client):
+    headers = {"Idempotency-Key": "key-2"}
+    client.post("/api/agri_soil", json=soil(), headers=headers)
+    response = client.post("/api/agri_soil", json=soil(name="Clay"), headers=headers)
+    assert response.status_code == 422
+    assert "error" in response.get_json()
+
+
+def test_failed_write_is_not_replayed(client, broker):
+    headers = {"Idempotency-Key": "key-3"}
+    broker.fail(503, method="POST")
+    response = client.post("/api/agri_soil", json=soil(), headers=headers)
+    assert response.status_code == 502
+    assert "503" in response.get_json()["error"]
+
+    retry = client.post("/api/agri_soil", json=soil(), headers=headers)
+    assert retry.status_code == 201
+    assert "Idempotent-Replayed" not in retry.headers
+    assert "urn:ngsi-ld:AgriSoil:1" in broker.entities
+
+
+def test_idempotency_key_in_progress_is_answered_with_409(app, client, broker, monkeypatch):
+    headers = {"Idempotency-Key": "key-4"}
+    started, finish = threading.Event(), threading.Event()
+    create_entities = smartdatamodel_api.create_entities
+
+    def slow_create_entities(entities):
+        started.set()
+        finish.wait(5)
+        return create_entities(entities)
+
+    monkeypatch.setattr(smartdatamodel_api, "create_entities", slow_create_entities)
+    responses = []
+    first = threading.Thread(target=lambda: responses.append(app.test_client().post("/api/agri_soil", json=soil(), headers=headers)))
+    first.start()
+    assert started.wait(5)
+
+    concurrent = client.post("/api/agri_soil", json=soil(), headers=headers)
+    finish.set()
+    first.join(5)
+
+    assert concurrent.status_code == 409
+    assert responses[0].status_code == 201
+    replayed = client.post("/api/agri_soil", json=soil(), headers=headers)
+    assert replayed.headers["Idempotent-Replayed"] == "true"
+    assert len(creates(broker)) == 1
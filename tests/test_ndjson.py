@@ -0,0 +1,59 @@
+import io
+import json
+
+from app.utils import PayloadError, iter_ndjson, parse_ndjson
+
+
+def soil(number, name="Loam"):
+    date = {"type": "Property", "value": {"@type": "DateTime", "@value": "2024-05-01T12:00:00Z"}}
+    return {"id": f"urn:ngsi-ld:AgriSoil:{number}", "type": "AgriSoil", "dateCreated": date, "dateModified": date,
+            "name": {"type": "Property", "value": name}}
+
+
+def test_iter_ndjson_reports_bad_lines_and_carries_on():
+    stream = io.BytesIO(b'{"a": 1}\n\n{"b": \n' + b'"' + b"x" * 40 + b'"\n{"c": 3}')
+
+    items = list(iter_ndjson(stream, max_line_length=32))
+
+    assert items[0] == (1, {"a": 1})
+    assert items[1][0] == 3 and isinstance(items[1][1], PayloadError)
+    assert items[1][1].body["error"].startswith("Invalid JSON")
+    assert items[2][0] == 4 and items[2][1].body == {"error": "Line longer than 32 bytes"}
+    assert items[3] == (5, {"c": 3})
+
+
+def test_iter_ndjson_skips_the_whole_of_an_oversized_line():
+    stream = io.BytesIO(b'"' + b"x" * 100 + b'"\n{"a": 1}\n')
+
+    items = list(iter_ndjson(stream, max_line_length=16))
+
+    assert items[1] == (2, {"a": 1})
+
+
+def test_parse_ndjson():
+    assert parse_ndjson('{"a": 1}\r\n\n{"b": 2}\n') == [{"a": 1}, {"b": 2}]
+    try:
+        parse_ndjson('{"a": 1}\n{"b"\n')
+    except PayloadError as e:
+        assert e.body["error"].startswith("Invalid JSON on line 2")
+    else:
+        raise AssertionError("PayloadError not raised")
+
+
+def test_batch_endpoint_accepts_ndjson(client, broker):
+    body = "\n".join(json.dumps(soil(number)) for number in (1, 2)) + "\n"
+
+    response = client.post("/api/batch/AgriSoil", data=body, content_type="application/x-ndjson")
+
+    assert response.status_code == 200
+    assert set(broker.entities) == {"urn:ngsi-ld:AgriSoil:1", "urn:ngsi-ld:AgriSoil:2"}
+
+
+def test_stream_endpoint_reports_bad_lines(client, broker):
+    body = json.dumps(soil(1)) + "\nnot json\n" + json.dumps(soil(2)) + "\n"
+
+    response = client.post("/api/stream/AgriSoil", data=body, content_type="application/x-ndjson")
+
+    assert response.status_code == 207
+    assert response.get_json()["errors"][0]["line"] == 2
+    assert set(broker.entities) == {"urn:ngsi-ld:AgriSoil:1", "urn:ngsi-ld:AgriSoil:2"}
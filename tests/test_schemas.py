@@ -0,0 +1,71 @@
+import pytest
+
+from app.smart_data_models.agri_soil_state import AgriSoilState
+from app.smart_data_models.agri_yeld import AgriYeld
+from app.smart_data_models.schemas import SchemaValidator, is_date_time, to_key_values
+
+
+def date(value):
+    return {"type": "Property", "value": {"@type": "DateTime", "@value": value}}
+
+
+def soil_state(**attributes):
+    entity = {
+        "id": "urn:ngsi-ld:AgriSoilState:1", "type": "AgriSoilState",
+        "dateCreated": date("2024-05-01T12:00:00"), "dateModified": date("2024-05-01T12:00:00"),
+        "dateOfMeasurement": date("2024-05-01T11:00:00Z"),
+        "acidity": {"type": "Property", "value": 6.5, "unitCode": "pH"},
+        "humus": {"type": "Property", "value": 3.2, "unitCode": "percent"},
+        "hasAgriSoil": {"type": "Relationship", "object": "urn:ngsi-ld:AgriSoil:1"},
+        "hasAgriParcel": {"type": "Relationship", "object": "urn:ngsi-ld:AgriParcel:1"},
+    }
+    entity.update(attributes)
+    return entity
+
+
+def test_to_key_values():
+    entity = soil_state()
+    data = to_key_values(entity)
+    assert data["acidity"] == 6.5
+    assert data["dateCreated"] == "2024-05-01T12:00:00"
+    assert data["hasAgriSoil"] == "urn:ngsi-ld:AgriSoil:1"
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2024-05-01T12:00:00", True),
+    ("2024-05-01T12:00:00Z", True),
+    ("2024-05-01T12:00:00.123+02:00", True),
+    ("2024-05-01", False),
+    ("2024-05-01T25:00:00", False),
+    ("end of year", False),
+])
+def test_is_date_time(value, expected):
+    assert is_date_time(value) is expected
+
+
+def test_valid_entity():
+    assert AgriSoilState.validate_smart_data_model(soil_state()) == (True, '')
+
+
+def test_invalid_entity_reports_the_attribute():
+    valid, message = AgriSoilState.validate_smart_data_model(soil_state(acidity={"type": "Property", "value": "high"}))
+    assert not valid
+    assert message.startswith("acidity:")
+
+
+def test_date_only_is_not_a_date_time():
+    valid, message = AgriSoilState.validate_smart_data_model(soil_state(dateOfMeasurement=date("2024-05-01")))
+    assert not valid
+    assert "dateOfMeasurement" in message
+
+
+def test_enum_rejects_values_of_another_type():
+    validator = SchemaValidator({"type": "object", "properties": {"status": {"enum": ["a", "b"]}}})
+    assert validator.error({"status": "a"}) is None
+    assert validator.error({"status": 5}) is not None
+    assert validator.error({"status": "c"}) is not None
+
+
+def test_common_schema_references_are_inlined():
+    schema = AgriYeld._schema_validator.schema
+    assert "$ref" not in str(schema)
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from app import api
+from app.streaming import iter_json_array, ndjson_line
+
+ELEMENTS = [{"id": "a", "name": {"value": "x, [y] {z}"}}, {"id": "b\\\"", "list": [1, [2, 3], {}]}, 4, "s,]"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1000])
+def test_iter_json_array_splits_elements_across_chunks(chunk_size):
+    data = json.dumps(ELEMENTS, indent=2).encode()
+    chunks = [data[start:start + chunk_size] for start in range(0, len(data), chunk_size)]
+
+    assert [json.loads(element) for element in iter_json_array(chunks)] == ELEMENTS
+
+
+def test_iter_json_array_of_an_empty_array():
+    assert list(iter_json_array([b" [ ", b"] "])) == []
+
+
+def test_ndjson_line():
+    assert ndjson_line(b'{"a": 1}') == b'{"a": 1}\n'
+    assert ndjson_line(b'{\n  "a": 1\n}') == b'{"a": 1}\n'
+
+
+def soil(number):
+    return {"id": f"urn:ngsi-ld:AgriSoil:{number}", "type": "AgriSoil", "name": {"type": "Property", "value": f"Soil {number}"}}
+
+
+@pytest.fixture
+def soils(broker, monkeypatch):
+    # Pages of 2 entities, so 5 entities take 3 requests to the broker.
+    monkeypatch.setattr(api, "BROKER_PAGE_SIZE", 2)
+    for number in range(5):
+        broker.store(soil(number))
+    return broker
+
+
+def test_stream_as_json_array(client, soils):
+    response = client.get("/context-broker/entity/AgriSoil?stream=true")
+
+    assert response.status_code == 200
+    assert [entity["id"] for entity in json.loads(response.data)] == [soil(number)["id"] for number in range(5)]
+    assert soils.requests.count(("GET", "/ngsi-ld/v1/entities")) == 3
+
+
+def test_stream_as_ndjson_with_a_limit(client, soils):
+    response = client.get("/context-broker/entity/AgriSoil?stream=true&format=ndjson&limit=3")
+
+    assert response.mimetype == "application/x-ndjson"
+    assert [json.loads(line)["id"] for line in response.data.splitlines()] == [soil(number)["id"] for number in range(3)]
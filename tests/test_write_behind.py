@@ -0,0 +1,53 @@
+import time
+from types import SimpleNamespace
+
+from app.write_behind import WriteBehindQueue
+
+
+def soil(name):
+    return {"id": "urn:ngsi-ld:AgriSoil:1", "name": {"type": "Property", "value": name}}
+
+
+def queue(tmp_path, upsert, retry_delay=5):
+    # Without worker threads, so the tests claim and process the items themselves.
+    write_behind = WriteBehindQueue(upsert, workers=0, retry_delay=retry_delay)
+    write_behind.init_app(SimpleNamespace(instance_path=str(tmp_path)), "queue.db")
+    return write_behind
+
+
+def test_versions_of_an_entity_are_not_sent_together(tmp_path):
+    write_behind = queue(tmp_path, lambda entities: [{"id": entity["id"], "status": "created"} for entity in entities])
+    write_behind.enqueue([("AgriSoil", soil("Loam")), ("AgriSoil", soil("Clay"))])
+
+    rows = write_behind._claim()
+    assert len(rows) == 1 and "Loam" in rows[0]["payload"]
+    assert write_behind._claim() == []
+    write_behind._process(rows)
+    assert "Clay" in write_behind._claim()[0]["payload"]
+
+
+def test_failed_version_is_retried_before_the_next_one(tmp_path):
+    broker = {}
+    sent = []
+
+    def upsert(entities):
+        sent.append([entity["name"]["value"] for entity in entities])
+        if len(sent) == 1:
+            return [{"id": entity["id"], "status": "failed", "error": "503"} for entity in entities]
+        broker.update({entity["id"]: entity["name"]["value"] for entity in entities})
+        return [{"id": entity["id"], "status": "updated"} for entity in entities]
+
+    write_behind = queue(tmp_path, upsert, retry_delay=0.05)
+    first, = write_behind.enqueue([("AgriSoil", soil("Loam"))])
+    write_behind._process(write_behind._claim())
+    second, = write_behind.enqueue([("AgriSoil", soil("Clay"))])
+
+    # The new version waits for the retry of the failed one.
+    assert write_behind._claim() == []
+    time.sleep(0.1)
+    write_behind._process(write_behind._claim())
+    write_behind._process(write_behind._claim())
+
+    assert sent == [["Loam"], ["Loam"], ["Clay"]]
+    assert broker == {"urn:ngsi-ld:AgriSoil:1": "Clay"}
+    assert write_behind.status(first)["status"] == write_behind.status(second)["status"] == "done"